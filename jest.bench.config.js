@@ -0,0 +1,25 @@
+const nextJest = require('next/jest');
+
+const createJestConfig = nextJest({
+    dir: './',
+});
+
+// Benchmarks laufen getrennt von den Tests: `npm run bench`
+const benchJestConfig = {
+    moduleNameMapper: {
+        '^@/(.*)$': '<rootDir>/src/$1',
+    },
+    testEnvironment: 'node',
+    moduleFileExtensions: ['ts', 'tsx', 'js', 'jsx'],
+    transformIgnorePatterns: [
+        '/node_modules/(?!(@azure|tedious|mssql)/)',
+    ],
+    testMatch: ['<rootDir>/tests/benchmark/**/*.bench.ts'],
+    transform: {
+        '^.+\\.(js|jsx|ts|tsx)$': ['babel-jest', { presets: ['next/babel'] }],
+    },
+    // Große Datensätze und PDF-Erzeugung brauchen deutlich länger als Unit-Tests
+    testTimeout: 10 * 60 * 1000,
+};
+
+module.exports = createJestConfig(benchJestConfig);
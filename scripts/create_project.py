@@ -1,211 +1,483 @@
+#!/usr/bin/env python3
+"""
+Scaffolds the RDAuswertung project structure (or any number of copies of it).
+
+The directory and file lists below are turned into one deduplicated tree.
+For every base directory a plan is built with a single os.scandir per
+existing directory; only missing directories and files are created, in
+parallel. Existing files are never touched, so the script can be re-run at
+any time.
+
+Usage:
+    python create_project.py C:\\Development\\RDAuswertung
+    python create_project.py --dry-run ./kunde-a ./kunde-b
+    python create_project.py --manifest templates.json --var firma=ACME ./kunde-a
+
+Manifest (JSON, paths relative to the base directory; absolute paths and
+paths leaving it via ".." are rejected):
+
+    {
+      "directories": ["src/reports"],
+      "files": {
+        "README.md": "# $project_name\\n",
+        "src/config/app.ts": {"source": "templates/app.ts"}
+      },
+      "replace_defaults": false
+    }
+
+Inline content and template files (relative to the manifest) are filled in
+with string.Template; $project_name is the name of the base directory, more
+variables come from --var.
+"""
+
+import argparse
+import json
+import ntpath
 import os
+import posixpath
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+
+DEFAULT_BASE_DIR = r"C:\Development\RDAuswertung"
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 2) * 4)
+
+# Create directories - using Windows-safe naming
+PROJECT_DIRECTORIES = [
+    # GitHub Actions
+    ".github/workflows",
+    # Husky for git hooks
+    ".husky",
+    # VS Code settings
+    ".vscode",
+    # Public assets
+    "public/images",
+    # Prisma ORM
+    "prisma",
+    # Next.js App Router structure
+    "src/app/api/standorte",
+    "src/app/api/standorte/[id]",
+    "src/app/api/raumbuch",
+    "src/app/api/raumbuch/[id]",
+    "src/app/api/export",
+    "src/app/api/export/excel/[id]",
+    "src/app/api/export/pdf/[id]",
+    "src/app/(dashboard)",
+    "src/app/standorte/[id]",
+    "src/app/report/[id]",
+    "src/app/export/excel/[id]",
+    "src/app/export/pdf/[id]",
+    # React components
+    "src/components/ui",
+    "src/components/charts",
+    "src/components/forms",
+    "src/components/layout",
+    "src/components/raumbuch",
+    # Configuration
+    "src/config",
+    # Utility functions and hooks
+    "src/lib",
+    "src/hooks",
+    # Data models and schemas
+    "src/models",
+    "src/schemas",
+    # Business logic services
+    "src/services",
+    "src/services/analysis",
+    "src/services/database",
+    "src/services/export",
+    # Global styles
+    "src/styles",
+    # TypeScript type definitions
+    "src/types",
+    # Tests
+    "tests/unit",
+    "tests/integration",
+    "tests/e2e",
+]
+
+# Create empty files - using Windows-safe naming
+PROJECT_FILES = [
+    # GitHub workflow
+    ".github/workflows/ci.yml",
+    # Husky hooks
+    ".husky/pre-commit",
+    # VS Code settings
+    ".vscode/settings.json",
+    ".vscode/extensions.json",
+    # Prisma schema
+    "prisma/schema.prisma",
+    # Next.js app files
+    "src/app/layout.tsx",
+    "src/app/page.tsx",
+    "src/app/(dashboard)/layout.tsx",
+    "src/app/(dashboard)/page.tsx",
+    "src/app/standorte/[id]/page.tsx",
+    "src/app/standorte/[id]/layout.tsx",
+    "src/app/report/[id]/page.tsx",
+    "src/app/report/[id]/layout.tsx",
+    # API Routes
+    "src/app/api/standorte/route.ts",
+    "src/app/api/standorte/[id]/route.ts",
+    "src/app/api/raumbuch/route.ts",
+    "src/app/api/raumbuch/[id]/route.ts",
+    "src/app/api/export/excel/[id]/route.ts",
+    "src/app/api/export/pdf/[id]/route.ts",
+    # Export Routes
+    "src/app/export/excel/[id]/route.ts",
+    "src/app/export/pdf/[id]/route.ts",
+    # UI Components
+    "src/components/ui/button.tsx",
+    "src/components/ui/card.tsx",
+    "src/components/ui/table.tsx",
+    "src/components/ui/select.tsx",
+    "src/components/ui/input.tsx",
+    "src/components/ui/alert.tsx",
+    "src/components/ui/loader.tsx",
+    # Chart Components
+    "src/components/charts/bereich-chart.tsx",
+    "src/components/charts/rg-chart.tsx",
+    "src/components/charts/etage-chart.tsx",
+    # Form Components
+    "src/components/forms/standort-select.tsx",
+    "src/components/forms/filter-form.tsx",
+    # Layout Components
+    "src/components/layout/header.tsx",
+    "src/components/layout/footer.tsx",
+    "src/components/layout/sidebar.tsx",
+    # Raumbuch Components
+    "src/components/raumbuch/raumbuch-table.tsx",
+    "src/components/raumbuch/summary-grid.tsx",
+    "src/components/raumbuch/summary-box.tsx",
+    "src/components/raumbuch/filter-bar.tsx",
+    # Configuration
+    "src/config/database.ts",
+    "src/config/app.ts",
+    # Utility libraries
+    "src/lib/db.ts",
+    "src/lib/utils.ts",
+    "src/lib/formatters.ts",
+    "src/lib/validators.ts",
+    # Custom hooks
+    "src/hooks/use-raumbuch-data.ts",
+    "src/hooks/use-standorte.ts",
+    "src/hooks/use-filter.ts",
+    # Models and types
+    "src/models/raumbuch.ts",
+    "src/models/standort.ts",
+    # Zod schemas for validation
+    "src/schemas/raumbuch.schema.ts",
+    "src/schemas/standort.schema.ts",
+    # Services
+    "src/services/database/client.ts",
+    "src/services/database/queries.ts",
+    "src/services/analysis/raumbuch-analysis.ts",
+    "src/services/analysis/calculate-summary.ts",
+    "src/services/analysis/prepare-visualization.ts",
+    "src/services/export/excel-export.ts",
+    "src/services/export/pdf-export.ts",
+    # Styles
+    "src/styles/globals.css",
+    # Types
+    "src/types/database.types.ts",
+    "src/types/raumbuch.types.ts",
+    "src/types/standort.types.ts",
+    # Tests - Unit
+    "tests/unit/services/analysis.test.ts",
+    "tests/unit/components/raumbuch-table.test.tsx",
+    "tests/unit/hooks/use-raumbuch-data.test.ts",
+    # Tests - Integration
+    "tests/integration/api/standorte.test.ts",
+    "tests/integration/services/export.test.ts",
+    # Tests - E2E
+    "tests/e2e/navigation.test.ts",
+    "tests/e2e/filtering.test.ts",
+    # Configuration files
+    ".env",
+    ".env.example",
+    ".eslintrc.json",
+    ".gitignore",
+    ".prettierrc",
+    "jest.config.js",
+    "next.config.js",
+    "package.json",
+    "postcss.config.js",
+    "tailwind.config.js",
+    "tsconfig.json",
+    "README.md",
+]
+
+
+class ScaffoldError(Exception):
+    """Raised for invalid manifests or paths that clash with existing files."""
+
+
+def safe_path(path, keep_brackets=False):
+    """Replace square brackets with alternative for Windows (unless kept)."""
+    path = path.replace('\\', '/').strip('/')
+    if keep_brackets:
+        return path
+    return path.replace('[', '_').replace(']', '_')
+
+
+def relative_manifest_path(path):
+    """
+    Normalizes a manifest path and makes sure it stays below the base directory.
+
+    Raises:
+        ScaffoldError: For absolute paths (also Windows drives) and paths
+            that leave the base directory via '..'
+    """
+    if not isinstance(path, str):
+        raise ScaffoldError(f"Invalid path in manifest: {path!r}")
+    normalized = posixpath.normpath(path.replace('\\', '/'))
+    if posixpath.isabs(normalized) or ntpath.splitdrive(normalized)[0]:
+        raise ScaffoldError(f"Absolute path in manifest: {path!r}")
+    if normalized == '.' or '..' in normalized.split('/'):
+        raise ScaffoldError(f"Path in manifest is outside the base directory: {path!r}")
+    return normalized
+
+
+class ProjectTree:
+    """
+    Deduplicated target structure: every directory (including all implied
+    parents) once, every file once with optional template content.
+    """
+
+    def __init__(self):
+        self.directories = set()
+        self.files = {}
+
+    def add_directory(self, path):
+        while path and path not in self.directories:
+            self.directories.add(path)
+            path = os.path.dirname(path)
+
+    def add_file(self, path, content=None):
+        if path in self.directories:
+            raise ScaffoldError(f"'{path}' is listed as directory and as file")
+        self.add_directory(os.path.dirname(path))
+        if content is not None or path not in self.files:
+            self.files[path] = content
+
+    @classmethod
+    def build(cls, directories, files, keep_brackets=False):
+        """
+        Args:
+            directories: Relative directory paths
+            files: Relative file paths, or a dict path -> content (None = empty)
+        """
+        tree = cls()
+        for directory in directories:
+            tree.add_directory(safe_path(directory, keep_brackets))
+        if not isinstance(files, dict):
+            files = dict.fromkeys(files)
+        for path, content in files.items():
+            tree.add_file(safe_path(path, keep_brackets), content)
+        return tree
+
+
+class Plan:
+    """What is missing below one base directory."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.create_base = False
+        self.directories = []
+        self.files = []
+        self.existing = 0
+        self.conflicts = []
+
+    def __bool__(self):
+        return bool(self.create_base or self.directories or self.files)
+
+    def describe(self):
+        lines = [f"Plan for {self.base_dir}:"]
+        if self.create_base:
+            lines.append("  + ./")
+        lines.extend(f"  + {path}/" for path in self.directories)
+        lines.extend(
+            f"  + {path}" + (" (template)" if content is not None else "")
+            for path, content in self.files
+        )
+        lines.extend(f"  ! {path}: {reason}" for path, reason in self.conflicts)
+        lines.append(
+            f"  {len(self.directories)} directories and {len(self.files)} files to create, "
+            f"{self.existing} already present, {len(self.conflicts)} conflicts"
+        )
+        return "\n".join(lines)
+
+
+def _listing(path):
+    """name -> is_dir for one directory (one scandir call), None if it does not exist."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry.is_dir() for entry in it}
+    except FileNotFoundError:
+        return None
+    except NotADirectoryError:
+        return False
+
+
+def make_plan(base_dir, tree):
+    """
+    Diffs ``tree`` against the file system below ``base_dir``.
+
+    Directories are visited parents first; only directories that already
+    exist are scanned, everything below a missing directory is missing too.
+    """
+    plan = Plan(base_dir)
+    base_listing = _listing(base_dir)
+    if base_listing is False:
+        plan.conflicts.append((base_dir, 'exists as a file'))
+        return plan
+    plan.create_base = base_listing is None
+
+    listings = {'': base_listing}
+    blocked = set()
+    for directory in sorted(tree.directories, key=lambda p: (p.count('/'), p)):
+        parent_dir = os.path.dirname(directory)
+        if parent_dir in blocked:
+            blocked.add(directory)
+            continue
+
+        parent = listings[parent_dir]
+        name = os.path.basename(directory)
+        if parent is None or name not in parent:
+            # Fehlt das Elternverzeichnis, fehlt alles darunter (kein scandir nötig)
+            plan.directories.append(directory)
+            listings[directory] = None
+        elif not parent[name]:
+            plan.conflicts.append((directory, 'exists as a file'))
+            blocked.add(directory)
+        else:
+            plan.existing += 1
+            listings[directory] = _listing(os.path.join(base_dir, directory)) or {}
+
+    for path in sorted(tree.files):
+        directory = os.path.dirname(path)
+        if directory in blocked:
+            continue
 
-def create_directory(path):
-    """Creates a directory if it doesn't exist."""
-    # Replace square brackets with alternative for Windows
-    safe_path = path.replace('[', '_').replace(']', '_')
-    if not os.path.exists(safe_path):
-        os.makedirs(safe_path)
-        print(f"Created directory: {safe_path}")
-
-def create_empty_file(path):
-    """Creates an empty file if it doesn't exist."""
-    # Replace square brackets with alternative for Windows
-    safe_path = path.replace('[', '_').replace(']', '_')
-    # Ensure the directory exists
-    dir_path = os.path.dirname(safe_path)
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
-    if not os.path.exists(safe_path):
-        with open(safe_path, 'w') as f:
-            pass
-        print(f"Created empty file: {safe_path}")
-
-def setup_project():
-    # Base directory
-    base_dir = r"C:\Development\RDAuswertung"
-    create_directory(base_dir)
-
-    # Change to base directory
-    os.chdir(base_dir)
-
-    # Create directories - using Windows-safe naming
-    directories = [
-        # GitHub Actions
-        ".github/workflows",
-        # Husky for git hooks
-        ".husky",
-        # VS Code settings
-        ".vscode",
-        # Public assets
-        "public/images",
-        # Prisma ORM
-        "prisma",
-        # Next.js App Router structure
-        "src/app/api/standorte",
-        "src/app/api/standorte/[id]",
-        "src/app/api/raumbuch",
-        "src/app/api/raumbuch/[id]",
-        "src/app/api/export",
-        "src/app/api/export/excel/[id]",
-        "src/app/api/export/pdf/[id]",
-        "src/app/(dashboard)",
-        "src/app/standorte/[id]",
-        "src/app/report/[id]",
-        "src/app/export/excel/[id]",
-        "src/app/export/pdf/[id]",
-        # React components
-        "src/components/ui",
-        "src/components/charts",
-        "src/components/forms",
-        "src/components/layout",
-        "src/components/raumbuch",
-        # Configuration
-        "src/config",
-        # Utility functions and hooks
-        "src/lib",
-        "src/hooks",
-        # Data models and schemas
-        "src/models",
-        "src/schemas",
-        # Business logic services
-        "src/services",
-        "src/services/analysis",
-        "src/services/database",
-        "src/services/export",
-        # Global styles
-        "src/styles",
-        # TypeScript type definitions
-        "src/types",
-        # Tests
-        "tests/unit",
-        "tests/integration",
-        "tests/e2e",
-    ]
-
-    for directory in directories:
-        create_directory(os.path.join(base_dir, directory))
-
-    # Create empty files - using Windows-safe naming
-    files = [
-        # GitHub workflow
-        ".github/workflows/ci.yml",
-        # Husky hooks
-        ".husky/pre-commit",
-        # VS Code settings
-        ".vscode/settings.json",
-        ".vscode/extensions.json",
-        # Prisma schema
-        "prisma/schema.prisma",
-        # Next.js app files
-        "src/app/layout.tsx",
-        "src/app/page.tsx",
-        "src/app/(dashboard)/layout.tsx",
-        "src/app/(dashboard)/page.tsx",
-        "src/app/standorte/[id]/page.tsx",
-        "src/app/standorte/[id]/layout.tsx",
-        "src/app/report/[id]/page.tsx",
-        "src/app/report/[id]/layout.tsx",
-        # API Routes
-        "src/app/api/standorte/route.ts",
-        "src/app/api/standorte/[id]/route.ts",
-        "src/app/api/raumbuch/route.ts",
-        "src/app/api/raumbuch/[id]/route.ts",
-        "src/app/api/export/excel/[id]/route.ts",
-        "src/app/api/export/pdf/[id]/route.ts",
-        # Export Routes
-        "src/app/export/excel/[id]/route.ts",
-        "src/app/export/pdf/[id]/route.ts",
-        # UI Components
-        "src/components/ui/button.tsx",
-        "src/components/ui/card.tsx",
-        "src/components/ui/table.tsx",
-        "src/components/ui/select.tsx",
-        "src/components/ui/input.tsx",
-        "src/components/ui/alert.tsx",
-        "src/components/ui/loader.tsx",
-        # Chart Components
-        "src/components/charts/bereich-chart.tsx",
-        "src/components/charts/rg-chart.tsx",
-        "src/components/charts/etage-chart.tsx",
-        # Form Components
-        "src/components/forms/standort-select.tsx",
-        "src/components/forms/filter-form.tsx",
-        # Layout Components
-        "src/components/layout/header.tsx",
-        "src/components/layout/footer.tsx",
-        "src/components/layout/sidebar.tsx",
-        # Raumbuch Components
-        "src/components/raumbuch/raumbuch-table.tsx",
-        "src/components/raumbuch/summary-grid.tsx",
-        "src/components/raumbuch/summary-box.tsx",
-        "src/components/raumbuch/filter-bar.tsx",
-        # Configuration
-        "src/config/database.ts",
-        "src/config/app.ts",
-        # Utility libraries
-        "src/lib/db.ts",
-        "src/lib/utils.ts",
-        "src/lib/formatters.ts",
-        "src/lib/validators.ts",
-        # Custom hooks
-        "src/hooks/use-raumbuch-data.ts",
-        "src/hooks/use-standorte.ts",
-        "src/hooks/use-filter.ts",
-        # Models and types
-        "src/models/raumbuch.ts",
-        "src/models/standort.ts",
-        # Zod schemas for validation
-        "src/schemas/raumbuch.schema.ts",
-        "src/schemas/standort.schema.ts",
-        # Services
-        "src/services/database/client.ts",
-        "src/services/database/queries.ts",
-        "src/services/analysis/raumbuch-analysis.ts",
-        "src/services/analysis/calculate-summary.ts",
-        "src/services/analysis/prepare-visualization.ts",
-        "src/services/export/excel-export.ts",
-        "src/services/export/pdf-export.ts",
-        # Styles
-        "src/styles/globals.css",
-        # Types
-        "src/types/database.types.ts",
-        "src/types/raumbuch.types.ts",
-        "src/types/standort.types.ts",
-        # Tests - Unit
-        "tests/unit/services/analysis.test.ts",
-        "tests/unit/components/raumbuch-table.test.tsx",
-        "tests/unit/hooks/use-raumbuch-data.test.ts",
-        # Tests - Integration
-        "tests/integration/api/standorte.test.ts",
-        "tests/integration/services/export.test.ts",
-        # Tests - E2E
-        "tests/e2e/navigation.test.ts",
-        "tests/e2e/filtering.test.ts",
-        # Configuration files
-        ".env",
-        ".env.example",
-        ".eslintrc.json",
-        ".gitignore",
-        ".prettierrc",
-        "jest.config.js",
-        "next.config.js",
-        "package.json",
-        "postcss.config.js",
-        "tailwind.config.js",
-        "tsconfig.json",
-        "README.md",
-    ]
-
-    for file in files:
-        create_empty_file(os.path.join(base_dir, file))
-
-    print("\nProject structure setup complete!")
-    print(f"Project created at: {base_dir}")
-    print("\nNOTE: For Next.js dynamic routes, we've used '[id]' instead of '[id]' due to")
-    print("Windows file system limitations. When working in your Next.js project, you'll need to")
-    print("replace '[id]' with '[id]' in your import statements and file references.")
+        parent = listings[directory]
+        name = os.path.basename(path)
+        if parent is None or name not in parent:
+            plan.files.append((path, tree.files[path]))
+        elif parent[name]:
+            plan.conflicts.append((path, 'exists as a directory'))
+        else:
+            plan.existing += 1
+
+    return plan
+
+
+def _create_file(path, content, variables):
+    # 'x': niemals eine inzwischen angelegte Datei überschreiben
+    try:
+        with open(path, 'x', encoding='utf-8', newline='') as f:
+            if content:
+                f.write(Template(content).safe_substitute(variables))
+        return True
+    except FileExistsError:
+        return False
+
+
+def apply_plan(plan, variables=None, workers=DEFAULT_WORKERS, executor=None):
+    """
+    Creates what ``plan`` lists: directories level by level (parents first,
+    each level in parallel), then all files in parallel. Template content is
+    filled in with ``variables`` plus $project_name.
+
+    Returns:
+        (directories created, files created)
+    """
+    if plan.conflicts:
+        raise ScaffoldError(
+            f"{plan.base_dir}: " + "; ".join(f"{p} {reason}" for p, reason in plan.conflicts)
+        )
+    if plan.create_base:
+        os.makedirs(plan.base_dir, exist_ok=True)
+    variables = {
+        'project_name': os.path.basename(os.path.normpath(plan.base_dir)),
+        **(variables or {}),
+    }
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        levels = {}
+        for directory in plan.directories:
+            levels.setdefault(directory.count('/'), []).append(directory)
+        for depth in sorted(levels):
+            paths = [os.path.join(plan.base_dir, d) for d in levels[depth]]
+            list(executor.map(lambda p: os.makedirs(p, exist_ok=True), paths))
+
+        created = executor.map(
+            lambda item: _create_file(os.path.join(plan.base_dir, item[0]), item[1], variables),
+            plan.files,
+        )
+        files_created = sum(1 for ok in created if ok)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return len(plan.directories), files_created
+
+
+def load_manifest(manifest_path):
+    """
+    Reads a template manifest.
+
+    Returns:
+        (directories, files dict path -> content, replace_defaults)
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as exc:
+        raise ScaffoldError(f"Cannot read manifest {manifest_path}: {exc}") from exc
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    directories = [relative_manifest_path(path) for path in data.get('directories', [])]
+    files = {}
+    for raw_path, spec in data.get('files', {}).items():
+        path = relative_manifest_path(raw_path)
+        if spec is None or isinstance(spec, str):
+            files[path] = spec
+        elif isinstance(spec, dict) and 'source' in spec:
+            source = os.path.join(manifest_dir, spec['source'])
+            try:
+                with open(source, 'r', encoding='utf-8', newline='') as f:
+                    files[path] = f.read()
+            except OSError as exc:
+                raise ScaffoldError(f"Template for {path} not readable: {exc}") from exc
+        else:
+            raise ScaffoldError(f"Invalid manifest entry for {path}: {spec!r}")
+
+    return directories, files, bool(data.get('replace_defaults', False))
+
+
+def build_project_tree(manifest_path=None, keep_brackets=False):
+    """Default structure, extended (or replaced) by the manifest."""
+    directories = list(PROJECT_DIRECTORIES)
+    files = dict.fromkeys(PROJECT_FILES)
+
+    if manifest_path:
+        extra_dirs, extra_files, replace_defaults = load_manifest(manifest_path)
+        if replace_defaults:
+            directories, files = [], {}
+        directories.extend(extra_dirs)
+        files.update(extra_files)
+
+    return ProjectTree.build(directories, files, keep_brackets)
+
+
+def print_next_steps(base_dir, keep_brackets):
+    if not keep_brackets:
+        print("\nNOTE: For Next.js dynamic routes, we've used '[id]' instead of '[id]' due to")
+        print("Windows file system limitations. When working in your Next.js project, you'll need to")
+        print("replace '[id]' with '[id]' in your import statements and file references.")
     print("\nNext steps:")
     print("1. Navigate to the project directory: cd " + base_dir)
     print("2. Initialize the project: npm init -y")
@@ -218,5 +490,87 @@ def setup_project():
     print("6. Initialize Prisma: npx prisma init")
     print("7. Start the development server: npm run dev")
 
+
+def setup_project(base_dirs=(DEFAULT_BASE_DIR,), dry_run=False, manifest=None, variables=None,
+                  workers=DEFAULT_WORKERS, keep_brackets=False, verbose=False):
+    """
+    Plans and (unless ``dry_run``) creates the project structure below every
+    base directory. All base directories share one tree and one thread pool.
+
+    Returns:
+        List of Plan objects, one per base directory
+    """
+    tree = build_project_tree(manifest, keep_brackets)
+    plans = [make_plan(os.path.abspath(base_dir), tree) for base_dir in base_dirs]
+
+    if dry_run:
+        for plan in plans:
+            print(plan.describe())
+        return plans
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for plan in plans:
+            if verbose:
+                print(plan.describe())
+            dirs_created, files_created = apply_plan(plan, variables, executor=executor)
+            print(
+                f"{plan.base_dir}: created {dirs_created} directories and {files_created} files "
+                f"({plan.existing} already present)"
+            )
+
+    return plans
+
+
+def parse_variable(text):
+    name, sep, value = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got '{text}'")
+    return name, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the RDAuswertung project structure.")
+    parser.add_argument('base_dirs', nargs='*', metavar='BASE_DIR',
+                        help=f'project directories to scaffold (default: {DEFAULT_BASE_DIR} on Windows)')
+    parser.add_argument('--base-dir', action='append', dest='extra_base_dirs', default=[],
+                        help='additional project directory (may be repeated)')
+    parser.add_argument('--dry-run', action='store_true', help='only print the plan')
+    parser.add_argument('--manifest', help='JSON manifest with extra directories and file templates')
+    parser.add_argument('--var', action='append', type=parse_variable, default=[],
+                        help='template variable NAME=VALUE (may be repeated)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'parallel file creations (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--keep-brackets', action='store_true',
+                        help="keep '[id]' in paths instead of the Windows-safe '_id_'")
+    parser.add_argument('--verbose', action='store_true', help='print the plan before applying it')
+    args = parser.parse_args()
+
+    base_dirs = args.base_dirs + args.extra_base_dirs
+    if not base_dirs:
+        if os.name != 'nt':
+            parser.error("no base directory given")
+        base_dirs = [DEFAULT_BASE_DIR]
+
+    try:
+        plans = setup_project(
+            base_dirs,
+            dry_run=args.dry_run,
+            manifest=args.manifest,
+            variables=dict(args.var),
+            workers=args.workers,
+            keep_brackets=args.keep_brackets,
+            verbose=args.verbose,
+        )
+    except (ScaffoldError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if not args.dry_run:
+        print("\nProject structure setup complete!")
+        if len(plans) == 1:
+            print(f"Project created at: {plans[0].base_dir}")
+            print_next_steps(plans[0].base_dir, args.keep_brackets)
+
+
 if __name__ == "__main__":
-    setup_project()
\ No newline at end of file
+    main()
@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Shared dump engine for the print_*.py scripts of the RDAuswertung project.
+
+The scripts print_files.py, print_test_files.py and print_frontend_files.py
+are thin presets around this module. They only decide *which* files are
+dumped and *how* headers and footers look; reading, ordering and writing is
+done here:
+
+- files are read on a thread pool, in chunks
+- chunks are streamed to the output in the configured order
+- everything goes through one buffered sink (no swapping of sys.stdout)
+- a byte budget bounds how much file content is in flight at any time
+- in raw mode (RawSink) file contents are never decoded: workers only
+  validate UTF-8 over an mmap, the writer copies the bytes to the output
+  with os.sendfile (falling back to shutil.copyfileobj), so memory stays
+  flat no matter how large the files are
+
+Usage from a preset:
+
+    parts = ["Some title\\n", DumpFile("src/lib/db.ts"), ...]
+    with open_output(output_file) as out:
+        sink = make_sink(out, MyStyle(), **sink_options(args))
+        dump(parts, sink, **engine_options(args))
+"""
+
+import codecs
+import errno
+import hashlib
+import io
+import mmap
+import os
+import queue
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_MAX_IN_FLIGHT = 32 * 1024 * 1024
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 2) * 2)
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+MAX_OPEN_FILES = 64
+SENDFILE_BLOCK = 64 * 1024 * 1024
+INVALID_POLICIES = ('skip', 'raw', 'replace', 'error')
+
+# Nachrichten, die die Lese-Threads an den Schreiber schicken
+_OPENED = 'opened'
+_CHUNK = 'chunk'
+_DONE = 'done'
+_FAILED = 'failed'
+_CHECKED = 'checked'
+
+# errno-Werte, bei denen os.sendfile für dieses Ziel nicht nutzbar ist
+_SENDFILE_UNSUPPORTED = {
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    getattr(errno, 'ENOTSOCK', errno.EINVAL),
+    getattr(errno, 'EOPNOTSUPP', errno.EINVAL),
+}
+
+
+class DumpFile:
+    """A single file to dump: where to read it and how to label it."""
+
+    __slots__ = ('path', 'label', 'category')
+
+    def __init__(self, path, label=None, category=None):
+        self.path = str(path)
+        self.label = label if label is not None else str(path)
+        self.category = category
+
+    def __repr__(self):
+        return f"DumpFile({self.label!r})"
+
+
+class DumpStats:
+    """Counters collected while dumping."""
+
+    def __init__(self):
+        self.files = 0
+        self.failed = 0
+        self.bytes = 0
+
+    def __repr__(self):
+        return f"DumpStats(files={self.files}, failed={self.failed}, bytes={self.bytes})"
+
+
+class InvalidUtf8Error(ValueError):
+    """A file is not valid UTF-8; ``offset`` is the absolute byte position."""
+
+    def __init__(self, label, offset, reason):
+        super().__init__(f"{label}: invalid UTF-8 at byte {offset} ({reason})")
+        self.label = label
+        self.offset = offset
+        self.reason = reason
+
+
+class DumpStyle:
+    """
+    Text layout of a preset. Subclasses override the hooks they need.
+
+    ``errors`` is the decoding policy used for file contents ('strict' or
+    'replace').
+    """
+
+    errors = 'strict'
+
+    def header(self, item):
+        return ''
+
+    def footer(self, item):
+        return ''
+
+    def error(self, item, exc, started):
+        """
+        Text emitted when ``item`` could not be dumped. ``started`` is True if
+        the header and part of the content were already written.
+        """
+        return ''
+
+
+class Output:
+    """One buffered binary output stream with text helpers."""
+
+    def __init__(self, raw, encoding='utf-8'):
+        self.raw = raw
+        self.encoding = encoding
+
+    def write_text(self, text):
+        if text:
+            self.raw.write(text.encode(self.encoding))
+
+    def write_bytes(self, data):
+        if data:
+            self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+    def fileno(self):
+        """Descriptor of the underlying stream, or None if there is none."""
+        try:
+            return self.raw.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def copy_file(self, src, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Copies the open binary file ``src`` (from its start) to the output.
+
+        Uses os.sendfile where the platform and the target allow it, so the
+        bytes never pass through Python; otherwise shutil.copyfileobj.
+
+        Returns:
+            Number of bytes copied
+        """
+        fd = self.fileno()
+        offset = 0
+        if fd is not None and hasattr(os, 'sendfile'):
+            self.raw.flush()
+            try:
+                while True:
+                    sent = os.sendfile(fd, src.fileno(), offset, SENDFILE_BLOCK)
+                    if sent == 0:
+                        return offset
+                    offset += sent
+            except OSError as exc:
+                if offset or exc.errno not in _SENDFILE_UNSUPPORTED:
+                    raise
+
+        src.seek(offset)
+        shutil.copyfileobj(src, self.raw, chunk_size)
+        return src.tell()
+
+
+@contextmanager
+def open_output(output_file=None, buffer_size=OUTPUT_BUFFER_SIZE):
+    """
+    Open the sink for a dump: ``output_file`` if given, otherwise stdout.
+
+    stdout is written through its underlying binary buffer, so nothing is
+    swapped or re-encoded by print().
+    """
+    if output_file:
+        raw = open(output_file, 'wb', buffering=buffer_size)
+        try:
+            yield Output(raw)
+        finally:
+            raw.close()
+    else:
+        sys.stdout.flush()
+        try:
+            raw = io.BufferedWriter(
+                io.FileIO(sys.stdout.fileno(), 'w', closefd=False), buffer_size
+            )
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # stdout ohne Dateideskriptor (z.B. umgeleitet in einer IDE)
+            raw = sys.stdout.buffer
+        try:
+            yield Output(raw)
+        finally:
+            raw.flush()
+
+
+class TextSink:
+    """
+    Concatenated text output as produced by the original scripts.
+
+    File contents are decoded incrementally with the style's error policy and
+    written between the style's header and footer.
+    """
+
+    def __init__(self, output, style):
+        self.output = output
+        self.style = style
+        self._decoder = None
+
+    def text(self, text):
+        self.output.write_text(text)
+
+    def begin(self, item):
+        self._decoder = codecs.getincrementaldecoder('utf-8')(self.style.errors)
+        self.output.write_text(self.style.header(item))
+
+    def chunk(self, item, data):
+        self.output.write_text(self._decoder.decode(data))
+
+    def end(self, item):
+        self.output.write_text(self._decoder.decode(b'', final=True))
+        self._decoder = None
+        self.output.write_text(self.style.footer(item))
+
+    def fail(self, item, exc, started):
+        self._decoder = None
+        self.output.write_text(self.style.error(item, exc, started))
+
+    def close(self):
+        self.output.flush()
+
+
+class RawSink:
+    """
+    Raw-bytes variant of TextSink with the same layout.
+
+    Only headers and footers are produced in Python; file contents are copied
+    byte for byte from the open file to the output (zero-copy where possible).
+    The engine validates UTF-8 beforehand; ``on_invalid`` decides what
+    happens to files that fail:
+
+    - 'skip': emit the style's error text instead of the content
+    - 'raw': copy the bytes anyway
+    - 'replace': decode with U+FFFD replacement (streamed in chunks)
+    - 'error': abort the dump with InvalidUtf8Error
+    """
+
+    zero_copy = True
+
+    def __init__(self, output, style, on_invalid='skip', chunk_size=DEFAULT_CHUNK_SIZE):
+        if on_invalid not in INVALID_POLICIES:
+            raise ValueError(f"on_invalid must be one of {', '.join(INVALID_POLICIES)}")
+        self.output = output
+        self.style = style
+        self.on_invalid = on_invalid
+        self.chunk_size = chunk_size
+
+    def text(self, text):
+        self.output.write_text(text)
+
+    def begin(self, item):
+        self.output.write_text(self.style.header(item))
+
+    def copy(self, item, src, check):
+        """Writes the content of the open file ``src``; returns the byte count."""
+        if check.error is not None and self.on_invalid == 'replace':
+            decoder = codecs.getincrementaldecoder('utf-8')('replace')
+            size = 0
+            while True:
+                data = src.read(self.chunk_size)
+                if not data:
+                    break
+                size += len(data)
+                self.output.write_text(decoder.decode(data))
+            self.output.write_text(decoder.decode(b'', final=True))
+            return size
+        return self.output.copy_file(src, self.chunk_size)
+
+    def end(self, item):
+        self.output.write_text(self.style.footer(item))
+
+    def fail(self, item, exc, started):
+        self.output.write_text(self.style.error(item, exc, started))
+
+    def close(self):
+        self.output.flush()
+
+
+def make_sink(output, style, raw=False, on_invalid='skip', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Returns a RawSink in raw mode, otherwise the decoding TextSink."""
+    if raw:
+        return RawSink(output, style, on_invalid or 'skip', chunk_size)
+    return TextSink(output, style)
+
+
+class _ByteBudget:
+    """
+    Bounds the number of bytes read but not yet written.
+
+    The file currently being written (the *head*) may always proceed, so the
+    writer can never wait on a file whose reader is blocked by later files.
+    """
+
+    def __init__(self, limit):
+        self._limit = max(1, limit)
+        self._used = 0
+        self._head = -1
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, index, size):
+        with self._cond:
+            while (
+                not self._closed
+                and index != self._head
+                and self._used > 0
+                and self._used + size > self._limit
+            ):
+                self._cond.wait()
+            self._used += size
+            return not self._closed
+
+    def release(self, size):
+        if size <= 0:
+            return
+        with self._cond:
+            self._used -= size
+            self._cond.notify_all()
+
+    def advance(self, index):
+        with self._cond:
+            self._head = index
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def _read_file(index, item, channel, budget, chunk_size):
+    """Reads one file in chunks and hands them to the writer via ``channel``."""
+    try:
+        with open(item.path, 'rb') as f:
+            channel.put((_OPENED, None))
+            while True:
+                if not budget.acquire(index, chunk_size):
+                    return
+                data = f.read(chunk_size)
+                budget.release(chunk_size - len(data))
+                if not data:
+                    break
+                channel.put((_CHUNK, data))
+        channel.put((_DONE, None))
+    except OSError as exc:
+        channel.put((_FAILED, exc))
+
+
+class _Check:
+    """Result of validating one file for a zero-copy sink."""
+
+    __slots__ = ('error', 'sha256')
+
+    def __init__(self, error=None, sha256=None):
+        self.error = error
+        self.sha256 = sha256
+
+
+def check_utf8(f, label, chunk_size=DEFAULT_CHUNK_SIZE, digest=False):
+    """
+    Validates the open binary file ``f`` as UTF-8 without keeping its content.
+
+    The file is mapped with mmap and fed through an incremental decoder slice
+    by slice; pure ASCII slices skip the decoder. With ``digest`` the sha256
+    of the content is computed in the same pass.
+
+    Returns:
+        _Check with ``error`` (InvalidUtf8Error or None) and ``sha256``
+    """
+    hasher = hashlib.sha256() if digest else None
+    size = os.fstat(f.fileno()).st_size
+    if size == 0:
+        return _Check(None, hasher.hexdigest() if hasher else None)
+
+    error = None
+    decoder = codecs.getincrementaldecoder('utf-8')('strict')
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, len(mm), chunk_size):
+            data = mm[start:start + chunk_size]
+            if hasher is not None:
+                hasher.update(data)
+            if error is not None:
+                continue
+            pending = decoder.getstate()[0]
+            if not pending and data.isascii():
+                continue
+            try:
+                decoder.decode(data)
+            except UnicodeDecodeError as exc:
+                error = InvalidUtf8Error(label, start - len(pending) + exc.start, exc.reason)
+            if error is not None and hasher is None:
+                break
+        if error is None:
+            pending = decoder.getstate()[0]
+            try:
+                decoder.decode(b'', final=True)
+            except UnicodeDecodeError as exc:
+                error = InvalidUtf8Error(label, len(mm) - len(pending) + exc.start, exc.reason)
+
+    return _Check(error, hasher.hexdigest() if hasher else None)
+
+
+def _check_file(index, item, channel, handles, chunk_size, digest):
+    """
+    Opens and validates one file for a zero-copy sink. The open file is handed
+    to the writer, which copies from it and closes it; ``handles`` bounds the
+    number of files kept open ahead of the writer.
+    """
+    if not handles.acquire(index, 1):
+        return
+    try:
+        f = open(item.path, 'rb')
+    except OSError as exc:
+        handles.release(1)
+        channel.put((_FAILED, exc))
+        return
+    try:
+        check = check_utf8(f, item.label, chunk_size, digest)
+    except (OSError, ValueError) as exc:
+        f.close()
+        handles.release(1)
+        channel.put((_FAILED, exc))
+        return
+    channel.put((_CHECKED, (f, check)))
+
+
+def _write_checked(part, sink, src, check, stats):
+    """Writer side of the zero-copy path for one validated file."""
+    with src:
+        if check.error is not None:
+            if sink.on_invalid == 'error':
+                raise check.error
+            if sink.on_invalid == 'skip':
+                stats.failed += 1
+                sink.fail(part, check.error, False)
+                return
+        sink.begin(part)
+        stats.bytes += sink.copy(part, src, check)
+        sink.end(part)
+
+
+def dump(
+    parts,
+    sink,
+    workers=DEFAULT_WORKERS,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+):
+    """
+    Dump ``parts`` to ``sink`` in order.
+
+    Args:
+        parts: Sequence of literal text (str) and DumpFile entries
+        sink: Object with text/begin/chunk/end/fail/close (e.g. TextSink),
+            or a zero-copy sink with text/begin/copy/end/fail/close and
+            ``zero_copy = True`` (e.g. RawSink)
+        workers: Number of reader threads
+        chunk_size: Read size per chunk in bytes
+        max_in_flight: Upper bound for file bytes held in memory
+
+    Returns:
+        DumpStats for the run
+    """
+    parts = list(parts)
+    stats = DumpStats()
+    budget = _ByteBudget(max_in_flight)
+    handles = _ByteBudget(MAX_OPEN_FILES)
+    zero_copy = getattr(sink, 'zero_copy', False)
+    digest = getattr(sink, 'wants_digest', False)
+    channels = {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='dump')
+    try:
+        # FIFO-Reihenfolge des Pools: Datei i startet immer vor Datei i+1
+        for index, part in enumerate(parts):
+            if isinstance(part, DumpFile):
+                channels[index] = queue.SimpleQueue()
+                if zero_copy:
+                    executor.submit(
+                        _check_file, index, part, channels[index], handles, chunk_size, digest
+                    )
+                else:
+                    executor.submit(_read_file, index, part, channels[index], budget, chunk_size)
+
+        for index, part in enumerate(parts):
+            if not isinstance(part, DumpFile):
+                sink.text(part)
+                continue
+
+            budget.advance(index)
+            handles.advance(index)
+            channel = channels.pop(index)
+            stats.files += 1
+            started = False
+            failed = False
+
+            while True:
+                kind, payload = channel.get()
+
+                if kind == _CHECKED:
+                    src, check = payload
+                    try:
+                        _write_checked(part, sink, src, check, stats)
+                    finally:
+                        handles.release(1)
+                    break
+                elif kind == _OPENED:
+                    sink.begin(part)
+                    started = True
+                elif kind == _CHUNK:
+                    budget.release(len(payload))
+                    if failed:
+                        continue
+                    stats.bytes += len(payload)
+                    try:
+                        sink.chunk(part, payload)
+                    except UnicodeDecodeError as exc:
+                        failed = True
+                        stats.failed += 1
+                        sink.fail(part, exc, started)
+                elif kind == _DONE:
+                    if not failed:
+                        try:
+                            sink.end(part)
+                        except UnicodeDecodeError as exc:
+                            stats.failed += 1
+                            sink.fail(part, exc, started)
+                    break
+                else:
+                    if not failed:
+                        stats.failed += 1
+                        sink.fail(part, payload, started)
+                    break
+    finally:
+        budget.close()
+        handles.close()
+        executor.shutdown(wait=True)
+        # Bei Abbruch noch offene, bereits geprüfte Dateien schließen
+        for channel in channels.values():
+            while not channel.empty():
+                kind, payload = channel.get()
+                if kind == _CHECKED:
+                    payload[0].close()
+        sink.close()
+
+    return stats
+
+
+def parse_size(value):
+    """Parses sizes like '512K', '64M' or '1G' into bytes."""
+    text = str(value).strip().upper()
+    factors = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if text and text[-1] in factors:
+        return int(float(text[:-1]) * factors[text[-1]])
+    return int(text)
+
+
+def add_engine_arguments(parser):
+    """Registers the engine options shared by all presets."""
+    group = parser.add_argument_group('dump engine')
+    group.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'reader threads (default: {DEFAULT_WORKERS})')
+    group.add_argument('--chunk-size', type=parse_size, default=DEFAULT_CHUNK_SIZE,
+                       help='read chunk size, e.g. 256K (default: 256K)')
+    group.add_argument('--max-in-flight', type=parse_size, default=DEFAULT_MAX_IN_FLIGHT,
+                       help='memory cap for file bytes in flight, e.g. 32M (default: 32M)')
+    group.add_argument('--raw', action='store_true',
+                       help='copy file bytes unchanged (zero-copy) instead of decoding them')
+    group.add_argument('--on-invalid', choices=INVALID_POLICIES,
+                       help='raw/tar/jsonl: handling of files that are not valid UTF-8 '
+                            '(default: skip, raw for tar)')
+    return group
+
+
+def engine_options(args):
+    """Extracts the keyword arguments for dump() from parsed CLI arguments."""
+    return {
+        'workers': args.workers,
+        'chunk_size': args.chunk_size,
+        'max_in_flight': args.max_in_flight,
+    }
+
+
+def sink_options(args):
+    """Extracts the keyword arguments for make_sink() from parsed CLI arguments."""
+    return {
+        'raw': args.raw,
+        'on_invalid': args.on_invalid,
+        'chunk_size': args.chunk_size,
+    }
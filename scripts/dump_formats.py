@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Structured output formats for the dump scripts.
+
+Besides the concatenated text of TextSink/RawSink the presets can write
+
+- ``tar``: a streaming tar archive (gzip, zstd or uncompressed); each file
+  becomes one member and a trailing ``.dump-manifest.json`` member lists
+  category, size and sha256 of all files plus failures
+- ``jsonl``: one JSON record per file (path, category, content, size,
+  sha256) plus an offset index ``<output>.idx``, so single records can be
+  read with one seek
+
+Both sinks use the zero-copy interface of the engine: files are opened and
+validated by the workers and streamed from the open file, so neither format
+is ever built in memory.
+
+Reading a single file back:
+
+    python dump_formats.py get dump.jsonl src/lib/db.ts
+    python dump_formats.py list dump.jsonl
+"""
+
+import argparse
+import base64
+import codecs
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import time
+
+from dump_engine import DEFAULT_CHUNK_SIZE, INVALID_POLICIES, make_sink
+
+FORMATS = ('text', 'tar', 'jsonl')
+COMPRESSIONS = ('gz', 'zst', 'none')
+MANIFEST_MEMBER = '.dump-manifest.json'
+INDEX_VERSION = 1
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+def archive_name(label):
+    """Turns a label (possibly a Windows or absolute path) into a relative member name."""
+    name = label.replace('\\', '/')
+    drive, sep, rest = name.partition(':/')
+    if sep and len(drive) == 1:
+        name = rest
+    return name.lstrip('/')
+
+
+def zstd_available():
+    """True if zstd compression is possible in this interpreter."""
+    try:
+        from compression import zstd  # noqa: F401
+        return True
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _zstd_writer(raw, level=None):
+    """Opens a zstd compressing writer on ``raw`` (Python 3.14+ or the zstandard package)."""
+    try:
+        from compression import zstd
+    except ImportError:
+        zstd = None
+    if zstd is not None:
+        return zstd.ZstdFile(raw, 'w', level=level)
+
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "zstd compression needs Python 3.14+ or the 'zstandard' package "
+            "(pip install zstandard); use --compression gz instead"
+        ) from None
+    compressor = zstandard.ZstdCompressor(level=level if level is not None else 3)
+    return compressor.stream_writer(raw, closefd=False)
+
+
+class TarSink:
+    """
+    Streaming tar output.
+
+    The member header needs the size up front, so the size is taken from the
+    open file handed over by the engine and the content is streamed with
+    TarFile.addfile. Only the 'replace' policy has to spool the re-encoded
+    content first (in memory up to SPOOL_SIZE, on disk beyond).
+    """
+
+    zero_copy = True
+    wants_digest = True
+
+    def __init__(self, output, compression='gz', on_invalid='raw',
+                 chunk_size=DEFAULT_CHUNK_SIZE, level=None):
+        if on_invalid not in INVALID_POLICIES:
+            raise ValueError(f"on_invalid must be one of {', '.join(INVALID_POLICIES)}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}")
+
+        self.output = output
+        self.on_invalid = on_invalid
+        self.chunk_size = chunk_size
+        self.entries = []
+        self._compressor = None
+        self._pending = None
+
+        output.flush()
+        if compression == 'zst':
+            self._compressor = _zstd_writer(output.raw, level)
+            self.tar = tarfile.open(fileobj=self._compressor, mode='w|', format=tarfile.PAX_FORMAT)
+        elif compression == 'gz':
+            self.tar = tarfile.open(fileobj=output.raw, mode='w|gz', format=tarfile.PAX_FORMAT)
+        else:
+            self.tar = tarfile.open(fileobj=output.raw, mode='w|', format=tarfile.PAX_FORMAT)
+
+    def text(self, text):
+        # Überschriften der Presets gehören nicht ins Archiv
+        pass
+
+    def begin(self, item):
+        pass
+
+    def copy(self, item, src, check):
+        st = os.fstat(src.fileno())
+        info = tarfile.TarInfo(archive_name(item.label))
+        info.mtime = int(st.st_mtime)
+        info.mode = 0o644
+
+        if check.error is not None and self.on_invalid == 'replace':
+            with tempfile.SpooledTemporaryFile(SPOOL_SIZE) as spool:
+                decoder = codecs.getincrementaldecoder('utf-8')('replace')
+                while True:
+                    data = src.read(self.chunk_size)
+                    if not data:
+                        break
+                    spool.write(decoder.decode(data).encode('utf-8'))
+                spool.write(decoder.decode(b'', final=True).encode('utf-8'))
+                info.size = spool.tell()
+                spool.seek(0)
+                self.tar.addfile(info, spool)
+        else:
+            info.size = st.st_size
+            self.tar.addfile(info, src)
+
+        self._pending = {
+            'path': info.name,
+            'category': item.category,
+            'size': info.size,
+            'sha256': check.sha256,
+        }
+        return info.size
+
+    def end(self, item):
+        self.entries.append(self._pending)
+        self._pending = None
+
+    def fail(self, item, exc, started):
+        self.entries.append({
+            'path': archive_name(item.label),
+            'category': item.category,
+            'error': str(exc),
+        })
+
+    def close(self):
+        manifest = json.dumps(
+            {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'files': self.entries},
+            ensure_ascii=False,
+            indent=1,
+        ).encode('utf-8')
+        info = tarfile.TarInfo(MANIFEST_MEMBER)
+        info.size = len(manifest)
+        info.mtime = int(time.time())
+        self.tar.addfile(info, io.BytesIO(manifest))
+
+        self.tar.close()
+        if self._compressor is not None:
+            self._compressor.close()
+        self.output.flush()
+
+
+class JsonlSink:
+    """
+    One JSON object per line and file:
+
+        {"path": ..., "category": ..., "content": "...", "size": N, "sha256": "..."}
+
+    The content is escaped chunk by chunk while it streams, which is why size
+    and sha256 follow it. Files that are not valid UTF-8 follow
+    ``on_invalid``: 'skip' writes a record with "error" instead of content,
+    'raw' writes the bytes as "content_base64", 'replace' decodes with U+FFFD
+    and 'error' aborts the dump.
+
+    With ``index_path`` the byte offset and length of every record is written
+    to a sidecar index on close (see read_record).
+    """
+
+    zero_copy = True
+    wants_digest = True
+
+    def __init__(self, output, on_invalid='skip', chunk_size=DEFAULT_CHUNK_SIZE, index_path=None):
+        if on_invalid not in INVALID_POLICIES:
+            raise ValueError(f"on_invalid must be one of {', '.join(INVALID_POLICIES)}")
+        self.output = output
+        self.on_invalid = on_invalid
+        self.chunk_size = chunk_size
+        self.index_path = index_path
+        self.index = {}
+        self.position = 0
+        self._start = None
+        self._size = 0
+        self._sha256 = None
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self.output.write_bytes(data)
+        self.position += len(data)
+
+    def _open_record(self, item):
+        self._start = self.position
+        self._write(
+            f'{{"path": {json.dumps(item.label, ensure_ascii=False)}, '
+            f'"category": {json.dumps(item.category, ensure_ascii=False)}'
+        )
+
+    def _close_record(self, item, fields):
+        self._write(''.join(f', "{key}": {json.dumps(value)}' for key, value in fields) + '}\n')
+        self.index[item.label] = (self._start, self.position - self._start)
+        self._start = None
+
+    def text(self, text):
+        pass
+
+    def begin(self, item):
+        self._open_record(item)
+
+    def copy(self, item, src, check):
+        size = 0
+        if check.error is not None and self.on_invalid == 'raw':
+            # Vielfaches von 3, damit die Base64-Blöcke ohne Padding aneinanderpassen
+            block = max(3, self.chunk_size - self.chunk_size % 3)
+            self._write(', "content_base64": "')
+            while True:
+                data = src.read(block)
+                if not data:
+                    break
+                size += len(data)
+                self._write(base64.b64encode(data).decode('ascii'))
+        else:
+            errors = 'replace' if check.error is not None else 'strict'
+            decoder = codecs.getincrementaldecoder('utf-8')(errors)
+            self._write(', "content": "')
+            while True:
+                data = src.read(self.chunk_size)
+                if not data:
+                    break
+                size += len(data)
+                self._write(json.dumps(decoder.decode(data), ensure_ascii=False)[1:-1])
+            self._write(json.dumps(decoder.decode(b'', final=True), ensure_ascii=False)[1:-1])
+        self._write('"')
+
+        self._size = size
+        self._sha256 = check.sha256
+        return size
+
+    def end(self, item):
+        self._close_record(item, (('size', self._size), ('sha256', self._sha256)))
+
+    def fail(self, item, exc, started):
+        if not started:
+            self._open_record(item)
+        self._close_record(item, (('error', str(exc)),))
+
+    def close(self):
+        self.output.flush()
+        if self.index_path:
+            write_index(self.index_path, self.index)
+
+
+def write_index(index_path, index):
+    """Writes the JSONL offset index atomically."""
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.index-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'version': INDEX_VERSION, 'records': {k: list(v) for k, v in index.items()}},
+            f,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, index_path)
+
+
+def load_index(index_path):
+    """Returns label -> (offset, length) from a JSONL offset index."""
+    with open(index_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != INDEX_VERSION:
+        raise ValueError(f"Unsupported index version in {index_path}")
+    return {label: tuple(entry) for label, entry in data['records'].items()}
+
+
+def read_record(jsonl_path, label, index=None):
+    """
+    Reads the record of ``label`` from a JSONL dump with a single seek.
+
+    Args:
+        jsonl_path: The dump file
+        label: Path as printed in the dump
+        index: Loaded index or None for ``<jsonl_path>.idx``
+
+    Returns:
+        The record as dict, or None if the label is not in the index
+    """
+    if index is None:
+        index = load_index(f"{jsonl_path}.idx")
+    entry = index.get(label)
+    if entry is None:
+        return None
+    offset, length = entry
+    with open(jsonl_path, 'rb') as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def iter_records(jsonl_path):
+    """Yields all records of a JSONL dump in order (sequential scan, no index)."""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def record_content(record):
+    """Returns the content of a record as bytes, or None for failed files."""
+    if 'content_base64' in record:
+        return base64.b64decode(record['content_base64'])
+    if 'content' in record:
+        return record['content'].encode('utf-8')
+    return None
+
+
+def format_sink(output, style, fmt='text', output_file=None, compression='gz',
+                index_path=None, raw=False, on_invalid=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Creates the sink for ``fmt``.
+
+    'text' keeps the preset's layout (TextSink, or RawSink with ``raw``);
+    'tar' and 'jsonl' ignore the style. The JSONL index defaults to
+    ``<output_file>.idx`` and is skipped for stdout.
+    """
+    if fmt == 'tar':
+        return TarSink(output, compression, on_invalid or 'raw', chunk_size)
+    if fmt == 'jsonl':
+        if index_path is None and output_file:
+            index_path = f"{output_file}.idx"
+        return JsonlSink(output, on_invalid or 'skip', chunk_size, index_path)
+    return make_sink(output, style, raw, on_invalid or 'skip', chunk_size)
+
+
+def add_format_arguments(parser):
+    """Registers the output format options shared by the presets."""
+    group = parser.add_argument_group('output format')
+    group.add_argument('--format', choices=FORMATS, default='text',
+                       help='text (default), streaming tar archive or JSONL records')
+    group.add_argument('--compression', choices=COMPRESSIONS, default='gz',
+                       help='tar compression (default: gz; zst needs Python 3.14+ or zstandard)')
+    group.add_argument('--index',
+                       help='JSONL offset index (default: <output>.idx)')
+    return group
+
+
+def check_format_arguments(parser, args):
+    """Rejects option combinations that cannot work, before any output is opened."""
+    if args.format == 'tar' and args.compression == 'zst' and not zstd_available():
+        parser.error("--compression zst needs Python 3.14+ or the 'zstandard' package")
+    if getattr(args, 'incremental', None) and args.format != 'text':
+        parser.error("--incremental only works with --format text")
+
+
+def format_options(args):
+    """Extracts the keyword arguments for format_sink() from parsed CLI arguments."""
+    return {
+        'fmt': args.format,
+        'compression': args.compression,
+        'index_path': args.index,
+        'raw': args.raw,
+        'on_invalid': args.on_invalid,
+        'chunk_size': args.chunk_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read files back from a JSONL dump.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    get = sub.add_parser('get', help='print the content of one file')
+    get.add_argument('dump')
+    get.add_argument('path')
+    listing = sub.add_parser('list', help='list the files of a dump')
+    listing.add_argument('dump')
+    args = parser.parse_args()
+
+    index = load_index(f"{args.dump}.idx")
+    if args.command == 'list':
+        for label in index:
+            print(label)
+        return
+
+    record = read_record(args.dump, args.path, index)
+    if record is None:
+        sys.exit(f"Not in dump: {args.path}")
+    content = record_content(record)
+    if content is None:
+        sys.exit(f"{args.path}: {record.get('error')}")
+    sys.stdout.buffer.write(content)
+
+
+if __name__ == '__main__':
+    main()
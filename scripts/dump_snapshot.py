@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Content-hash snapshots for the dump scripts.
+
+A snapshot is a directory kept beside the dump output:
+
+    <snapshot-dir>/manifest.json        path, size, mtime and sha256 per file
+    <snapshot-dir>/objects/ab/cdef...   content of each dumped version
+
+With a snapshot in place the presets can run incrementally:
+
+- ``--incremental changed`` emits only added and modified files and lists
+  deleted ones
+- ``--incremental diff`` emits a unified diff against the previous snapshot
+
+Files are stat'ed first; only files whose size or mtime changed are hashed,
+so a repeated dump costs time proportional to what actually changed. After
+each run the objects the new manifest no longer refers to are deleted, so the
+store only holds the versions of the latest snapshot.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dump_engine import DEFAULT_WORKERS, DumpFile, dump
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+INCREMENTAL_MODES = ('changed', 'diff')
+
+
+class SnapshotEntry:
+    """Stat and hash information of one file in a snapshot."""
+
+    __slots__ = ('path', 'size', 'mtime_ns', 'sha256')
+
+    def __init__(self, path, size, mtime_ns, sha256):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha256 = sha256
+
+    def same_stat(self, st):
+        return self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+
+    def to_json(self):
+        return {
+            'path': self.path,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'sha256': self.sha256,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['path'], data['size'], data['mtime_ns'], data['sha256'])
+
+
+class SnapshotDiff:
+    """Result of comparing the current tree with the previous snapshot."""
+
+    def __init__(self, added, modified, deleted, unchanged):
+        self.added = added
+        self.modified = modified
+        self.deleted = deleted
+        self.unchanged = unchanged
+
+    @property
+    def changed(self):
+        return self.added + self.modified
+
+    def __bool__(self):
+        return bool(self.added or self.modified or self.deleted)
+
+
+class Snapshot:
+    """
+    On-disk manifest plus content-addressed object store.
+
+    Entries are keyed by the label of the DumpFile, so presets that print
+    project-relative paths keep stable keys across machines.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        self.entries = {}
+        self.created = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def object_path(self, sha256):
+        return os.path.join(self.directory, 'objects', sha256[:2], sha256[2:])
+
+    def has_object(self, sha256):
+        return os.path.exists(self.object_path(sha256))
+
+    def read_object(self, sha256):
+        try:
+            with open(self.object_path(sha256), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def load(cls, directory):
+        """Loads a snapshot; a missing or unreadable manifest yields an empty one."""
+        snapshot = cls(directory)
+        try:
+            with open(snapshot.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return snapshot
+
+        if data.get('version') != MANIFEST_VERSION:
+            return snapshot
+
+        snapshot.created = data.get('created')
+        snapshot.entries = {
+            label: SnapshotEntry.from_json(entry) for label, entry in data['files'].items()
+        }
+        return snapshot
+
+    def save(self):
+        """Writes the manifest atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'files': {label: entry.to_json() for label, entry in sorted(self.entries.items())},
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.manifest-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def prune_objects(self):
+        """
+        Deletes stored objects that no manifest entry refers to.
+
+        Temporary files of an interrupted store_file() are left alone, a
+        concurrent run may still be writing them.
+
+        Returns:
+            Number of deleted objects
+        """
+        referenced = {entry.sha256 for entry in self.entries.values()}
+        objects = os.path.join(self.directory, 'objects')
+        try:
+            buckets = os.listdir(objects)
+        except FileNotFoundError:
+            return 0
+
+        removed = 0
+        for bucket in buckets:
+            bucket_dir = os.path.join(objects, bucket)
+            if bucket.startswith('.') or not os.path.isdir(bucket_dir):
+                continue
+            for name in os.listdir(bucket_dir):
+                if bucket + name in referenced:
+                    continue
+                try:
+                    os.remove(os.path.join(bucket_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+            try:
+                os.rmdir(bucket_dir)
+            except OSError:
+                pass  # still holds referenced objects
+        return removed
+
+    def store_file(self, source_path, sha256=None):
+        """
+        Copies ``source_path`` into the object store, hashing the bytes on the way.
+
+        With ``sha256`` the copy is only kept if the content still matches it;
+        a file that changed since it was hashed yields None. Otherwise returns
+        (sha256, stat) of the stored content, stat taken from the open file.
+        """
+        objects = os.path.join(self.directory, 'objects')
+        os.makedirs(objects, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=objects, prefix='.obj-')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(source_path, 'rb') as src:
+                while True:
+                    data = src.read(HASH_CHUNK_SIZE)
+                    if not data:
+                        break
+                    digest.update(data)
+                    dst.write(data)
+                st = os.fstat(src.fileno())
+
+            actual = digest.hexdigest()
+            if sha256 is not None and actual != sha256:
+                return None
+
+            target = self.object_path(actual)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+            return actual, st
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def hash_file(path):
+    """Returns the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(HASH_CHUNK_SIZE)
+            if not data:
+                break
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def scan(files, previous, workers=DEFAULT_WORKERS):
+    """
+    Builds the current entries for ``files`` and compares them to ``previous``.
+
+    Every file is stat'ed; only files whose stat differs from the previous
+    snapshot are hashed (in parallel). Missing files are left out.
+
+    Returns:
+        (entries, SnapshotDiff) where entries maps label -> SnapshotEntry
+    """
+    entries = {}
+    to_hash = []
+
+    for item in files:
+        try:
+            st = os.stat(item.path)
+        except OSError:
+            continue
+
+        old = previous.entries.get(item.label)
+        if old is not None and old.same_stat(st):
+            entries[item.label] = SnapshotEntry(item.path, st.st_size, st.st_mtime_ns, old.sha256)
+        else:
+            to_hash.append((item, st))
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            digests = executor.map(lambda pair: _try_hash(pair[0].path), to_hash)
+            for (item, st), sha256 in zip(to_hash, digests):
+                if sha256 is not None:
+                    entries[item.label] = SnapshotEntry(item.path, st.st_size, st.st_mtime_ns, sha256)
+
+    added, modified, unchanged = [], [], []
+    for item in files:
+        entry = entries.get(item.label)
+        if entry is None:
+            continue
+        old = previous.entries.get(item.label)
+        if old is None:
+            added.append(item)
+        elif old.sha256 != entry.sha256:
+            modified.append(item)
+        else:
+            unchanged.append(item)
+
+    deleted = sorted(label for label in previous.entries if label not in entries)
+    return entries, SnapshotDiff(added, modified, deleted, unchanged)
+
+
+def _try_hash(path):
+    try:
+        return hash_file(path)
+    except OSError:
+        return None
+
+
+class RecordingSink:
+    """
+    Wraps a dump sink and hashes every file while it is written, so a full
+    dump refreshes the snapshot without reading the files a second time.
+    Zero-copy sinks get their hash from the engine's UTF-8 check instead.
+    """
+
+    wants_digest = True
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.digests = {}
+        self._digest = None
+        self._copied = None
+
+    @property
+    def zero_copy(self):
+        return getattr(self.sink, 'zero_copy', False)
+
+    @property
+    def on_invalid(self):
+        return self.sink.on_invalid
+
+    def text(self, text):
+        self.sink.text(text)
+
+    def begin(self, item):
+        self._digest = hashlib.sha256()
+        self.sink.begin(item)
+
+    def chunk(self, item, data):
+        self._digest.update(data)
+        self.sink.chunk(item, data)
+
+    def copy(self, item, src, check):
+        # Zero-Copy: der Hash wurde bereits bei der UTF-8-Prüfung berechnet
+        self._copied = check.sha256
+        return self.sink.copy(item, src, check)
+
+    def end(self, item):
+        self.sink.end(item)
+        self.digests[item.label] = self._copied or self._digest.hexdigest()
+        self._digest = None
+        self._copied = None
+
+    def fail(self, item, exc, started):
+        self._digest = None
+        self._copied = None
+        self.sink.fail(item, exc, started)
+
+    def close(self):
+        self.sink.close()
+
+
+def record_full_dump(files, parts, sink, snapshot_dir, engine_opts):
+    """
+    Runs a normal dump and refreshes the snapshot from the written content.
+
+    Hashes come from the dumped bytes; only objects not yet in the store are
+    copied. Files the dump skipped (unreadable or, with ``--on-invalid skip``,
+    invalid UTF-8) are hashed from their raw bytes so they stay in the manifest.
+    """
+    recorder = RecordingSink(sink)
+    stats = dump(parts, recorder, **engine_opts)
+
+    current = Snapshot(snapshot_dir)
+    for item in files:
+        sha256 = recorder.digests.get(item.label)
+        try:
+            if sha256 is not None and current.has_object(sha256):
+                st = os.stat(item.path)
+            else:
+                stored = current.store_file(item.path, sha256)
+                if stored is None:
+                    current.entries[item.label] = _stale_entry(item, sha256)
+                    continue
+                sha256, st = stored
+        except OSError:
+            continue
+        current.entries[item.label] = SnapshotEntry(item.path, st.st_size, st.st_mtime_ns, sha256)
+    current.save()
+    current.prune_objects()
+    return stats
+
+
+def _stale_entry(item, sha256):
+    """
+    Entry for a file that changed between hashing and storing: it keeps the
+    hash of the dumped content, and its impossible stat makes the next scan
+    hash the file again and report it as modified.
+    """
+    return SnapshotEntry(item.path, -1, -1, sha256)
+
+
+def run_incremental(files, output, sink, snapshot_dir, mode, engine_opts):
+    """
+    Emits only what changed since the previous snapshot and saves the new one.
+
+    Args:
+        files: DumpFile entries the preset would dump in full mode
+        output: dump_engine.Output the result is written to
+        sink: Sink used to format changed files in 'changed' mode
+        snapshot_dir: Directory of the snapshot
+        mode: 'changed' or 'diff'
+        engine_opts: Keyword arguments for dump()
+
+    Returns:
+        SnapshotDiff describing the changes
+    """
+    previous = Snapshot.load(snapshot_dir)
+    entries, changes = scan(files, previous, engine_opts.get('workers', DEFAULT_WORKERS))
+
+    since = previous.created or 'never'
+    output.write_text(
+        f"=== INCREMENTAL DUMP ({mode}) since {since}: "
+        f"{len(changes.added)} added, {len(changes.modified)} modified, "
+        f"{len(changes.deleted)} deleted, {len(changes.unchanged)} unchanged ===\n"
+    )
+
+    if mode == 'diff':
+        for item in changes.changed:
+            old = previous.entries.get(item.label)
+            old_bytes = (previous.read_object(old.sha256) or b'') if old else b''
+            output.write_text(_unified_diff(item, old_bytes, old is not None))
+        for label in changes.deleted:
+            old_bytes = previous.read_object(previous.entries[label].sha256) or b''
+            output.write_text(_unified_diff(DumpFile(label), old_bytes, True, deleted=True))
+        sink.close()
+    else:
+        dump(list(changes.changed), sink, **engine_opts)
+        for label in changes.deleted:
+            output.write_text(f"DELETED: {label}\n")
+        output.flush()
+
+    current = Snapshot(snapshot_dir)
+    current.entries = entries
+    for item in changes.changed:
+        try:
+            stored = current.store_file(item.path, entries[item.label].sha256)
+        except OSError:
+            stored = None
+        if stored is None:
+            entries[item.label] = _stale_entry(item, entries[item.label].sha256)
+    current.save()
+    current.prune_objects()
+    return changes
+
+
+def _unified_diff(item, old_bytes, existed, deleted=False):
+    old_lines = old_bytes.decode('utf-8', errors='replace').splitlines(keepends=True)
+    if deleted:
+        new_lines = []
+    else:
+        with open(item.path, 'r', encoding='utf-8', errors='replace') as f:
+            new_lines = f.readlines()
+
+    diff = difflib.unified_diff(
+        old_lines,
+        new_lines,
+        fromfile=f"a/{item.label}" if existed else '/dev/null',
+        tofile='/dev/null' if deleted else f"b/{item.label}",
+    )
+    text = []
+    for line in diff:
+        text.append(line)
+        if not line.endswith('\n'):
+            text.append('\n\\ No newline at end of file\n')
+    return ''.join(text)
+
+
+def default_snapshot_dir(output_file, project_root, preset):
+    """Snapshot beside the output file, or under .dump-snapshot/ for stdout dumps."""
+    if output_file:
+        return f"{output_file}.snapshot"
+    return os.path.join(project_root, '.dump-snapshot', preset)
+
+
+def add_snapshot_arguments(parser):
+    """Registers the snapshot options shared by the presets."""
+    group = parser.add_argument_group('snapshot')
+    group.add_argument('--incremental', choices=INCREMENTAL_MODES,
+                       help='emit only changes since the last snapshot')
+    group.add_argument('--snapshot', action='store_true',
+                       help='refresh the snapshot during a full dump')
+    group.add_argument('--snapshot-dir',
+                       help='snapshot directory (default: beside the output)')
+    return group
+
+
+def run_dump(files, parts, output, sink, engine_opts, snapshot_dir, incremental=None, record=False):
+    """
+    Entry point for the presets: full dump, full dump with snapshot refresh,
+    or incremental dump, depending on the CLI options.
+    """
+    if incremental:
+        return run_incremental(files, output, sink, snapshot_dir, incremental, engine_opts)
+    if record:
+        return record_full_dump(files, parts, sink, snapshot_dir, engine_opts)
+    return dump(parts, sink, **engine_opts)
@@ -4,9 +4,27 @@ Script to print the contents of specified files in the RDAuswertung project.
 This script can be run from any directory within the project.
 """
 
+import argparse
 import os
 import sys
 
+from dump_engine import (
+    DumpFile,
+    DumpStyle,
+    InvalidUtf8Error,
+    add_engine_arguments,
+    engine_options,
+    open_output,
+)
+from dump_formats import (
+    add_format_arguments,
+    check_format_arguments,
+    format_options,
+    format_sink,
+)
+from dump_snapshot import add_snapshot_arguments, default_snapshot_dir, run_dump
+from tree_walker import find_project_root
+
 # List of files to print
 files_to_print = [
     # Datenmodelle und Typen
@@ -51,66 +69,83 @@ files_to_print = [
     "src/services/export/pdf-export.ts"
 ]
 
-def find_project_root():
-    """Find the root directory of the project by traversing up until package.json is found."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-
-    # If the script is run directly, use the current working directory
-    if os.path.basename(current_dir) == "scripts":
-        parent_dir = os.path.dirname(current_dir)
-        if os.path.exists(os.path.join(parent_dir, "package.json")):
-            return parent_dir
-
-    # Otherwise traverse up until we find package.json
-    while True:
-        if os.path.exists(os.path.join(current_dir, "package.json")):
-            return current_dir
+class PrintFilesStyle(DumpStyle):
+    """Header and footer layout of this script."""
 
-        parent_dir = os.path.dirname(current_dir)
-        if parent_dir == current_dir:  # Reached the root directory
-            return None
+    separator = "=" * 80
 
-        current_dir = parent_dir
+    def header(self, item):
+        return f"\n{self.separator}\nFILE: {item.label}\n{self.separator}\n"
 
-def print_file_content(file_path):
-    """Print the content of a file with a header and footer for better readability."""
-    separator = "=" * 80
-    print(f"\n{separator}")
-    print(f"FILE: {file_path}")
-    print(separator)
+    def footer(self, item):
+        return f"\n{self.separator}\n\n"
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            print(content)
-    except FileNotFoundError:
-        print(f"ERROR: File not found: {file_path}")
-    except Exception as e:
-        print(f"ERROR: Could not read file: {file_path}")
-        print(f"Reason: {str(e)}")
+    def error(self, item, exc, started):
+        text = "" if started else self.header(item)
+        if started:
+            text += "\n"
+        if isinstance(exc, FileNotFoundError):
+            text += f"ERROR: File not found: {item.label}\n"
+        else:
+            text += f"ERROR: Could not read file: {item.label}\n"
+            text += f"Reason: {str(exc)}\n"
+        return text + f"{self.separator}\n\n"
 
-    print(f"{separator}\n")
 
 def main():
     """Main function to print all specified files."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_engine_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_format_arguments(parser)
+    parser.add_argument('--output', help='write the dump to this file instead of stdout')
+    args = parser.parse_args()
+
+    check_format_arguments(parser, args)
+
+    # Statusmeldungen dürfen ein Archiv auf stdout nicht verunreinigen
+    log = sys.stdout if args.format == 'text' or args.output else sys.stderr
+
+    # Relativ zum Aufrufverzeichnis, nicht zum Projekt-Root
+    output_file = os.path.abspath(args.output) if args.output else None
+
     # Find the project root directory
     project_root = find_project_root()
 
     if not project_root:
-        print("Error: Could not find the root directory of the RDAuswertung project.")
-        print("Make sure this script is run from within the project directory structure.")
+        print("Error: Could not find the root directory of the RDAuswertung project.", file=log)
+        print("Make sure this script is run from within the project directory structure.", file=log)
         sys.exit(1)
 
     # Change to the project root directory
     os.chdir(project_root)
-    print(f"Working from project root: {project_root}\n")
+    print(f"Working from project root: {project_root}\n", file=log)
 
-    print("Starting to print files...\n")
+    print("Starting to print files...\n", file=log)
 
-    for file_path in files_to_print:
-        print_file_content(file_path)
+    files = [DumpFile(file_path) for file_path in files_to_print]
+    snapshot_dir = args.snapshot_dir or default_snapshot_dir(
+        output_file, project_root, "print_files"
+    )
+    try:
+        with open_output(output_file) as output:
+            run_dump(
+                files,
+                files,
+                output,
+                format_sink(
+                    output, PrintFilesStyle(), output_file=output_file, **format_options(args)
+                ),
+                engine_options(args),
+                snapshot_dir,
+                incremental=args.incremental,
+                record=args.snapshot,
+            )
+    except InvalidUtf8Error as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
 
-    print("Finished printing all files.")
+    print("Finished printing all files.", file=log)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,114 +1,181 @@
+import argparse
 import os
 import sys
-from pathlib import Path
 
-def find_and_print_frontend_components(project_dir, output_file=None):
+from dump_engine import (
+    DumpFile,
+    DumpStyle,
+    InvalidUtf8Error,
+    add_engine_arguments,
+    engine_options,
+    open_output,
+)
+from dump_formats import (
+    add_format_arguments,
+    check_format_arguments,
+    format_options,
+    format_sink,
+)
+from dump_snapshot import add_snapshot_arguments, default_snapshot_dir, run_dump
+from tree_walker import PrefixTable, collect, find_project_root
+
+DEFAULT_EXTENSIONS = ('.tsx',)
+
+# Nur Dateien in src/app und src/components berücksichtigen
+FRONTEND_SCOPE = ('src/app', 'src/components')
+
+# Reihenfolge der Kategorien in der Ausgabe
+FRONTEND_CATEGORIES = (
+    'pages',               # Page-Komponenten (page.tsx)
+    'layouts',             # Layout-Komponenten (layout.tsx)
+    'ui_components',       # UI-Komponenten (in /components/ui)
+    'feature_components',  # Feature-spezifische Komponenten
+    'chart_components',    # Chart/Diagramm-Komponenten
+    'form_components',     # Formular-Komponenten
+    'layout_components',   # Layout-spezifische Komponenten
+)
+
+# Dateinamen haben Vorrang, danach gewinnt der längste passende Präfix
+FRONTEND_TABLE = PrefixTable(
+    filenames={
+        'page.tsx': 'pages',
+        'layout.tsx': 'layouts',
+    },
+    prefixes={
+        'src/components/ui': 'ui_components',
+        'src/components/charts': 'chart_components',
+        'src/components/forms': 'form_components',
+        'src/components/layout': 'layout_components',
+        'src/components': 'feature_components',
+    },
+)
+
+
+class FrontendStyle(DumpStyle):
+    """Layout der Komponenten-Ausgabe."""
+
+    def header(self, item):
+        return f"\n{'#' * 80}\n# KOMPONENTE: {item.label}\n{'#' * 80}\n\n"
+
+    def footer(self, item):
+        return "\n\n\n\n"
+
+    def error(self, item, exc, started):
+        prefix = "\n" if started else ""
+        return f"{prefix}FEHLER beim Lesen von {item.label}: {str(exc)}\n\n\n"
+
+
+def find_and_print_frontend_components(
+    project_dir, output_file=None, engine_opts=None, incremental=None, snapshot=False,
+    snapshot_dir=None, extensions=DEFAULT_EXTENSIONS, sink_opts=None
+):
     """
     Findet alle Frontend-Komponenten (.tsx-Dateien) im Projekt und gibt deren vollständigen Inhalt aus.
     Optional kann die Ausgabe in eine Datei geschrieben werden.
+
+    Das Projekt wird in einem einzigen os.scandir-Durchlauf durchsucht;
+    node_modules, .next, .git und Einträge aus der .gitignore werden
+    übersprungen. Über ``extensions`` lassen sich weitere Dateitypen
+    (z.B. .ts, .json) unterhalb von src/app und src/components in einem
+    Durchlauf mit einsammeln.
+
+    Die Dateien werden über die gemeinsame Dump-Engine parallel gelesen und
+    in fester Reihenfolge in eine gepufferte Ausgabe geschrieben.
+
+    Mit ``incremental`` ('changed' oder 'diff') werden nur die seit dem
+    letzten Snapshot geänderten Komponenten ausgegeben; ``snapshot`` aktualisiert
+    den Snapshot bei einer vollständigen Ausgabe.
+
+    ``sink_opts`` (siehe dump_formats.format_options) wählt das Ausgabeformat:
+    Text (mit ``raw`` als Zero-Copy-Ausgabe), ein gestreamtes tar-Archiv oder
+    JSONL mit Offset-Index; ``on_invalid`` regelt Dateien mit ungültigem UTF-8.
     """
-    categories = {
-        'pages': [],          # Page-Komponenten (page.tsx)
-        'layouts': [],        # Layout-Komponenten (layout.tsx)
-        'ui_components': [],  # UI-Komponenten (in /components/ui)
-        'feature_components': [],  # Feature-spezifische Komponenten
-        'chart_components': [],  # Chart/Diagramm-Komponenten
-        'form_components': [],  # Formular-Komponenten
-        'layout_components': []  # Layout-spezifische Komponenten
-    }
-
-    project_path = Path(project_dir)
-
-    # Alle .tsx-Dateien finden und kategorisieren
-    for tsx_file in project_path.rglob('*.tsx'):
-        try:
-            rel_path = tsx_file.relative_to(project_path)
-            rel_path_str = str(rel_path)
-
-            # Nur Dateien in src/app und src/components berücksichtigen
-            if not (rel_path_str.startswith('src' + os.sep + 'app') or
-                    rel_path_str.startswith('src' + os.sep + 'components')):
-                continue
-
-            # Komponenten kategorisieren
-            if tsx_file.name == 'page.tsx':
-                categories['pages'].append((rel_path_str, tsx_file))
-            elif tsx_file.name == 'layout.tsx':
-                categories['layouts'].append((rel_path_str, tsx_file))
-            elif ('components' + os.sep + 'ui') in rel_path_str:
-                categories['ui_components'].append((rel_path_str, tsx_file))
-            elif ('components' + os.sep + 'charts') in rel_path_str:
-                categories['chart_components'].append((rel_path_str, tsx_file))
-            elif ('components' + os.sep + 'forms') in rel_path_str:
-                categories['form_components'].append((rel_path_str, tsx_file))
-            elif ('components' + os.sep + 'layout') in rel_path_str:
-                categories['layout_components'].append((rel_path_str, tsx_file))
-            elif ('components') in rel_path_str:
-                categories['feature_components'].append((rel_path_str, tsx_file))
-        except ValueError:
-            continue
-
-    # Ausgabe vorbereiten
+    categories = collect(
+        project_dir,
+        FRONTEND_TABLE,
+        extensions,
+        categories=FRONTEND_CATEGORIES,
+        scope=FRONTEND_SCOPE,
+    )
+
+    # Ausgabe als Folge von Textblöcken und Dateien aufbauen
+    dump_files = []
+    parts = ["=== FRONTEND-KOMPONENTEN MIT VOLLSTÄNDIGEM CODE ===\n\n"]
+    total_components = 0
+
+    for category_name, files in categories.items():
+        if files:
+            category_title = category_name.replace('_', ' ').upper()
+            parts.append(f"{'=' * 80}\n== {category_title} ({len(files)}) ==\n{'=' * 80}\n\n")
+
+            for rel_path, file_path in files:
+                item = DumpFile(file_path, label=rel_path, category=category_name)
+                dump_files.append(item)
+                parts.append(item)
+
+            total_components += len(files)
+
+    parts.append(f"\nGESAMT: {total_components} Frontend-Komponenten wurden ausgegeben.\n")
+
+    snapshot_dir = snapshot_dir or default_snapshot_dir(
+        output_file, project_dir, 'print_frontend_files'
+    )
+    with open_output(output_file) as output:
+        run_dump(
+            dump_files,
+            parts,
+            output,
+            format_sink(output, FrontendStyle(), output_file=output_file, **(sink_opts or {})),
+            engine_opts or {},
+            snapshot_dir,
+            incremental=incremental,
+            record=snapshot,
+        )
+
     if output_file:
-        f = open(output_file, 'w', encoding='utf-8')
-        original_stdout = sys.stdout
-        sys.stdout = f
+        print(f"Ergebnisse wurden in '{output_file}' gespeichert.")
 
-    try:
-        print("=== FRONTEND-KOMPONENTEN MIT VOLLSTÄNDIGEM CODE ===\n")
-
-        total_components = 0
-
-        # Alle Kategorien mit Inhalten ausgeben
-        for category_name, files in categories.items():
-            if files:
-                category_title = category_name.replace('_', ' ').upper()
-                print(f"{'=' * 80}")
-                print(f"== {category_title} ({len(files)}) ==")
-                print(f"{'=' * 80}\n")
-
-                for rel_path, file_path in sorted(files):
-                    try:
-                        # Dateiinhalt lesen
-                        with open(file_path, 'r', encoding='utf-8') as src_file:
-                            content = src_file.read()
-
-                        # Header für die Komponente
-                        print(f"\n{'#' * 80}")
-                        print(f"# KOMPONENTE: {rel_path}")
-                        print(f"{'#' * 80}\n")
-
-                        # Vollständigen Inhalt ausgeben
-                        print(content)
-                        print("\n\n")
-                    except Exception as e:
-                        print(f"FEHLER beim Lesen von {rel_path}: {str(e)}\n\n")
-
-                total_components += len(files)
-
-        print(f"\nGESAMT: {total_components} Frontend-Komponenten wurden ausgegeben.")
-
-    finally:
-        # Zurücksetzen des stdout, falls in eine Datei geschrieben wurde
-        if output_file:
-            sys.stdout = original_stdout
-            f.close()
-            print(f"Ergebnisse wurden in '{output_file}' gespeichert.")
 
 def main():
     """Hauptfunktion."""
+    parser = argparse.ArgumentParser(description="Gibt alle Frontend-Komponenten aus.")
+    add_engine_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_format_arguments(parser)
+    parser.add_argument('--project-dir', help='Projektverzeichnis (Standard: automatisch ermittelt)')
+    parser.add_argument('--ext', default=','.join(DEFAULT_EXTENSIONS),
+                        help='Dateiendungen unter src/app und src/components, '
+                             'z.B. .tsx,.ts,.json (Standard: .tsx)')
+    parser.add_argument('--output', help='Ausgabedatei (Standard: frontend_components_full.txt)')
+    args = parser.parse_args()
+
+    check_format_arguments(parser, args)
+
     # Projektverzeichnis (kann bei Bedarf angepasst werden)
-    project_dir = "C:/Development/RDAuswertung"
+    project_dir = args.project_dir or find_project_root()
 
-    if not os.path.exists(project_dir):
+    if not project_dir or not os.path.isdir(project_dir):
         print(f"Fehler: Das Verzeichnis '{project_dir}' existiert nicht.")
         sys.exit(1)
 
     # Ausgabedatei definieren
-    output_file = os.path.join(project_dir, "frontend_components_full.txt")
+    output_file = args.output or os.path.join(project_dir, "frontend_components_full.txt")
 
     # Komponenten finden und Inhalt ausgeben
-    find_and_print_frontend_components(project_dir, output_file)
+    try:
+        find_and_print_frontend_components(
+            project_dir,
+            output_file,
+            engine_options(args),
+            incremental=args.incremental,
+            snapshot=args.snapshot,
+            snapshot_dir=args.snapshot_dir,
+            extensions=args.ext,
+            sink_opts=format_options(args),
+        )
+    except InvalidUtf8Error as exc:
+        print(f"Fehler: {exc}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
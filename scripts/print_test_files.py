@@ -10,47 +10,59 @@ Usage:
     python print_test_files.py
 """
 
-import os
+import argparse
 import sys
-from pathlib import Path
 
-
-def print_file_content(file_path):
+from dump_engine import (
+    DumpFile,
+    DumpStyle,
+    InvalidUtf8Error,
+    add_engine_arguments,
+    dump,
+    engine_options,
+    open_output,
+)
+from dump_formats import (
+    add_format_arguments,
+    check_format_arguments,
+    format_options,
+    format_sink,
+)
+
+
+class TestFilesStyle(DumpStyle):
     """
-    Print the content of a single file with a header and footer for readability.
-
-    Args:
-        file_path (str): Path to the file to be printed
+    Header and footer layout of this script. Undecodable bytes are replaced,
+    as before (in --raw mode --on-invalid decides instead).
     """
-    try:
-        # Create Path object
-        path = Path(file_path)
-
-        # Print file header
-        print("\n" + "=" * 80)
-        print(f"FILE: {file_path}")
-        print("=" * 80)
 
-        # Check if file exists
-        if not path.exists():
-            print(f"ERROR: File not found!")
-            return
+    errors = 'replace'
+    separator = "=" * 80
 
-        # Read and print file content
-        with open(path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-            print(content)
+    def header(self, item):
+        return f"\n{self.separator}\nFILE: {item.label}\n{self.separator}\n"
 
-        # Print file footer
-        print("=" * 80)
-        print(f"END OF FILE: {file_path}")
-        print("=" * 80)
+    def footer(self, item):
+        return f"\n{self.separator}\nEND OF FILE: {item.label}\n{self.separator}\n"
 
-    except Exception as e:
-        print(f"ERROR reading file {file_path}: {str(e)}")
+    def error(self, item, exc, started):
+        if isinstance(exc, FileNotFoundError):
+            return self.header(item) + "ERROR: File not found!\n"
+        text = "\n" if started else self.header(item)
+        return text + f"ERROR reading file {item.label}: {str(exc)}\n"
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Print the RDAuswertung test setup files.")
+    add_engine_arguments(parser)
+    add_format_arguments(parser)
+    parser.add_argument('--output', help='write the dump to this file instead of stdout')
+    args = parser.parse_args()
+    check_format_arguments(parser, args)
+
+    # Statusmeldungen dürfen ein Archiv auf stdout nicht verunreinigen
+    log = sys.stdout if args.format == 'text' or args.output else sys.stderr
+
     # List of all required files for test setup
     required_files = [
         r"C:\Development\RDAuswertung\jest.config.js",
@@ -108,13 +120,21 @@ def main():
     ]
 
     # Print a summary of files to be processed
-    print(f"Preparing to print {len(required_files)} files for RDAuswertung test setup...")
+    print(f"Preparing to print {len(required_files)} files for RDAuswertung test setup...", file=log)
 
-    # Process each file
-    for file_path in required_files:
-        print_file_content(file_path)
-
-    print("\nFile printing completed.")
+    # Process all files through the shared dump engine
+    parts = [DumpFile(file_path) for file_path in required_files]
+    try:
+        with open_output(args.output) as output:
+            sink = format_sink(
+                output, TestFilesStyle(), output_file=args.output, **format_options(args)
+            )
+            dump(parts, sink, **engine_options(args))
+    except InvalidUtf8Error as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    print("\nFile printing completed.", file=log)
 
 
 if __name__ == "__main__":
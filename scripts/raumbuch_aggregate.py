@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Spaltenbasierte Raumbuch-Aggregation, Python-Pendant zu
+src/services/analysis/columnar-aggregation.ts.
+
+Liefert dieselben Ergebnisse wie calculateSummary(),
+prepareDataForVisualization() und prepareGebaeudeteilData() der
+TypeScript-Services, bis aufs letzte Bit:
+
+- Kennzahlen werden wie safeNumber() gelesen (parseFloat-Präfix, sonst 0),
+- Gruppenschlüssel wie groupBy() über String(wert) gebildet
+  (``None`` -> 'null', fehlendes Feld -> 'undefined'),
+- je Gruppe wird in Zeilenreihenfolge addiert (np.bincount summiert
+  sequentiell, np.cumsum ebenso - np.sum dagegen paarweise und ist daher
+  hier nicht verwendbar),
+- gerundet wird wie Number(x.toFixed(2)), die Reihenfolge der Schlüssel
+  folgt Object.entries().
+
+NumPy ist optional; ohne NumPy rechnen dieselben Schleifen in reinem Python.
+Beide Implementierungen werden gegen tests/fixtures/raumbuch-aggregation.golden.json
+geprüft (``verify``, in CI über tests/scripts/test_raumbuch_aggregate.py
+mit ``npm run test:scripts``), dieselbe Datei nutzt der Jest-Test
+tests/unit/services/columnar-aggregation.test.ts.
+
+Usage:
+    python raumbuch_aggregate.py verify
+    python raumbuch_aggregate.py verify --pure-python
+    python raumbuch_aggregate.py summarize rows.json
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from decimal import ROUND_HALF_UP, Decimal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy ist optional
+    np = None
+
+MEASURES = (
+    'Menge',
+    'MengeAktivMonat',
+    'VkWertNettoMonat',
+    'VkWertBruttoMonat',
+    'RgWertNettoMonat',
+    'RgWertBruttoMonat',
+    'StundeMonat',
+)
+DIMENSIONS = ('Bereich', 'Reinigungsgruppe', 'Etage', 'Gebaeudeteil')
+
+SUMMARY_TOTALS = (
+    ('totalMenge', 'Menge'),
+    ('totalMengeAktivMonat', 'MengeAktivMonat'),
+    ('totalVkWertNettoMonat', 'VkWertNettoMonat'),
+    ('totalVkWertBruttoMonat', 'VkWertBruttoMonat'),
+    ('totalRgWertNettoMonat', 'RgWertNettoMonat'),
+    ('totalRgWertBruttoMonat', 'RgWertBruttoMonat'),
+    ('totalStundenMonat', 'StundeMonat'),
+)
+STAT_FIELDS = (
+    ('menge', 'Menge'),
+    ('vkWertNettoMonat', 'VkWertNettoMonat'),
+    ('vkWertBruttoMonat', 'VkWertBruttoMonat'),
+    ('stundenMonat', 'StundeMonat'),
+)
+VISUALIZATION = (
+    ('bereichData', 'Bereich', 'Menge'),
+    ('rgData', 'Reinigungsgruppe', 'VkWertNettoMonat'),
+    ('etageData', 'Etage', 'StundeMonat'),
+)
+GOLDEN_FILE = os.path.join('tests', 'fixtures', 'raumbuch-aggregation.golden.json')
+
+_MISSING = object()
+_FLOAT_PREFIX = re.compile(r'[+-]?(?:Infinity|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)')
+_CENT = Decimal('0.01')
+
+
+# ---------------------------------------------------------------------------
+# JavaScript-Semantik
+# ---------------------------------------------------------------------------
+
+def js_number(value):
+    """Entspricht safeNumber(): null/undefined/ungültig -> 0, Strings wie parseFloat()."""
+    if value is None or value is _MISSING or isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float, Decimal)):
+        number = float(value)
+        return 0.0 if math.isnan(number) else number
+    match = _FLOAT_PREFIX.match(str(value).lstrip())
+    return float(match.group()) if match else 0.0
+
+
+def js_string(value):
+    """Entspricht String(wert) für die Werte, die im Raumbuch vorkommen."""
+    if value is _MISSING:
+        return 'undefined'
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float, Decimal)):
+        return _js_number_string(float(value))
+    return str(value)
+
+
+def _js_number_string(number):
+    # Number.prototype.toString(): Exponentialschreibweise erst ab 1e21 bzw. unter 1e-6
+    if math.isnan(number):
+        return 'NaN'
+    if math.isinf(number):
+        return 'Infinity' if number > 0 else '-Infinity'
+    if number == 0:
+        return '0'
+
+    sign = '-' if number < 0 else ''
+    # repr() liefert die kürzeste Ziffernfolge, wie JavaScript
+    parsed = Decimal(repr(abs(number))).normalize().as_tuple()
+    digits = ''.join(map(str, parsed.digits))
+    k = len(digits)
+    point = parsed.exponent + k
+
+    if k <= point <= 21:
+        text = digits + '0' * (point - k)
+    elif 0 < point <= 21:
+        text = f'{digits[:point]}.{digits[point:]}'
+    elif -6 < point <= 0:
+        text = '0.' + '0' * -point + digits
+    else:
+        e = point - 1
+        mantissa = digits[0] + (f'.{digits[1:]}' if k > 1 else '')
+        text = f'{mantissa}e{"+" if e >= 0 else "-"}{abs(e)}'
+    return sign + text
+
+
+def js_round2(number):
+    """Entspricht Number(x.toFixed(2)): exakter Dezimalwert, bei Gleichstand vom Nullpunkt weg."""
+    if not math.isfinite(number) or abs(number) >= 1e21:
+        return number
+    return float(Decimal(number).quantize(_CENT, rounding=ROUND_HALF_UP)) + 0.0
+
+
+def js_ordered(mapping):
+    """Reihenfolge von Object.entries(): Integer-Schlüssel aufsteigend, dann Einfügereihenfolge."""
+    integer_keys = sorted(
+        (k for k in mapping if k.isdigit() and (k == '0' or not k.startswith('0'))
+         and int(k) < 2 ** 32 - 1),
+        key=int,
+    )
+    integer_set = set(integer_keys)
+    return [(k, mapping[k]) for k in integer_keys] + [
+        (k, v) for k, v in mapping.items() if k not in integer_set
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Spalten und Aggregation
+# ---------------------------------------------------------------------------
+
+class Columns:
+    """
+    Raumbuch-Zeilen in Spaltenform: je Kennzahl ein float64-Array, je
+    Gruppierung ein Code-Array und die Schlüssel in Reihenfolge des ersten
+    Auftretens.
+    """
+
+    def __init__(self, row_count, measures, keys, codes):
+        self.row_count = row_count
+        self.measures = measures
+        self.keys = keys
+        self.codes = codes
+
+    @classmethod
+    def from_rows(cls, rows, use_numpy=True):
+        """Baut die Spalten in einem Durchlauf aus Zeilen (dicts)."""
+        measures = {measure: [] for measure in MEASURES}
+        keys = {dimension: [] for dimension in DIMENSIONS}
+        codes = {dimension: [] for dimension in DIMENSIONS}
+        lookups = {dimension: {} for dimension in DIMENSIONS}
+
+        row_count = 0
+        for row in rows:
+            row_count += 1
+            for measure in MEASURES:
+                measures[measure].append(js_number(row.get(measure)))
+            for dimension in DIMENSIONS:
+                value = row.get(dimension, _MISSING)
+                # Nur Strings direkt nachschlagen: 1, 1.0 und True wären als
+                # dict-Schlüssel gleich, ergeben in JS aber '1' bzw. 'true'
+                key = value if isinstance(value, str) else js_string(value)
+                lookup = lookups[dimension]
+                code = lookup.get(key)
+                if code is None:
+                    code = lookup[key] = len(keys[dimension])
+                    keys[dimension].append(key)
+                codes[dimension].append(code)
+
+        if use_numpy and np is not None:
+            measures = {m: np.asarray(v, dtype=np.float64) for m, v in measures.items()}
+            codes = {d: np.asarray(c, dtype=np.intp) for d, c in codes.items()}
+        return cls(row_count, measures, keys, codes)
+
+
+class Aggregates:
+    """Gesamtsummen je Kennzahl und Summen je Gruppe (``groups[dim][measure][code]``)."""
+
+    def __init__(self, row_count, totals, keys, groups):
+        self.row_count = row_count
+        self.totals = totals
+        self.keys = keys
+        self.groups = groups
+
+
+def aggregate(columns):
+    """Summiert alle Kennzahlen gesamt und je Gruppe in Zeilenreihenfolge."""
+    if np is not None and isinstance(columns.measures[MEASURES[0]], np.ndarray):
+        return _aggregate_numpy(columns)
+    return _aggregate_python(columns)
+
+
+def _aggregate_numpy(columns):
+    totals = {}
+    groups = {dimension: {} for dimension in DIMENSIONS}
+    for measure in MEASURES:
+        values = columns.measures[measure]
+        totals[measure] = float(np.cumsum(values)[-1]) if columns.row_count else 0.0
+        for dimension in DIMENSIONS:
+            sums = np.bincount(columns.codes[dimension], weights=values,
+                               minlength=len(columns.keys[dimension]))
+            groups[dimension][measure] = sums.tolist()
+    return Aggregates(columns.row_count, totals, columns.keys, groups)
+
+
+def _aggregate_python(columns):
+    totals = {}
+    groups = {dimension: {} for dimension in DIMENSIONS}
+    for measure in MEASURES:
+        values = columns.measures[measure]
+        total = 0.0
+        for value in values:
+            total += value
+        totals[measure] = total
+        for dimension in DIMENSIONS:
+            sums = [0.0] * len(columns.keys[dimension])
+            for code, value in zip(columns.codes[dimension], values):
+                sums[code] += value
+            groups[dimension][measure] = sums
+    return Aggregates(columns.row_count, totals, columns.keys, groups)
+
+
+def aggregate_rows(rows, use_numpy=True):
+    return aggregate(Columns.from_rows(rows, use_numpy=use_numpy))
+
+
+# ---------------------------------------------------------------------------
+# Ergebnisse wie in den TypeScript-Services
+# ---------------------------------------------------------------------------
+
+def summary(aggregates):
+    """Ergebnis wie calculateSummary()."""
+    result = {'totalRooms': aggregates.row_count}
+    for name, measure in SUMMARY_TOTALS:
+        result[name] = aggregates.totals[measure]
+    if not aggregates.row_count:
+        return result
+
+    for stat_name, key_name, dimension in (('bereichStats', 'bereich', 'Bereich'),
+                                           ('rgStats', 'reinigungsgruppe', 'Reinigungsgruppe')):
+        sums = aggregates.groups[dimension]
+        index = {key: code for code, key in enumerate(aggregates.keys[dimension])}
+        result[stat_name] = [
+            {key_name: key, **{name: sums[measure][code] for name, measure in STAT_FIELDS}}
+            for key, code in js_ordered(index)
+        ]
+    return result
+
+
+def group_totals(aggregates, dimension, measure):
+    """Summe einer Kennzahl je Gruppe, gerundet; leere Schlüssel werden übersprungen."""
+    sums = aggregates.groups[dimension][measure]
+    index = {key: code for code, key in enumerate(aggregates.keys[dimension])}
+    return {key: js_round2(sums[code]) for key, code in js_ordered(index) if key}
+
+
+def visualization(aggregates):
+    """Ergebnis wie prepareDataForVisualization()."""
+    if not aggregates.row_count:
+        return {}
+    return {name: group_totals(aggregates, dimension, measure)
+            for name, dimension, measure in VISUALIZATION}
+
+
+def gebaeudeteil_data(aggregates):
+    """Ergebnis wie prepareGebaeudeteilData()."""
+    if not aggregates.row_count:
+        return {}
+    return group_totals(aggregates, 'Gebaeudeteil', 'Menge')
+
+
+def summarize(rows):
+    """Zusammenfassung wie calculateSummary() für Zeilen als dicts."""
+    return summary(aggregate_rows(rows))
+
+
+# ---------------------------------------------------------------------------
+# Golden-Datei
+# ---------------------------------------------------------------------------
+
+def _differences(actual, expected, path='$'):
+    # Vergleich wie JSON.stringify(): gleiche Schlüsselreihenfolge, Zahlen exakt
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict) or list(actual) != list(expected):
+            yield f'{path}: Schlüssel {list(actual) if isinstance(actual, dict) else actual!r}'
+            return
+        for key in expected:
+            yield from _differences(actual[key], expected[key], f'{path}.{key}')
+    elif isinstance(expected, list):
+        if not isinstance(actual, list) or len(actual) != len(expected):
+            yield f'{path}: Länge {len(actual) if isinstance(actual, list) else actual!r}'
+            return
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            yield from _differences(a, e, f'{path}[{i}]')
+    elif isinstance(expected, (int, float)) and not isinstance(expected, bool):
+        if isinstance(actual, bool) or not isinstance(actual, (int, float)) or actual != expected:
+            yield f'{path}: {actual!r} != {expected!r}'
+    elif actual != expected:
+        yield f'{path}: {actual!r} != {expected!r}'
+
+
+def verify(golden_path, use_numpy=True):
+    """
+    Prüft die Aggregation gegen die Golden-Datei.
+
+    Returns:
+        Liste der Abweichungen (leer, wenn alles übereinstimmt)
+    """
+    with open(golden_path, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+
+    problems = []
+    for case in golden['cases']:
+        aggregates = aggregate_rows(case['rows'], use_numpy=use_numpy)
+        actual = {
+            'summary': summary(aggregates),
+            'visualization': visualization(aggregates),
+            'gebaeudeteil': gebaeudeteil_data(aggregates),
+        }
+        problems.extend(f"{case['name']}: {p}"
+                        for p in _differences(actual, case['expected']))
+    return problems
+
+
+def main():
+    from tree_walker import find_project_root
+
+    parser = argparse.ArgumentParser(description="Raumbuch-Aggregation wie in den TypeScript-Services.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    verify_parser = sub.add_parser('verify', help='gegen die Golden-Datei prüfen')
+    verify_parser.add_argument('golden', nargs='?',
+                               help=f'Golden-Datei (Standard: {GOLDEN_FILE} im Projekt)')
+    verify_parser.add_argument('--pure-python', action='store_true',
+                               help='ohne NumPy rechnen')
+
+    summarize_parser = sub.add_parser('summarize', help='Zeilen aus JSON zusammenfassen')
+    summarize_parser.add_argument('rows', help="JSON-Datei mit einer Liste von Zeilen ('-' für stdin)")
+    args = parser.parse_args()
+
+    if args.command == 'verify':
+        golden_path = args.golden or os.path.join(find_project_root() or os.getcwd(), GOLDEN_FILE)
+        use_numpy = not args.pure_python
+        problems = verify(golden_path, use_numpy=use_numpy)
+        engine = 'numpy' if use_numpy and np is not None else 'python'
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        if problems:
+            print(f"{len(problems)} Abweichung(en) ({engine})", file=sys.stderr)
+            sys.exit(1)
+        print(f"Golden-Datei stimmt überein ({engine}): {golden_path}")
+        return
+
+    if args.rows == '-':
+        rows = json.load(sys.stdin)
+    else:
+        with open(args.rows, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    aggregates = aggregate_rows(rows)
+    json.dump(
+        {
+            'summary': summary(aggregates),
+            'visualizationData': visualization(aggregates),
+            'gebaeudeteilData': gebaeudeteil_data(aggregates),
+        },
+        sys.stdout,
+        ensure_ascii=False,
+        indent=2,
+    )
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+// scripts/update_bench_baseline.js
+/**
+ * Übernimmt die Ergebnisse des letzten Benchmark-Laufs als Baseline
+ *
+ * Usage: npm run bench:baseline [-- name1 name2 ...]
+ * Ohne Namen werden alle Ergebnisse übernommen, sonst nur die genannten
+ * (z.B. "excel@50000"). Die Schwellwerte in baselines.json bleiben erhalten.
+ */
+const fs = require('fs');
+const path = require('path');
+
+const benchDir = path.resolve(__dirname, '../tests/benchmark');
+const baselineFile = path.join(benchDir, 'baselines.json');
+const resultsFile = path.join(benchDir, 'results', 'latest.json');
+
+if (!fs.existsSync(resultsFile)) {
+  console.error(`No benchmark results found at ${resultsFile}. Run "npm run bench" first.`);
+  process.exit(1);
+}
+
+const baselines = JSON.parse(fs.readFileSync(baselineFile, 'utf8'));
+const latest = JSON.parse(fs.readFileSync(resultsFile, 'utf8'));
+const names = process.argv.slice(2);
+
+const selected = Object.entries(latest.results).filter(
+  ([name]) => names.length === 0 || names.includes(name)
+);
+
+selected.forEach(([name, result]) => {
+  baselines.results[name] = result;
+});
+baselines.recordedOn = `${latest.platform}, node ${latest.node}, ${latest.createdAt}`;
+
+fs.writeFileSync(baselineFile, `${JSON.stringify(baselines, null, 2)}\n`);
+console.log(`Updated ${selected.length} baseline(s) in ${baselineFile}`);
@@ -1,11 +1,19 @@
 // C:\Development\RDAuswertung\src\app\api\export\excel\[id]\route.ts
 
+import { PassThrough, Readable } from 'stream';
+
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
-import { calculateSummary } from '@/services/analysis/raumbuch-analysis';
-import { getGebaeudeById, getRaumbuchData } from '@/services/database/queries';
-import { generateExcel } from '@/services/export/excel-export';
+import { prefetchFirstRow } from '@/lib/ndjson';
+import { withRequestMetrics } from '@/lib/request-metrics';
+import { getGebaeudeById, getRaumbuchVersion } from '@/services/database/queries';
+import { writeExcelStream } from '@/services/export/excel-export';
+import { cachedExportResponse, getExportCache } from '@/services/export/export-cache';
+import { excelExportRows, exportKey } from '@/services/export/export-jobs';
+
+// Route label for metrics
+const ROUTE = '/api/export/excel/[id]';
 
 // Validate ID parameter
 const paramsSchema = z.object({
@@ -25,7 +33,7 @@ const querySchema = z.object({
   reinigungsgruppe: z.string().optional(), // Geändert von "rg" zu "reinigungsgruppe"
 });
 
-export async function GET(request: NextRequest, { params }: { params: { id: string } }) {
+async function handleGet(request: NextRequest, { params }: { params: { id: string } }) {
   try {
     // Validate gebaeude ID
     const validatedParams = paramsSchema.safeParse({ id: params.id });
@@ -55,41 +63,34 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
       return NextResponse.json({ error: 'Gebaeude not found' }, { status: 404 });
     }
 
-    // Get raumbuch data with filters
-    let raumbuchData = await getRaumbuchData(gebaeudeId);
-
-    // Apply filters if any are provided
-    const filters = validatedQuery.success ? validatedQuery.data : {};
-    if (filters.bereich) {
-      raumbuchData = raumbuchData.filter(item => item.Bereich === filters.bereich);
-    }
-    if (filters.gebaeudeteil) {
-      raumbuchData = raumbuchData.filter(item => item.Gebaeudeteil === filters.gebaeudeteil);
-    }
-    if (filters.etage) {
-      raumbuchData = raumbuchData.filter(item => item.Etage === filters.etage);
-    }
-    if (filters.reinigungsgruppe) {
-      raumbuchData = raumbuchData.filter(
-        item => item.Reinigungsgruppe === filters.reinigungsgruppe
-      ); // Geändert von "RG" zu "Reinigungsgruppe"
+    // Serve a finished export of the same data version (e.g. from an export job)
+    const filters = validatedQuery.data;
+    const version = await getRaumbuchVersion(gebaeudeId);
+    const cached = await getExportCache().open(exportKey('excel', gebaeudeId, filters, version));
+    if (cached) {
+      return cachedExportResponse(cached);
     }
 
-    // Calculate summary for Excel sheets
-    const summary = calculateSummary(raumbuchData);
+    // Stream raumbuch rows from the database; filters are applied in SQL. Export
+    // jobs read the same rows, so both produce the same file for a cache key.
+    // The first row is read before responding so query errors still yield a 500.
+    const rows = await prefetchFirstRow(excelExportRows(gebaeudeId, filters));
 
-    // Generate Excel file
-    const excelBuffer = await generateExcel(raumbuchData, gebaeude.bezeichnung, summary);
+    // Write the workbook into the response (exceljs sends the zip once it is complete)
+    const output = new PassThrough();
+    writeExcelStream(rows, gebaeude.bezeichnung, output).catch(error => {
+      console.error('Excel export error:', error);
+      output.destroy(error);
+    });
 
-    // Set response headers
+    // Set response headers (no Content-Length, the file is streamed)
     const filename = `Raumbuch_Auswertung_${gebaeude.bezeichnung}_${new Date().toISOString().split('T')[0]}.xlsx`;
 
-    return new NextResponse(excelBuffer, {
+    return new NextResponse(Readable.toWeb(output) as ReadableStream<Uint8Array>, {
       status: 200,
       headers: {
         'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         'Content-Disposition': `attachment; filename="${filename}"`,
-        'Content-Length': excelBuffer.byteLength.toString(),
       },
     });
   } catch (error) {
@@ -97,3 +98,7 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
     return NextResponse.json({ error: 'Failed to generate Excel file' }, { status: 500 });
   }
 }
+
+export function GET(request: NextRequest, context: { params: { id: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request, context));
+}
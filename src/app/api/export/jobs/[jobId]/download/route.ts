@@ -0,0 +1,38 @@
+// C:\Development\RDAuswertung\src\app\api\export\jobs\[jobId]\download\route.ts
+
+import { NextRequest, NextResponse } from 'next/server';
+
+import { withRequestMetrics } from '@/lib/request-metrics';
+import { cachedExportResponse, getExportCache } from '@/services/export/export-cache';
+import { getExportJobQueue } from '@/services/export/export-jobs';
+
+// Route label for metrics
+const ROUTE = '/api/export/jobs/[jobId]/download';
+
+async function handleGet({ params }: { params: { jobId: string } }) {
+  const queue = getExportJobQueue();
+  const job = queue.get(params.jobId);
+  if (!job) {
+    return NextResponse.json({ error: 'Export job not found' }, { status: 404 });
+  }
+
+  if (job.status !== 'done') {
+    return NextResponse.json(
+      { error: 'Export job is not finished', status: job.status },
+      { status: 409 }
+    );
+  }
+
+  const resultKey = queue.resultKey(job.id);
+  const opened = resultKey ? await getExportCache().open(resultKey) : null;
+  if (!opened) {
+    // Evicted from the export cache; submitting the job again recreates the file
+    return NextResponse.json({ error: 'Export file has expired' }, { status: 410 });
+  }
+
+  return cachedExportResponse(opened);
+}
+
+export function GET(request: NextRequest, context: { params: { jobId: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(context));
+}
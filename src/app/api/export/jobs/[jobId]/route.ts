@@ -0,0 +1,37 @@
+// C:\Development\RDAuswertung\src\app\api\export\jobs\[jobId]\route.ts
+
+import { NextRequest, NextResponse } from 'next/server';
+
+import { createRowStream, ROW_STREAM_CONTENT_TYPES } from '@/lib/ndjson';
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
+import { getExportJobQueue } from '@/services/export/export-jobs';
+
+// Route label for metrics
+const ROUTE = '/api/export/jobs/[jobId]';
+
+async function handleGet(request: NextRequest, { params }: { params: { jobId: string } }) {
+  const queue = getExportJobQueue();
+  const job = queue.get(params.jobId);
+  if (!job) {
+    return NextResponse.json({ error: 'Export job not found' }, { status: 404 });
+  }
+
+  // ?stream=1: one NDJSON line per change until the job is done or has failed
+  if (request.nextUrl.searchParams.get('stream')) {
+    return new NextResponse(createRowStream(queue.watch(params.jobId), 'ndjson', 1), {
+      headers: {
+        'Content-Type': ROW_STREAM_CONTENT_TYPES.ndjson,
+        'Cache-Control': 'no-store',
+      },
+    });
+  }
+
+  return jsonResponse(ROUTE, job, { headers: { 'Cache-Control': 'no-store' } });
+}
+
+export function GET(request: NextRequest, context: { params: { jobId: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request, context));
+}
+
+// Job state changes with every request
+export const dynamic = 'force-dynamic';
@@ -0,0 +1,62 @@
+// C:\Development\RDAuswertung\src\app\api\export\jobs\route.ts
+
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
+import { getGebaeudeById } from '@/services/database/queries';
+import { ExportQueueFullError, getExportJobQueue } from '@/services/export/export-jobs';
+
+// Route label for metrics
+const ROUTE = '/api/export/jobs';
+
+// Request body for a new export job
+const bodySchema = z.object({
+  format: z.enum(['excel', 'pdf']),
+  gebaeude_ID: z.coerce.number().int().positive(),
+  filter: z
+    .object({
+      bereich: z.string().optional(),
+      gebaeudeteil: z.string().optional(),
+      etage: z.string().optional(),
+      reinigungsgruppe: z.string().optional(),
+    })
+    .optional(),
+});
+
+async function handlePost(request: NextRequest) {
+  try {
+    const body = await request.json().catch(() => null);
+    const validated = bodySchema.safeParse(body);
+    if (!validated.success) {
+      return NextResponse.json({ error: 'Invalid export job' }, { status: 400 });
+    }
+
+    const gebaeude = await getGebaeudeById(validated.data.gebaeude_ID);
+    if (!gebaeude) {
+      return NextResponse.json({ error: 'Gebaeude not found' }, { status: 404 });
+    }
+
+    // Identical jobs (same format, gebaeude, filters and data version) return the existing job
+    const job = await getExportJobQueue().submit(validated.data);
+
+    return jsonResponse(ROUTE, job, {
+      status: job.status === 'done' ? 200 : 202,
+      headers: { Location: `/api/export/jobs/${job.id}` },
+    });
+  } catch (error) {
+    if (error instanceof ExportQueueFullError) {
+      return NextResponse.json(
+        { error: error.message },
+        { status: 503, headers: { 'Retry-After': '30' } }
+      );
+    }
+
+    console.error('Export job error:', error);
+    return NextResponse.json({ error: 'Failed to create export job' }, { status: 500 });
+  }
+}
+
+export function POST(request: NextRequest) {
+  return withRequestMetrics(ROUTE, request, () => handlePost(request));
+}
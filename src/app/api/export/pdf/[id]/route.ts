@@ -3,13 +3,17 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
-import {
-  calculateSummary,
-  prepareDataForVisualization,
-} from '@/services/analysis/raumbuch-analysis';
-import { getRaumbuchData, getStandortById } from '@/services/database/queries';
+import { withRequestMetrics } from '@/lib/request-metrics';
+import { filterRaumbuchFrame } from '@/services/analysis/raumbuch-analysis';
+import { getStandortById } from '@/services/database/queries';
+import { getRaumbuchResult, resultForRows } from '@/services/database/raumbuch-cache';
+import { cachedExportResponse, getExportCache } from '@/services/export/export-cache';
+import { exportContentType, exportKey } from '@/services/export/export-jobs';
 import { generatePdf } from '@/services/export/pdf-export';
 
+// Route label for metrics
+const ROUTE = '/api/export/pdf/[id]';
+
 // Validate ID parameter
 const paramsSchema = z.object({
   id: z
@@ -28,7 +32,7 @@ const querySchema = z.object({
   reinigungsgruppe: z.string().optional(), // Geändert von rg zu reinigungsgruppe
 });
 
-export async function GET(request: NextRequest, { params }: { params: { id: string } }) {
+async function handleGet(request: NextRequest, { params }: { params: { id: string } }) {
   try {
     // Validate standort ID
     const validatedParams = paramsSchema.safeParse({ id: params.id });
@@ -58,29 +62,22 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
       return NextResponse.json({ error: 'Standort not found' }, { status: 404 });
     }
 
-    // Get raumbuch data with filters
-    let raumbuchData = await getRaumbuchData(standortId);
+    // Get raumbuch data (cached per Gebaeude together with its evaluation)
+    const raumbuch = await getRaumbuchResult(standortId);
 
-    // Apply filters if any are provided
-    const filters = validatedQuery.success ? validatedQuery.data : {};
-    if (filters.bereich) {
-      raumbuchData = raumbuchData.filter(item => item.Bereich === filters.bereich);
-    }
-    if (filters.gebaeudeteil) {
-      raumbuchData = raumbuchData.filter(item => item.Gebaeudeteil === filters.gebaeudeteil);
-    }
-    if (filters.etage) {
-      raumbuchData = raumbuchData.filter(item => item.Etage === filters.etage);
-    }
-    if (filters.reinigungsgruppe) {
-      raumbuchData = raumbuchData.filter(
-        item => item.Reinigungsgruppe === filters.reinigungsgruppe
-      );
+    // Serve a finished export of the same data version (e.g. from an export job)
+    const cache = getExportCache();
+    const key = exportKey('pdf', standortId, validatedQuery.data, raumbuch.version);
+    const cached = raumbuch.version ? await cache.open(key) : null;
+    if (cached) {
+      return cachedExportResponse(cached);
     }
 
-    // Calculate summary and prepare visualization data
-    const summary = calculateSummary(raumbuchData);
-    const visualizationData = prepareDataForVisualization(raumbuchData);
+    // Apply filters in a single pass over the cached columns (no row copies)
+    const raumbuchData = filterRaumbuchFrame(raumbuch.frame, validatedQuery.data);
+
+    // Calculate summary and prepare visualization data (cached unless filters narrowed the rows)
+    const { summary, visualizationData } = resultForRows(raumbuch, raumbuchData);
 
     // Generate PDF file
     const pdfBuffer = await generatePdf(raumbuchData, standort.bezeichnung, {
@@ -91,6 +88,13 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
     // Set response headers
     const filename = `Raumbuch_Auswertung_${standort.bezeichnung}_${new Date().toISOString().split('T')[0]}.pdf`;
 
+    // Keep the file for repeat downloads; a failing cache must not fail the export
+    if (raumbuch.version) {
+      await cache
+        .put(key, { filename, contentType: exportContentType('pdf') }, pdfBuffer)
+        .catch(error => console.error('PDF export cache error:', error));
+    }
+
     return new NextResponse(pdfBuffer, {
       status: 200,
       headers: {
@@ -104,3 +108,7 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
     return NextResponse.json({ error: 'Failed to generate PDF file' }, { status: 500 });
   }
 }
+
+export function GET(request: NextRequest, context: { params: { id: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request, context));
+}
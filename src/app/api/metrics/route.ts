@@ -0,0 +1,185 @@
+// C:\Development\RDAuswertung\src\app\api\metrics\route.ts
+
+import { NextRequest, NextResponse } from 'next/server';
+
+import { METRICS_CONFIG } from '@/config/app';
+import { metrics } from '@/lib/metrics';
+import { getPoolStats } from '@/services/database/client';
+import { getPortfolioCacheStats } from '@/services/database/portfolio-cache';
+import { getRaumbuchAggregateStats } from '@/services/database/raumbuch-aggregates';
+import { getRaumbuchCacheStats } from '@/services/database/raumbuch-cache';
+import { getBrowserPool } from '@/services/export/browser-pool';
+import { getExportCache } from '@/services/export/export-cache';
+import { getExportJobQueue } from '@/services/export/export-jobs';
+
+import type { MetricFamily } from '@/lib/metrics';
+import type { CacheStats } from '@/services/database/cache';
+
+/**
+ * Cache statistics as metric families, one series per cache
+ */
+function cacheFamilies(caches: Record<string, CacheStats & { inflight: number }>): MetricFamily[] {
+  const entries = Object.entries(caches);
+  const family = (
+    name: string,
+    help: string,
+    type: MetricFamily['type'],
+    value: (stats: CacheStats & { inflight: number }) => number
+  ): MetricFamily => ({
+    name,
+    help,
+    type,
+    samples: entries.map(([cache, stats]) => ({ labels: { cache }, value: value(stats) })),
+  });
+
+  return [
+    family('rd_cache_hits_total', 'Cache hits', 'counter', stats => stats.hits),
+    family('rd_cache_misses_total', 'Cache misses', 'counter', stats => stats.misses),
+    family('rd_cache_hit_ratio', 'Share of lookups served from the cache', 'gauge', stats =>
+      stats.hits + stats.misses > 0 ? stats.hits / (stats.hits + stats.misses) : 0
+    ),
+    family('rd_cache_evictions_total', 'Evicted entries', 'counter', stats => stats.evictions),
+    family('rd_cache_entries', 'Cached entries', 'gauge', stats => stats.entries),
+    family('rd_cache_bytes', 'Estimated size in bytes', 'gauge', stats => stats.bytes),
+    family('rd_cache_inflight', 'Loads currently running', 'gauge', stats => stats.inflight),
+  ];
+}
+
+/**
+ * Connection pool, prepared statements and circuit breaker as metric families
+ */
+function databaseFamilies(): MetricFamily[] {
+  const pool = getPoolStats();
+  const gauge = (name: string, help: string, value: number): MetricFamily => ({
+    name,
+    help,
+    type: 'gauge',
+    samples: [{ value }],
+  });
+  const counter = (name: string, help: string, value: number): MetricFamily => ({
+    name,
+    help,
+    type: 'counter',
+    samples: [{ value }],
+  });
+
+  return [
+    gauge('rd_db_pool_size', 'Open connections', pool.size),
+    gauge('rd_db_pool_available', 'Idle connections', pool.available),
+    gauge('rd_db_pool_borrowed', 'Connections in use', pool.borrowed),
+    gauge('rd_db_pool_pending', 'Requests waiting for a connection', pool.pending),
+    gauge('rd_db_pool_max', 'Configured maximum pool size', pool.max),
+    gauge('rd_db_prepared_statements', 'Cached prepared statements', pool.preparedStatements),
+    counter(
+      'rd_db_prepared_executions_total',
+      'Executions via a prepared statement',
+      pool.preparedExecutions
+    ),
+    counter(
+      'rd_db_prepared_fallbacks_total',
+      'Fixed queries run ad hoc because the statement was busy',
+      pool.preparedFallbacks
+    ),
+    counter('rd_db_retries_total', 'Retries of transient database errors', pool.retries),
+    gauge(
+      'rd_db_circuit_open',
+      'Circuit breaker state (0 closed, 0.5 half-open, 1 open)',
+      { closed: 0, 'half-open': 0.5, open: 1 }[pool.breaker.state]
+    ),
+    counter(
+      'rd_db_circuit_rejected_total',
+      'Calls rejected by the open circuit breaker',
+      pool.breaker.rejected
+    ),
+  ];
+}
+
+/**
+ * PDF browser pool as metric families
+ */
+function browserPoolFamilies(): MetricFamily[] {
+  const stats = getBrowserPool().stats();
+
+  return [
+    {
+      name: 'rd_pdf_pool_pages',
+      help: 'Pages of the PDF browser pool by state',
+      type: 'gauge',
+      samples: [
+        { labels: { state: 'active' }, value: stats.active },
+        { labels: { state: 'idle' }, value: stats.idle },
+        { labels: { state: 'waiting' }, value: stats.waiting },
+      ],
+    },
+    {
+      name: 'rd_pdf_renders_total',
+      help: 'PDF documents rendered',
+      type: 'counter',
+      samples: [{ value: stats.renders }],
+    },
+  ];
+}
+
+/**
+ * Background export jobs as metric families
+ */
+function exportJobFamilies(): MetricFamily[] {
+  const stats = getExportJobQueue().stats();
+
+  return [
+    {
+      name: 'rd_export_jobs',
+      help: 'Export jobs by state',
+      type: 'gauge',
+      samples: (['queued', 'running', 'done', 'failed'] as const).map(state => ({
+        labels: { state },
+        value: stats[state],
+      })),
+    },
+    {
+      name: 'rd_export_jobs_deduplicated_total',
+      help: 'Submissions answered with an identical existing job',
+      type: 'counter',
+      samples: [{ value: stats.deduplicated }],
+    },
+  ];
+}
+
+/**
+ * Stage timings, row counts, payload sizes, cache and pool statistics in the
+ * Prometheus text format
+ */
+export async function GET(request: NextRequest) {
+  if (!METRICS_CONFIG.enabled) {
+    return NextResponse.json({ error: 'Metrics are disabled' }, { status: 404 });
+  }
+
+  if (
+    METRICS_CONFIG.token &&
+    request.headers.get('authorization') !== `Bearer ${METRICS_CONFIG.token}`
+  ) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+  }
+
+  const body = metrics.render([
+    ...cacheFamilies({
+      raumbuch: getRaumbuchCacheStats(),
+      aggregates: getRaumbuchAggregateStats(),
+      portfolio: getPortfolioCacheStats(),
+      exports: { ...getExportCache().stats(), inflight: getExportJobQueue().stats().running },
+    }),
+    ...databaseFamilies(),
+    ...browserPoolFamilies(),
+    ...exportJobFamilies(),
+  ]);
+
+  return new NextResponse(body, {
+    headers: {
+      'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+      'Cache-Control': 'no-store',
+    },
+  });
+}
+
+// Mark this route as dynamic to prevent static generation errors
+export const dynamic = 'force-dynamic';
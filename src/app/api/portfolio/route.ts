@@ -0,0 +1,66 @@
+// C:\Development\RDAuswertung\src\app\api\portfolio\route.ts
+
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
+import { getPortfolio } from '@/services/database/portfolio-cache';
+
+// Route label for metrics
+const ROUTE = '/api/portfolio';
+
+// Query parameters schema: a Standort and/or a Firma
+const querySchema = z
+  .object({
+    standort_ID: z.coerce.number().int().optional(),
+    firma_ID: z.coerce.number().int().optional(),
+    stats: z.enum(['true', 'false']).optional(),
+  })
+  .refine(query => query.standort_ID !== undefined || query.firma_ID !== undefined, {
+    message: 'standort_ID or firma_ID is required',
+  });
+
+/**
+ * Sums and key figures of all Gebaeude of a Standort or Firma in one request
+ */
+async function handleGet(request: NextRequest) {
+  try {
+    const searchParams = request.nextUrl.searchParams;
+    const validatedQuery = querySchema.safeParse({
+      standort_ID: searchParams.get('standort_ID') || undefined,
+      firma_ID: searchParams.get('firma_ID') || undefined,
+      stats: searchParams.get('stats') || undefined,
+    });
+
+    if (!validatedQuery.success) {
+      return NextResponse.json(
+        { error: 'Invalid query parameters', details: validatedQuery.error.format() },
+        { status: 400 }
+      );
+    }
+
+    const { standort_ID, firma_ID, stats } = validatedQuery.data;
+    const portfolio = await getPortfolio({ standort_ID, firma_ID }, { stats: stats === 'true' });
+
+    return jsonResponse(ROUTE, {
+      data: portfolio.gebaeude,
+      standorte: portfolio.standorte,
+      totals: portfolio.totals,
+      meta: {
+        scope: portfolio.scope,
+        version: portfolio.version,
+        refreshedAt: new Date(portfolio.refreshedAt).toISOString(),
+      },
+    });
+  } catch (error) {
+    console.error('Error fetching portfolio:', error);
+    return NextResponse.json({ error: 'Failed to fetch portfolio' }, { status: 500 });
+  }
+}
+
+export function GET(request: NextRequest) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request));
+}
+
+// Mark this route as dynamic to prevent static generation errors
+export const dynamic = 'force-dynamic';
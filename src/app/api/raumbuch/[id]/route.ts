@@ -3,11 +3,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
-import {
-  calculateSummary,
-  prepareDataForVisualization,
-} from '@/services/analysis/raumbuch-analysis';
-import { getRaumbuchData } from '@/services/database/queries';
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
+import { filterRaumbuchFrame } from '@/services/analysis/raumbuch-analysis';
+import { getRaumbuchResult, resultForRows } from '@/services/database/raumbuch-cache';
+
+// Route label for metrics
+const ROUTE = '/api/raumbuch/[id]';
 
 // Validate ID parameter
 const paramsSchema = z.object({
@@ -25,9 +26,13 @@ const filterSchema = z.object({
   gebaeudeteil: z.string().optional(),
   etage: z.string().optional(),
   reinigungsgruppe: z.string().optional(),
+  bereich_ID: z.coerce.number().int().optional(),
+  gebaeudeteil_ID: z.coerce.number().int().optional(),
+  etage_ID: z.coerce.number().int().optional(),
+  reinigungsgruppe_ID: z.coerce.number().int().optional(),
 });
 
-export async function GET(request: NextRequest, { params }: { params: { id: string } }) {
+async function handleGet(request: NextRequest, { params }: { params: { id: string } }) {
   try {
     // Validate gebaeude ID
     const validatedParams = paramsSchema.safeParse({ id: params.id });
@@ -44,6 +49,10 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
       gebaeudeteil: searchParams.get('gebaeudeteil') || undefined,
       etage: searchParams.get('etage') || undefined,
       reinigungsgruppe: searchParams.get('reinigungsgruppe') || undefined,
+      bereich_ID: searchParams.get('bereich_ID') || undefined,
+      gebaeudeteil_ID: searchParams.get('gebaeudeteil_ID') || undefined,
+      etage_ID: searchParams.get('etage_ID') || undefined,
+      reinigungsgruppe_ID: searchParams.get('reinigungsgruppe_ID') || undefined,
     };
 
     // Validate filter parameters
@@ -52,50 +61,19 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
       return NextResponse.json({ error: 'Invalid filter parameters' }, { status: 400 });
     }
 
-    // Get raumbuch data
-    let raumbuchData = await getRaumbuchData(gebaeude_ID);
-
-    // Apply filters if provided
-    const filters = validatedFilters.data;
-
-    if (filters.bereich) {
-      raumbuchData = raumbuchData.filter(item => item.Bereich === filters.bereich);
-    }
-
-    if (filters.gebaeudeteil) {
-      raumbuchData = raumbuchData.filter(item => item.Gebaeudeteil === filters.gebaeudeteil);
-    }
-
-    if (filters.etage) {
-      raumbuchData = raumbuchData.filter(item => item.Etage === filters.etage);
-    }
-
-    if (filters.reinigungsgruppe) {
-      raumbuchData = raumbuchData.filter(
-        item => item.Reinigungsgruppe === filters.reinigungsgruppe
-      );
-    }
+    // Get raumbuch data (cached per Gebaeude together with its evaluation)
+    const raumbuch = await getRaumbuchResult(gebaeude_ID);
 
-    // Calculate summary data
-    const summary = calculateSummary(raumbuchData);
+    // Apply filters in a single pass over the cached columns (no row copies)
+    const frame = filterRaumbuchFrame(raumbuch.frame, validatedFilters.data);
 
-    // Prepare visualization data
-    const visualizationData = prepareDataForVisualization(raumbuchData);
+    // Summary, visualization data and filter options for the frontend
+    // (cached unless filters narrowed the rows)
+    const { summary, visualizationData, filterOptions } = resultForRows(raumbuch, frame);
 
-    // Create filter options for the frontend
-    const filterOptions = {
-      bereiche: [...new Set(raumbuchData.map(item => item.Bereich))].filter(Boolean).sort(),
-      gebaeudeteil: [...new Set(raumbuchData.map(item => item.Gebaeudeteil))]
-        .filter(Boolean)
-        .sort(),
-      etage: [...new Set(raumbuchData.map(item => item.Etage))].filter(Boolean).sort(),
-      reinigungsgruppe: [...new Set(raumbuchData.map(item => item.Reinigungsgruppe))]
-        .filter(Boolean)
-        .sort(),
-    };
-
-    return NextResponse.json({
-      data: raumbuchData,
+    // Row objects are only built here, for the rows being returned
+    return jsonResponse(ROUTE, {
+      data: frame.toRows(),
       summary,
       visualizationData,
       filterOptions,
@@ -105,3 +83,7 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
     return NextResponse.json({ error: 'Failed to fetch raumbuch data' }, { status: 500 });
   }
 }
+
+export function GET(request: NextRequest, context: { params: { id: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request, context));
+}
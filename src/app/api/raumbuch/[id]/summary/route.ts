@@ -0,0 +1,64 @@
+// C:\Development\RDAuswertung\src\app\api\raumbuch\[id]\summary\route.ts
+
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
+import { getRaumbuchAggregates } from '@/services/database/raumbuch-aggregates';
+
+// Route label for metrics
+const ROUTE = '/api/raumbuch/[id]/summary';
+
+// Validate ID parameter
+const paramsSchema = z.object({
+  id: z
+    .string()
+    .min(1)
+    .refine(val => !isNaN(Number(val)), {
+      message: 'ID must be a valid number',
+    }),
+});
+
+/**
+ * Summary and chart data of a Gebaeude from the precomputed aggregates
+ * (no Raumbuch rows are loaded)
+ */
+async function handleGet(request: NextRequest, { params }: { params: { id: string } }) {
+  try {
+    // Validate gebaeude ID
+    const validatedParams = paramsSchema.safeParse({ id: params.id });
+    if (!validatedParams.success) {
+      return NextResponse.json({ error: 'Invalid gebaeude ID' }, { status: 400 });
+    }
+
+    const gebaeude_ID = Number(params.id);
+    const aggregates = await getRaumbuchAggregates(gebaeude_ID);
+
+    // The data state identifies the aggregates, unchanged data needs no new body
+    const etag = `"${encodeURIComponent(aggregates.version)}"`;
+    if (request.headers.get('if-none-match') === etag) {
+      return new NextResponse(null, { status: 304, headers: { ETag: etag } });
+    }
+
+    return jsonResponse(
+      ROUTE,
+      {
+        summary: aggregates.summary,
+        visualizationData: aggregates.visualizationData,
+        gebaeudeteilData: aggregates.gebaeudeteilData,
+        meta: {
+          version: aggregates.version,
+          refreshedAt: new Date(aggregates.refreshedAt).toISOString(),
+        },
+      },
+      { headers: { ETag: etag } }
+    );
+  } catch (error) {
+    console.error('Error fetching raumbuch summary:', error);
+    return NextResponse.json({ error: 'Failed to fetch raumbuch summary' }, { status: 500 });
+  }
+}
+
+export function GET(request: NextRequest, context: { params: { id: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request, context));
+}
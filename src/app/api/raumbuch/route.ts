@@ -3,7 +3,28 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
-import { getRaumbuchData } from '@/services/database/queries';
+import { createRowStream, prefetchFirstRow, ROW_STREAM_CONTENT_TYPES } from '@/lib/ndjson';
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
+import {
+  isRaumbuchField,
+  parseRaumbuchCursor,
+  queryRaumbuch,
+  streamRaumbuch,
+} from '@/services/database/queries';
+
+import type { RaumbuchQueryOptions } from '@/services/database/queries';
+
+// Route label for metrics
+const ROUTE = '/api/raumbuch';
+
+// Optional numeric query parameter
+const numberParam = (name: string, min: number) =>
+  z
+    .string()
+    .optional()
+    .refine(val => !val || (Number.isInteger(Number(val)) && Number(val) >= min), {
+      message: `${name} must be an integer >= ${min}`,
+    });
 
 // Query parameters schema for raumbuch filtering
 const querySchema = z.object({
@@ -17,33 +38,33 @@ const querySchema = z.object({
   gebaeudeteil: z.string().optional(),
   etage: z.string().optional(),
   reinigungsgruppe: z.string().optional(),
-  limit: z
+  bereich_ID: numberParam('bereich_ID', 0),
+  gebaeudeteil_ID: numberParam('gebaeudeteil_ID', 0),
+  etage_ID: numberParam('etage_ID', 0),
+  reinigungsgruppe_ID: numberParam('reinigungsgruppe_ID', 0),
+  fields: z
     .string()
     .optional()
-    .refine(val => !val || !isNaN(Number(val)), {
-      message: 'limit must be a valid number',
-    }),
-  offset: z
-    .string()
-    .optional()
-    .refine(val => !val || !isNaN(Number(val)), {
-      message: 'offset must be a valid number',
+    .refine(val => !val || val.split(',').every(isRaumbuchField), {
+      message: 'fields must be a comma-separated list of Raumbuch columns',
     }),
+  orderBy: z.enum(['ID', 'LfdNr']).optional(),
+  after: z.string().optional(),
+  limit: numberParam('limit', 1),
+  offset: numberParam('offset', 0),
+  // Stream rows as NDJSON or as a chunked JSON array instead of { data, meta }
+  stream: z.enum(['ndjson', 'json']).optional(),
 });
 
-export async function GET(request: NextRequest) {
+const optionalNumber = (val: string | undefined) => (val ? Number(val) : undefined);
+
+async function handleGet(request: NextRequest) {
   try {
     // Parse and validate query parameters
     const searchParams = request.nextUrl.searchParams;
-    const queryParams = {
-      gebaeude_ID: searchParams.get('gebaeude_ID') || undefined, // Changed from objekt_ID
-      bereich: searchParams.get('bereich') || undefined,
-      gebaeudeteil: searchParams.get('gebaeudeteil') || undefined,
-      etage: searchParams.get('etage') || undefined,
-      reinigungsgruppe: searchParams.get('reinigungsgruppe') || undefined,
-      limit: searchParams.get('limit') || undefined,
-      offset: searchParams.get('offset') || undefined,
-    };
+    const queryParams = Object.fromEntries(
+      Object.keys(querySchema.shape).map(key => [key, searchParams.get(key) || undefined])
+    );
 
     const validatedQuery = querySchema.safeParse(queryParams);
 
@@ -54,51 +75,60 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const { gebaeude_ID, bereich, gebaeudeteil, etage, reinigungsgruppe, limit, offset } =
+    const { gebaeude_ID, fields, orderBy, after, limit, offset, stream, ...filter } =
       validatedQuery.data;
 
-    // If no gebaeude_ID provided, use default (-1)
-    const requestedGebaeudeId = gebaeude_ID ? Number(gebaeude_ID) : -1;
-
-    // Get raumbuch data
-    let raumbuchData = await getRaumbuchData(requestedGebaeudeId);
-
-    // Apply filters if provided
-    if (bereich) {
-      raumbuchData = raumbuchData.filter(item => item.Bereich === bereich);
+    if (after && !parseRaumbuchCursor(after, orderBy)) {
+      return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
     }
 
-    if (gebaeudeteil) {
-      raumbuchData = raumbuchData.filter(item => item.Gebaeudeteil === gebaeudeteil);
-    }
+    // If no gebaeude_ID provided, use default (-1)
+    const requestedGebaeudeId = gebaeude_ID ? Number(gebaeude_ID) : -1;
 
-    if (etage) {
-      raumbuchData = raumbuchData.filter(item => item.Etage === etage);
-    }
+    // Filters, column selection and pagination run in SQL; offset only applies with a limit
+    const limitNum = optionalNumber(limit);
+    const offsetNum = limitNum !== undefined ? optionalNumber(offset) : undefined;
+    const options: RaumbuchQueryOptions = {
+      gebaeude_ID: requestedGebaeudeId,
+      filter: {
+        bereich: filter.bereich,
+        gebaeudeteil: filter.gebaeudeteil,
+        etage: filter.etage,
+        reinigungsgruppe: filter.reinigungsgruppe,
+        bereich_ID: optionalNumber(filter.bereich_ID),
+        gebaeudeteil_ID: optionalNumber(filter.gebaeudeteil_ID),
+        etage_ID: optionalNumber(filter.etage_ID),
+        reinigungsgruppe_ID: optionalNumber(filter.reinigungsgruppe_ID),
+      },
+      fields: fields ? fields.split(',').filter(isRaumbuchField) : undefined,
+      orderBy,
+      after,
+      limit: limitNum,
+      offset: offsetNum,
+    };
 
-    if (reinigungsgruppe) {
-      raumbuchData = raumbuchData.filter(item => item.Reinigungsgruppe === reinigungsgruppe);
+    // Streaming: rows are mapped and sent one by one while the query is still running
+    if (stream) {
+      const rows = await prefetchFirstRow(streamRaumbuch(options));
+      return new NextResponse(createRowStream(rows, stream), {
+        headers: {
+          'Content-Type': ROW_STREAM_CONTENT_TYPES[stream],
+          'Cache-Control': 'no-store',
+        },
+      });
     }
 
-    // Calculate total count before pagination
-    const totalCount = raumbuchData.length;
-
-    // Apply pagination if limit is provided
-    if (limit) {
-      const limitNum = Number(limit);
-      const offsetNum = offset ? Number(offset) : 0;
-
-      raumbuchData = raumbuchData.slice(offsetNum, offsetNum + limitNum);
-    }
+    const page = await queryRaumbuch(options);
 
     // Return the filtered and paginated data
-    return NextResponse.json({
-      data: raumbuchData,
+    return jsonResponse(ROUTE, {
+      data: page.data,
       meta: {
-        totalCount,
-        filteredCount: raumbuchData.length,
-        limit: limit ? Number(limit) : null,
-        offset: offset ? Number(offset) : 0,
+        totalCount: page.totalCount,
+        filteredCount: page.data.length,
+        limit: limitNum ?? null,
+        offset: offsetNum ?? 0,
+        nextCursor: page.nextCursor,
       },
     });
   } catch (error) {
@@ -107,5 +137,9 @@ export async function GET(request: NextRequest) {
   }
 }
 
+export function GET(request: NextRequest) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request));
+}
+
 // Mark this route as dynamic to prevent static generation errors
 export const dynamic = 'force-dynamic';
@@ -3,8 +3,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
+import { withRequestMetrics } from '@/lib/request-metrics';
 import { getStandortById } from '@/services/database/queries';
 
+// Route label for metrics
+const ROUTE = '/api/standorte/[id]';
+
 // Validate ID parameter
 const paramsSchema = z.object({
   id: z
@@ -15,7 +19,7 @@ const paramsSchema = z.object({
     }),
 });
 
-export async function GET(_request: NextRequest, { params }: { params: { id: string } }) {
+async function handleGet(_request: NextRequest, { params }: { params: { id: string } }) {
   try {
     // Validate standort ID
     const validatedParams = paramsSchema.safeParse({ id: params.id });
@@ -38,3 +42,7 @@ export async function GET(_request: NextRequest, { params }: { params: { id: str
     return NextResponse.json({ error: 'Failed to fetch standort' }, { status: 500 });
   }
 }
+
+export function GET(request: NextRequest, context: { params: { id: string } }) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request, context));
+}
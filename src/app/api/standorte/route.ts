@@ -3,8 +3,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
+import { jsonResponse, withRequestMetrics } from '@/lib/request-metrics';
 import { getStandorte } from '@/services/database/queries';
 
+// Route label for metrics
+const ROUTE = '/api/standorte';
+
 // Query parameters schema
 const querySchema = z.object({
   search: z.string().optional(),
@@ -24,7 +28,7 @@ const querySchema = z.object({
     }),
 });
 
-export async function GET(request: NextRequest) {
+async function handleGet(request: NextRequest) {
   try {
     // Parse and validate query parameters
     const searchParams = request.nextUrl.searchParams;
@@ -83,7 +87,7 @@ export async function GET(request: NextRequest) {
     }
 
     // Return the filtered, sorted, and paginated data
-    return NextResponse.json({
+    return jsonResponse(ROUTE, {
       data: standorte,
       meta: {
         totalCount,
@@ -98,5 +102,9 @@ export async function GET(request: NextRequest) {
   }
 }
 
+export function GET(request: NextRequest) {
+  return withRequestMetrics(ROUTE, request, () => handleGet(request));
+}
+
 // Mark this route as dynamic to prevent static generation errors
 export const dynamic = 'force-dynamic';
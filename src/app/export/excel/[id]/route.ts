@@ -3,8 +3,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
-import { calculateSummary } from '@/services/analysis/raumbuch-analysis';
-import { getGebaeudeById, getRaumbuchData } from '@/services/database/queries';
+import { filterRaumbuchFrame } from '@/services/analysis/raumbuch-analysis';
+import { getGebaeudeById } from '@/services/database/queries';
+import { getRaumbuchResult, resultForRows } from '@/services/database/raumbuch-cache';
 import { generateExcel } from '@/services/export/excel-export';
 
 // Validate ID parameter
@@ -56,32 +57,14 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
       return NextResponse.json({ error: 'Invalid filter parameters' }, { status: 400 });
     }
 
-    // Get raumbuch data
-    let raumbuchData = await getRaumbuchData(gebaeude_ID);
+    // Get raumbuch data (cached per Gebaeude together with its evaluation)
+    const raumbuch = await getRaumbuchResult(gebaeude_ID);
 
-    // Apply filters if provided
-    const filters = validatedFilters.data;
+    // Apply filters in a single pass over the cached columns (no row copies)
+    const raumbuchData = filterRaumbuchFrame(raumbuch.frame, validatedFilters.data);
 
-    if (filters.bereich) {
-      raumbuchData = raumbuchData.filter(item => item.Bereich === filters.bereich);
-    }
-
-    if (filters.gebaeudeteil) {
-      raumbuchData = raumbuchData.filter(item => item.Gebaeudeteil === filters.gebaeudeteil);
-    }
-
-    if (filters.etage) {
-      raumbuchData = raumbuchData.filter(item => item.Etage === filters.etage);
-    }
-
-    if (filters.reinigungsgruppe) {
-      raumbuchData = raumbuchData.filter(
-        item => item.Reinigungsgruppe === filters.reinigungsgruppe
-      );
-    }
-
-    // Calculate summary data
-    const summary = calculateSummary(raumbuchData);
+    // Calculate summary data (cached unless filters narrowed the rows)
+    const { summary } = resultForRows(raumbuch, raumbuchData);
 
     // Generate Excel
     const excelBuffer = await generateExcel(raumbuchData, gebaeude.bezeichnung, summary);
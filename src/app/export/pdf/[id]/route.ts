@@ -3,11 +3,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { z } from 'zod';
 
-import {
-  calculateSummary,
-  prepareDataForVisualization,
-} from '@/services/analysis/raumbuch-analysis';
-import { getGebaeudeById, getRaumbuchData } from '@/services/database/queries';
+import { filterRaumbuchFrame } from '@/services/analysis/raumbuch-analysis';
+import { getGebaeudeById } from '@/services/database/queries';
+import { getRaumbuchResult, resultForRows } from '@/services/database/raumbuch-cache';
 import { generatePdf } from '@/services/export/pdf-export';
 
 // Validate ID parameter
@@ -59,35 +57,14 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
       return NextResponse.json({ error: 'Invalid filter parameters' }, { status: 400 });
     }
 
-    // Get raumbuch data
-    let raumbuchData = await getRaumbuchData(gebaeude_ID);
+    // Get raumbuch data (cached per Gebaeude together with its evaluation)
+    const raumbuch = await getRaumbuchResult(gebaeude_ID);
 
-    // Apply filters if provided
-    const filters = validatedFilters.data;
+    // Apply filters in a single pass over the cached columns (no row copies)
+    const raumbuchData = filterRaumbuchFrame(raumbuch.frame, validatedFilters.data);
 
-    if (filters.bereich) {
-      raumbuchData = raumbuchData.filter(item => item.Bereich === filters.bereich);
-    }
-
-    if (filters.gebaeudeteil) {
-      raumbuchData = raumbuchData.filter(item => item.Gebaeudeteil === filters.gebaeudeteil);
-    }
-
-    if (filters.etage) {
-      raumbuchData = raumbuchData.filter(item => item.Etage === filters.etage);
-    }
-
-    if (filters.reinigungsgruppe) {
-      raumbuchData = raumbuchData.filter(
-        item => item.Reinigungsgruppe === filters.reinigungsgruppe
-      );
-    }
-
-    // Calculate summary data
-    const summary = calculateSummary(raumbuchData);
-
-    // Prepare visualization data
-    const visualizationData = prepareDataForVisualization(raumbuchData);
+    // Calculate summary and visualization data (cached unless filters narrowed the rows)
+    const { summary, visualizationData } = resultForRows(raumbuch, raumbuchData);
 
     // Generate PDF
     const pdfBuffer = await generatePdf(raumbuchData, gebaeude.bezeichnung, {
@@ -1,18 +1,9 @@
 'use client';
 
 import { motion } from 'framer-motion';
-import {
-  ArrowDownToLine,
-  ChevronLeft,
-  ChevronRight,
-  ChevronsLeft,
-  ChevronsRight,
-  FileSpreadsheet,
-  FileText,
-  RefreshCw,
-} from 'lucide-react';
+import { ArrowDownToLine, FileSpreadsheet, FileText, RefreshCw } from 'lucide-react';
 import { useRouter } from 'next/navigation';
-import { useEffect, useMemo, useState } from 'react';
+import { useState } from 'react';
 
 import StandortSelect from '@/components/forms/standort-select';
 import FilterBar from '@/components/raumbuch/filter-bar';
@@ -30,44 +21,25 @@ interface StandortPageProps {
   };
 }
 
-const ITEMS_PER_PAGE = 20;
-const VISIBLE_PAGE_BUTTONS = 5;
-
 export default function StandortPage({ params }: StandortPageProps) {
   const standortId = Number.parseInt(params.id);
   const router = useRouter();
   const { standorte, isLoading: standorteLoading, error: standorteError } = useStandorte();
   const [selectedStandortId, setSelectedStandortId] = useState<number>(standortId);
-  const [currentPage, setCurrentPage] = useState<number>(1);
 
   // Get filter state from hook
   const { filters, setFilter, resetFilters, filterQueryString } = useFilter();
 
-  // Fetch raumbuch data with filters
+  // Fetch raumbuch data once (streamed, so the table fills while the query runs);
+  // filters are applied in the browser via the facet index
   const {
     data: raumbuchData,
     summary,
     filterOptions,
+    facetCounts,
     isLoading,
     error,
-  } = useRaumbuchData(standortId, filterQueryString);
-
-  // Pagination logic
-  const { paginatedData, totalPages } = useMemo(() => {
-    if (!raumbuchData) return { paginatedData: [], totalPages: 0 };
-
-    const startIndex = (currentPage - 1) * ITEMS_PER_PAGE;
-    const endIndex = startIndex + ITEMS_PER_PAGE;
-    const paginatedData = raumbuchData.slice(startIndex, endIndex);
-    const totalPages = Math.ceil(raumbuchData.length / ITEMS_PER_PAGE);
-
-    return { paginatedData, totalPages };
-  }, [raumbuchData, currentPage]);
-
-  // Reset page when filters change
-  useEffect(() => {
-    setCurrentPage(1);
-  }, [filterQueryString]);
+  } = useRaumbuchData(standortId, filterQueryString, { stream: true, clientFilter: true });
 
   // Selected standort info
   const selectedStandort = standorte?.find(s => s.id === standortId);
@@ -89,57 +61,6 @@ export default function StandortPage({ params }: StandortPageProps) {
     window.open(exportUrl, '_blank');
   };
 
-  // Handle page changes
-  const handlePageChange = (page: number) => {
-    setCurrentPage(page);
-    window.scrollTo({ top: 0, behavior: 'smooth' });
-  };
-
-  // Generate visible page numbers with ellipsis logic
-  const visiblePageNumbers = useMemo(() => {
-    if (totalPages <= VISIBLE_PAGE_BUTTONS) {
-      return Array.from({ length: totalPages }, (_, i) => i + 1);
-    }
-
-    const pages: (number | string)[] = [];
-    const showLeftEllipsis = currentPage > Math.ceil(VISIBLE_PAGE_BUTTONS / 2);
-    const showRightEllipsis = currentPage < totalPages - Math.floor(VISIBLE_PAGE_BUTTONS / 2);
-
-    // Always show first page
-    pages.push(1);
-
-    // Show left ellipsis if needed
-    if (showLeftEllipsis) {
-      pages.push('...');
-    }
-
-    // Calculate range for middle pages
-    let startPage = Math.max(2, currentPage - Math.floor(VISIBLE_PAGE_BUTTONS / 2));
-    const endPage = Math.min(totalPages - 1, startPage + VISIBLE_PAGE_BUTTONS - 3);
-
-    // Adjust if we're near the end
-    if (endPage === totalPages - 1 && !showRightEllipsis) {
-      startPage = Math.max(2, endPage - VISIBLE_PAGE_BUTTONS + 3);
-    }
-
-    // Add middle pages
-    for (let i = startPage; i <= endPage; i++) {
-      pages.push(i);
-    }
-
-    // Show right ellipsis if needed
-    if (showRightEllipsis) {
-      pages.push('...');
-    }
-
-    // Always show last page
-    if (totalPages > 1) {
-      pages.push(totalPages);
-    }
-
-    return pages;
-  }, [currentPage, totalPages]);
-
   // Animation variants
   const containerVariants = {
     hidden: { opacity: 0 },
@@ -224,16 +145,15 @@ export default function StandortPage({ params }: StandortPageProps) {
           <motion.div variants={itemVariants}>
             <FilterBar
               filterOptions={filterOptions}
+              facetCounts={facetCounts}
               initialFilters={filters}
               onSubmit={newFilters => {
                 Object.entries(newFilters).forEach(([key, value]) => {
                   setFilter(key as any, value as string);
                 });
               }}
-              onReset={() => {
-                resetFilters();
-                setCurrentPage(1);
-              }}
+              onChange={setFilter}
+              onReset={resetFilters}
             />
           </motion.div>
 
@@ -293,125 +213,8 @@ export default function StandortPage({ params }: StandortPageProps) {
                 </button>
               </div>
               <div className="p-6">
-                <RaumbuchTable data={paginatedData} summary={summary} />
+                <RaumbuchTable data={raumbuchData} summary={summary} virtualized />
               </div>
-
-              {/* Enhanced Pagination */}
-              {totalPages > 1 && (
-                <div className="border-t border-gray-100 px-6 py-4">
-                  <div className="flex flex-col sm:flex-row items-center justify-between gap-4">
-                    {/* Items info */}
-                    <div className="text-sm text-gray-500">
-                      Zeige{' '}
-                      <span className="font-medium">{(currentPage - 1) * ITEMS_PER_PAGE + 1}</span>{' '}
-                      bis{' '}
-                      <span className="font-medium">
-                        {Math.min(currentPage * ITEMS_PER_PAGE, raumbuchData.length)}
-                      </span>{' '}
-                      von <span className="font-medium">{raumbuchData.length}</span> Einträgen
-                    </div>
-
-                    {/* Pagination controls */}
-                    <div className="flex items-center space-x-2">
-                      {/* First page */}
-                      <button
-                        onClick={() => handlePageChange(1)}
-                        disabled={currentPage === 1}
-                        className={`p-2 rounded-md ${
-                          currentPage === 1
-                            ? 'text-gray-300 cursor-not-allowed'
-                            : 'text-gray-700 hover:bg-gray-100'
-                        }`}
-                        title="Erste Seite"
-                      >
-                        <ChevronsLeft className="h-4 w-4" />
-                      </button>
-
-                      {/* Previous page */}
-                      <button
-                        onClick={() => handlePageChange(currentPage - 1)}
-                        disabled={currentPage === 1}
-                        className={`p-2 rounded-md ${
-                          currentPage === 1
-                            ? 'text-gray-300 cursor-not-allowed'
-                            : 'text-gray-700 hover:bg-gray-100'
-                        }`}
-                        title="Vorherige Seite"
-                      >
-                        <ChevronLeft className="h-4 w-4" />
-                      </button>
-
-                      {/* Page numbers */}
-                      <div className="flex items-center space-x-1">
-                        {visiblePageNumbers.map((number, index) => (
-                          <div key={index}>
-                            {number === '...' ? (
-                              <span className="px-3 py-1 text-gray-500">...</span>
-                            ) : (
-                              <button
-                                onClick={() => handlePageChange(number as number)}
-                                className={`px-3 py-1 text-sm rounded-md border transition-colors ${
-                                  currentPage === number
-                                    ? 'border-accent bg-accent text-white'
-                                    : 'border-gray-300 text-gray-700 hover:bg-gray-50'
-                                }`}
-                              >
-                                {number}
-                              </button>
-                            )}
-                          </div>
-                        ))}
-                      </div>
-
-                      {/* Next page */}
-                      <button
-                        onClick={() => handlePageChange(currentPage + 1)}
-                        disabled={currentPage === totalPages}
-                        className={`p-2 rounded-md ${
-                          currentPage === totalPages
-                            ? 'text-gray-300 cursor-not-allowed'
-                            : 'text-gray-700 hover:bg-gray-100'
-                        }`}
-                        title="Nächste Seite"
-                      >
-                        <ChevronRight className="h-4 w-4" />
-                      </button>
-
-                      {/* Last page */}
-                      <button
-                        onClick={() => handlePageChange(totalPages)}
-                        disabled={currentPage === totalPages}
-                        className={`p-2 rounded-md ${
-                          currentPage === totalPages
-                            ? 'text-gray-300 cursor-not-allowed'
-                            : 'text-gray-700 hover:bg-gray-100'
-                        }`}
-                        title="Letzte Seite"
-                      >
-                        <ChevronsRight className="h-4 w-4" />
-                      </button>
-                    </div>
-
-                    {/* Page size selector (optional) */}
-                    <div className="hidden sm:block">
-                      <select
-                        value={ITEMS_PER_PAGE}
-                        onChange={e => {
-                          // Handle page size change if needed
-                          const newPageSize = parseInt(e.target.value);
-                          // You would need to implement this logic
-                        }}
-                        className="text-sm border border-gray-300 rounded-md px-2 py-1 text-gray-700 focus:outline-none focus:ring-2 focus:ring-accent focus:border-accent"
-                      >
-                        <option value="10">10 pro Seite</option>
-                        <option value="20">20 pro Seite</option>
-                        <option value="50">50 pro Seite</option>
-                        <option value="100">100 pro Seite</option>
-                      </select>
-                    </div>
-                  </div>
-                </div>
-              )}
             </div>
           </motion.div>
         </>
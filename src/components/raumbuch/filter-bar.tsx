@@ -6,6 +6,8 @@ import Button from '@/components/ui/button';
 import Select from '@/components/ui/select';
 import { RaumbuchFilter } from '@/types/raumbuch.types';
 
+import type { FacetCounts } from '@/services/analysis/facet-index';
+
 // Define FilterOptions type locally
 export interface FilterOptions {
   bereiche?: string[];
@@ -22,14 +24,25 @@ interface FilterFormProps {
   initialFilters?: Filters;
   onSubmit: (filters: Filters) => void;
   onReset?: () => void;
+  /** Wird bei jeder Auswahl aufgerufen (Filter sofort anwenden, z.B. bei clientFilter) */
+  onChange?: (name: keyof Filters, value: string) => void;
+  /** Anzahl der Einträge je Wert, wird hinter der Option angezeigt */
+  facetCounts?: FacetCounts | null;
   className?: string;
 }
 
+// Option mit Anzahl der Einträge, falls bekannt
+function optionLabel(value: string, counts?: Record<string, number>) {
+  return counts ? `${value} (${counts[value] ?? 0})` : value;
+}
+
 export default function FilterForm({
   filterOptions,
   initialFilters = {},
   onSubmit,
   onReset,
+  onChange,
+  facetCounts,
   className = '',
 }: FilterFormProps) {
   const [filters, setFilters] = useState<Filters>(initialFilters);
@@ -40,6 +53,9 @@ export default function FilterForm({
       ...prev,
       [name]: value,
     }));
+    if (onChange) {
+      onChange(name, value);
+    }
   };
 
   // Handle form submission
@@ -72,7 +88,7 @@ export default function FilterForm({
             <option value="">Alle Bereiche</option>
             {filterOptions.bereiche?.map(bereich => (
               <option key={bereich} value={bereich}>
-                {bereich}
+                {optionLabel(bereich, facetCounts?.bereich)}
               </option>
             ))}
           </Select>
@@ -89,7 +105,7 @@ export default function FilterForm({
             <option value="">Alle Gebäudeteile</option>
             {filterOptions.gebaeudeteil?.map(gebaeudeteil => (
               <option key={gebaeudeteil} value={gebaeudeteil}>
-                {gebaeudeteil}
+                {optionLabel(gebaeudeteil, facetCounts?.gebaeudeteil)}
               </option>
             ))}
           </Select>
@@ -106,7 +122,7 @@ export default function FilterForm({
             <option value="">Alle Etagen</option>
             {filterOptions.etage?.map(etage => (
               <option key={etage} value={etage}>
-                {etage}
+                {optionLabel(etage, facetCounts?.etage)}
               </option>
             ))}
           </Select>
@@ -126,7 +142,7 @@ export default function FilterForm({
                 gruppe // Geändert von rg zu reinigungsgruppe
               ) => (
                 <option key={gruppe} value={gruppe}>
-                  {gruppe}
+                  {optionLabel(gruppe, facetCounts?.reinigungsgruppe)}
                 </option>
               )
             )}
@@ -4,6 +4,9 @@ import React, { useCallback, useMemo, useState } from 'react';
 
 import Input from '@/components/ui/input';
 import Table from '@/components/ui/table';
+import { useVirtualRows } from '@/hooks/use-virtual-rows';
+import { SortIndex } from '@/lib/sort-index';
+import { aggregateRaumbuch, summaryFromAggregates } from '@/services/analysis/columnar-aggregation';
 
 import type { RaumbuchRow, RaumbuchSummary } from '@/types/raumbuch.types';
 
@@ -14,6 +17,14 @@ interface RaumbuchTableProps {
   data: RaumbuchEntry[];
   summary: RaumbuchSummary;
   className?: string;
+  /** Nur die sichtbaren Zeilen (plus overscan) rendern, für große Gebäude */
+  virtualized?: boolean;
+  /** Höhe des scrollbaren Bereichs in px (nur virtualized) */
+  height?: number;
+  /** Feste Zeilenhöhe in px (nur virtualized) */
+  rowHeight?: number;
+  /** Zusätzlich gerenderte Zeilen ober- und unterhalb (nur virtualized) */
+  overscan?: number;
 }
 
 // Define a stricter type for sort configuration
@@ -22,20 +33,157 @@ interface SortConfig {
   direction: 'asc' | 'desc';
 }
 
-export default function RaumbuchTable({ data, summary, className = '' }: RaumbuchTableProps) {
+// Row height of the default (non-compact) table: py-3 + text-sm line + divider
+const DEFAULT_ROW_HEIGHT = 45;
+
+// Fields searched by the search input
+const SEARCH_FIELDS = [
+  'Raumnummer',
+  'Bereich',
+  'Gebaeudeteil',
+  'Etage',
+  'Bezeichnung',
+  'Reinigungsgruppe',
+] as const;
+
+// Format a number to fixed decimal places
+const formatNumber = (value: number | null | undefined, decimals = 2) => {
+  if (value === null || value === undefined) return '';
+  // Make sure value is a number
+  const numValue = typeof value === 'number' ? value : parseFloat(String(value));
+  // Check if conversion was successful
+  if (isNaN(numValue)) return '';
+  return numValue.toFixed(decimals);
+};
+
+// Define columns for the table (module level, so they are created only once)
+const columns = [
+  {
+    header: 'Raumnr.',
+    accessor: 'Raumnummer' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Raumnummer || '',
+  },
+  {
+    header: 'Bereich',
+    accessor: 'Bereich' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Bereich || '',
+  },
+  {
+    header: 'Gebäudeteil',
+    accessor: 'Gebaeudeteil' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Gebaeudeteil || '',
+  },
+  {
+    header: 'Etage',
+    accessor: 'Etage' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Etage || '',
+  },
+  {
+    header: 'Bezeichnung',
+    accessor: 'Bezeichnung' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Bezeichnung || '',
+  },
+  {
+    header: 'RG',
+    accessor: 'Reinigungsgruppe' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Reinigungsgruppe || '',
+  },
+  {
+    header: 'Menge',
+    accessor: 'Menge' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.Menge),
+    className: 'text-right',
+  },
+  {
+    header: 'Einheit',
+    accessor: 'Einheit' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Einheit || '',
+  },
+  {
+    header: 'Anz.',
+    accessor: 'Anzahl' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Anzahl || '',
+    className: 'text-right',
+  },
+  {
+    header: 'Intervall',
+    accessor: 'Reinigungsintervall' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => row.Reinigungsintervall || '',
+  },
+  {
+    header: 'Rg/Jahr',
+    accessor: 'ReinigungstageJahr' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.ReinigungstageJahr),
+    className: 'text-right',
+  },
+  {
+    header: 'Rg/Monat',
+    accessor: 'ReinigungstageMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.ReinigungstageMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'Menge/Monat',
+    accessor: 'MengeAktivMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.MengeAktivMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'VK Netto',
+    accessor: 'VkWertNettoMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.VkWertNettoMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'VK Brutto',
+    accessor: 'VkWertBruttoMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.VkWertBruttoMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'RG Netto',
+    accessor: 'RgWertNettoMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.RgWertNettoMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'RG Brutto',
+    accessor: 'RgWertBruttoMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.RgWertBruttoMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'h/Tag',
+    accessor: 'StundeTag' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.StundeTag, 3),
+    className: 'text-right',
+  },
+  {
+    header: 'h/Monat',
+    accessor: 'StundeMonat' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.StundeMonat),
+    className: 'text-right',
+  },
+  {
+    header: 'Leistung/h',
+    accessor: 'LeistungStunde' as keyof RaumbuchEntry,
+    cell: (row: RaumbuchEntry) => formatNumber(row.LeistungStunde),
+    className: 'text-right',
+  },
+];
+
+export default function RaumbuchTable({
+  data,
+  summary,
+  className = '',
+  virtualized = false,
+  height = 600,
+  rowHeight = DEFAULT_ROW_HEIGHT,
+  overscan = 10,
+}: RaumbuchTableProps) {
   const [searchTerm, setSearchTerm] = useState('');
   const [sortConfig, setSortConfig] = useState<SortConfig | null>(null);
 
-  // Format a number to fixed decimal places
-  const formatNumber = (value: number | null | undefined, decimals = 2) => {
-    if (value === null || value === undefined) return '';
-    // Make sure value is a number
-    const numValue = typeof value === 'number' ? value : parseFloat(String(value));
-    // Check if conversion was successful
-    if (isNaN(numValue)) return '';
-    return numValue.toFixed(decimals);
-  };
-
   // Handle search input change - make serializable with useCallback
   const handleSearchChange = useCallback((e: React.ChangeEvent<HTMLInputElement>) => {
     setSearchTerm(e.target.value);
@@ -46,7 +194,7 @@ export default function RaumbuchTable({ data, summary, className = '' }: Raumbuc
   const handleSort = useCallback(
     (key: string | number | symbol) => {
       // Only proceed if the key is a valid key of RaumbuchEntry
-      if (typeof key === 'string' && key in data[0]) {
+      if (typeof key === 'string' && data.length > 0 && key in data[0]) {
         let direction: 'asc' | 'desc' = 'asc';
 
         if (sortConfig && sortConfig.key === key && sortConfig.direction === 'asc') {
@@ -59,203 +207,60 @@ export default function RaumbuchTable({ data, summary, className = '' }: Raumbuc
     [sortConfig, data]
   );
 
-  // Filter and sort data
-  const filteredAndSortedData = useMemo(() => {
-    // First apply search filter
-    let filteredData = data;
-
-    if (searchTerm.trim() !== '') {
-      const lowercasedFilter = searchTerm.toLowerCase();
-
-      filteredData = data.filter(item => {
-        return (
-          item.Raumnummer?.toLowerCase().includes(lowercasedFilter) ||
-          false ||
-          item.Bereich?.toLowerCase().includes(lowercasedFilter) ||
-          false ||
-          item.Gebaeudeteil?.toLowerCase().includes(lowercasedFilter) ||
-          false ||
-          item.Etage?.toLowerCase().includes(lowercasedFilter) ||
-          false ||
-          item.Bezeichnung?.toLowerCase().includes(lowercasedFilter) ||
-          false ||
-          item.Reinigungsgruppe?.toLowerCase().includes(lowercasedFilter) ||
-          false
-        );
-      });
-    }
-
-    // Then apply sorting if needed
-    if (sortConfig !== null) {
-      filteredData = [...filteredData].sort((a, b) => {
-        const aValue = a[sortConfig.key];
-        const bValue = b[sortConfig.key];
+  // Sort orders per column, computed on first use and kept while data is unchanged
+  const sortIndex = useMemo(() => new SortIndex(data), [data]);
 
-        // Handle null or undefined values in sorting
-        if (aValue === null || aValue === undefined) return sortConfig.direction === 'asc' ? -1 : 1;
-        if (bValue === null || bValue === undefined) return sortConfig.direction === 'asc' ? 1 : -1;
+  // Rows matching the search term (null = no search)
+  const matches = useMemo(() => {
+    if (searchTerm.trim() === '') return null;
 
-        // Sort based on value type
-        if (typeof aValue === 'number' && typeof bValue === 'number') {
-          return sortConfig.direction === 'asc' ? aValue - bValue : bValue - aValue;
-        }
+    const lowercasedFilter = searchTerm.toLowerCase();
+    return Uint8Array.from(data, item =>
+      SEARCH_FIELDS.some(field => item[field]?.toLowerCase().includes(lowercasedFilter)) ? 1 : 0
+    );
+  }, [data, searchTerm]);
 
-        // Convert to string for comparison
-        const aString = String(aValue).toLowerCase();
-        const bString = String(bValue).toLowerCase();
-
-        return sortConfig.direction === 'asc'
-          ? aString.localeCompare(bString)
-          : bString.localeCompare(aString);
-      });
+  // Filter and sort data: walk the memoized sort order and keep matching rows
+  const filteredAndSortedData = useMemo(() => {
+    if (sortConfig === null) {
+      return matches ? data.filter((_, index) => matches[index]) : data;
     }
 
-    return filteredData;
-  }, [data, searchTerm, sortConfig]);
+    const order = sortIndex.order(sortConfig.key, sortConfig.direction);
+    const rows: RaumbuchEntry[] = [];
+    order.forEach(index => {
+      if (!matches || matches[index]) rows.push(data[index]);
+    });
+    return rows;
+  }, [data, matches, sortConfig, sortIndex]);
 
-  // Define columns for the table
-  const columns = [
-    {
-      header: 'Raumnr.',
-      accessor: 'Raumnummer' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Raumnummer || '',
-    },
-    {
-      header: 'Bereich',
-      accessor: 'Bereich' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Bereich || '',
-    },
-    {
-      header: 'Gebäudeteil',
-      accessor: 'Gebaeudeteil' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Gebaeudeteil || '',
-    },
-    {
-      header: 'Etage',
-      accessor: 'Etage' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Etage || '',
-    },
-    {
-      header: 'Bezeichnung',
-      accessor: 'Bezeichnung' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Bezeichnung || '',
-    },
-    {
-      header: 'RG',
-      accessor: 'Reinigungsgruppe' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Reinigungsgruppe || '',
-    },
-    {
-      header: 'Menge',
-      accessor: 'Menge' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.Menge),
-      className: 'text-right',
-    },
-    {
-      header: 'Einheit',
-      accessor: 'Einheit' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Einheit || '',
-    },
-    {
-      header: 'Anz.',
-      accessor: 'Anzahl' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Anzahl || '',
-      className: 'text-right',
-    },
-    {
-      header: 'Intervall',
-      accessor: 'Reinigungsintervall' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => row.Reinigungsintervall || '',
-    },
-    {
-      header: 'Rg/Jahr',
-      accessor: 'ReinigungstageJahr' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.ReinigungstageJahr),
-      className: 'text-right',
-    },
-    {
-      header: 'Rg/Monat',
-      accessor: 'ReinigungstageMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.ReinigungstageMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'Menge/Monat',
-      accessor: 'MengeAktivMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.MengeAktivMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'VK Netto',
-      accessor: 'VkWertNettoMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.VkWertNettoMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'VK Brutto',
-      accessor: 'VkWertBruttoMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.VkWertBruttoMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'RG Netto',
-      accessor: 'RgWertNettoMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.RgWertNettoMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'RG Brutto',
-      accessor: 'RgWertBruttoMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.RgWertBruttoMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'h/Tag',
-      accessor: 'StundeTag' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.StundeTag, 3),
-      className: 'text-right',
-    },
-    {
-      header: 'h/Monat',
-      accessor: 'StundeMonat' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.StundeMonat),
-      className: 'text-right',
-    },
-    {
-      header: 'Leistung/h',
-      accessor: 'LeistungStunde' as keyof RaumbuchEntry,
-      cell: (row: RaumbuchEntry) => formatNumber(row.LeistungStunde),
-      className: 'text-right',
-    },
-  ];
+  // Summary row from the aggregation layer: totals of the search result, if any
+  const summaryRow = useMemo(() => {
+    const totals = matches
+      ? summaryFromAggregates(aggregateRaumbuch(filteredAndSortedData))
+      : summary;
+    return createSummaryRow(totals);
+  }, [matches, filteredAndSortedData, summary]);
 
-  // Summary row calculations
-  const summaryRow: Partial<RaumbuchEntry> = {
-    ID: 0,
-    Raumnummer: '',
-    Bereich: '',
-    Gebaeudeteil: '',
-    Etage: '',
-    Bezeichnung: 'Summe:',
-    Reinigungsgruppe: '',
-    Menge: summary.totalMenge,
-    Einheit: '',
-    Anzahl: 0,
-    Reinigungsintervall: '',
-    ReinigungstageJahr: 0,
-    ReinigungstageMonat: 0,
-    MengeAktivMonat: summary.totalMengeAktivMonat,
-    VkWertNettoMonat: summary.totalVkWertNettoMonat,
-    VkWertBruttoMonat: summary.totalVkWertBruttoMonat,
-    RgWertNettoMonat: summary.totalRgWertNettoMonat,
-    RgWertBruttoMonat: summary.totalRgWertBruttoMonat,
-    StundeTag: 0,
-    StundeMonat: summary.totalStundenMonat,
-    LeistungStunde: 0,
-    ReinigungsTage: '',
-    Bemerkung: '',
-    Reduzierung: '',
-  };
+  // Rendered window of rows (virtualized mode only)
+  const { start, end, paddingTop, paddingBottom, onScroll } = useVirtualRows({
+    count: filteredAndSortedData.length,
+    rowHeight,
+    height,
+    overscan,
+  });
+
+  const virtualProps = virtualized
+    ? {
+        data: filteredAndSortedData.slice(start, end),
+        animated: false,
+        rowIndexOffset: start,
+        paddingTop,
+        paddingBottom,
+        height,
+        onScroll,
+      }
+    : { data: filteredAndSortedData };
 
   return (
     <div className={`space-y-4 ${className}`}>
@@ -289,8 +294,8 @@ export default function RaumbuchTable({ data, summary, className = '' }: Raumbuc
       <div className="overflow-x-auto">
         <Table
           columns={columns}
-          data={filteredAndSortedData}
-          summaryRow={summaryRow as RaumbuchEntry}
+          {...virtualProps}
+          summaryRow={summaryRow}
           currentSort={sortConfig}
           onSort={handleSort}
         />
@@ -304,3 +309,40 @@ export default function RaumbuchTable({ data, summary, className = '' }: Raumbuc
     </div>
   );
 }
+
+/**
+ * Creates the summary row of the table from aggregated totals
+ *
+ * @param summary - Totals from the aggregation layer
+ * @returns Row with totals in the measure columns
+ */
+function createSummaryRow(summary: RaumbuchSummary): RaumbuchEntry {
+  const summaryRow: Partial<RaumbuchEntry> = {
+    ID: 0,
+    Raumnummer: '',
+    Bereich: '',
+    Gebaeudeteil: '',
+    Etage: '',
+    Bezeichnung: 'Summe:',
+    Reinigungsgruppe: '',
+    Menge: summary.totalMenge,
+    Einheit: '',
+    Anzahl: 0,
+    Reinigungsintervall: '',
+    ReinigungstageJahr: 0,
+    ReinigungstageMonat: 0,
+    MengeAktivMonat: summary.totalMengeAktivMonat,
+    VkWertNettoMonat: summary.totalVkWertNettoMonat,
+    VkWertBruttoMonat: summary.totalVkWertBruttoMonat,
+    RgWertNettoMonat: summary.totalRgWertNettoMonat,
+    RgWertBruttoMonat: summary.totalRgWertBruttoMonat,
+    StundeTag: 0,
+    StundeMonat: summary.totalStundenMonat,
+    LeistungStunde: 0,
+    ReinigungsTage: '',
+    Bemerkung: '',
+    Reduzierung: '',
+  };
+
+  return summaryRow as RaumbuchEntry;
+}
@@ -36,6 +36,16 @@ interface TableProps<T> {
   rowClassName?: string;
   summaryRowClassName?: string;
   renderSortIcon?: (column: Column<T>) => React.ReactNode;
+  /** Zeilen beim Einblenden animieren (bei virtualisierten Tabellen abschalten) */
+  animated?: boolean;
+  /** Position der ersten Zeile in der Gesamtliste (Streifen und Keys bei Virtualisierung) */
+  rowIndexOffset?: number;
+  /** Platzhalterhöhe vor bzw. nach den Zeilen in px (nicht gerenderte Zeilen) */
+  paddingTop?: number;
+  paddingBottom?: number;
+  /** Feste Höhe in px; die Tabelle scrollt dann vertikal mit fixiertem Kopf und Fuß */
+  height?: number;
+  onScroll?: React.UIEventHandler<HTMLDivElement>;
 }
 
 const Table = forwardRef<HTMLTableElement, TableProps<any>>(
@@ -57,6 +67,12 @@ const Table = forwardRef<HTMLTableElement, TableProps<any>>(
       rowClassName = '',
       summaryRowClassName = '',
       renderSortIcon,
+      animated = true,
+      rowIndexOffset = 0,
+      paddingTop = 0,
+      paddingBottom = 0,
+      height,
+      onScroll,
     },
     ref
   ) => {
@@ -81,8 +97,22 @@ const Table = forwardRef<HTMLTableElement, TableProps<any>>(
     // Use provided renderSortIcon or default
     const sortIconRenderer = renderSortIcon || defaultRenderSortIcon;
 
+    const scrolling = height !== undefined;
+
+    // Platzhalter für nicht gerenderte Zeilen
+    const spacer = (spacerHeight: number) =>
+      spacerHeight > 0 && (
+        <tr aria-hidden="true" style={{ height: spacerHeight }}>
+          <td colSpan={columns.length} className="p-0" />
+        </tr>
+      );
+
     return (
-      <div className={cn('overflow-x-auto rounded-lg', className)}>
+      <div
+        className={cn('overflow-x-auto rounded-lg', scrolling && 'overflow-y-auto', className)}
+        style={scrolling ? { height } : undefined}
+        onScroll={onScroll}
+      >
         <table
           ref={ref}
           className={cn(
@@ -91,7 +121,13 @@ const Table = forwardRef<HTMLTableElement, TableProps<any>>(
             'w-full border-collapse'
           )}
         >
-          <thead className={cn('bg-primary-50 text-primary-700', headerClassName)}>
+          <thead
+            className={cn(
+              'bg-primary-50 text-primary-700',
+              scrolling && 'sticky top-0 z-10',
+              headerClassName
+            )}
+          >
             <tr>
               {columns.map((column, idx) => (
                 <th
@@ -118,36 +154,49 @@ const Table = forwardRef<HTMLTableElement, TableProps<any>>(
           </thead>
 
           <tbody className="bg-white divide-y divide-gray-100">
+            {spacer(paddingTop)}
             {data.length > 0 ? (
-              data.map((row, rowIdx) => (
-                <motion.tr
-                  key={rowIdx}
-                  initial={{ opacity: 0, y: 5 }}
-                  animate={{ opacity: 1, y: 0 }}
-                  transition={{ delay: rowIdx * 0.01, duration: 0.2 }}
-                  className={cn(
+              data.map((row, idx) => {
+                const rowIdx = rowIndexOffset + idx;
+                const rowProps = {
+                  className: cn(
                     onRowClick && 'cursor-pointer',
                     stripped && rowIdx % 2 === 1 && 'bg-primary-50/20',
                     hoverable && 'hover:bg-primary-50/40 transition-colors',
                     rowClassName
-                  )}
-                  onClick={() => onRowClick && onRowClick(row)}
-                >
-                  {columns.map((column, colIdx) => (
-                    <td
-                      key={colIdx}
-                      className={cn(
-                        'whitespace-nowrap text-sm text-primary-700',
-                        compact ? 'px-3 py-2' : 'px-4 py-3',
-                        bordered && 'border-x border-gray-100',
-                        column.className
-                      )}
-                    >
-                      {column.cell ? column.cell(row) : (row[column.accessor] as React.ReactNode)}
-                    </td>
-                  ))}
-                </motion.tr>
-              ))
+                  ),
+                  onClick: () => onRowClick && onRowClick(row),
+                };
+                const cells = columns.map((column, colIdx) => (
+                  <td
+                    key={colIdx}
+                    className={cn(
+                      'whitespace-nowrap text-sm text-primary-700',
+                      compact ? 'px-3 py-2' : 'px-4 py-3',
+                      bordered && 'border-x border-gray-100',
+                      column.className
+                    )}
+                  >
+                    {column.cell ? column.cell(row) : (row[column.accessor] as React.ReactNode)}
+                  </td>
+                ));
+
+                return animated ? (
+                  <motion.tr
+                    key={rowIdx}
+                    initial={{ opacity: 0, y: 5 }}
+                    animate={{ opacity: 1, y: 0 }}
+                    transition={{ delay: idx * 0.01, duration: 0.2 }}
+                    {...rowProps}
+                  >
+                    {cells}
+                  </motion.tr>
+                ) : (
+                  <tr key={rowIdx} {...rowProps}>
+                    {cells}
+                  </tr>
+                );
+              })
             ) : (
               <tr>
                 <td
@@ -167,11 +216,16 @@ const Table = forwardRef<HTMLTableElement, TableProps<any>>(
                 </td>
               </tr>
             )}
+            {spacer(paddingBottom)}
           </tbody>
 
           {summaryRow && (
             <tfoot
-              className={cn('bg-primary-50/50 font-medium text-primary-800', summaryRowClassName)}
+              className={cn(
+                'bg-primary-50/50 font-medium text-primary-800',
+                scrolling && 'sticky bottom-0',
+                summaryRowClassName
+              )}
             >
               <tr>
                 {columns.map((column, colIdx) => (
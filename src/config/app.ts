@@ -20,9 +20,44 @@ export const EXPORT_CONFIG = {
   pdf: {
     enabled: true,
     folder: '/tmp/exports', // Wird bei Vercel nicht verwendet, aber für lokale Entwicklung
+    // Browser-Pool für die PDF-Erzeugung (siehe services/export/browser-pool.ts)
+    pool: {
+      // Anzahl gleichzeitig nutzbarer Seiten
+      size: parseInt(process.env.PDF_POOL_SIZE || '2', 10),
+      // Seite wird nach so vielen Exporten geschlossen und neu erstellt
+      maxRendersPerPage: parseInt(process.env.PDF_POOL_MAX_RENDERS || '50', 10),
+      // Maximale Wartezeit auf eine freie Seite in ms
+      acquireTimeoutMs: parseInt(process.env.PDF_POOL_ACQUIRE_TIMEOUT_MS || '60000', 10),
+      // Browser wird nach so vielen ms ohne Export beendet (0 = nie)
+      idleTimeoutMs: parseInt(process.env.PDF_POOL_IDLE_MS || '300000', 10),
+    },
+  },
+  // Hintergrund-Jobs für Exporte (siehe services/export/export-jobs.ts)
+  jobs: {
+    // Anzahl gleichzeitig laufender Exporte
+    workers: parseInt(process.env.EXPORT_WORKERS || '2', 10),
+    // Maximale Zahl wartender Jobs, darüber wird mit 503 abgelehnt
+    maxQueued: parseInt(process.env.EXPORT_MAX_QUEUED || '100', 10),
+    // Abgeschlossene Jobs bleiben so viele ms abrufbar
+    retainMs: parseInt(process.env.EXPORT_JOB_RETAIN_MS || '3600000', 10),
+  },
+  // Datei-Cache für fertige Exporte (siehe services/export/export-cache.ts)
+  cache: {
+    folder: process.env.EXPORT_CACHE_DIR || '/tmp/exports/cache',
+    // Obergrenze für alle Dateien zusammen, älteste werden zuerst verdrängt
+    maxMegabytes: parseInt(process.env.EXPORT_CACHE_MB || '512', 10),
   },
 };
 
+// Messung der Hot Paths (siehe lib/metrics.ts und /api/metrics)
+export const METRICS_CONFIG = {
+  enabled: process.env.METRICS_ENABLED !== 'false',
+  // Server-Timing-Header: 'off', 'opt-in' (mit ?timing=1 oder X-Server-Timing: 1) oder 'always'
+  serverTiming: (process.env.METRICS_SERVER_TIMING || 'opt-in') as 'off' | 'opt-in' | 'always',
+  // Wenn gesetzt, verlangt /api/metrics "Authorization: Bearer <token>"
+  token: process.env.METRICS_TOKEN || '',
+};
+
 // Theme Konfiguration
 export const THEME_CONFIG = {
   colors: {
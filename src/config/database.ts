@@ -48,6 +48,52 @@ export const DATABASE_CONFIG = {
   timeout: parseInt(process.env.DATABASE_TIMEOUT || '30', 10),
 };
 
+// Connection pool and fault handling (see services/database/client.ts)
+export const DATABASE_POOL_CONFIG = {
+  // Pool sizing; prepared statements each keep one connection of the pool
+  max: parseInt(process.env.DATABASE_POOL_MAX || '10', 10),
+  min: parseInt(process.env.DATABASE_POOL_MIN || '0', 10),
+  // Idle connections are closed after this many ms
+  idleTimeoutMs: parseInt(process.env.DATABASE_POOL_IDLE_MS || '30000', 10),
+  // Maximum wait for a free connection in ms
+  acquireTimeoutMs: parseInt(process.env.DATABASE_POOL_ACQUIRE_MS || '15000', 10),
+  // Cache PreparedStatement handles for the fixed queries
+  preparedStatements: process.env.DATABASE_PREPARED_STATEMENTS !== 'false',
+  // Retries of transient errors with jittered exponential backoff
+  retries: parseInt(process.env.DATABASE_RETRIES || '3', 10),
+  retryBaseMs: parseInt(process.env.DATABASE_RETRY_BASE_MS || '100', 10),
+  retryMaxMs: parseInt(process.env.DATABASE_RETRY_MAX_MS || '2000', 10),
+  // Consecutive transient failures that open the circuit breaker, 0 disables it
+  breakerThreshold: parseInt(process.env.DATABASE_BREAKER_THRESHOLD || '5', 10),
+  // Time in ms the breaker stays open before a probe request is let through
+  breakerResetMs: parseInt(process.env.DATABASE_BREAKER_RESET_MS || '10000', 10),
+};
+
+// Cache for Raumbuch results (see services/database/raumbuch-cache.ts)
+export const RAUMBUCH_CACHE_CONFIG = {
+  // Maximum estimated size in MB, 0 disables the cache
+  maxMegabytes: parseInt(process.env.RAUMBUCH_CACHE_MAX_MB || '256', 10),
+  // Maximum age of an entry in seconds
+  ttlSeconds: parseInt(process.env.RAUMBUCH_CACHE_TTL || '900', 10),
+  // Entries younger than this are served without a freshness probe
+  probeIntervalMs: parseInt(process.env.RAUMBUCH_CACHE_PROBE_MS || '2000', 10),
+};
+
+// Store of precomputed Raumbuch aggregates (see services/database/raumbuch-aggregates.ts);
+// entries are refreshed when the data state probed via RAUMBUCH_CACHE_PROBE_MS changes
+export const RAUMBUCH_AGGREGATE_CONFIG = {
+  // Maximum estimated size in MB, 0 disables the store
+  maxMegabytes: parseInt(process.env.RAUMBUCH_AGGREGATES_MAX_MB || '16', 10),
+};
+
+// Portfolio analytics across Gebaeude (see services/database/portfolio-cache.ts)
+export const PORTFOLIO_CONFIG = {
+  // Maximum estimated size of cached portfolios in MB, 0 disables the cache
+  maxMegabytes: parseInt(process.env.PORTFOLIO_CACHE_MAX_MB || '8', 10),
+  // Maximum number of per-Gebaeude queries running at the same time
+  concurrency: parseInt(process.env.PORTFOLIO_CONCURRENCY || '4', 10),
+};
+
 // Default standort ID if none is specified
 export const DEFAULT_STANDORT_ID = parseInt(process.env.DEFAULT_STANDORT_ID || '-1', 10);
 
@@ -1,7 +1,19 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 
+import { NdjsonParser } from '@/lib/ndjson';
+import { parseFacetSelection } from '@/services/analysis/facet-index';
+import {
+  aggregateRaumbuch,
+  createFilterOptions,
+  filterRaumbuchData,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+} from '@/services/analysis/raumbuch-analysis';
+
+import type { FacetIndexClient } from '@/lib/facet-index-client';
+import type { FacetCounts, FacetSelection } from '@/services/analysis/facet-index';
 import type { RaumbuchRow, RaumbuchSummary, VisualizationData } from '@/types/raumbuch.types';
 
 // Verwende RaumbuchRow als RaumbuchEntry
@@ -15,14 +27,77 @@ interface FilterOptions {
   reinigungsgruppe?: string[];
 }
 
+// Optionen für den Hook
+interface UseRaumbuchDataOptions {
+  /**
+   * Zeilen als NDJSON-Stream laden und schon während der Abfrage anzeigen;
+   * Zusammenfassung und Filteroptionen werden nach dem Ende berechnet
+   */
+  stream?: boolean;
+  /**
+   * Zeilen einmal ohne Filter laden und im Browser über einen Facettenindex
+   * filtern (Web Worker); Filterwechsel lösen dann keine Abfrage mehr aus
+   */
+  clientFilter?: boolean;
+}
+
+/**
+ * Liest einen NDJSON-Stream und meldet Zwischenstände
+ *
+ * Gemeldet wird der erste Block und danach jeweils bei Verdopplung der
+ * Zeilenzahl, damit Aufbereitung und Rendering insgesamt linear bleiben.
+ *
+ * @param response - Antwort mit NDJSON-Body
+ * @param onRows - Wird mit allen bisher empfangenen Zeilen aufgerufen
+ * @returns Alle empfangenen Zeilen
+ */
+async function readNdjsonRows<T>(response: Response, onRows: (rows: T[]) => void): Promise<T[]> {
+  const parser = new NdjsonParser<T>();
+  const reader = response.body?.getReader();
+
+  if (!reader) {
+    return parser.push(await response.text()).concat(parser.flush());
+  }
+
+  const rows: T[] = [];
+  const decoder = new TextDecoder();
+  let reported = 0;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    for (const row of parser.push(decoder.decode(value, { stream: true }))) {
+      rows.push(row);
+    }
+
+    if (rows.length > 0 && rows.length >= reported * 2) {
+      reported = rows.length;
+      onRows(rows.slice());
+    }
+  }
+
+  for (const row of parser.push(decoder.decode()).concat(parser.flush())) {
+    rows.push(row);
+  }
+
+  return rows;
+}
+
 /**
  * Hook zum Abrufen und Verarbeiten von Raumbuch-Daten für einen bestimmten Standort/Gebäude
  *
  * @param gebaeudeId - ID des Gebäudes
  * @param filterQuery - Optionale Filter-Parameter als Query-String
+ * @param options - Optionen (z.B. Streaming)
  * @returns Ein Objekt mit Raumbuch-Daten, Zusammenfassung, Visualisierungsdaten und Filteroptionen
  */
-export function useRaumbuchData(gebaeudeId: number, filterQuery?: string) {
+export function useRaumbuchData(
+  gebaeudeId: number,
+  filterQuery?: string,
+  options: UseRaumbuchDataOptions = {}
+) {
+  const { stream = false, clientFilter = false } = options;
   const [data, setData] = useState<RaumbuchEntry[]>([]);
   const [summary, setSummary] = useState<RaumbuchSummary | null>(null);
   const [visualizationData, setVisualizationData] = useState<VisualizationData | null>(null);
@@ -33,7 +108,18 @@ export function useRaumbuchData(gebaeudeId: number, filterQuery?: string) {
     reinigungsgruppe: [],
   });
   const [isLoading, setIsLoading] = useState<boolean>(true);
+  const [isStreaming, setIsStreaming] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
+  const [facetCounts, setFacetCounts] = useState<FacetCounts | null>(null);
+  // Alle Zeilen des Gebäudes, sobald der Facettenindex steht (nur clientFilter)
+  const [indexedRows, setIndexedRows] = useState<RaumbuchEntry[] | null>(null);
+  const facetClient = useRef<FacetIndexClient | null>(null);
+
+  // Mit clientFilter wird ungefiltert geladen; die aktuelle Auswahl filtert
+  // nur die Zwischenstände beim Streaming
+  const serverFilterQuery = clientFilter ? undefined : filterQuery;
+  const selection = useRef<FacetSelection>({});
+  selection.current = parseFacetSelection(filterQuery);
 
   useEffect(() => {
     // Abbruch wenn keine gebaeudeId
@@ -42,13 +128,83 @@ export function useRaumbuchData(gebaeudeId: number, filterQuery?: string) {
       return;
     }
 
+    const controller = stream ? new AbortController() : null;
+    let disposed = false;
+
+    if (clientFilter) {
+      setIndexedRows(null);
+      setFacetCounts(null);
+    }
+
+    // Baut den Facettenindex über alle Zeilen auf (im Worker)
+    async function indexRows(rows: RaumbuchEntry[]) {
+      const { createFacetIndexClient } = await import('@/lib/facet-index-client');
+      if (disposed) return;
+
+      const client = createFacetIndexClient();
+      facetClient.current = client;
+      const options = await client.build(rows);
+      if (disposed) return;
+
+      setFilterOptions(options);
+      setIndexedRows(rows);
+    }
+
+    async function fetchStream(signal: AbortSignal) {
+      setIsLoading(true);
+      setIsStreaming(true);
+      setError(null);
+
+      try {
+        const params = new URLSearchParams(serverFilterQuery);
+        params.set('gebaeude_ID', String(gebaeudeId));
+        params.set('stream', 'ndjson');
+        const response = await fetch(`/api/raumbuch?${params.toString()}`, { signal });
+
+        if (!response.ok) {
+          throw new Error(
+            `Fehler beim Abrufen der Daten: ${response.status} ${response.statusText}`
+          );
+        }
+
+        // Erste Zeilen sofort anzeigen (mit vorläufiger Zusammenfassung),
+        // Visualisierung und Filteroptionen nach dem letzten Block
+        const rows = await readNdjsonRows<RaumbuchEntry>(response, received => {
+          const visible = clientFilter ? filterRaumbuchData(received, selection.current) : received;
+          setData(visible);
+          setSummary(summaryFromAggregates(aggregateRaumbuch(visible)));
+          setIsLoading(false);
+        });
+
+        if (clientFilter) {
+          await indexRows(rows);
+          return;
+        }
+
+        const aggregates = aggregateRaumbuch(rows);
+        setData(rows);
+        setSummary(summaryFromAggregates(aggregates));
+        setVisualizationData(visualizationFromAggregates(aggregates));
+        setFilterOptions(createFilterOptions(rows));
+      } catch (err) {
+        if (signal.aborted) return;
+        setError(err instanceof Error ? err.message : 'Ein unbekannter Fehler ist aufgetreten');
+        console.error('Fehler in useRaumbuchData:', err);
+      } finally {
+        if (!signal.aborted) {
+          setIsLoading(false);
+          setIsStreaming(false);
+        }
+      }
+    }
+
     async function fetchData() {
       setIsLoading(true);
       setError(null);
 
       try {
         // Query-Parameter zusammenbauen
-        const queryParams = filterQuery ? `?${filterQuery}` : '';
+        const queryParams = serverFilterQuery ? `?${serverFilterQuery}` : '';
         const response = await fetch(`/api/raumbuch/${gebaeudeId}${queryParams}`);
 
         if (!response.ok) {
@@ -71,6 +227,10 @@ export function useRaumbuchData(gebaeudeId: number, filterQuery?: string) {
             reinigungsgruppe: [],
           }
         );
+
+        if (clientFilter && result.data) {
+          await indexRows(result.data);
+        }
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Ein unbekannter Fehler ist aufgetreten');
         console.error('Fehler in useRaumbuchData:', err);
@@ -79,15 +239,54 @@ export function useRaumbuchData(gebaeudeId: number, filterQuery?: string) {
       }
     }
 
-    fetchData();
-  }, [gebaeudeId, filterQuery]);
+    if (controller) {
+      fetchStream(controller.signal);
+    } else {
+      fetchData();
+    }
+
+    return () => {
+      disposed = true;
+      controller?.abort();
+      facetClient.current?.terminate();
+      facetClient.current = null;
+    };
+  }, [gebaeudeId, serverFilterQuery, stream, clientFilter]);
+
+  // Auswahl über den Facettenindex auswerten (ohne Serveranfrage)
+  useEffect(() => {
+    const client = facetClient.current;
+    if (!clientFilter || !indexedRows || !client) return;
+
+    let cancelled = false;
+    client
+      .query(parseFacetSelection(filterQuery))
+      .then(result => {
+        if (cancelled) return;
+        setData(Array.from(result.positions, position => indexedRows[position]));
+        setSummary(result.summary);
+        setVisualizationData(result.visualizationData);
+        setFacetCounts(result.facetCounts);
+      })
+      .catch(err => {
+        if (cancelled) return;
+        setError(err instanceof Error ? err.message : 'Ein unbekannter Fehler ist aufgetreten');
+        console.error('Fehler beim Filtern in useRaumbuchData:', err);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [clientFilter, indexedRows, filterQuery]);
 
   return {
     data,
     summary,
     visualizationData,
     filterOptions,
+    facetCounts,
     isLoading,
+    isStreaming,
     error,
   };
 }
@@ -0,0 +1,66 @@
+'use client';
+
+import { useCallback, useState } from 'react';
+
+import type React from 'react';
+
+interface VirtualRowsOptions {
+  /** Anzahl aller Zeilen */
+  count: number;
+  /** Feste Zeilenhöhe in px */
+  rowHeight: number;
+  /** Höhe des scrollbaren Bereichs in px */
+  height: number;
+  /** Zusätzlich gerenderte Zeilen ober- und unterhalb des sichtbaren Bereichs */
+  overscan?: number;
+}
+
+/**
+ * Sichtbarer Ausschnitt einer virtualisierten Liste
+ */
+export interface VirtualWindow {
+  /** Erste gerenderte Zeile (einschließlich) */
+  start: number;
+  /** Letzte gerenderte Zeile (ausschließlich) */
+  end: number;
+  /** Platzhalterhöhe vor den gerenderten Zeilen in px */
+  paddingTop: number;
+  /** Platzhalterhöhe nach den gerenderten Zeilen in px */
+  paddingBottom: number;
+}
+
+/**
+ * Berechnet den zu rendernden Ausschnitt für eine Scroll-Position
+ *
+ * @param scrollTop - Scroll-Position in px
+ * @param options - Zeilenzahl, Zeilenhöhe, Höhe und Überhang
+ * @returns Ausschnitt mit Platzhalterhöhen
+ */
+export function virtualWindow(scrollTop: number, options: VirtualRowsOptions): VirtualWindow {
+  const { count, rowHeight, height, overscan = 10 } = options;
+  const end = Math.min(count, Math.ceil((scrollTop + height) / rowHeight) + overscan);
+  const start = Math.min(end, Math.max(0, Math.floor(scrollTop / rowHeight) - overscan));
+
+  return {
+    start,
+    end,
+    paddingTop: start * rowHeight,
+    paddingBottom: (count - end) * rowHeight,
+  };
+}
+
+/**
+ * Hook für das Rendern nur der sichtbaren Zeilen einer Liste
+ *
+ * @param options - Zeilenzahl, Zeilenhöhe, Höhe und Überhang
+ * @returns Ausschnitt und Scroll-Handler für den scrollbaren Container
+ */
+export function useVirtualRows(options: VirtualRowsOptions) {
+  const [scrollTop, setScrollTop] = useState(0);
+
+  const onScroll = useCallback((e: React.UIEvent<HTMLElement>) => {
+    setScrollTop(e.currentTarget.scrollTop);
+  }, []);
+
+  return { ...virtualWindow(scrollTop, options), onScroll };
+}
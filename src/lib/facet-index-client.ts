@@ -0,0 +1,135 @@
+/**
+ * Client für den Facettenindex (src/services/analysis/facet-index.ts)
+ *
+ * Aufbau des Index und Auswertungen laufen in einem Web Worker, damit das
+ * Filtern großer Gebäude die Oberfläche nicht blockiert. Ohne Worker-Support
+ * (z.B. in Tests) wird derselbe Index synchron im Hauptthread verwendet.
+ */
+
+import { FacetIndexStore } from '@/services/analysis/facet-index';
+
+import type { FacetQueryResult, FacetSelection } from '@/services/analysis/facet-index';
+import type { FilterOptions } from '@/services/analysis/raumbuch-analysis';
+import type { RaumbuchRow } from '@/types/raumbuch.types';
+
+/**
+ * Nachricht an den Worker
+ */
+export type FacetWorkerRequest =
+  | { type: 'build'; id: number; rows: RaumbuchRow[] }
+  | { type: 'query'; id: number; selection: FacetSelection };
+
+/**
+ * Antwort des Workers
+ */
+export type FacetWorkerResponse =
+  | { type: 'built'; id: number; filterOptions: FilterOptions }
+  | { type: 'result'; id: number; result: FacetQueryResult }
+  | { type: 'error'; id: number; message: string };
+
+/**
+ * Zugriff auf den Facettenindex eines Gebäudes
+ */
+export interface FacetIndexClient {
+  /** Baut den Index über alle Zeilen auf (ersetzt einen vorhandenen Index) */
+  build(rows: RaumbuchRow[]): Promise<FilterOptions>;
+  /** Wertet eine Auswahl aus */
+  query(selection: FacetSelection): Promise<FacetQueryResult>;
+  /** Beendet den Worker; offene Anfragen werden verworfen */
+  terminate(): void;
+}
+
+interface PendingRequest {
+  resolve: (value: any) => void;
+  reject: (error: Error) => void;
+}
+
+/**
+ * Client mit Web Worker
+ *
+ * @param worker - Gestarteter Facetten-Worker
+ * @returns Client, der Anfragen per postMessage stellt
+ */
+function createWorkerClient(worker: Worker): FacetIndexClient {
+  const pending = new Map<number, PendingRequest>();
+  let nextId = 0;
+
+  worker.onmessage = (event: MessageEvent<FacetWorkerResponse>) => {
+    const message = event.data;
+    const request = pending.get(message.id);
+    if (!request) return;
+    pending.delete(message.id);
+
+    if (message.type === 'error') {
+      request.reject(new Error(message.message));
+    } else if (message.type === 'built') {
+      request.resolve(message.filterOptions);
+    } else {
+      request.resolve(message.result);
+    }
+  };
+
+  worker.onerror = event => {
+    const error = new Error(event.message || 'Fehler im Facetten-Worker');
+    pending.forEach(request => request.reject(error));
+    pending.clear();
+  };
+
+  function send<T>(request: FacetWorkerRequest): Promise<T> {
+    return new Promise<T>((resolve, reject) => {
+      pending.set(request.id, { resolve, reject });
+      worker.postMessage(request);
+    });
+  }
+
+  return {
+    build: rows => send({ type: 'build', id: nextId++, rows }),
+    query: selection => send({ type: 'query', id: nextId++, selection }),
+    terminate: () => {
+      worker.terminate();
+      pending.clear();
+    },
+  };
+}
+
+/**
+ * Client ohne Worker (synchron im Hauptthread)
+ *
+ * @returns Client mit demselben Verhalten wie der Worker
+ */
+function createInlineClient(): FacetIndexClient {
+  let store: FacetIndexStore | null = null;
+
+  return {
+    build: async rows => {
+      store = new FacetIndexStore(rows);
+      return store.filterOptions();
+    },
+    query: async selection => {
+      if (!store) throw new Error('Facettenindex wurde noch nicht aufgebaut');
+      return store.query(selection);
+    },
+    terminate: () => {
+      store = null;
+    },
+  };
+}
+
+/**
+ * Erstellt einen Client für den Facettenindex
+ *
+ * @returns Client mit Web Worker, falls verfügbar, sonst synchron
+ */
+export function createFacetIndexClient(): FacetIndexClient {
+  if (typeof Worker === 'undefined') {
+    return createInlineClient();
+  }
+
+  try {
+    const worker = new Worker(new URL('../workers/facet-index.worker.ts', import.meta.url));
+    return createWorkerClient(worker);
+  } catch (error) {
+    console.warn('Facetten-Worker nicht verfügbar, filtere im Hauptthread:', error);
+    return createInlineClient();
+  }
+}
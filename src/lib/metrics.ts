@@ -0,0 +1,414 @@
+/**
+ * Leichtgewichtige Messung der Hot Paths: Laufzeiten je Verarbeitungsschritt,
+ * Zeilenzahlen und Antwortgrößen
+ *
+ * Die Messwerte werden prozessweit in Histogrammen und Zählern gesammelt und
+ * über /api/metrics im Prometheus-Textformat ausgegeben. Läuft ein Schritt
+ * innerhalb einer Anfrage (siehe lib/request-metrics.ts), wird seine Dauer
+ * zusätzlich für den Server-Timing-Header dieser Anfrage festgehalten.
+ *
+ * Das Modul hat keine Node-Abhängigkeiten, da die Analysefunktionen auch im
+ * Browser laufen; dort wird nicht gemessen.
+ */
+
+import { METRICS_CONFIG } from '@/config/app';
+
+/**
+ * Labels einer Messreihe
+ */
+export type MetricLabels = Record<string, string>;
+
+/**
+ * Ein Messwert mit seinen Labels
+ */
+export interface MetricSample {
+  labels?: MetricLabels;
+  value: number;
+}
+
+/**
+ * Messreihe für die Ausgabe, z.B. aus der Statistik eines Caches
+ */
+export interface MetricFamily {
+  name: string;
+  help: string;
+  type: 'counter' | 'gauge';
+  samples: MetricSample[];
+}
+
+/**
+ * Bucket-Grenzen für Laufzeiten in Sekunden
+ */
+export const DURATION_BUCKETS = [
+  0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+];
+
+/**
+ * Bucket-Grenzen für Antwortgrößen in Bytes
+ */
+export const BYTE_BUCKETS = [1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7];
+
+/**
+ * Schlüssel einer Messreihe: Labels in fester Reihenfolge
+ */
+function labelKey(labels: MetricLabels): string {
+  return Object.keys(labels)
+    .sort()
+    .map(name => `${name}=${labels[name]}`)
+    .join(',');
+}
+
+function escapeLabelValue(value: string): string {
+  return value.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+/**
+ * Formatiert Labels als {name="wert",...}
+ */
+function formatLabels(labels: MetricLabels | undefined, extra?: MetricLabels): string {
+  const all = { ...labels, ...extra };
+  const names = Object.keys(all).sort();
+  if (names.length === 0) {
+    return '';
+  }
+  return `{${names.map(name => `${name}="${escapeLabelValue(all[name])}"`).join(',')}}`;
+}
+
+function formatValue(value: number): string {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return Number.isNaN(value) ? 'NaN' : String(value);
+}
+
+/**
+ * Monoton steigender Zähler je Label-Kombination
+ */
+export class Counter {
+  private readonly values = new Map<string, MetricSample>();
+
+  constructor(
+    readonly name: string,
+    readonly help: string
+  ) {}
+
+  /**
+   * Erhöht den Zähler
+   *
+   * @param labels - Labels der Messreihe
+   * @param value - Betrag (Standard: 1)
+   */
+  inc(labels: MetricLabels = {}, value: number = 1): void {
+    const key = labelKey(labels);
+    const sample = this.values.get(key);
+    if (sample) {
+      sample.value += value;
+    } else {
+      this.values.set(key, { labels, value });
+    }
+  }
+
+  /**
+   * Liefert den aktuellen Wert
+   */
+  get(labels: MetricLabels = {}): number {
+    return this.values.get(labelKey(labels))?.value ?? 0;
+  }
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} counter`];
+    this.values.forEach(sample => {
+      lines.push(`${this.name}${formatLabels(sample.labels)} ${formatValue(sample.value)}`);
+    });
+    return lines;
+  }
+
+  reset(): void {
+    this.values.clear();
+  }
+}
+
+interface HistogramSeries {
+  labels: MetricLabels;
+  counts: number[];
+  sum: number;
+  count: number;
+}
+
+/**
+ * Histogramm mit festen Bucket-Grenzen je Label-Kombination
+ */
+export class Histogram {
+  private readonly series = new Map<string, HistogramSeries>();
+
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    readonly buckets: number[]
+  ) {}
+
+  /**
+   * Erfasst einen Messwert
+   *
+   * @param labels - Labels der Messreihe
+   * @param value - Messwert
+   */
+  observe(labels: MetricLabels, value: number): void {
+    const key = labelKey(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+
+    // Nur den ersten passenden Bucket zählen; die Ausgabe kumuliert
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index >= 0) {
+      series.counts[index]++;
+    }
+    series.sum += value;
+    series.count++;
+  }
+
+  /**
+   * Liefert Anzahl und Summe der Messwerte
+   */
+  get(labels: MetricLabels = {}): { count: number; sum: number } {
+    const series = this.series.get(labelKey(labels));
+    return { count: series?.count ?? 0, sum: series?.sum ?? 0 };
+  }
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    this.series.forEach(series => {
+      const bucket = (le: string, value: number) =>
+        `${this.name}_bucket${formatLabels(series.labels, { le })} ${value}`;
+
+      let cumulative = 0;
+      this.buckets.forEach((bound, i) => {
+        cumulative += series.counts[i];
+        lines.push(bucket(formatValue(bound), cumulative));
+      });
+      lines.push(bucket('+Inf', series.count));
+      lines.push(`${this.name}_sum${formatLabels(series.labels)} ${formatValue(series.sum)}`);
+      lines.push(`${this.name}_count${formatLabels(series.labels)} ${series.count}`);
+    });
+    return lines;
+  }
+
+  reset(): void {
+    this.series.clear();
+  }
+}
+
+/**
+ * Sammlung aller Zähler und Histogramme eines Prozesses
+ */
+export class MetricsRegistry {
+  private readonly metrics = new Map<string, Counter | Histogram>();
+
+  /**
+   * Liefert den Zähler mit diesem Namen und legt ihn bei Bedarf an
+   */
+  counter(name: string, help: string): Counter {
+    let metric = this.metrics.get(name);
+    if (!metric) {
+      metric = new Counter(name, help);
+      this.metrics.set(name, metric);
+    }
+    return metric as Counter;
+  }
+
+  /**
+   * Liefert das Histogramm mit diesem Namen und legt es bei Bedarf an
+   */
+  histogram(name: string, help: string, buckets: number[] = DURATION_BUCKETS): Histogram {
+    let metric = this.metrics.get(name);
+    if (!metric) {
+      metric = new Histogram(name, help, buckets);
+      this.metrics.set(name, metric);
+    }
+    return metric as Histogram;
+  }
+
+  /**
+   * Gibt alle Messreihen im Prometheus-Textformat (Version 0.0.4) aus
+   *
+   * @param families - Zusätzliche Messreihen, z.B. aus Cache-Statistiken
+   * @returns Text für die Antwort von /api/metrics
+   */
+  render(families: MetricFamily[] = []): string {
+    const lines: string[] = [];
+    this.metrics.forEach(metric => lines.push(...metric.render()));
+
+    families.forEach(family => {
+      lines.push(`# HELP ${family.name} ${family.help}`, `# TYPE ${family.name} ${family.type}`);
+      family.samples.forEach(sample => {
+        lines.push(`${family.name}${formatLabels(sample.labels)} ${formatValue(sample.value)}`);
+      });
+    });
+
+    return `${lines.join('\n')}\n`;
+  }
+
+  /**
+   * Setzt alle Messwerte zurück
+   */
+  reset(): void {
+    this.metrics.forEach(metric => metric.reset());
+  }
+}
+
+/**
+ * Gemessene Schritte einer einzelnen Anfrage für den Server-Timing-Header
+ */
+export class RequestTimings {
+  private readonly stages = new Map<string, { ms: number; count: number }>();
+
+  /**
+   * Addiert die Dauer eines Schritts
+   *
+   * @param stage - Name des Schritts
+   * @param ms - Dauer in Millisekunden
+   */
+  add(stage: string, ms: number): void {
+    const entry = this.stages.get(stage);
+    if (entry) {
+      entry.ms += ms;
+      entry.count++;
+    } else {
+      this.stages.set(stage, { ms, count: 1 });
+    }
+  }
+
+  /**
+   * Gesamtdauer eines Schritts in Millisekunden
+   */
+  get(stage: string): number {
+    return this.stages.get(stage)?.ms ?? 0;
+  }
+
+  /**
+   * Formatiert die Schritte als Wert des Server-Timing-Headers,
+   * z.B. "db;dur=12.4, map;dur=3.1;desc=\"2x\""
+   */
+  toHeader(): string {
+    return Array.from(this.stages, ([stage, { ms, count }]) => {
+      const desc = count > 1 ? `;desc="${count}x"` : '';
+      return `${stage.replace(/[^\w-]/g, '_')};dur=${ms.toFixed(1)}${desc}`;
+    }).join(', ');
+  }
+}
+
+// Globale Registry, damit Hot-Reload und getrennt gebündelte Routen dieselben Werte sehen
+const globalForMetrics = globalThis as unknown as {
+  rdMetrics: MetricsRegistry | undefined;
+};
+
+/**
+ * Registry des Prozesses
+ */
+export const metrics: MetricsRegistry = globalForMetrics.rdMetrics ?? new MetricsRegistry();
+globalForMetrics.rdMetrics = metrics;
+
+const stageDuration = metrics.histogram(
+  'rd_stage_duration_seconds',
+  'Duration of processing stages (db, map, aggregate, serialize, excel, pdf, ...)'
+);
+const stageRows = metrics.counter('rd_stage_rows_total', 'Rows processed per stage');
+const payloadBytes = metrics.histogram(
+  'rd_response_payload_bytes',
+  'Size of serialized response bodies per route',
+  BYTE_BUCKETS
+);
+
+const enabled = typeof window === 'undefined' && METRICS_CONFIG.enabled;
+
+let requestTimings: () => RequestTimings | undefined = () => undefined;
+
+/**
+ * Legt fest, wie die Messungen der laufenden Anfrage gefunden werden
+ * (auf dem Server über AsyncLocalStorage, siehe lib/request-metrics.ts)
+ *
+ * @param provider - Liefert die RequestTimings der laufenden Anfrage
+ */
+export function setRequestTimingsProvider(provider: () => RequestTimings | undefined): void {
+  requestTimings = provider;
+}
+
+/**
+ * Erfasst die Dauer eines Schritts
+ *
+ * @param stage - Name des Schritts
+ * @param ms - Dauer in Millisekunden
+ */
+export function recordStage(stage: string, ms: number): void {
+  if (!enabled) {
+    return;
+  }
+  stageDuration.observe({ stage }, ms / 1000);
+  requestTimings()?.add(stage, ms);
+}
+
+/**
+ * Misst die Dauer einer synchronen Funktion als Schritt
+ *
+ * @param stage - Name des Schritts
+ * @param fn - Gemessene Funktion
+ * @returns Ergebnis von fn
+ */
+export function timeStage<T>(stage: string, fn: () => T): T {
+  if (!enabled) {
+    return fn();
+  }
+
+  const start = performance.now();
+  try {
+    return fn();
+  } finally {
+    recordStage(stage, performance.now() - start);
+  }
+}
+
+/**
+ * Misst die Dauer einer asynchronen Funktion als Schritt
+ *
+ * @param stage - Name des Schritts
+ * @param fn - Gemessene Funktion
+ * @returns Ergebnis von fn
+ */
+export async function timeStageAsync<T>(stage: string, fn: () => Promise<T>): Promise<T> {
+  if (!enabled) {
+    return fn();
+  }
+
+  const start = performance.now();
+  try {
+    return await fn();
+  } finally {
+    recordStage(stage, performance.now() - start);
+  }
+}
+
+/**
+ * Zählt die in einem Schritt verarbeiteten Zeilen
+ *
+ * @param stage - Name des Schritts
+ * @param rows - Anzahl der Zeilen
+ */
+export function countRows(stage: string, rows: number): void {
+  if (enabled && rows > 0) {
+    stageRows.inc({ stage }, rows);
+  }
+}
+
+/**
+ * Erfasst die Größe einer Antwort
+ *
+ * @param route - Route der Anfrage
+ * @param bytes - Größe in Bytes
+ */
+export function recordPayload(route: string, bytes: number): void {
+  if (enabled) {
+    payloadBytes.observe({ route }, bytes);
+  }
+}
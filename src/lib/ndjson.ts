@@ -0,0 +1,151 @@
+/**
+ * Hilfsfunktionen für das Streaming von Zeilen als NDJSON oder JSON-Array
+ */
+
+/**
+ * Format eines gestreamten Ergebnisses
+ */
+export type RowStreamFormat = 'ndjson' | 'json';
+
+/**
+ * Content-Type je Streaming-Format
+ */
+export const ROW_STREAM_CONTENT_TYPES: Record<RowStreamFormat, string> = {
+  ndjson: 'application/x-ndjson; charset=utf-8',
+  json: 'application/json; charset=utf-8',
+};
+
+/**
+ * Erstellt einen ReadableStream, der Zeilen als NDJSON (eine Zeile je Objekt)
+ * oder als JSON-Array ausgibt
+ *
+ * Der Stream ist pull-basiert: neue Zeilen werden erst gelesen, wenn der
+ * Empfänger weitere Daten anfordert, sodass die Quelle (z.B. streamQuery)
+ * bei langsamen Clients pausiert. Zeilen werden zu Blöcken von etwa
+ * chunkBytes zusammengefasst; der erste Block wird sofort gesendet.
+ *
+ * @param rows - Zeilenquelle
+ * @param format - Ausgabeformat
+ * @param chunkBytes - Ungefähre Blockgröße in Zeichen
+ * @returns Stream mit UTF-8-kodierten Blöcken
+ */
+export function createRowStream(
+  rows: AsyncIterable<unknown>,
+  format: RowStreamFormat = 'ndjson',
+  chunkBytes: number = 64 * 1024
+): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  const iterator = rows[Symbol.asyncIterator]();
+  let count = 0;
+  let opened = false;
+
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      let chunk = '';
+      if (format === 'json' && !opened) {
+        chunk = '[';
+        opened = true;
+      }
+
+      // Der erste Block enthält nur die erste Zeile, damit der Client früh rendern kann
+      const limit = chunk.length + (count === 0 ? 1 : chunkBytes);
+
+      try {
+        while (chunk.length < limit) {
+          const next = await iterator.next();
+          if (next.done) {
+            if (format === 'json') {
+              chunk += ']';
+            }
+            if (chunk) {
+              controller.enqueue(encoder.encode(chunk));
+            }
+            controller.close();
+            return;
+          }
+
+          const json = JSON.stringify(next.value);
+          if (format === 'json') {
+            chunk += count === 0 ? json : `,${json}`;
+          } else {
+            chunk += `${json}\n`;
+          }
+          count++;
+        }
+      } catch (error) {
+        controller.error(error);
+        return;
+      }
+
+      controller.enqueue(encoder.encode(chunk));
+    },
+    async cancel() {
+      // Client hat die Verbindung beendet: Quelle (und damit die Query) abbrechen
+      await iterator.return?.();
+    },
+  });
+}
+
+/**
+ * Liest die erste Zeile einer Quelle vorab, damit Verbindungs- und
+ * Query-Fehler noch vor dem Senden der Antwort-Header auftreten
+ *
+ * @param rows - Zeilenquelle
+ * @returns Quelle mit allen Zeilen einschließlich der ersten
+ */
+export async function prefetchFirstRow<T>(rows: AsyncIterable<T>): Promise<AsyncIterable<T>> {
+  const iterator = rows[Symbol.asyncIterator]();
+  const first = await iterator.next();
+
+  async function* resume(): AsyncGenerator<T> {
+    try {
+      if (first.done) {
+        return;
+      }
+      yield first.value;
+
+      while (true) {
+        const next = await iterator.next();
+        if (next.done) {
+          return;
+        }
+        yield next.value;
+      }
+    } finally {
+      await iterator.return?.();
+    }
+  }
+
+  return resume();
+}
+
+/**
+ * Zerlegt gestreamten NDJSON-Text in Objekte; unvollständige Zeilen werden
+ * bis zum nächsten Block zurückgehalten
+ */
+export class NdjsonParser<T = unknown> {
+  private rest = '';
+
+  /**
+   * Verarbeitet einen Textblock
+   *
+   * @param text - Dekodierter Textblock
+   * @returns Vollständig empfangene Objekte
+   */
+  push(text: string): T[] {
+    const lines = (this.rest + text).split('\n');
+    this.rest = lines.pop() ?? '';
+    return lines.filter(line => line.trim() !== '').map(line => JSON.parse(line) as T);
+  }
+
+  /**
+   * Verarbeitet den Rest nach dem Ende des Streams
+   *
+   * @returns Letztes Objekt, falls der Stream ohne Zeilenumbruch endete
+   */
+  flush(): T[] {
+    const rest = this.rest;
+    this.rest = '';
+    return rest.trim() !== '' ? [JSON.parse(rest) as T] : [];
+  }
+}
@@ -0,0 +1,109 @@
+/**
+ * Messung je API-Anfrage: Gesamtdauer, Antwortgröße und optionaler
+ * Server-Timing-Header mit der Aufteilung auf die Verarbeitungsschritte
+ *
+ * Nur für den Server: die Schritte einer Anfrage werden über AsyncLocalStorage
+ * zugeordnet, auch wenn sie tief in den Services gemessen werden.
+ */
+
+import { AsyncLocalStorage } from 'async_hooks';
+
+import { NextRequest, NextResponse } from 'next/server';
+
+import { METRICS_CONFIG } from '@/config/app';
+import {
+  metrics,
+  recordPayload,
+  RequestTimings,
+  setRequestTimingsProvider,
+  timeStage,
+} from '@/lib/metrics';
+
+const storage = new AsyncLocalStorage<RequestTimings>();
+setRequestTimingsProvider(() => storage.getStore());
+
+const requestDuration = metrics.histogram(
+  'rd_http_request_duration_seconds',
+  'Duration of API requests until the response headers are ready'
+);
+
+/**
+ * Prüft, ob die Anfrage einen Server-Timing-Header erhalten soll
+ *
+ * @param request - Eingehende Anfrage
+ * @returns true bei METRICS_SERVER_TIMING=always oder auf Anforderung
+ */
+export function wantsServerTiming(request: NextRequest): boolean {
+  switch (METRICS_CONFIG.serverTiming) {
+    case 'always':
+      return true;
+    case 'off':
+      return false;
+    default:
+      return (
+        request.nextUrl.searchParams.get('timing') === '1' ||
+        request.headers.get('x-server-timing') === '1'
+      );
+  }
+}
+
+/**
+ * Führt einen Route-Handler mit Messung der Anfrage aus
+ *
+ * Bei gestreamten Antworten endet die Messung, sobald die Header feststehen;
+ * die Dauer des Streamings erfassen die Export-Schritte selbst.
+ *
+ * @param route - Route für das Label, z.B. '/api/raumbuch/[id]'
+ * @param request - Eingehende Anfrage
+ * @param handler - Eigentlicher Route-Handler
+ * @returns Antwort des Handlers, ggf. mit Server-Timing-Header
+ */
+export async function withRequestMetrics(
+  route: string,
+  request: NextRequest,
+  handler: () => Promise<Response>
+): Promise<Response> {
+  const timings = new RequestTimings();
+  const start = performance.now();
+  let status = 500;
+
+  try {
+    const response = await storage.run(timings, handler);
+    status = response.status;
+
+    if (METRICS_CONFIG.enabled && wantsServerTiming(request)) {
+      timings.add('total', performance.now() - start);
+      response.headers.set('Server-Timing', timings.toHeader());
+    }
+
+    return response;
+  } finally {
+    if (METRICS_CONFIG.enabled) {
+      requestDuration.observe(
+        { route, method: request.method, status: String(status) },
+        (performance.now() - start) / 1000
+      );
+    }
+  }
+}
+
+/**
+ * Erstellt eine JSON-Antwort und misst dabei die Serialisierung und die Größe
+ *
+ * @param route - Route für das Label
+ * @param payload - Zu serialisierende Daten
+ * @param init - Status und weitere Header
+ * @returns JSON-Antwort
+ */
+export function jsonResponse(
+  route: string,
+  payload: unknown,
+  init: ResponseInit = {}
+): NextResponse {
+  const body = timeStage('serialize', () => JSON.stringify(payload));
+  recordPayload(route, Buffer.byteLength(body));
+
+  const headers = new Headers(init.headers);
+  headers.set('Content-Type', 'application/json');
+  return new NextResponse(body, { ...init, headers });
+}
@@ -0,0 +1,126 @@
+/**
+ * Vorberechnete Sortierreihenfolgen für Tabellen
+ *
+ * Je Spalte wird einmal eine aufsteigende Permutation der Zeilenpositionen
+ * berechnet und gemerkt; die absteigende Reihenfolge entsteht daraus ohne
+ * erneutes Sortieren. Ein Spalten- oder Richtungswechsel kostet damit nach der
+ * ersten Sortierung keinen Sortierlauf mehr.
+ *
+ * Die Reihenfolge entspricht der bisherigen Array.sort()-Vergleichsfunktion der
+ * Raumbuch-Tabelle: leere Werte zuerst (absteigend zuletzt), Zahlen numerisch,
+ * sonst Textvergleich ohne Groß-/Kleinschreibung; gleiche Werte behalten ihre
+ * Ausgangsreihenfolge.
+ */
+
+export type SortDirection = 'asc' | 'desc';
+
+// Intl.Collator ohne Optionen vergleicht wie String.prototype.localeCompare()
+const collator = new Intl.Collator();
+
+/**
+ * Vergleichswert einer Zelle: Zahl, kleingeschriebener Text oder null
+ *
+ * @param value - Zellwert
+ * @returns Vergleichswert
+ */
+function sortValue(value: unknown): number | string | null {
+  if (value === null || value === undefined) return null;
+  if (typeof value === 'number') return value;
+  return String(value).toLowerCase();
+}
+
+/**
+ * Vergleicht zwei Vergleichswerte aufsteigend
+ *
+ * @param a - Erster Wert
+ * @param b - Zweiter Wert
+ * @returns Negativ, 0 oder positiv
+ */
+function compareAscending(a: number | string | null, b: number | string | null): number {
+  if (a === null || b === null) {
+    return a === b ? 0 : a === null ? -1 : 1;
+  }
+  if (typeof a === 'number' && typeof b === 'number') {
+    return a - b;
+  }
+  return collator.compare(String(a), String(b));
+}
+
+/**
+ * Aufsteigende, stabile Sortierreihenfolge einer Spalte
+ *
+ * @param data - Zeilen
+ * @param key - Spalte
+ * @returns Zeilenpositionen in Sortierreihenfolge
+ */
+export function sortPermutation<T>(data: T[], key: keyof T): Uint32Array {
+  const values = data.map(row => sortValue(row[key]));
+  const order = Array.from(values.keys());
+  // Array.prototype.sort ist stabil
+  order.sort((a, b) => compareAscending(values[a], values[b]));
+  return Uint32Array.from(order);
+}
+
+/**
+ * Kehrt eine aufsteigende Reihenfolge um; Gruppen gleicher Werte behalten
+ * dabei ihre Ausgangsreihenfolge (wie eine stabile absteigende Sortierung)
+ *
+ * @param data - Zeilen
+ * @param key - Spalte
+ * @param ascending - Ergebnis von sortPermutation()
+ * @returns Zeilenpositionen absteigend
+ */
+export function reversePermutation<T>(
+  data: T[],
+  key: keyof T,
+  ascending: Uint32Array
+): Uint32Array {
+  const descending = new Uint32Array(ascending.length);
+  let next = 0;
+  let end = ascending.length;
+
+  while (end > 0) {
+    const value = sortValue(data[ascending[end - 1]][key]);
+    let start = end - 1;
+    while (start > 0 && compareAscending(sortValue(data[ascending[start - 1]][key]), value) === 0) {
+      start--;
+    }
+    descending.set(ascending.subarray(start, end), next);
+    next += end - start;
+    end = start;
+  }
+
+  return descending;
+}
+
+/**
+ * Merkt sich die Sortierreihenfolgen aller bereits sortierten Spalten
+ */
+export class SortIndex<T> {
+  private readonly data: T[];
+  private readonly orders = new Map<string, Uint32Array>();
+
+  constructor(data: T[]) {
+    this.data = data;
+  }
+
+  /**
+   * Reihenfolge einer Spalte, beim ersten Zugriff berechnet
+   *
+   * @param key - Spalte
+   * @param direction - Sortierrichtung
+   * @returns Zeilenpositionen in Sortierreihenfolge
+   */
+  order(key: keyof T, direction: SortDirection): Uint32Array {
+    const cacheKey = `${String(key)}:${direction}`;
+    let order = this.orders.get(cacheKey);
+    if (!order) {
+      order =
+        direction === 'asc'
+          ? sortPermutation(this.data, key)
+          : reversePermutation(this.data, key, this.order(key, 'asc'));
+      this.orders.set(cacheKey, order);
+    }
+    return order;
+  }
+}
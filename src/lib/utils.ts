@@ -32,6 +32,36 @@ export function delay(ms: number): Promise<void> {
   return new Promise(resolve => setTimeout(resolve, ms));
 }
 
+/**
+ * Wendet eine asynchrone Funktion auf alle Elemente an, mit höchstens
+ * `concurrency` gleichzeitig laufenden Aufrufen
+ *
+ * @param items - Zu verarbeitende Elemente
+ * @param concurrency - Maximale Anzahl gleichzeitiger Aufrufe
+ * @param fn - Asynchrone Funktion je Element
+ * @returns Ergebnisse in der Reihenfolge der Elemente
+ */
+export async function mapWithConcurrency<T, R>(
+  items: T[],
+  concurrency: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+
+  // Jeder Worker holt sich das nächste freie Element, bis alle verarbeitet sind
+  async function worker(): Promise<void> {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index], index);
+    }
+  }
+
+  const workers = Array.from({ length: Math.min(Math.max(1, concurrency), items.length) }, worker);
+  await Promise.all(workers);
+  return results;
+}
+
 /**
  * Truncate text to a specific length and append ellipsis if needed
  *
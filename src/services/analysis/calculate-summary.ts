@@ -2,32 +2,21 @@
  * Service zum Berechnen von Zusammenfassungen für Raumbuch-Daten
  */
 
-import { groupBy } from '@/lib/utils';
+import { timeStage } from '@/lib/metrics';
+
+import { aggregateRaumbuch, summaryFromAggregates } from './columnar-aggregation';
 
 import type { RaumbuchRow, RaumbuchSummary } from '@/types/raumbuch.types';
 
 // Verwende RaumbuchRow als RaumbuchEntry
 type RaumbuchEntry = RaumbuchRow;
 
-/**
- * Schützt die Berechnung gegen NULL-Werte und ungültige Zahlen
- *
- * @param value - Der zu verarbeitende Wert
- * @param defaultValue - Standardwert, wenn der Wert ungültig ist
- * @returns Eine gültige Zahl oder den Standardwert
- */
-function safeNumber(value: unknown, defaultValue: number = 0): number {
-  if (value === null || value === undefined) {
-    return defaultValue;
-  }
-
-  const parsed = typeof value === 'number' ? value : parseFloat(String(value));
-  return isNaN(parsed) ? defaultValue : parsed;
-}
-
 /**
  * Berechnet eine Zusammenfassung der Raumbuch-Daten
  *
+ * Gesamtwerte sowie Bereichs- und RG-Statistiken entstehen in einem
+ * einzigen spaltenbasierten Durchlauf (siehe columnar-aggregation.ts).
+ *
  * @param data - Liste der Raumbuch-Einträge
  * @returns Zusammenfassung mit verschiedenen Statistiken
  */
@@ -45,70 +34,7 @@ export function calculateSummary(data: RaumbuchEntry[]): RaumbuchSummary {
     };
   }
 
-  // Berechnung der Gesamtwerte
-  const totalRooms = data.length;
-
-  const totalMenge = data.reduce((sum, item) => sum + safeNumber(item.Menge), 0);
-
-  const totalMengeAktivMonat = data.reduce(
-    (sum, item) => sum + safeNumber(item.MengeAktivMonat),
-    0
-  );
-
-  const totalVkWertNettoMonat = data.reduce(
-    (sum, item) => sum + safeNumber(item.VkWertNettoMonat),
-    0
-  );
-
-  const totalVkWertBruttoMonat = data.reduce(
-    (sum, item) => sum + safeNumber(item.VkWertBruttoMonat),
-    0
-  );
-
-  const totalRgWertNettoMonat = data.reduce(
-    (sum, item) => sum + safeNumber(item.RgWertNettoMonat),
-    0
-  );
-
-  const totalRgWertBruttoMonat = data.reduce(
-    (sum, item) => sum + safeNumber(item.RgWertBruttoMonat),
-    0
-  );
-
-  const totalStundenMonat = data.reduce((sum, item) => sum + safeNumber(item.StundeMonat), 0);
-
-  // Statistiken nach Bereichen
-  const groupedByBereich = groupBy(data, 'Bereich');
-  const bereichStats = Object.entries(groupedByBereich).map(([bereich, items]) => ({
-    bereich: bereich,
-    menge: items.reduce((sum, item) => sum + safeNumber(item.Menge), 0),
-    vkWertNettoMonat: items.reduce((sum, item) => sum + safeNumber(item.VkWertNettoMonat), 0),
-    vkWertBruttoMonat: items.reduce((sum, item) => sum + safeNumber(item.VkWertBruttoMonat), 0),
-    stundenMonat: items.reduce((sum, item) => sum + safeNumber(item.StundeMonat), 0),
-  }));
-
-  // Statistiken nach Reinigungsgruppen
-  const groupedByRG = groupBy(data, 'Reinigungsgruppe');
-  const rgStats = Object.entries(groupedByRG).map(([reinigungsgruppe, items]) => ({
-    reinigungsgruppe: reinigungsgruppe,
-    menge: items.reduce((sum, item) => sum + safeNumber(item.Menge), 0),
-    vkWertNettoMonat: items.reduce((sum, item) => sum + safeNumber(item.VkWertNettoMonat), 0),
-    vkWertBruttoMonat: items.reduce((sum, item) => sum + safeNumber(item.VkWertBruttoMonat), 0),
-    stundenMonat: items.reduce((sum, item) => sum + safeNumber(item.StundeMonat), 0),
-  }));
-
-  return {
-    totalRooms,
-    totalMenge,
-    totalMengeAktivMonat,
-    totalVkWertNettoMonat,
-    totalVkWertBruttoMonat,
-    totalRgWertNettoMonat,
-    totalRgWertBruttoMonat,
-    totalStundenMonat,
-    bereichStats,
-    rgStats,
-  };
+  return timeStage('summary', () => summaryFromAggregates(aggregateRaumbuch(data)));
 }
 
 /**
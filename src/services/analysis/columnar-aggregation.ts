@@ -0,0 +1,513 @@
+/**
+ * Spaltenbasierte Aggregation für Raumbuch-Daten
+ *
+ * calculateSummary(), prepareDataForVisualization() und prepareGebaeudeteilData()
+ * brauchen dieselben Summen: sieben Gesamtwerte und Summen je Bereich,
+ * Reinigungsgruppe, Etage und Gebäudeteil. Statt die Zeilen für jede Kennzahl
+ * erneut zu durchlaufen und mehrfach zu gruppieren, werden sie einmal in
+ * Float64Array-Spalten mit dictionary-kodierten Gruppenschlüsseln überführt
+ * und anschließend in einem einzigen Durchlauf summiert.
+ *
+ * Die Summation erfolgt je Gruppe in Zeilenreihenfolge, die Ergebnisse sind
+ * daher bitgenau identisch mit den früheren reduce()-Ketten. Das Python-Pendant
+ * für die Batch-Auswertung liegt in scripts/raumbuch_aggregate.py; beide werden
+ * gegen tests/fixtures/raumbuch-aggregation.golden.json geprüft.
+ */
+
+import type { RaumbuchFrame } from './raumbuch-frame';
+import type {
+  RaumbuchAggregateRow,
+  RaumbuchRow,
+  RaumbuchSummary,
+  VisualizationData,
+} from '@/types/raumbuch.types';
+
+// Alias-Typ
+type RaumbuchEntry = RaumbuchRow;
+
+/**
+ * Summierte Kennzahlen in Spaltenreihenfolge
+ */
+export const MEASURES = [
+  'Menge',
+  'MengeAktivMonat',
+  'VkWertNettoMonat',
+  'VkWertBruttoMonat',
+  'RgWertNettoMonat',
+  'RgWertBruttoMonat',
+  'StundeMonat',
+] as const;
+
+/**
+ * Gruppierungsspalten (dictionary-kodiert)
+ */
+export const DIMENSIONS = ['Bereich', 'Reinigungsgruppe', 'Etage', 'Gebaeudeteil'] as const;
+
+export type Measure = (typeof MEASURES)[number];
+export type Dimension = (typeof DIMENSIONS)[number];
+
+const MEASURE_COUNT = MEASURES.length;
+const MENGE = MEASURES.indexOf('Menge');
+const VK_NETTO = MEASURES.indexOf('VkWertNettoMonat');
+const VK_BRUTTO = MEASURES.indexOf('VkWertBruttoMonat');
+const STUNDE = MEASURES.indexOf('StundeMonat');
+
+// Felder vorberechneter Gruppenzeilen je Kennzahl (Index wie MEASURES)
+type AggregateRowMeasure = Exclude<keyof RaumbuchAggregateRow, 'dimension' | 'key' | 'anzahl'>;
+const AGGREGATE_ROW_MEASURES: AggregateRowMeasure[] = [
+  'menge',
+  'mengeAktivMonat',
+  'vkWertNettoMonat',
+  'vkWertBruttoMonat',
+  'rgWertNettoMonat',
+  'rgWertBruttoMonat',
+  'stundenMonat',
+];
+
+/**
+ * Dictionary einer Gruppierungsspalte: Schlüssel wie bei groupBy() (String(wert))
+ */
+export interface KeyDictionary {
+  /** Schlüssel je Code, in Reihenfolge des ersten Auftretens */
+  keys: string[];
+  /** Code je Zeile */
+  codes: Int32Array;
+}
+
+/**
+ * Raumbuch-Daten in Spaltenform
+ */
+export interface RaumbuchColumns {
+  rowCount: number;
+  measures: Record<Measure, Float64Array>;
+  dimensions: Record<Dimension, KeyDictionary>;
+}
+
+/**
+ * Ergebnis des Aggregationsdurchlaufs
+ */
+export interface RaumbuchAggregates {
+  rowCount: number;
+  /** Gesamtsumme je Kennzahl (Index wie MEASURES) */
+  totals: Float64Array;
+  /** Summen je Gruppe, zeilenweise: sums[code * MEASURES.length + kennzahl] */
+  groups: Record<Dimension, { keys: string[]; sums: Float64Array }>;
+}
+
+/**
+ * Schützt die Berechnung gegen NULL-Werte und ungültige Zahlen (wie safeNumber)
+ *
+ * @param value - Der zu verarbeitende Wert
+ * @returns Eine gültige Zahl oder 0
+ */
+function numericValue(value: unknown): number {
+  if (typeof value === 'number' && !isNaN(value)) {
+    return value;
+  }
+
+  if (value === null || value === undefined) {
+    return 0;
+  }
+
+  const parsed = typeof value === 'number' ? value : parseFloat(String(value));
+  return isNaN(parsed) ? 0 : parsed;
+}
+
+/**
+ * Überführt Raumbuch-Zeilen in Spaltenform
+ *
+ * @param data - Raumbuch-Einträge
+ * @returns Kennzahlen als Float64Array und dictionary-kodierte Gruppenschlüssel
+ */
+export function toColumns(data: RaumbuchEntry[]): RaumbuchColumns {
+  const rowCount = data ? data.length : 0;
+
+  const menge = new Float64Array(rowCount);
+  const mengeAktivMonat = new Float64Array(rowCount);
+  const vkWertNettoMonat = new Float64Array(rowCount);
+  const vkWertBruttoMonat = new Float64Array(rowCount);
+  const rgWertNettoMonat = new Float64Array(rowCount);
+  const rgWertBruttoMonat = new Float64Array(rowCount);
+  const stundeMonat = new Float64Array(rowCount);
+
+  const bereich = new KeyEncoder(rowCount);
+  const reinigungsgruppe = new KeyEncoder(rowCount);
+  const etage = new KeyEncoder(rowCount);
+  const gebaeudeteil = new KeyEncoder(rowCount);
+
+  // Ein Durchlauf über die Zeilen mit direktem Feldzugriff
+  for (let row = 0; row < rowCount; row++) {
+    const item = data[row];
+
+    menge[row] = numericValue(item.Menge);
+    mengeAktivMonat[row] = numericValue(item.MengeAktivMonat);
+    vkWertNettoMonat[row] = numericValue(item.VkWertNettoMonat);
+    vkWertBruttoMonat[row] = numericValue(item.VkWertBruttoMonat);
+    rgWertNettoMonat[row] = numericValue(item.RgWertNettoMonat);
+    rgWertBruttoMonat[row] = numericValue(item.RgWertBruttoMonat);
+    stundeMonat[row] = numericValue(item.StundeMonat);
+
+    bereich.add(row, item.Bereich);
+    reinigungsgruppe.add(row, item.Reinigungsgruppe);
+    etage.add(row, item.Etage);
+    gebaeudeteil.add(row, item.Gebaeudeteil);
+  }
+
+  return {
+    rowCount,
+    measures: {
+      Menge: menge,
+      MengeAktivMonat: mengeAktivMonat,
+      VkWertNettoMonat: vkWertNettoMonat,
+      VkWertBruttoMonat: vkWertBruttoMonat,
+      RgWertNettoMonat: rgWertNettoMonat,
+      RgWertBruttoMonat: rgWertBruttoMonat,
+      StundeMonat: stundeMonat,
+    },
+    dimensions: {
+      Bereich: bereich.dictionary(),
+      Reinigungsgruppe: reinigungsgruppe.dictionary(),
+      Etage: etage.dictionary(),
+      Gebaeudeteil: gebaeudeteil.dictionary(),
+    },
+  };
+}
+
+/**
+ * Dictionary-Kodierung einer Gruppierungsspalte
+ *
+ * Nachgeschlagen wird über den Rohwert, String() nur beim ersten Auftreten.
+ * Werte mit gleichem String (z.B. 1 und '1') teilen sich wie bei groupBy()
+ * eine Gruppe.
+ */
+class KeyEncoder {
+  private readonly keys: string[] = [];
+  private readonly codes: Int32Array;
+  private readonly lookup = new Map<unknown, number>();
+
+  constructor(rowCount: number) {
+    this.codes = new Int32Array(rowCount);
+  }
+
+  add(row: number, value: unknown): void {
+    this.codes[row] = this.code(value);
+  }
+
+  code(value: unknown): number {
+    let code = this.lookup.get(value);
+    if (code === undefined) {
+      const key = String(value);
+      code = this.lookup.get(key);
+      if (code === undefined) {
+        code = this.keys.length;
+        this.keys.push(key);
+        this.lookup.set(key, code);
+      }
+      this.lookup.set(value, code);
+    }
+    return code;
+  }
+
+  dictionary(): KeyDictionary {
+    return { keys: this.keys, codes: this.codes };
+  }
+}
+
+/**
+ * Summiert alle Kennzahlen gesamt und je Gruppe
+ *
+ * Jede Kennzahlspalte wird je Gruppierung einmal linear durchlaufen; innerhalb
+ * einer Gruppe wird wie bei reduce() in Zeilenreihenfolge addiert.
+ *
+ * @param columns - Raumbuch-Daten in Spaltenform
+ * @returns Gesamtsummen und Gruppensummen
+ */
+export function aggregateColumns(columns: RaumbuchColumns): RaumbuchAggregates {
+  const { rowCount, measures, dimensions } = columns;
+  const totals = new Float64Array(MEASURE_COUNT);
+  const groups = {} as RaumbuchAggregates['groups'];
+
+  DIMENSIONS.forEach(dimension => {
+    const { keys } = dimensions[dimension];
+    groups[dimension] = { keys, sums: new Float64Array(keys.length * MEASURE_COUNT) };
+  });
+
+  MEASURES.forEach((measure, m) => {
+    const values = measures[measure];
+
+    let total = 0;
+    for (let row = 0; row < rowCount; row++) {
+      total += values[row];
+    }
+    totals[m] = total;
+
+    DIMENSIONS.forEach(dimension => {
+      const { codes } = dimensions[dimension];
+      const { sums } = groups[dimension];
+      for (let row = 0; row < rowCount; row++) {
+        sums[codes[row] * MEASURE_COUNT + m] += values[row];
+      }
+    });
+  });
+
+  return { rowCount, totals, groups };
+}
+
+/**
+ * Aggregiert Raumbuch-Zeilen (toColumns + aggregateColumns)
+ *
+ * @param data - Raumbuch-Einträge
+ * @returns Gesamtsummen und Gruppensummen
+ */
+export function aggregateRaumbuch(data: RaumbuchEntry[]): RaumbuchAggregates {
+  return aggregateColumns(toColumns(data));
+}
+
+/**
+ * Aggregiert die (ausgewählten) Zeilen eines Frames, ohne Zeilenobjekte zu bilden
+ *
+ * @param frame - Raumbuch-Daten in Spaltenform
+ * @returns Gesamtsummen und Gruppensummen wie aggregateRaumbuch() über dieselben Zeilen
+ */
+export function aggregateFrame(frame: RaumbuchFrame): RaumbuchAggregates {
+  return aggregateColumns(frame.toColumns());
+}
+
+/**
+ * Aggregiert Raumbuch-Zeilen einzeln, z.B. während sie gestreamt werden
+ *
+ * Summiert wie aggregateColumns() je Gruppe in Zeilenreihenfolge, das Ergebnis
+ * ist daher identisch mit aggregateRaumbuch() über dieselben Zeilen. Die Zeilen
+ * selbst werden nicht gehalten.
+ */
+export class RaumbuchAccumulator {
+  private rowCount = 0;
+  private readonly totals = new Float64Array(MEASURE_COUNT);
+  private readonly values = new Float64Array(MEASURE_COUNT);
+  private readonly encoders = DIMENSIONS.map(() => new KeyEncoder(0));
+  private readonly sums = DIMENSIONS.map(() => new Float64Array(16 * MEASURE_COUNT));
+
+  /**
+   * Nimmt eine Zeile auf
+   *
+   * @param item - Raumbuch-Eintrag
+   */
+  add(item: Partial<RaumbuchEntry>): void {
+    const { values, totals } = this;
+    values[0] = numericValue(item.Menge);
+    values[1] = numericValue(item.MengeAktivMonat);
+    values[2] = numericValue(item.VkWertNettoMonat);
+    values[3] = numericValue(item.VkWertBruttoMonat);
+    values[4] = numericValue(item.RgWertNettoMonat);
+    values[5] = numericValue(item.RgWertBruttoMonat);
+    values[6] = numericValue(item.StundeMonat);
+
+    for (let m = 0; m < MEASURE_COUNT; m++) {
+      totals[m] += values[m];
+    }
+
+    for (let d = 0; d < DIMENSIONS.length; d++) {
+      const offset = this.encoders[d].code(item[DIMENSIONS[d]]) * MEASURE_COUNT;
+      let sums = this.sums[d];
+      if (offset + MEASURE_COUNT > sums.length) {
+        const grown = new Float64Array(sums.length * 2);
+        grown.set(sums);
+        sums = this.sums[d] = grown;
+      }
+      for (let m = 0; m < MEASURE_COUNT; m++) {
+        sums[offset + m] += values[m];
+      }
+    }
+
+    this.rowCount++;
+  }
+
+  /**
+   * Liefert die bisherigen Summen
+   *
+   * @returns Gesamtsummen und Gruppensummen wie aggregateColumns()
+   */
+  result(): RaumbuchAggregates {
+    const groups = {} as RaumbuchAggregates['groups'];
+    DIMENSIONS.forEach((dimension, d) => {
+      const { keys } = this.encoders[d].dictionary();
+      groups[dimension] = {
+        keys: keys.slice(),
+        sums: this.sums[d].slice(0, keys.length * MEASURE_COUNT),
+      };
+    });
+
+    return { rowCount: this.rowCount, totals: this.totals.slice(), groups };
+  }
+}
+
+/**
+ * Übernimmt vorberechnete Gruppenzeilen (z.B. aus GROUPING SETS in der
+ * Datenbank) als Aggregationsergebnis
+ *
+ * Die Gruppen behalten die Reihenfolge der Zeilen; Schlüssel werden wie bei
+ * groupBy() über String(wert) gebildet.
+ *
+ * @param rows - Gesamtzeile (dimension null) und Zeilen je Gruppe
+ * @returns Gesamtsummen und Gruppensummen wie aggregateColumns()
+ */
+export function aggregatesFromGroupRows(rows: RaumbuchAggregateRow[]): RaumbuchAggregates {
+  const totals = new Float64Array(MEASURE_COUNT);
+  const encoders = {} as Record<Dimension, KeyEncoder>;
+  const groupSums = {} as Record<Dimension, number[]>;
+  let rowCount = 0;
+
+  DIMENSIONS.forEach(dimension => {
+    encoders[dimension] = new KeyEncoder(0);
+    groupSums[dimension] = [];
+  });
+
+  rows.forEach(row => {
+    if (row.dimension === null) {
+      rowCount = row.anzahl;
+      AGGREGATE_ROW_MEASURES.forEach((field, m) => {
+        totals[m] = row[field];
+      });
+      return;
+    }
+
+    const sums = groupSums[row.dimension];
+    const offset = encoders[row.dimension].code(row.key) * MEASURE_COUNT;
+    AGGREGATE_ROW_MEASURES.forEach((field, m) => {
+      sums[offset + m] = (sums[offset + m] ?? 0) + row[field];
+    });
+  });
+
+  const groups = {} as RaumbuchAggregates['groups'];
+  DIMENSIONS.forEach(dimension => {
+    const { keys } = encoders[dimension].dictionary();
+    groups[dimension] = { keys, sums: Float64Array.from(groupSums[dimension]) };
+  });
+
+  return { rowCount, totals, groups };
+}
+
+/**
+ * Liefert die Codes einer Gruppierung in der Reihenfolge von Object.entries(groupBy(...))
+ * (Integer-Schlüssel aufsteigend, danach Reihenfolge des ersten Auftretens)
+ *
+ * @param keys - Schlüssel je Code
+ * @returns Codes in Ausgabereihenfolge
+ */
+function orderedCodes(keys: string[]): number[] {
+  const index: Record<string, number> = Object.create(null);
+  keys.forEach((key, code) => {
+    index[key] = code;
+  });
+  return Object.keys(index).map(key => index[key]);
+}
+
+/**
+ * Rundet wie Number(sum.toFixed(2))
+ *
+ * @param value - Summe
+ * @returns Auf zwei Nachkommastellen gerundete Zahl
+ */
+function round2(value: number): number {
+  return Number(value.toFixed(2));
+}
+
+/**
+ * Erzeugt die Zusammenfassung (Ergebnis wie calculateSummary)
+ *
+ * @param aggregates - Ergebnis von aggregateColumns()
+ * @returns Zusammenfassung mit Gesamtwerten, Bereichs- und RG-Statistiken
+ */
+export function summaryFromAggregates(aggregates: RaumbuchAggregates): RaumbuchSummary {
+  const { rowCount, totals, groups } = aggregates;
+  const summary: RaumbuchSummary = {
+    totalRooms: rowCount,
+    totalMenge: totals[MENGE],
+    totalMengeAktivMonat: totals[MEASURES.indexOf('MengeAktivMonat')],
+    totalVkWertNettoMonat: totals[VK_NETTO],
+    totalVkWertBruttoMonat: totals[VK_BRUTTO],
+    totalRgWertNettoMonat: totals[MEASURES.indexOf('RgWertNettoMonat')],
+    totalRgWertBruttoMonat: totals[MEASURES.indexOf('RgWertBruttoMonat')],
+    totalStundenMonat: totals[STUNDE],
+  };
+
+  if (rowCount === 0) {
+    return summary;
+  }
+
+  const { keys: bereiche, sums: bereichSums } = groups.Bereich;
+  summary.bereichStats = orderedCodes(bereiche).map(code => ({
+    bereich: bereiche[code],
+    menge: bereichSums[code * MEASURE_COUNT + MENGE],
+    vkWertNettoMonat: bereichSums[code * MEASURE_COUNT + VK_NETTO],
+    vkWertBruttoMonat: bereichSums[code * MEASURE_COUNT + VK_BRUTTO],
+    stundenMonat: bereichSums[code * MEASURE_COUNT + STUNDE],
+  }));
+
+  const { keys: gruppen, sums: rgSums } = groups.Reinigungsgruppe;
+  summary.rgStats = orderedCodes(gruppen).map(code => ({
+    reinigungsgruppe: gruppen[code],
+    menge: rgSums[code * MEASURE_COUNT + MENGE],
+    vkWertNettoMonat: rgSums[code * MEASURE_COUNT + VK_NETTO],
+    vkWertBruttoMonat: rgSums[code * MEASURE_COUNT + VK_BRUTTO],
+    stundenMonat: rgSums[code * MEASURE_COUNT + STUNDE],
+  }));
+
+  return summary;
+}
+
+/**
+ * Summen einer Kennzahl je Gruppe, gerundet auf zwei Nachkommastellen.
+ * Leere Schlüssel werden übersprungen.
+ *
+ * @param aggregates - Ergebnis von aggregateColumns()
+ * @param dimension - Gruppierungsspalte
+ * @param measure - Kennzahl
+ * @returns Record mit Gruppe als Key und Summe als Value
+ */
+export function groupTotals(
+  aggregates: RaumbuchAggregates,
+  dimension: Dimension,
+  measure: Measure
+): Record<string, number> {
+  const { keys, sums } = aggregates.groups[dimension];
+  const m = MEASURES.indexOf(measure);
+  const result: Record<string, number> = {};
+  orderedCodes(keys).forEach(code => {
+    if (!keys[code]) return; // Überspringe leere Gruppen
+    result[keys[code]] = round2(sums[code * MEASURE_COUNT + m]);
+  });
+  return result;
+}
+
+/**
+ * Erzeugt die Visualisierungsdaten (Ergebnis wie prepareDataForVisualization)
+ *
+ * @param aggregates - Ergebnis von aggregateColumns()
+ * @returns Menge je Bereich, Verkaufswert je Reinigungsgruppe, Stunden je Etage
+ */
+export function visualizationFromAggregates(aggregates: RaumbuchAggregates): VisualizationData {
+  if (aggregates.rowCount === 0) {
+    return {};
+  }
+
+  return {
+    bereichData: groupTotals(aggregates, 'Bereich', 'Menge'),
+    rgData: groupTotals(aggregates, 'Reinigungsgruppe', 'VkWertNettoMonat'),
+    etageData: groupTotals(aggregates, 'Etage', 'StundeMonat'),
+  };
+}
+
+/**
+ * Erzeugt die Gebäudeteil-Daten (Ergebnis wie prepareGebaeudeteilData)
+ *
+ * @param aggregates - Ergebnis von aggregateColumns()
+ * @returns Menge je Gebäudeteil
+ */
+export function gebaeudeteilFromAggregates(aggregates: RaumbuchAggregates): Record<string, number> {
+  if (aggregates.rowCount === 0) {
+    return {};
+  }
+
+  return groupTotals(aggregates, 'Gebaeudeteil', 'Menge');
+}
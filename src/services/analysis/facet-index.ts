@@ -0,0 +1,356 @@
+/**
+ * Facettenindex für die clientseitige Filterung von Raumbuch-Daten
+ *
+ * Die Zeilen eines Gebäudes werden einmal geladen; je Facette (Bereich,
+ * Gebäudeteil, Etage, Reinigungsgruppe) und Wert entsteht eine Bitmap über die
+ * Zeilenpositionen (32 Zeilen je Uint32-Wort). Eine Filterkombination ist dann
+ * die UND-Verknüpfung der gewählten Bitmaps, die Anzahl je Facettenwert ein
+ * Popcount über die Schnittmenge mit den übrigen gewählten Facetten.
+ *
+ * Zusammenfassung und Diagrammdaten werden nur über die ausgewählten Zeilen
+ * berechnet (RaumbuchAccumulator, Ergebnis wie aggregateRaumbuch() auf den per
+ * filterRaumbuchData() gefilterten Zeilen) und je Auswahl zwischengespeichert.
+ *
+ * Die Funktionen sind frei von DOM-Abhängigkeiten und laufen im Web Worker
+ * (src/workers/facet-index.worker.ts) wie auch synchron im Hauptthread.
+ */
+
+import {
+  aggregateRaumbuch,
+  RaumbuchAccumulator,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+} from './columnar-aggregation';
+
+import type { FilterOptions } from './raumbuch-analysis';
+import type {
+  RaumbuchFilter,
+  RaumbuchRow,
+  RaumbuchSummary,
+  VisualizationData,
+} from '@/types/raumbuch.types';
+
+/**
+ * Facetten: Filter-Parameter → Spalte
+ */
+export const FACETS = {
+  bereich: 'Bereich',
+  gebaeudeteil: 'Gebaeudeteil',
+  etage: 'Etage',
+  reinigungsgruppe: 'Reinigungsgruppe',
+} as const;
+
+export type FacetKey = keyof typeof FACETS;
+
+const FACET_KEYS = Object.keys(FACETS) as FacetKey[];
+
+/**
+ * Gewählter Wert je Facette (fehlend oder leer = alle)
+ */
+export type FacetSelection = Partial<Record<FacetKey, string>>;
+
+/**
+ * Anzahl der Zeilen je Facettenwert unter der Auswahl der übrigen Facetten
+ */
+export type FacetCounts = Record<FacetKey, Record<string, number>>;
+
+/**
+ * Posting-Listen einer Facette
+ */
+export interface FacetPostings {
+  /** Werte, sortiert wie bei createFilterOptions() */
+  values: string[];
+  /** Bitmap der Zeilen je Wert (Index wie values) */
+  bitmaps: Uint32Array[];
+}
+
+/**
+ * Bitmap-Index über die Zeilen eines Gebäudes
+ */
+export interface FacetIndex {
+  rowCount: number;
+  /** Länge jeder Bitmap in Uint32-Worten */
+  wordCount: number;
+  facets: Record<FacetKey, FacetPostings>;
+}
+
+/**
+ * Ergebnis einer Abfrage des Facettenindex
+ */
+export interface FacetQueryResult {
+  /** Positionen der ausgewählten Zeilen in Ladereihenfolge */
+  positions: Uint32Array;
+  summary: RaumbuchSummary;
+  visualizationData: VisualizationData;
+  facetCounts: FacetCounts;
+}
+
+/**
+ * Erstellt den Bitmap-Index über alle Facetten
+ *
+ * @param rows - Raumbuch-Zeilen eines Gebäudes
+ * @returns Index mit einer Bitmap je Facettenwert
+ */
+export function buildFacetIndex(rows: Partial<RaumbuchRow>[]): FacetIndex {
+  const rowCount = rows.length;
+  const wordCount = Math.ceil(rowCount / 32);
+  const facets = {} as Record<FacetKey, FacetPostings>;
+
+  FACET_KEYS.forEach(facet => {
+    const column = FACETS[facet];
+    const postings = new Map<string, Uint32Array>();
+
+    for (let row = 0; row < rowCount; row++) {
+      const value = rows[row][column];
+      if (typeof value !== 'string' || value === '') continue;
+
+      let bitmap = postings.get(value);
+      if (!bitmap) {
+        bitmap = new Uint32Array(wordCount);
+        postings.set(value, bitmap);
+      }
+      bitmap[row >>> 5] |= 1 << (row & 31);
+    }
+
+    const values = [...postings.keys()].sort();
+    facets[facet] = { values, bitmaps: values.map(value => postings.get(value)!) };
+  });
+
+  return { rowCount, wordCount, facets };
+}
+
+/**
+ * Liest die Facetten-Auswahl aus einem Filter-Query-String
+ *
+ * @param filterQuery - Query-String wie von useFilter()
+ * @returns Auswahl je Facette (nur gesetzte Werte)
+ */
+export function parseFacetSelection(filterQuery?: string): FacetSelection {
+  const params = new URLSearchParams(filterQuery);
+  const selection: FacetSelection = {};
+  FACET_KEYS.forEach(facet => {
+    const value = params.get(facet);
+    if (value) selection[facet] = value;
+  });
+  return selection;
+}
+
+/**
+ * Stabiler Schlüssel einer Auswahl (für den Ergebnis-Cache)
+ *
+ * @param selection - Auswahl je Facette
+ * @returns Schlüssel, gleich für gleiche Auswahl
+ */
+export function facetSelectionKey(selection: FacetSelection | RaumbuchFilter): string {
+  return FACET_KEYS.map(facet => selection[facet] || '').join('\u0000');
+}
+
+/**
+ * Anzahl gesetzter Bits
+ *
+ * @param word - 32-Bit-Wort
+ * @returns Popcount
+ */
+function popcount(word: number): number {
+  word -= (word >>> 1) & 0x55555555;
+  word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+  return (((word + (word >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+}
+
+/**
+ * Bitmap aller Zeilen
+ *
+ * @param index - Facettenindex
+ * @returns Bitmap mit gesetzten Bits für alle Zeilen
+ */
+function allRows(index: FacetIndex): Uint32Array {
+  const bitmap = new Uint32Array(index.wordCount).fill(0xffffffff);
+  const rest = index.rowCount & 31;
+  if (rest > 0) {
+    bitmap[index.wordCount - 1] = (1 << rest) - 1;
+  }
+  return bitmap;
+}
+
+/**
+ * Schnittmenge der gewählten Facetten
+ *
+ * @param index - Facettenindex
+ * @param selection - Auswahl je Facette
+ * @param except - Facette, deren Auswahl unberücksichtigt bleibt
+ * @returns Bitmap der Zeilen oder null, wenn keine Facette eingrenzt
+ */
+function intersect(
+  index: FacetIndex,
+  selection: FacetSelection,
+  except?: FacetKey
+): Uint32Array | null {
+  let result: Uint32Array | null = null;
+
+  for (const facet of FACET_KEYS) {
+    const value = selection[facet];
+    if (!value || facet === except) continue;
+
+    const { values, bitmaps } = index.facets[facet];
+    const position = values.indexOf(value);
+    // Unbekannter Wert: keine Zeile passt
+    if (position < 0) return new Uint32Array(index.wordCount);
+
+    const bitmap = bitmaps[position];
+    if (!result) {
+      result = bitmap.slice();
+    } else {
+      for (let word = 0; word < index.wordCount; word++) {
+        result[word] &= bitmap[word];
+      }
+    }
+  }
+
+  return result;
+}
+
+/**
+ * Ermittelt die Zeilen einer Auswahl
+ *
+ * @param index - Facettenindex
+ * @param selection - Auswahl je Facette
+ * @returns Bitmap der ausgewählten Zeilen
+ */
+export function selectRows(index: FacetIndex, selection: FacetSelection): Uint32Array {
+  return intersect(index, selection) ?? allRows(index);
+}
+
+/**
+ * Wandelt eine Bitmap in aufsteigende Zeilenpositionen um
+ *
+ * @param bitmap - Bitmap der Zeilen
+ * @returns Positionen der gesetzten Bits
+ */
+export function bitmapPositions(bitmap: Uint32Array): Uint32Array {
+  let count = 0;
+  for (let word = 0; word < bitmap.length; word++) {
+    count += popcount(bitmap[word]);
+  }
+
+  const positions = new Uint32Array(count);
+  let next = 0;
+  for (let word = 0; word < bitmap.length; word++) {
+    let bits = bitmap[word];
+    while (bits !== 0) {
+      const lowest = bits & -bits;
+      positions[next++] = (word << 5) + (31 - Math.clz32(lowest));
+      bits ^= lowest;
+    }
+  }
+  return positions;
+}
+
+/**
+ * Zählt je Facettenwert die Zeilen unter der Auswahl der übrigen Facetten
+ *
+ * So bleibt in jeder Auswahlliste sichtbar, wie viele Zeilen ein Wechsel des
+ * Werts ergäbe, während die anderen Facetten die Auswahl eingrenzen.
+ *
+ * @param index - Facettenindex
+ * @param selection - Auswahl je Facette
+ * @returns Anzahl je Facette und Wert
+ */
+export function countFacets(index: FacetIndex, selection: FacetSelection): FacetCounts {
+  const counts = {} as FacetCounts;
+
+  FACET_KEYS.forEach(facet => {
+    const base = intersect(index, selection, facet);
+    const { values, bitmaps } = index.facets[facet];
+    const facetCounts: Record<string, number> = {};
+
+    values.forEach((value, position) => {
+      const bitmap = bitmaps[position];
+      let count = 0;
+      for (let word = 0; word < index.wordCount; word++) {
+        count += popcount(base ? bitmap[word] & base[word] : bitmap[word]);
+      }
+      facetCounts[value] = count;
+    });
+
+    counts[facet] = facetCounts;
+  });
+
+  return counts;
+}
+
+/**
+ * Facettenindex mit den zugehörigen Zeilen und einem Cache der Auswertungen
+ *
+ * Ohne Auswahl werden die einmal berechneten Gesamtsummen geliefert; bei einer
+ * Auswahl wird nur über deren Zeilen summiert. Zuletzt verwendete Auswahlen
+ * bleiben zwischengespeichert, sodass ein Zurückwechseln sofort antwortet.
+ */
+export class FacetIndexStore {
+  readonly index: FacetIndex;
+  private readonly rows: Partial<RaumbuchRow>[];
+  private readonly maxEntries: number;
+  private readonly results = new Map<string, FacetQueryResult>();
+
+  constructor(rows: Partial<RaumbuchRow>[], maxEntries = 32) {
+    this.rows = rows;
+    this.maxEntries = maxEntries;
+    this.index = buildFacetIndex(rows);
+  }
+
+  /**
+   * Werte je Facette (wie createFilterOptions())
+   *
+   * @returns Filteroptionen
+   */
+  filterOptions(): FilterOptions {
+    const { facets } = this.index;
+    return {
+      bereiche: facets.bereich.values,
+      gebaeudeteil: facets.gebaeudeteil.values,
+      etage: facets.etage.values,
+      reinigungsgruppe: facets.reinigungsgruppe.values,
+    };
+  }
+
+  /**
+   * Wertet eine Auswahl aus
+   *
+   * @param selection - Auswahl je Facette
+   * @returns Zeilenpositionen, Zusammenfassung, Diagrammdaten und Facettenanzahlen
+   */
+  query(selection: FacetSelection): FacetQueryResult {
+    const key = facetSelectionKey(selection);
+    const cached = this.results.get(key);
+    if (cached) {
+      // Als zuletzt verwendet markieren
+      this.results.delete(key);
+      this.results.set(key, cached);
+      return cached;
+    }
+
+    const selected = intersect(this.index, selection);
+    const positions = bitmapPositions(selected ?? allRows(this.index));
+
+    let aggregates;
+    if (selected) {
+      const accumulator = new RaumbuchAccumulator();
+      positions.forEach(position => accumulator.add(this.rows[position]));
+      aggregates = accumulator.result();
+    } else {
+      aggregates = aggregateRaumbuch(this.rows as RaumbuchRow[]);
+    }
+
+    const result: FacetQueryResult = {
+      positions,
+      summary: summaryFromAggregates(aggregates),
+      visualizationData: visualizationFromAggregates(aggregates),
+      facetCounts: countFacets(this.index, selection),
+    };
+
+    this.results.set(key, result);
+    if (this.results.size > this.maxEntries) {
+      this.results.delete(this.results.keys().next().value as string);
+    }
+    return result;
+  }
+}
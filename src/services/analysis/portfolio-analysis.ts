@@ -0,0 +1,125 @@
+/**
+ * Service zum Zusammenfassen von Gebäude-Summen zu einem Portfolio
+ *
+ * Die Summen je Gebäude kommen aus einer GROUP-BY-Abfrage; hier werden sie je
+ * Standort und gesamt addiert und um Kennzahlen ergänzt, die sich nicht
+ * summieren lassen (Wert je qm, Leistung je Stunde).
+ */
+
+import type {
+  Portfolio,
+  PortfolioGebaeudeRow,
+  PortfolioMeasures,
+  PortfolioScope,
+  PortfolioStandort,
+  PortfolioSums,
+} from '@/types/portfolio.types';
+
+// Standort während des Summierens (ohne abgeleitete Kennzahlen)
+type StandortSums = Pick<PortfolioStandort, 'standort_ID' | 'standort' | 'gebaeudeCount'> &
+  PortfolioSums;
+
+/**
+ * Summierbare Kennzahlen
+ */
+const SUM_FIELDS: (keyof PortfolioSums)[] = [
+  'anzahl',
+  'menge',
+  'mengeAktivMonat',
+  'vkWertNettoMonat',
+  'vkWertBruttoMonat',
+  'rgWertNettoMonat',
+  'rgWertBruttoMonat',
+  'stundenMonat',
+];
+
+/**
+ * Teilt zwei Summen, 0 wenn der Nenner 0 ist
+ *
+ * @param numerator - Zähler
+ * @param denominator - Nenner
+ * @returns Quotient oder 0
+ */
+function ratio(numerator: number, denominator: number): number {
+  return denominator === 0 ? 0 : numerator / denominator;
+}
+
+/**
+ * Leere Summen
+ *
+ * @returns Summen mit 0 für alle Kennzahlen
+ */
+function emptySums(): PortfolioSums {
+  return {
+    anzahl: 0,
+    menge: 0,
+    mengeAktivMonat: 0,
+    vkWertNettoMonat: 0,
+    vkWertBruttoMonat: 0,
+    rgWertNettoMonat: 0,
+    rgWertBruttoMonat: 0,
+    stundenMonat: 0,
+  };
+}
+
+/**
+ * Addiert die Kennzahlen von source auf target
+ *
+ * @param target - Summen, die erhöht werden
+ * @param source - Zu addierende Summen
+ */
+function addSums(target: PortfolioSums, source: PortfolioSums): void {
+  SUM_FIELDS.forEach(field => {
+    target[field] += source[field];
+  });
+}
+
+/**
+ * Ergänzt Summen um die abgeleiteten Kennzahlen
+ *
+ * @param sums - Summen (werden nicht verändert)
+ * @returns Summen mit Wert je qm und Leistung je Stunde
+ */
+export function withPortfolioRatios<T extends PortfolioSums>(sums: T): T & PortfolioMeasures {
+  return {
+    ...sums,
+    vkWertNettoProQm: ratio(sums.vkWertNettoMonat, sums.menge),
+    mengeProStunde: ratio(sums.mengeAktivMonat, sums.stundenMonat),
+  };
+}
+
+/**
+ * Erstellt das Portfolio aus den Summen je Gebäude
+ *
+ * @param scope - Standort und/oder Firma des Portfolios
+ * @param rows - Summen je Gebäude, sortiert nach Standort und Gebäude
+ * @returns Portfolio mit Gebäuden, Standorten und Gesamtsummen
+ */
+export function buildPortfolio(scope: PortfolioScope, rows: PortfolioGebaeudeRow[]): Portfolio {
+  const totals = emptySums();
+  const standorte = new Map<number, StandortSums>();
+
+  rows.forEach(row => {
+    addSums(totals, row);
+
+    let standort = standorte.get(row.standort_ID);
+    if (!standort) {
+      standort = {
+        standort_ID: row.standort_ID,
+        standort: row.standort,
+        gebaeudeCount: 0,
+        ...emptySums(),
+      };
+      standorte.set(row.standort_ID, standort);
+    }
+    standort.gebaeudeCount++;
+    addSums(standort, row);
+  });
+
+  return {
+    scope,
+    totals: withPortfolioRatios({ ...totals, gebaeudeCount: rows.length }),
+    standorte: Array.from(standorte.values(), withPortfolioRatios),
+    gebaeude: rows.map(withPortfolioRatios),
+  };
+}
@@ -4,11 +4,26 @@
  */
 
 import { toNumber } from '@/lib/formatters';
+import { countRows, timeStage } from '@/lib/metrics';
 
 import { calculateSummary } from './calculate-summary';
+import {
+  aggregateFrame,
+  aggregateRaumbuch,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+} from './columnar-aggregation';
 import { prepareDataForVisualization } from './prepare-visualization';
+import { RaumbuchFrame } from './raumbuch-frame';
 
-import type { RaumbuchRow, RaumbuchSummary, VisualizationData } from '@/types/raumbuch.types';
+import type { FrameString } from './raumbuch-frame';
+
+import type {
+  RaumbuchFilter,
+  RaumbuchRow,
+  RaumbuchSummary,
+  VisualizationData,
+} from '@/types/raumbuch.types';
 
 // Definiere fehlende Typen
 type RaumbuchEntry = RaumbuchRow;
@@ -71,31 +86,50 @@ export function preprocessData(data: RaumbuchEntry[]): RaumbuchEntry[] {
     'Aufschlag',
   ];
 
-  return data.map(item => {
-    const processedItem = { ...item };
-
-    // Numerische Felder als Zahlen konvertieren oder 0 setzen
-    numericFields.forEach(field => {
-      if (field in processedItem) {
-        // Typ-Assertion verwenden
-        (processedItem as Record<keyof RaumbuchEntry, unknown>)[field] = safeNumber(
-          (processedItem as Record<keyof RaumbuchEntry, unknown>)[field],
-          0
-        );
-      }
-    });
-
-    return processedItem;
-  });
+  countRows('preprocess', data.length);
+  return timeStage('preprocess', () =>
+    data.map(item => {
+      const processedItem = { ...item };
+
+      // Numerische Felder als Zahlen konvertieren oder 0 setzen
+      numericFields.forEach(field => {
+        if (field in processedItem) {
+          // Typ-Assertion verwenden
+          (processedItem as Record<keyof RaumbuchEntry, unknown>)[field] = safeNumber(
+            (processedItem as Record<keyof RaumbuchEntry, unknown>)[field],
+            0
+          );
+        }
+      });
+
+      return processedItem;
+    })
+  );
 }
 
 /**
  * Erstellt Filteroptionen aus den Raumbuch-Daten
  *
- * @param data - Liste von Raumbuch-Daten
+ * @param data - Liste von Raumbuch-Daten oder Frame
  * @returns Filteroptionen
  */
-export function createFilterOptions(data: RaumbuchEntry[]): FilterOptions {
+export function createFilterOptions(data: RaumbuchEntry[] | RaumbuchFrame): FilterOptions {
+  if (data instanceof RaumbuchFrame) {
+    // Die Werte stehen bereits im Dictionary der Spalten
+    const values = (field: FrameString) =>
+      data
+        .distinct(field)
+        .filter((value): value is string => Boolean(value))
+        .sort();
+
+    return {
+      bereiche: values('Bereich'),
+      gebaeudeteil: values('Gebaeudeteil'),
+      etage: values('Etage'),
+      reinigungsgruppe: values('Reinigungsgruppe'),
+    };
+  }
+
   if (!data || data.length === 0) {
     return {
       bereiche: [],
@@ -126,6 +160,59 @@ export function createFilterOptions(data: RaumbuchEntry[]): FilterOptions {
   };
 }
 
+/**
+ * Übersetzt einen Filter in Gleichheitsbedingungen je Feld
+ *
+ * @param filter - Filter; leere Werte werden ignoriert
+ * @returns Feld und erwarteter Wert je gesetztem Filter
+ */
+function filterChecks(filter: RaumbuchFilter): [keyof RaumbuchEntry, unknown][] {
+  const checks: [keyof RaumbuchEntry, unknown][] = [];
+  const add = (field: keyof RaumbuchEntry, value: unknown) => {
+    if (value !== undefined && value !== '') checks.push([field, value]);
+  };
+
+  add('Bereich_ID', filter.bereich_ID);
+  add('Gebaeudeteil_ID', filter.gebaeudeteil_ID);
+  add('Etage_ID', filter.etage_ID);
+  add('Reinigungsgruppe_ID', filter.reinigungsgruppe_ID);
+  add('Bereich', filter.bereich);
+  add('Gebaeudeteil', filter.gebaeudeteil);
+  add('Etage', filter.etage);
+  add('Reinigungsgruppe', filter.reinigungsgruppe);
+
+  return checks;
+}
+
+/**
+ * Filtert Raumbuch-Daten in einem Durchlauf (entspricht den WHERE-Bedingungen
+ * von buildRaumbuchQuery für bereits geladene Zeilen)
+ *
+ * @param data - Liste von Raumbuch-Daten
+ * @param filter - Filter; leere Werte werden ignoriert
+ * @returns Gefilterte Daten oder data selbst, wenn kein Filter gesetzt ist
+ */
+export function filterRaumbuchData(data: RaumbuchEntry[], filter: RaumbuchFilter): RaumbuchEntry[] {
+  const checks = filterChecks(filter);
+
+  if (checks.length === 0) {
+    return data;
+  }
+
+  return data.filter(item => checks.every(([field, value]) => item[field] === value));
+}
+
+/**
+ * Filtert einen Frame wie filterRaumbuchData(), ohne Zeilen zu kopieren
+ *
+ * @param frame - Raumbuch-Daten in Spaltenform
+ * @param filter - Filter; leere Werte werden ignoriert
+ * @returns Frame mit den passenden Zeilen oder frame selbst, wenn kein Filter gesetzt ist
+ */
+export function filterRaumbuchFrame(frame: RaumbuchFrame, filter: RaumbuchFilter): RaumbuchFrame {
+  return frame.where(filterChecks(filter));
+}
+
 /**
  * Analysiert Raumbuch-Daten und bereitet sie für die Verwendung vor
  *
@@ -136,11 +223,10 @@ export function analyzeRaumbuchData(data: RaumbuchEntry[]) {
   // Vorverarbeitung der Daten
   const processedData = preprocessData(data);
 
-  // Zusammenfassung berechnen
-  const summary = calculateSummary(processedData);
-
-  // Visualisierungsdaten vorbereiten
-  const visualizationData = prepareDataForVisualization(processedData);
+  // Zusammenfassung und Visualisierungsdaten aus einem gemeinsamen Durchlauf
+  const aggregates = aggregateRaumbuch(processedData);
+  const summary = summaryFromAggregates(aggregates);
+  const visualizationData = visualizationFromAggregates(aggregates);
 
   // Filteroptionen erstellen
   const filterOptions = createFilterOptions(processedData);
@@ -154,4 +240,11 @@ export function analyzeRaumbuchData(data: RaumbuchEntry[]) {
 }
 
 // Re-export der spezifischen Analysefunktionen für Verwendung außerhalb
-export { calculateSummary, prepareDataForVisualization };
+export {
+  aggregateFrame,
+  aggregateRaumbuch,
+  calculateSummary,
+  prepareDataForVisualization,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+};
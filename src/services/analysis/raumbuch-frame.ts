@@ -0,0 +1,602 @@
+/**
+ * Spaltenbasierte Darstellung der Raumbuch-Zeilen eines Gebäudes
+ *
+ * Statt je Zeile ein Objekt mit 45 Feldern zu halten (und es für Vorverarbeitung
+ * und PDF-Formatierung erneut zu kopieren), liegen die Werte je Spalte vor:
+ * Kennzahlen und IDs in Float64Array, Texte dictionary-kodiert (Int32Array mit
+ * Codes und einer Liste der unterschiedlichen Werte). Filter erzeugen keine
+ * Kopien, sondern einen neuen Frame mit einer Auswahl von Zeilenpositionen über
+ * denselben Spalten.
+ *
+ * Analyse und Export lesen die Spalten direkt oder über Zeilensichten, deren
+ * Felder erst beim Zugriff aus den Spalten gelesen werden. Vollständige
+ * Objekte entstehen nur mit toRows() bzw. toObject(), also an der
+ * JSON-Grenze und nur für die ausgelieferten Zeilen. Diese Objekte entsprechen
+ * Feld für Feld (und in derselben Reihenfolge) mapToRaumbuchEntry().
+ */
+
+import { toNumber } from '@/lib/formatters';
+
+import { DIMENSIONS, MEASURES } from './columnar-aggregation';
+
+import type { KeyDictionary, RaumbuchColumns } from './columnar-aggregation';
+import type { RaumbuchRow } from '@/types/raumbuch.types';
+
+/**
+ * Kennzahlen: wie in mapToRaumbuchEntry() mit toNumber() gelesen, NULL wird 0
+ */
+export const FRAME_MEASURES = [
+  'Menge',
+  'MengeAktiv',
+  'MengeInAktiv',
+  'Anzahl',
+  'ReinigungstageMonat',
+  'ReinigungstageJahr',
+  'LeistungStunde',
+  'LeistungStundeIst',
+  'Aufschlag',
+  'StundeTag',
+  'StundeMonat',
+  'MengeAktivMonat',
+  'VkWertNettoMonat',
+  'VkWertBruttoMonat',
+  'RgWertNettoMonat',
+  'RgWertBruttoMonat',
+] as const;
+
+/**
+ * Texte (dictionary-kodiert, NULL bleibt erhalten)
+ */
+export const FRAME_STRINGS = [
+  'Standort',
+  'Gebaeude',
+  'Raumnummer',
+  'Bereich',
+  'Gebaeudeteil',
+  'Etage',
+  'Bezeichnung',
+  'Reinigungsgruppe',
+  'Einheit',
+  'Reinigungsintervall',
+  'ReinigungsTage',
+  'Reduzierung',
+  'Bemerkung',
+  'xBenutzer',
+] as const;
+
+export type FrameMeasure = (typeof FRAME_MEASURES)[number];
+export type FrameString = (typeof FRAME_STRINGS)[number];
+export type FrameField = keyof RaumbuchRow;
+
+/**
+ * Alle Felder in der Reihenfolge von mapToRaumbuchEntry()
+ */
+const FIELDS: FrameField[] = [
+  'ID',
+  'Firma_ID',
+  'Standort_ID',
+  'Gebaeude_ID',
+  'Standort',
+  'Gebaeude',
+  'Raumnummer',
+  'Bereich',
+  'Gebaeudeteil',
+  'Etage',
+  'Bezeichnung',
+  'Reinigungsgruppe',
+  'Menge',
+  'MengeAktiv',
+  'MengeInAktiv',
+  'Einheit',
+  'Anzahl',
+  'Reinigungsintervall',
+  'ReinigungstageMonat',
+  'ReinigungstageJahr',
+  'LeistungStunde',
+  'LeistungStundeIst',
+  'Aufschlag',
+  'StundeTag',
+  'StundeMonat',
+  'MengeAktivMonat',
+  'VkWertNettoMonat',
+  'VkWertBruttoMonat',
+  'RgWertNettoMonat',
+  'RgWertBruttoMonat',
+  'ReinigungsTage',
+  'Reduzierung',
+  'Bemerkung',
+  'Bereich_ID',
+  'Gebaeudeteil_ID',
+  'Etage_ID',
+  'Reinigungsgruppe_ID',
+  'Einheit_ID',
+  'Reinigungsintervall_ID',
+  'ReinigungsTage_ID',
+  'LfdNr',
+  'xStatus',
+  'xDatum',
+  'xBenutzer',
+  'xVersion',
+];
+
+const DATE_FIELDS = new Set<FrameField>(['xDatum']);
+const MEASURE_FIELDS = new Set<FrameField>(FRAME_MEASURES);
+const STRING_FIELDS = new Set<FrameField>(FRAME_STRINGS);
+
+/**
+ * Zeilensicht auf einen Frame; Felder werden beim Zugriff aus den Spalten gelesen
+ */
+export type RaumbuchRowView = Readonly<RaumbuchRow> & {
+  /** Baut das vollständige Zeilenobjekt */
+  toObject(): RaumbuchRow;
+};
+
+/**
+ * Quelle eines Frames: Datenbankzeilen oder bereits gemappte Einträge
+ */
+type FrameRecord = Record<string, unknown> | RaumbuchRow;
+
+/**
+ * Spalte eines Frames; row ist immer die physische Zeilenposition
+ */
+interface FrameColumn {
+  get(row: number): unknown;
+  /** Prüfung auf Gleichheit (===) mit value; null, wenn keine Zeile passen kann */
+  matcher(value: unknown): ((row: number) => boolean) | null;
+  byteSize(): number;
+}
+
+/**
+ * Kennzahlspalte ohne NULL-Werte
+ */
+class MeasureColumn implements FrameColumn {
+  constructor(readonly values: Float64Array) {}
+
+  static build(records: readonly FrameRecord[], field: FrameField): MeasureColumn {
+    const values = new Float64Array(records.length);
+    for (let row = 0; row < records.length; row++) {
+      values[row] = toNumber((records[row] as Record<string, any>)[field]);
+    }
+    return new MeasureColumn(values);
+  }
+
+  get(row: number): number {
+    return this.values[row];
+  }
+
+  matcher(value: unknown): ((row: number) => boolean) | null {
+    const { values } = this;
+    return typeof value === 'number' ? row => values[row] === value : null;
+  }
+
+  byteSize(): number {
+    return this.values.byteLength;
+  }
+}
+
+/**
+ * Zahlen- oder Datumsspalte, deren Werte unverändert übernommen werden
+ *
+ * NULL ist als NaN kodiert. Werte, die keine Zahl bzw. kein gültiges Datum sind
+ * (z.B. BIGINT, das mssql als String liefert), stehen unverändert in extras.
+ */
+class ValueColumn implements FrameColumn {
+  constructor(
+    readonly values: Float64Array,
+    readonly extras: Map<number, unknown> | null,
+    readonly isDate: boolean
+  ) {}
+
+  static build(records: readonly FrameRecord[], field: FrameField): ValueColumn {
+    const isDate = DATE_FIELDS.has(field);
+    const values = new Float64Array(records.length);
+    let extras: Map<number, unknown> | null = null;
+
+    for (let row = 0; row < records.length; row++) {
+      const value = (records[row] as Record<string, unknown>)[field];
+      const encoded = isDate
+        ? value instanceof Date
+          ? value.getTime()
+          : NaN
+        : typeof value === 'number'
+          ? value
+          : NaN;
+
+      values[row] = encoded;
+      if (encoded !== encoded && value !== null && value !== undefined) {
+        (extras ??= new Map()).set(row, value);
+      }
+    }
+
+    return new ValueColumn(values, extras, isDate);
+  }
+
+  get(row: number): unknown {
+    const value = this.values[row];
+    if (value === value) {
+      return this.isDate ? new Date(value) : value;
+    }
+    return this.extras?.get(row) ?? null;
+  }
+
+  matcher(value: unknown): ((row: number) => boolean) | null {
+    if (this.isDate) {
+      // Neue Date-Objekte sind nie === value
+      return null;
+    }
+    const { values } = this;
+    if (typeof value === 'number') {
+      return row => values[row] === value;
+    }
+    return this.extras ? row => this.extras?.get(row) === value : null;
+  }
+
+  byteSize(): number {
+    return this.values.byteLength + (this.extras ? this.extras.size * 48 : 0);
+  }
+}
+
+/**
+ * Dictionary-kodierte Textspalte; keys in Reihenfolge des ersten Auftretens
+ */
+class DictionaryColumn implements FrameColumn {
+  constructor(
+    readonly keys: unknown[],
+    readonly codes: Int32Array
+  ) {}
+
+  static build(records: readonly FrameRecord[], field: FrameField): DictionaryColumn {
+    const keys: unknown[] = [];
+    const codes = new Int32Array(records.length);
+    const lookup = new Map<unknown, number>();
+
+    for (let row = 0; row < records.length; row++) {
+      const raw = (records[row] as Record<string, unknown>)[field];
+      const value = raw === undefined ? null : raw;
+      let code = lookup.get(value);
+      if (code === undefined) {
+        code = keys.length;
+        keys.push(value);
+        lookup.set(value, code);
+      }
+      codes[row] = code;
+    }
+
+    return new DictionaryColumn(keys, codes);
+  }
+
+  get(row: number): unknown {
+    return this.keys[this.codes[row]];
+  }
+
+  matcher(value: unknown): ((row: number) => boolean) | null {
+    const code = this.keys.indexOf(value);
+    const { codes } = this;
+    return code < 0 ? null : row => codes[row] === code;
+  }
+
+  byteSize(): number {
+    let bytes = this.codes.byteLength + this.keys.length * 8;
+    for (const key of this.keys) {
+      bytes += typeof key === 'string' ? 16 + key.length * 2 : 8;
+    }
+    return bytes;
+  }
+}
+
+type FrameColumns = Record<FrameField, FrameColumn>;
+
+/**
+ * Zeilensicht: hält nur Frame und logische Zeilennummer
+ */
+class FrameRowView {
+  constructor(
+    readonly frame: RaumbuchFrame,
+    public index: number
+  ) {}
+
+  toObject(): RaumbuchRow {
+    return this.frame.toObject(this.index);
+  }
+
+  toJSON(): RaumbuchRow {
+    return this.toObject();
+  }
+}
+
+FIELDS.forEach(field => {
+  Object.defineProperty(FrameRowView.prototype, field, {
+    get(this: FrameRowView) {
+      return this.frame.get(field, this.index);
+    },
+    enumerable: true,
+  });
+});
+
+/**
+ * Raumbuch-Zeilen in Spaltenform
+ *
+ * Ein Frame ist unveränderlich; where() liefert einen neuen Frame über
+ * denselben Spalten. Alle Zeilennummern sind logisch (0 bis length - 1).
+ */
+export class RaumbuchFrame {
+  private constructor(
+    private readonly columns: FrameColumns,
+    private readonly rowCount: number,
+    /** Physische Zeilenpositionen der Auswahl; null = alle Zeilen */
+    private readonly selection: Uint32Array | null
+  ) {}
+
+  /**
+   * Baut einen Frame aus Datenbankzeilen oder gemappten Einträgen
+   *
+   * Die Werte werden wie in mapToRaumbuchEntry() übernommen: Kennzahlen mit
+   * toNumber(), alle übrigen Felder unverändert (fehlende Felder als NULL).
+   *
+   * @param records - Zeilen aus der Datenbank oder RaumbuchRow-Objekte
+   * @returns Frame über alle Zeilen
+   */
+  static from(records: readonly FrameRecord[]): RaumbuchFrame {
+    const list = Array.isArray(records) ? records : [];
+    const columns = {} as FrameColumns;
+
+    // Spaltenweise: je Spalte eine gleichförmige Schleife über die Zeilen
+    FIELDS.forEach(field => {
+      columns[field] = MEASURE_FIELDS.has(field)
+        ? MeasureColumn.build(list, field)
+        : STRING_FIELDS.has(field)
+          ? DictionaryColumn.build(list, field)
+          : ValueColumn.build(list, field);
+    });
+
+    return new RaumbuchFrame(columns, list.length, null);
+  }
+
+  /**
+   * Leerer Frame
+   */
+  static empty(): RaumbuchFrame {
+    return RaumbuchFrame.from([]);
+  }
+
+  /**
+   * Anzahl der (ausgewählten) Zeilen
+   */
+  get length(): number {
+    return this.selection ? this.selection.length : this.rowCount;
+  }
+
+  /**
+   * Physische Position einer logischen Zeile
+   */
+  private position(index: number): number {
+    return this.selection ? this.selection[index] : index;
+  }
+
+  /**
+   * Liest einen Wert
+   *
+   * @param field - Feld
+   * @param index - Logische Zeilennummer
+   * @returns Wert wie in mapToRaumbuchEntry()
+   */
+  get<F extends FrameField>(field: F, index: number): RaumbuchRow[F] {
+    return this.columns[field].get(this.position(index)) as RaumbuchRow[F];
+  }
+
+  /**
+   * Liefert eine Sicht auf eine Zeile
+   *
+   * @param index - Logische Zeilennummer
+   * @returns Sicht, deren Felder beim Zugriff gelesen werden
+   */
+  row(index: number): RaumbuchRowView {
+    return new FrameRowView(this, index) as unknown as RaumbuchRowView;
+  }
+
+  /**
+   * Durchläuft alle Zeilen mit einer einzigen, wiederverwendeten Sicht
+   *
+   * Die Sicht zeigt nach jedem Schritt auf die nächste Zeile; wer Zeilen
+   * behalten will, muss toObject() aufrufen.
+   */
+  *rows(): IterableIterator<RaumbuchRowView> {
+    const view = new FrameRowView(this, 0);
+    for (let index = 0; index < this.length; index++) {
+      view.index = index;
+      yield view as unknown as RaumbuchRowView;
+    }
+  }
+
+  /**
+   * Baut das vollständige Objekt einer Zeile
+   *
+   * @param index - Logische Zeilennummer
+   * @returns Zeile wie von mapToRaumbuchEntry()
+   */
+  toObject(index: number): RaumbuchRow {
+    const row = this.position(index);
+    const result = {} as Record<FrameField, unknown>;
+    for (let f = 0; f < FIELDS.length; f++) {
+      result[FIELDS[f]] = this.columns[FIELDS[f]].get(row);
+    }
+    return result as unknown as RaumbuchRow;
+  }
+
+  /**
+   * Baut vollständige Objekte für einen Bereich von Zeilen (für JSON-Antworten)
+   *
+   * @param start - Erste Zeile (inklusive)
+   * @param end - Letzte Zeile (exklusive)
+   * @returns Zeilen wie von mapToRaumbuchEntries()
+   */
+  toRows(start: number = 0, end: number = this.length): RaumbuchRow[] {
+    const to = Math.min(end, this.length);
+    const rows: RaumbuchRow[] = [];
+    for (let index = Math.max(0, start); index < to; index++) {
+      rows.push(this.toObject(index));
+    }
+    return rows;
+  }
+
+  /**
+   * Werte einer Kennzahl in Zeilenreihenfolge
+   *
+   * Ohne Auswahl wird die Spalte selbst geliefert; sie darf nicht verändert werden.
+   *
+   * @param field - Kennzahl
+   * @returns Werte der ausgewählten Zeilen
+   */
+  numbers(field: FrameMeasure): Float64Array {
+    const { values } = this.columns[field] as MeasureColumn;
+    if (!this.selection) {
+      return values;
+    }
+
+    const result = new Float64Array(this.selection.length);
+    for (let index = 0; index < result.length; index++) {
+      result[index] = values[this.selection[index]];
+    }
+    return result;
+  }
+
+  /**
+   * Summe einer Kennzahl in Zeilenreihenfolge
+   *
+   * @param field - Kennzahl
+   * @returns Summe über die ausgewählten Zeilen
+   */
+  sum(field: FrameMeasure): number {
+    const { values } = this.columns[field] as MeasureColumn;
+    let total = 0;
+    for (let index = 0; index < this.length; index++) {
+      total += values[this.position(index)];
+    }
+    return total;
+  }
+
+  /**
+   * Kodiert eine Textspalte für die Aggregation neu
+   *
+   * Schlüssel wie bei groupBy() (String(wert)) in Reihenfolge des ersten
+   * Auftretens unter den ausgewählten Zeilen, Ergebnis also wie toColumns()
+   * über die entsprechenden Zeilenobjekte.
+   *
+   * @param field - Textspalte
+   * @returns Schlüssel und Code je ausgewählter Zeile
+   */
+  dictionary(field: FrameString): KeyDictionary {
+    const { keys: sourceKeys, codes: sourceCodes } = this.columns[field] as DictionaryColumn;
+    const remap = new Int32Array(sourceKeys.length).fill(-1);
+    const byKey = new Map<string, number>();
+    const keys: string[] = [];
+    const codes = new Int32Array(this.length);
+
+    for (let index = 0; index < codes.length; index++) {
+      const source = sourceCodes[this.position(index)];
+      let code = remap[source];
+      if (code < 0) {
+        const key = String(sourceKeys[source]);
+        code = byKey.get(key) ?? keys.length;
+        if (code === keys.length) {
+          keys.push(key);
+          byKey.set(key, code);
+        }
+        remap[source] = code;
+      }
+      codes[index] = code;
+    }
+
+    return { keys, codes };
+  }
+
+  /**
+   * Unterschiedliche Werte einer Textspalte unter den ausgewählten Zeilen
+   *
+   * @param field - Textspalte
+   * @returns Werte in Reihenfolge des ersten Auftretens (inklusive NULL)
+   */
+  distinct(field: FrameString): (string | null)[] {
+    const { keys, codes } = this.columns[field] as DictionaryColumn;
+    if (!this.selection) {
+      return keys as (string | null)[];
+    }
+
+    const seen = new Uint8Array(keys.length);
+    const values: (string | null)[] = [];
+    for (let index = 0; index < this.selection.length; index++) {
+      const code = codes[this.selection[index]];
+      if (!seen[code]) {
+        seen[code] = 1;
+        values.push(keys[code] as string | null);
+      }
+    }
+    return values;
+  }
+
+  /**
+   * Wählt die Zeilen aus, deren Felder den Werten gleichen (===)
+   *
+   * @param checks - Feld und erwarteter Wert; alle müssen zutreffen
+   * @returns Frame über denselben Spalten oder dieser Frame ohne Bedingungen
+   */
+  where(checks: [FrameField, unknown][]): RaumbuchFrame {
+    if (checks.length === 0) {
+      return this;
+    }
+
+    const matchers = checks.map(([field, value]) => this.columns[field].matcher(value));
+    if (matchers.some(matcher => matcher === null)) {
+      return new RaumbuchFrame(this.columns, this.rowCount, new Uint32Array(0));
+    }
+
+    const tests = matchers as ((row: number) => boolean)[];
+    const selected = new Uint32Array(this.length);
+    let count = 0;
+    for (let index = 0; index < this.length; index++) {
+      const row = this.position(index);
+      if (tests.every(test => test(row))) {
+        selected[count++] = row;
+      }
+    }
+
+    return new RaumbuchFrame(this.columns, this.rowCount, selected.slice(0, count));
+  }
+
+  /**
+   * Kennzahlen und Gruppierungsspalten für aggregateColumns()
+   *
+   * @returns Spalten der ausgewählten Zeilen
+   */
+  toColumns(): RaumbuchColumns {
+    const measures = {} as RaumbuchColumns['measures'];
+    MEASURES.forEach(measure => {
+      measures[measure] = this.numbers(measure);
+    });
+
+    const dimensions = {} as RaumbuchColumns['dimensions'];
+    DIMENSIONS.forEach(dimension => {
+      dimensions[dimension] = this.dictionary(dimension);
+    });
+
+    return { rowCount: this.length, measures, dimensions };
+  }
+
+  /**
+   * Geschätzter Speicherbedarf in Bytes (Spalten werden von Auswahlen geteilt)
+   */
+  byteSize(): number {
+    let bytes = this.selection ? this.selection.byteLength : 0;
+    FIELDS.forEach(field => {
+      bytes += this.columns[field].byteSize();
+    });
+    return bytes;
+  }
+
+  /**
+   * Vollständige Zeilen für JSON.stringify()
+   */
+  toJSON(): RaumbuchRow[] {
+    return this.toRows();
+  }
+}
@@ -0,0 +1,232 @@
+/**
+ * LRU-Cache mit Größen- und Zeitbegrenzung für Abfrageergebnisse
+ */
+
+/**
+ * Optionen für den LRU-Cache
+ */
+export interface LruCacheOptions<V> {
+  /** Maximale Gesamtgröße in Bytes (0 deaktiviert den Cache) */
+  maxBytes: number;
+  /** Lebensdauer eines Eintrags in Millisekunden (0 = unbegrenzt) */
+  ttlMs: number;
+  /** Schätzt die Größe eines Werts in Bytes */
+  sizeOf?: (value: V) => number;
+}
+
+/**
+ * Statistik des Caches
+ */
+export interface CacheStats {
+  entries: number;
+  bytes: number;
+  maxBytes: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+}
+
+interface CacheEntry<V> {
+  value: V;
+  bytes: number;
+  expiresAt: number;
+}
+
+/**
+ * LRU-Cache, der nach geschätzter Größe in Bytes verdrängt
+ *
+ * Die Map hält die Einträge in Zugriffsreihenfolge: ein Treffer wird ans Ende
+ * verschoben, verdrängt wird vom Anfang. Abgelaufene Einträge werden beim
+ * Zugriff entfernt.
+ */
+export class LruCache<K, V> {
+  private readonly entries = new Map<K, CacheEntry<V>>();
+  private readonly options: LruCacheOptions<V>;
+  private bytes = 0;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+
+  constructor(options: LruCacheOptions<V>) {
+    this.options = options;
+  }
+
+  /**
+   * Liefert einen Eintrag und markiert ihn als zuletzt verwendet
+   *
+   * @param key - Schlüssel
+   * @returns Wert oder undefined, wenn nicht vorhanden oder abgelaufen
+   */
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry);
+      this.misses++;
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  /**
+   * Speichert einen Eintrag und verdrängt bei Bedarf die ältesten
+   *
+   * @param key - Schlüssel
+   * @param value - Wert
+   * @returns true, wenn der Wert gespeichert wurde (false, wenn er allein zu groß ist)
+   */
+  set(key: K, value: V): boolean {
+    const existing = this.entries.get(key);
+    if (existing) {
+      this.remove(key, existing);
+    }
+
+    const bytes = this.options.sizeOf ? this.options.sizeOf(value) : estimateSize(value);
+    if (bytes > this.options.maxBytes) {
+      return false;
+    }
+
+    const expiresAt = this.options.ttlMs > 0 ? Date.now() + this.options.ttlMs : Infinity;
+    this.entries.set(key, { value, bytes, expiresAt });
+    this.bytes += bytes;
+
+    // Älteste Einträge verdrängen, bis die Größe wieder passt
+    for (const [oldestKey, oldest] of this.entries) {
+      if (this.bytes <= this.options.maxBytes) break;
+      this.remove(oldestKey, oldest);
+      this.evictions++;
+    }
+
+    return true;
+  }
+
+  /**
+   * Entfernt einen Eintrag
+   *
+   * @param key - Schlüssel
+   */
+  delete(key: K): void {
+    const entry = this.entries.get(key);
+    if (entry) {
+      this.remove(key, entry);
+    }
+  }
+
+  /**
+   * Leert den Cache
+   */
+  clear(): void {
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  /**
+   * Liefert die aktuelle Statistik
+   */
+  stats(): CacheStats {
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxBytes: this.options.maxBytes,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+    };
+  }
+
+  private remove(key: K, entry: CacheEntry<V>): void {
+    this.entries.delete(key);
+    this.bytes -= entry.bytes;
+  }
+}
+
+/**
+ * Fasst gleichzeitige Aufrufe mit demselben Schlüssel zu einem zusammen:
+ * solange ein Aufruf läuft, erhalten weitere Aufrufer dasselbe Promise.
+ */
+export class SingleFlight<K, V> {
+  private readonly inflight = new Map<K, Promise<V>>();
+
+  /**
+   * Führt loader aus oder schließt sich einem laufenden Aufruf an
+   *
+   * @param key - Schlüssel
+   * @param loader - Funktion, die den Wert lädt
+   * @returns Ergebnis des (gemeinsamen) Aufrufs
+   */
+  run(key: K, loader: () => Promise<V>): Promise<V> {
+    const running = this.inflight.get(key);
+    if (running) {
+      return running;
+    }
+
+    const promise = loader().finally(() => {
+      this.inflight.delete(key);
+    });
+    this.inflight.set(key, promise);
+    return promise;
+  }
+
+  /**
+   * Anzahl der laufenden Aufrufe
+   */
+  get size(): number {
+    return this.inflight.size;
+  }
+}
+
+/**
+ * Schätzt den Speicherbedarf eines Werts in Bytes (V8-Größenordnung:
+ * Strings mit 2 Bytes je Zeichen, Zahlen 8 Bytes, Objekt-Overhead pauschal)
+ *
+ * @param value - Zu schätzender Wert
+ * @returns Geschätzte Größe in Bytes
+ */
+export function estimateSize(value: unknown): number {
+  if (value === null || value === undefined) {
+    return 8;
+  }
+
+  switch (typeof value) {
+    case 'string':
+      return 16 + value.length * 2;
+    case 'number':
+    case 'boolean':
+      return 8;
+    case 'object':
+      break;
+    default:
+      return 16;
+  }
+
+  if (value instanceof Date) {
+    return 32;
+  }
+
+  if (ArrayBuffer.isView(value)) {
+    return 64 + value.byteLength;
+  }
+
+  if (Array.isArray(value)) {
+    let bytes = 32 + value.length * 8;
+    for (let i = 0; i < value.length; i++) {
+      bytes += estimateSize(value[i]);
+    }
+    return bytes;
+  }
+
+  let bytes = 64;
+  const record = value as Record<string, unknown>;
+  for (const key in record) {
+    bytes += 8 + estimateSize(record[key]);
+  }
+  return bytes;
+}
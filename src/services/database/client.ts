@@ -2,9 +2,14 @@
  * Service für direkten Datenbankzugriff mit erweiterten Funktionen jenseits von Prisma
  */
 
-import SQL, { ConnectionPool } from 'mssql';
+import SQL, { ConnectionPool, PreparedStatement } from 'mssql';
 
-import { DATABASE_CONFIG } from '@/config/database';
+import { DATABASE_CONFIG, DATABASE_POOL_CONFIG } from '@/config/database';
+import { countRows, timeStageAsync } from '@/lib/metrics';
+
+import { CircuitBreaker, isTransientError, retryWithBackoff } from './resilience';
+
+import type { CircuitBreakerStats } from './resilience';
 
 /**
  * Verbindungskonfiguration für MSSQL
@@ -14,6 +19,12 @@ const sqlConfig: SQL.config = {
   password: DATABASE_CONFIG.password,
   server: DATABASE_CONFIG.server,
   database: DATABASE_CONFIG.database,
+  pool: {
+    max: DATABASE_POOL_CONFIG.max,
+    min: DATABASE_POOL_CONFIG.min,
+    idleTimeoutMillis: DATABASE_POOL_CONFIG.idleTimeoutMs,
+    acquireTimeoutMillis: DATABASE_POOL_CONFIG.acquireTimeoutMs,
+  },
   options: {
     encrypt: true,
     trustServerCertificate: true,
@@ -21,39 +32,181 @@ const sqlConfig: SQL.config = {
   },
 };
 
+/**
+ * Parametertypen für vorbereitete Abfragen
+ */
+export type PreparedParamType = 'Int' | 'BigInt' | 'Bit' | 'Float' | 'NVarChar' | 'DateTime';
+
+/**
+ * Feste Abfrage, die als PreparedStatement vorbereitet und wiederverwendet wird
+ */
+export interface PreparedQuery {
+  /** Eindeutiger Name des Statements im Cache */
+  name: string;
+  /** SQL-Text */
+  sql: string;
+  /** Parameter mit ihren SQL-Typen */
+  params: Record<string, PreparedParamType>;
+}
+
+/**
+ * Statistik des Connection Pools und der Fehlerbehandlung
+ */
+export interface DatabasePoolStats {
+  connected: boolean;
+  /** Offene Verbindungen */
+  size: number;
+  /** Freie Verbindungen */
+  available: number;
+  /** Ausgeliehene Verbindungen */
+  borrowed: number;
+  /** Anfragen in der Warteschlange auf eine Verbindung */
+  pending: number;
+  min: number;
+  max: number;
+  /** Vorbereitete Statements (halten je eine Verbindung) */
+  preparedStatements: number;
+  preparedExecutions: number;
+  /** Ausführungen ohne Statement, weil es belegt war oder das Limit erreicht ist */
+  preparedFallbacks: number;
+  retries: number;
+  breaker: CircuitBreakerStats;
+}
+
+interface PreparedHandle {
+  pool: SQL.ConnectionPool;
+  statement: SQL.PreparedStatement;
+  busy: boolean;
+}
+
 /**
  * Hält eine Verbindungs-Pool-Instanz
  */
 let pool: SQL.ConnectionPool | null = null;
 
+/**
+ * Laufender Verbindungsaufbau, an den sich gleichzeitige Aufrufer anhängen
+ */
+let connecting: Promise<SQL.ConnectionPool> | null = null;
+
+/**
+ * Vorbereitete Statements je Name; das Promise verhindert doppeltes Vorbereiten
+ */
+const preparedStatements = new Map<string, Promise<PreparedHandle>>();
+
+/**
+ * Höchstzahl vorbereiteter Statements: mindestens die Hälfte des Pools bleibt
+ * für die übrigen Abfragen frei
+ */
+const maxPreparedStatements = DATABASE_POOL_CONFIG.preparedStatements
+  ? Math.floor(DATABASE_POOL_CONFIG.max / 2)
+  : 0;
+
+const breaker = new CircuitBreaker({
+  failureThreshold: DATABASE_POOL_CONFIG.breakerThreshold,
+  resetTimeoutMs: DATABASE_POOL_CONFIG.breakerResetMs,
+});
+
+const counters = {
+  preparedExecutions: 0,
+  preparedFallbacks: 0,
+  retries: 0,
+};
+
 /**
  * Stellt sicher, dass der Pool initialisiert ist und gibt ihn zurück
  *
+ * Gleichzeitige Aufrufe während des Verbindungsaufbaus teilen sich denselben
+ * Aufbau, sodass nie mehrere Pools entstehen.
+ *
  * @returns Eine MSSQL Connection Pool Instanz
  */
 export async function getPool(): Promise<SQL.ConnectionPool> {
-  if (!pool) {
-    try {
-      pool = await new ConnectionPool(sqlConfig).connect();
-      console.log('SQL Server connection pool created');
+  if (pool) {
+    return pool;
+  }
 
-      // Event-Handler für Pool-Fehler
-      pool.on('error', err => {
-        console.error('SQL Pool Error:', err);
-        pool = null;
-      });
-    } catch (err) {
-      console.error('Failed to create SQL connection pool:', err);
-      throw err;
-    }
+  if (!connecting) {
+    connecting = connectPool().finally(() => {
+      connecting = null;
+    });
+  }
+
+  return connecting;
+}
+
+async function connectPool(): Promise<SQL.ConnectionPool> {
+  try {
+    const created = await new ConnectionPool(sqlConfig).connect();
+    console.log('SQL Server connection pool created');
+
+    // Event-Handler für Pool-Fehler; nur der aktuelle Pool wird verworfen
+    created.on('error', err => {
+      console.error('SQL Pool Error:', err);
+      if (pool === created) {
+        discardPool(created);
+      }
+    });
+
+    pool = created;
+    return created;
+  } catch (err) {
+    console.error('Failed to create SQL connection pool:', err);
+    throw err;
   }
+}
 
-  return pool;
+/**
+ * Verwirft einen fehlerhaften Pool samt seiner Statements; der nächste Aufruf
+ * von getPool baut einen neuen auf
+ */
+function discardPool(broken: SQL.ConnectionPool): void {
+  pool = null;
+  releasePreparedStatements();
+  broken.close().catch(err => {
+    console.error('Error closing broken SQL connection pool:', err);
+  });
+}
+
+/**
+ * Führt eine lesende Operation über Circuit Breaker und Wiederholungen aus
+ */
+function withResilience<T>(operation: () => Promise<T>): Promise<T> {
+  return retryWithBackoff(() => breaker.run(operation), {
+    retries: DATABASE_POOL_CONFIG.retries,
+    baseDelayMs: DATABASE_POOL_CONFIG.retryBaseMs,
+    maxDelayMs: DATABASE_POOL_CONFIG.retryMaxMs,
+    onRetry: (error, attempt, delayMs) => {
+      counters.retries++;
+      console.warn(`SQL transient error, retry ${attempt} in ${delayMs} ms:`, error);
+    },
+  });
+}
+
+/**
+ * Fügt die Parameter einem Request hinzu
+ */
+function addInputs(request: SQL.Request, params: Record<string, unknown>): void {
+  Object.entries(params).forEach(([key, value]) => {
+    request.input(key, value);
+  });
+}
+
+async function runQuery<T>(query: string, params: Record<string, unknown>): Promise<T[]> {
+  const pool = await getPool();
+  const request = pool.request();
+  addInputs(request, params);
+
+  const result = await request.query(query);
+  return result.recordset as T[];
 }
 
 /**
  * Führt eine Query mit Parametern aus
  *
+ * Vorübergehende Fehler werden mit gestreutem Backoff wiederholt; bei einem
+ * Ausfall weist der Circuit Breaker Aufrufe sofort mit CircuitOpenError ab.
+ *
  * @param query - SQL-Query
  * @param params - Query-Parameter
  * @returns Query-Ergebnis
@@ -63,22 +216,180 @@ export async function executeQuery<T = Record<string, unknown>>(
   params: Record<string, unknown> = {}
 ): Promise<T[]> {
   try {
-    const pool = await getPool();
-    const request = pool.request();
+    const rows = await timeStageAsync('db', () =>
+      withResilience(() => runQuery<T>(query, params))
+    );
+    countRows('db', rows.length);
+    return rows;
+  } catch (err) {
+    console.error('SQL Query Error:', err);
+    throw err;
+  }
+}
 
-    // Parameter hinzufügen
-    Object.entries(params).forEach(([key, value]) => {
-      request.input(key, value);
-    });
+/**
+ * Liefert den mssql-Typ zu einem Parametertyp
+ */
+function sqlType(type: PreparedParamType): SQL.ISqlType | SQL.ISqlTypeFactory {
+  switch (type) {
+    case 'Int':
+      return SQL.Int;
+    case 'BigInt':
+      return SQL.BigInt;
+    case 'Bit':
+      return SQL.Bit;
+    case 'Float':
+      return SQL.Float;
+    case 'DateTime':
+      return SQL.DateTime;
+    default:
+      return SQL.NVarChar(SQL.MAX);
+  }
+}
+
+async function prepareStatement(
+  current: SQL.ConnectionPool,
+  definition: PreparedQuery
+): Promise<PreparedHandle> {
+  const statement = new PreparedStatement(current);
+  Object.entries(definition.params).forEach(([key, type]) => {
+    statement.input(key, sqlType(type));
+  });
+
+  await statement.prepare(definition.sql);
+  return { pool: current, statement, busy: false };
+}
+
+/**
+ * Liefert das vorbereitete Statement für eine Abfrage oder null, wenn das
+ * Limit erreicht ist
+ */
+function getPreparedHandle(
+  current: SQL.ConnectionPool,
+  definition: PreparedQuery
+): Promise<PreparedHandle> | null {
+  const cached = preparedStatements.get(definition.name);
+  if (cached) {
+    return cached;
+  }
+
+  if (preparedStatements.size >= maxPreparedStatements) {
+    return null;
+  }
 
-    const result = await request.query(query);
+  const handle = prepareStatement(current, definition);
+  preparedStatements.set(definition.name, handle);
+  handle.catch(() => {
+    if (preparedStatements.get(definition.name) === handle) {
+      preparedStatements.delete(definition.name);
+    }
+  });
+  return handle;
+}
+
+/**
+ * Verwirft ein Statement nach einem Fehler; es wird beim nächsten Aufruf neu vorbereitet
+ */
+function dropPreparedHandle(name: string, handle: PreparedHandle): void {
+  preparedStatements.get(name)?.then(
+    cached => {
+      if (cached === handle) {
+        preparedStatements.delete(name);
+      }
+    },
+    () => undefined
+  );
+  handle.statement.unprepare().catch(() => undefined);
+}
+
+/**
+ * Gibt alle vorbereiteten Statements und ihre Verbindungen frei
+ */
+function releasePreparedStatements(): Promise<void> {
+  const handles = Array.from(preparedStatements.values());
+  preparedStatements.clear();
+
+  return Promise.all(
+    handles.map(handle =>
+      handle.then(
+        ({ statement }) => statement.unprepare().catch(() => undefined),
+        () => undefined
+      )
+    )
+  ).then(() => undefined);
+}
+
+async function runPrepared<T>(
+  definition: PreparedQuery,
+  params: Record<string, unknown>
+): Promise<T[]> {
+  const current = await getPool();
+  const pending = getPreparedHandle(current, definition);
+  const handle = pending ? await pending : null;
+
+  // Belegtes Statement oder Statement eines alten Pools: als normale Query ausführen
+  if (!handle || handle.busy || handle.pool !== current) {
+    counters.preparedFallbacks++;
+    return runQuery<T>(definition.sql, params);
+  }
+
+  handle.busy = true;
+  try {
+    const result = await handle.statement.execute(params);
+    counters.preparedExecutions++;
     return result.recordset as T[];
   } catch (err) {
-    console.error('SQL Query Error:', err);
+    if (isTransientError(err)) {
+      dropPreparedHandle(definition.name, handle);
+    }
     throw err;
+  } finally {
+    handle.busy = false;
   }
 }
 
+/**
+ * Führt eine feste Abfrage über ein zwischengespeichertes PreparedStatement aus
+ *
+ * Jedes Statement wird einmal je Pool vorbereitet und hält dafür eine
+ * Verbindung. Ist es gerade belegt, läuft die Abfrage als normale Query über
+ * den Pool, statt auf das Statement zu warten.
+ *
+ * @param definition - Feste Abfrage mit Parametertypen
+ * @param params - Query-Parameter
+ * @returns Query-Ergebnis
+ */
+export async function executePrepared<T = Record<string, unknown>>(
+  definition: PreparedQuery,
+  params: Record<string, unknown> = {}
+): Promise<T[]> {
+  try {
+    const rows = await timeStageAsync('db', () =>
+      withResilience(() => runPrepared<T>(definition, params))
+    );
+    countRows('db', rows.length);
+    return rows;
+  } catch (err) {
+    console.error(`SQL Prepared Statement Error (${definition.name}):`, err);
+    throw err;
+  }
+}
+
+/**
+ * Führt eine feste Abfrage als PreparedStatement aus und gibt ein einzelnes Ergebnis zurück
+ *
+ * @param definition - Feste Abfrage mit Parametertypen
+ * @param params - Query-Parameter
+ * @returns Einzelnes Query-Ergebnis oder null, wenn nichts gefunden wurde
+ */
+export async function executePreparedSingle<T = Record<string, unknown>>(
+  definition: PreparedQuery,
+  params: Record<string, unknown> = {}
+): Promise<T | null> {
+  const results = await executePrepared<T>(definition, params);
+  return results.length > 0 ? results[0] : null;
+}
+
 /**
  * Führt eine Query mit Parametern aus und gibt ein einzelnes Ergebnis zurück
  *
@@ -94,6 +405,113 @@ export async function executeSingleQuery<T = Record<string, unknown>>(
   return results.length > 0 ? results[0] : null;
 }
 
+/**
+ * Führt eine Query im Streaming-Modus aus und liefert die Zeilen einzeln
+ *
+ * Die Zeilen werden nicht als recordset gesammelt. Liest der Verbraucher
+ * langsamer als die Datenbank liefert, wird der Request ab highWaterMark
+ * gepufferten Zeilen pausiert und nach dem Abarbeiten fortgesetzt. Bricht der
+ * Verbraucher die Iteration ab, wird die Query abgebrochen.
+ *
+ * Der Circuit Breaker gilt wie bei executeQuery(): Ist er offen, wird sofort
+ * mit CircuitOpenError abgewiesen, und Fehler des Requests (auch mitten im
+ * Stream) zählen als Ausfall. Wiederholt wird nicht, da bereits gelieferte
+ * Zeilen nicht zurückgenommen werden können.
+ *
+ * @param query - SQL-Query
+ * @param params - Query-Parameter
+ * @param highWaterMark - Maximale Anzahl gepufferter Zeilen vor dem Pausieren
+ * @returns Zeilen des Query-Ergebnisses
+ */
+export async function* streamQuery<T = Record<string, unknown>>(
+  query: string,
+  params: Record<string, unknown> = {},
+  highWaterMark: number = 500
+): AsyncGenerator<T> {
+  const settle = breaker.begin();
+  let pool: SQL.ConnectionPool;
+  try {
+    pool = await getPool();
+  } catch (err) {
+    settle(err);
+    throw err;
+  }
+
+  const request = pool.request();
+  request.stream = true;
+  addInputs(request, params);
+
+  let buffer: T[] = [];
+  let paused = false;
+  let done = false;
+  let failure: unknown = null;
+  let wake: (() => void) | null = null;
+
+  const notify = () => {
+    const resolve = wake;
+    wake = null;
+    resolve?.();
+  };
+
+  request.on('row', (row: T) => {
+    buffer.push(row);
+    if (!paused && buffer.length >= highWaterMark) {
+      paused = request.pause();
+    }
+    notify();
+  });
+  request.on('error', err => {
+    failure = failure ?? err;
+    settle(err);
+    notify();
+  });
+  request.on('done', () => {
+    done = true;
+    settle();
+    notify();
+  });
+
+  request.query(query);
+
+  try {
+    while (true) {
+      if (buffer.length > 0) {
+        const batch = buffer;
+        buffer = [];
+        for (const row of batch) {
+          yield row;
+        }
+
+        // Erst nach dem Abarbeiten weiterlesen
+        if (paused) {
+          paused = false;
+          request.resume();
+        }
+        continue;
+      }
+
+      if (failure) {
+        console.error('SQL Stream Error:', failure);
+        throw failure;
+      }
+
+      if (done) {
+        return;
+      }
+
+      await new Promise<void>(resolve => {
+        wake = resolve;
+      });
+    }
+  } finally {
+    if (!done && !failure) {
+      request.cancel();
+      // Abbruch durch den Verbraucher, die Verbindung hat funktioniert
+      settle();
+    }
+  }
+}
+
 /**
  * Führt eine Stored Procedure aus
  *
@@ -106,16 +524,15 @@ export async function executeStoredProcedure<T = Record<string, unknown>>(
   params: Record<string, unknown> = {}
 ): Promise<T[]> {
   try {
-    const pool = await getPool();
-    const request = pool.request();
+    // Ohne Wiederholung, da Stored Procedures Daten ändern können
+    return await breaker.run(async () => {
+      const pool = await getPool();
+      const request = pool.request();
+      addInputs(request, params);
 
-    // Parameter hinzufügen
-    Object.entries(params).forEach(([key, value]) => {
-      request.input(key, value);
+      const result = await request.execute(procedureName);
+      return result.recordset as T[];
     });
-
-    const result = await request.execute(procedureName);
-    return result.recordset as T[];
   } catch (err) {
     console.error('SQL Stored Procedure Error:', err);
     throw err;
@@ -128,6 +545,7 @@ export async function executeStoredProcedure<T = Record<string, unknown>>(
 export async function closePool(): Promise<void> {
   if (pool) {
     try {
+      await releasePreparedStatements();
       await pool.close();
       console.log('SQL connection pool closed');
       pool = null;
@@ -153,3 +571,26 @@ export async function testConnection(): Promise<boolean> {
     return false;
   }
 }
+
+/**
+ * Liefert Kennzahlen des Connection Pools, der Warteschlange, der
+ * vorbereiteten Statements und des Circuit Breakers
+ *
+ * @returns Aktuelle Statistik
+ */
+export function getPoolStats(): DatabasePoolStats {
+  return {
+    connected: pool !== null,
+    size: pool?.size ?? 0,
+    available: pool?.available ?? 0,
+    borrowed: pool?.borrowed ?? 0,
+    pending: pool?.pending ?? 0,
+    min: DATABASE_POOL_CONFIG.min,
+    max: DATABASE_POOL_CONFIG.max,
+    preparedStatements: preparedStatements.size,
+    preparedExecutions: counters.preparedExecutions,
+    preparedFallbacks: counters.preparedFallbacks,
+    retries: counters.retries,
+    breaker: breaker.stats(),
+  };
+}
@@ -0,0 +1,150 @@
+/**
+ * Cache für Portfolio-Auswertungen je Standort oder Firma
+ *
+ * Die Summen aller Gebäude entstehen in einer GROUP-BY-Abfrage, sodass die
+ * Übersicht unabhängig von der Zahl der Gebäude mit einer Anfrage auskommt.
+ * Wie beim Raumbuch-Cache wird vor der Auslieferung der Datenstand geprüft und
+ * nur bei Änderungen neu geladen.
+ *
+ * Bereichs- und RG-Statistiken je Gebäude kommen auf Wunsch aus den
+ * vorberechneten Summen (raumbuch-aggregates.ts); diese Abfragen laufen mit
+ * begrenzter Parallelität, damit der Verbindungs-Pool nicht ausgeschöpft wird.
+ */
+
+import { PORTFOLIO_CONFIG, RAUMBUCH_CACHE_CONFIG } from '@/config/database';
+import { mapWithConcurrency } from '@/lib/utils';
+import { buildPortfolio } from '@/services/analysis/portfolio-analysis';
+
+import { estimateSize, LruCache, SingleFlight } from './cache';
+import { fetchPortfolioRows, getPortfolioVersion } from './queries';
+import { getRaumbuchAggregates } from './raumbuch-aggregates';
+
+import type { CacheStats } from './cache';
+import type { Portfolio, PortfolioScope } from '@/types/portfolio.types';
+
+/**
+ * Portfolio mit Datenstand
+ */
+export interface PortfolioResult extends Portfolio {
+  /** Datenstand laut getPortfolioVersion() */
+  version: string;
+  /** Zeitpunkt der Berechnung (ms) */
+  refreshedAt: number;
+  /** Zeitpunkt der letzten Prüfung des Datenstands (ms) */
+  checkedAt: number;
+}
+
+/**
+ * Optionen für getPortfolio()
+ */
+export interface PortfolioOptions {
+  /** Bereichs- und RG-Statistiken je Gebäude ergänzen */
+  stats?: boolean;
+}
+
+const cache = new LruCache<string, PortfolioResult>({
+  maxBytes: PORTFOLIO_CONFIG.maxMegabytes * 1024 * 1024,
+  ttlMs: 0,
+  sizeOf: result => estimateSize(result.gebaeude) + estimateSize(result.standorte),
+});
+
+const flights = new SingleFlight<string, PortfolioResult>();
+
+/**
+ * Schlüssel eines Portfolios im Cache
+ *
+ * @param scope - Standort und/oder Firma
+ * @returns Cache-Schlüssel
+ */
+function scopeKey(scope: PortfolioScope): string {
+  return `${scope.standort_ID ?? '*'}:${scope.firma_ID ?? '*'}`;
+}
+
+/**
+ * Liefert das Portfolio eines Standorts oder einer Firma, bei unverändertem
+ * Datenstand aus dem Cache
+ *
+ * @param scope - Standort und/oder Firma
+ * @param options - Optionen
+ * @returns Portfolio mit Datenstand
+ */
+export async function getPortfolio(
+  scope: PortfolioScope,
+  options: PortfolioOptions = {}
+): Promise<PortfolioResult> {
+  const key = scopeKey(scope);
+  const cached = cache.get(key);
+
+  const portfolio =
+    cached && Date.now() - cached.checkedAt < RAUMBUCH_CACHE_CONFIG.probeIntervalMs
+      ? cached
+      : await flights.run(key, () => refreshPortfolio(key, scope, cached));
+
+  return options.stats ? withGebaeudeStats(portfolio) : portfolio;
+}
+
+/**
+ * Prüft den Datenstand und lädt das Portfolio bei Bedarf neu
+ *
+ * @param key - Cache-Schlüssel
+ * @param scope - Standort und/oder Firma
+ * @param cached - Vorhandener Cache-Eintrag
+ * @returns Aktuelles Portfolio
+ */
+async function refreshPortfolio(
+  key: string,
+  scope: PortfolioScope,
+  cached: PortfolioResult | undefined
+): Promise<PortfolioResult> {
+  const version = await getPortfolioVersion(scope);
+  if (cached && cached.version === version) {
+    cached.checkedAt = Date.now();
+    return cached;
+  }
+
+  const rows = await fetchPortfolioRows(scope);
+  const now = Date.now();
+  const result: PortfolioResult = {
+    ...buildPortfolio(scope, rows),
+    version,
+    refreshedAt: now,
+    checkedAt: now,
+  };
+  cache.set(key, result);
+  return result;
+}
+
+/**
+ * Ergänzt die Gebäude um Bereichs- und RG-Statistiken
+ *
+ * @param portfolio - Portfolio (wird nicht verändert)
+ * @returns Kopie mit Statistiken je Gebäude
+ */
+async function withGebaeudeStats(portfolio: PortfolioResult): Promise<PortfolioResult> {
+  const gebaeude = await mapWithConcurrency(
+    portfolio.gebaeude,
+    PORTFOLIO_CONFIG.concurrency,
+    async item => {
+      const { summary } = await getRaumbuchAggregates(item.gebaeude_ID);
+      return { ...item, bereichStats: summary.bereichStats, rgStats: summary.rgStats };
+    }
+  );
+
+  return { ...portfolio, gebaeude };
+}
+
+/**
+ * Verwirft gecachte Portfolios
+ */
+export function invalidatePortfolioCache(): void {
+  cache.clear();
+}
+
+/**
+ * Liefert die Statistik des Portfolio-Caches
+ *
+ * @returns Einträge, Größe, Treffer und Verdrängungen
+ */
+export function getPortfolioCacheStats(): CacheStats & { inflight: number } {
+  return { ...cache.stats(), inflight: flights.size };
+}
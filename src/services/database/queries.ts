@@ -4,10 +4,20 @@
  */
 
 import { toNumber } from '@/lib/formatters';
+import { countRows, timeStage } from '@/lib/metrics';
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
 
-import { executeQuery, executeSingleQuery } from './client';
+import {
+  executePrepared,
+  executePreparedSingle,
+  executeQuery,
+  executeSingleQuery,
+  streamQuery,
+} from './client';
 
-import type { RaumbuchRow } from '@/types/raumbuch.types';
+import type { PreparedQuery } from './client';
+import type { PortfolioGebaeudeRow, PortfolioScope } from '@/types/portfolio.types';
+import type { RaumbuchAggregateRow, RaumbuchFilter, RaumbuchRow } from '@/types/raumbuch.types';
 import type { Gebaeude, Standort } from '@/types/standort.types';
 
 // Use RaumbuchRow as RaumbuchEntry for consistency with the rest of the code
@@ -157,7 +167,8 @@ export function mapToRaumbuchEntries(dataList: any[]): RaumbuchEntry[] {
     return [];
   }
 
-  return dataList.map(mapToRaumbuchEntry);
+  countRows('map', dataList.length);
+  return timeStage('map', () => dataList.map(mapToRaumbuchEntry));
 }
 
 /**
@@ -214,6 +225,61 @@ const RAUMBUCH_QUERY = `
     WHERE Gebaeude_ID = @gebaeude_ID
 `;
 
+/**
+ * Günstige Abfrage für den Datenstand eines Gebäudes (für die Cache-Invalidierung)
+ */
+const RAUMBUCH_VERSION_QUERY = `
+    SELECT COUNT(*) Anzahl
+         ,MAX(xDatum) xDatum
+         ,MAX(xVersion) xVersion
+    FROM BIRD.Raumbuch WITH (NOLOCK)
+    WHERE Gebaeude_ID = @gebaeude_ID
+`;
+
+/**
+ * Summen je Bereich, Reinigungsgruppe, Etage und Gebäudeteil sowie gesamt in
+ * einem Durchlauf über GROUPING SETS; die Gruppen kommen in der Reihenfolge
+ * ihres ersten Eintrags (wie beim Gruppieren der geladenen Zeilen)
+ */
+const RAUMBUCH_AGGREGATE_QUERY = `
+    SELECT GROUPING_ID(Raumbuch.Bereich, Raumbuch.Reinigungsgruppe,
+                       Raumbuch.Etage, Raumbuch.Gebaeudeteil) Gruppierung
+         ,Raumbuch.Bereich
+         ,Raumbuch.Reinigungsgruppe
+         ,Raumbuch.Etage
+         ,Raumbuch.Gebaeudeteil
+         ,COUNT(*) Anzahl
+         ,SUM(Raumbuch.Menge) Menge
+         ,SUM(Raumbuch.MengeAktivMonat) MengeAktivMonat
+         ,SUM(Raumbuch.VkWertNettoMonat) VkWertNettoMonat
+         ,SUM(Raumbuch.VkWertBruttoMonat) VkWertBruttoMonat
+         ,SUM(Raumbuch.RgWertNettoMonat) RgWertNettoMonat
+         ,SUM(Raumbuch.RgWertBruttoMonat) RgWertBruttoMonat
+         ,SUM(Raumbuch.StundeMonat) StundeMonat
+    FROM BIRD.Raumbuch WITH (NOLOCK)
+  INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
+    WHERE Gebaeude_ID = @gebaeude_ID
+    GROUP BY GROUPING SETS (
+         (),
+         (Raumbuch.Bereich),
+         (Raumbuch.Reinigungsgruppe),
+         (Raumbuch.Etage),
+         (Raumbuch.Gebaeudeteil)
+    )
+    ORDER BY MIN(Raumbuch.ID)
+`;
+
+/**
+ * Gruppierungsspalte je GROUPING_ID der Aggregat-Abfrage (Bit gesetzt = nicht gruppiert)
+ */
+const AGGREGATE_GROUPINGS: Record<number, RaumbuchAggregateRow['dimension']> = {
+  0b0111: 'Bereich',
+  0b1011: 'Reinigungsgruppe',
+  0b1101: 'Etage',
+  0b1110: 'Gebaeudeteil',
+  0b1111: null,
+};
+
 /**
  * SQL-Abfrage für alle verfügbaren Standorte
  */
@@ -244,6 +310,120 @@ INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
     ORDER BY Standort, Gebaeude
 `;
 
+/**
+ * SQL-Abfrage für einen Standort anhand seiner ID
+ */
+const STANDORT_BY_ID_QUERY = `SELECT ID, Bezeichnung, Adresse, Strasse, PLZ, Ort FROM BIRD.Standort WHERE ID = @standort_ID`;
+
+/**
+ * SQL-Abfrage für ein Gebäude anhand seiner ID
+ */
+const GEBAEUDE_BY_ID_QUERY = `
+    SELECT Gebaeude.ID Gebaeude_ID
+         ,Gebaeude.Firma_ID
+         ,Gebaeude.Standort_ID
+         ,Standort.Bezeichnung Standort
+         ,Standort.Adresse
+         ,Standort.Strasse
+         ,Standort.PLZ
+         ,Standort.Ort
+         ,Gebaeude.Bezeichnung Gebaeude
+         ,Gebaeude.Preis
+         ,Gebaeude.Preis7Tage
+         ,Gebaeude.PreisSonntag
+    FROM BIRD.Gebaeude WITH (NOLOCK)
+  INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
+    WHERE Gebaeude.ID = @gebaeude_ID
+`;
+
+/**
+ * SQL-Abfrage für einen Raumbuch-Eintrag anhand seiner ID
+ */
+const RAUMBUCH_BY_ID_QUERY = `
+    SELECT Raumbuch.ID
+         ,Raumbuch.Firma_ID
+         ,Raumbuch.Standort_ID
+         ,Raumbuch.Gebaeude_ID
+         ,Standort.Bezeichnung Standort
+         ,Raumbuch.Gebaeude
+         ,Raumbuch.Raumnummer
+         ,Raumbuch.Bereich
+         ,Raumbuch.Gebaeudeteil
+         ,Raumbuch.Etage
+         ,Raumbuch.Bezeichnung
+         ,Raumbuch.Reinigungsgruppe
+         ,Raumbuch.Menge
+         ,Raumbuch.MengeAktiv
+         ,Raumbuch.MengeInAktiv
+         ,Raumbuch.Einheit
+         ,Raumbuch.Anzahl
+         ,Raumbuch.Reinigungsintervall
+         ,Raumbuch.ReinigungstageMonat
+         ,Raumbuch.ReinigungstageJahr
+         ,Raumbuch.LeistungStunde
+         ,Raumbuch.LeistungStundeIst
+         ,Raumbuch.Aufschlag
+         ,Raumbuch.StundeTag
+         ,Raumbuch.StundeMonat
+         ,Raumbuch.MengeAktivMonat
+         ,Raumbuch.VkWertNettoMonat
+         ,Raumbuch.VkWertBruttoMonat
+         ,Raumbuch.RgWertNettoMonat
+         ,Raumbuch.RgWertBruttoMonat
+         ,Raumbuch.ReinigungsTage
+         ,Raumbuch.Reduzierung
+         ,Raumbuch.Bemerkung
+         ,Raumbuch.Bereich_ID
+         ,Raumbuch.Gebaeudeteil_ID
+         ,Raumbuch.Etage_ID
+         ,Raumbuch.Reinigungsgruppe_ID
+         ,Raumbuch.Einheit_ID
+         ,Raumbuch.Reinigungsintervall_ID
+         ,Raumbuch.ReinigungsTage_ID
+         ,Raumbuch.LfdNr
+         ,Raumbuch.xStatus
+         ,Raumbuch.xDatum
+         ,Raumbuch.xBenutzer
+         ,Raumbuch.xVersion
+    FROM BIRD.Raumbuch WITH (NOLOCK)
+  INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
+    WHERE Raumbuch.ID = @id
+`;
+
+/**
+ * Feste Abfragen, die als PreparedStatement zwischengespeichert werden
+ * (siehe executePrepared in ./client)
+ */
+const RAUMBUCH_STATEMENT: PreparedQuery = {
+  name: 'raumbuch',
+  sql: RAUMBUCH_QUERY,
+  params: { gebaeude_ID: 'Int' },
+};
+
+const GEBAEUDE_STATEMENT: PreparedQuery = {
+  name: 'gebaeude',
+  sql: GEBAEUDE_QUERY,
+  params: {},
+};
+
+const STANDORT_BY_ID_STATEMENT: PreparedQuery = {
+  name: 'standort-by-id',
+  sql: STANDORT_BY_ID_QUERY,
+  params: { standort_ID: 'Int' },
+};
+
+const GEBAEUDE_BY_ID_STATEMENT: PreparedQuery = {
+  name: 'gebaeude-by-id',
+  sql: GEBAEUDE_BY_ID_QUERY,
+  params: { gebaeude_ID: 'Int' },
+};
+
+const RAUMBUCH_BY_ID_STATEMENT: PreparedQuery = {
+  name: 'raumbuch-by-id',
+  sql: RAUMBUCH_BY_ID_QUERY,
+  params: { id: 'Int' },
+};
+
 /**
  * Ruft die Raumbuch-Daten für ein Gebäude ab
  * Renamed from getRaumbuchData to match database structure
@@ -253,15 +433,546 @@ INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
  */
 export async function getRaumbuchData(gebaeude_ID: number = -1): Promise<RaumbuchEntry[]> {
   try {
-    // Verwende die direkte SQL-Abfrage für komplexe Joins und Berechnungen
-    const data = await executeQuery(RAUMBUCH_QUERY, { gebaeude_ID });
-    return mapToRaumbuchEntries(data);
+    return await fetchRaumbuchData(gebaeude_ID);
   } catch (error) {
     console.error('Fehler beim Abrufen der Raumbuch-Daten:', error);
     return [];
   }
 }
 
+/**
+ * Lädt die Raumbuch-Daten für ein Gebäude; Fehler werden weitergereicht
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @returns Liste der Raumbuch-Einträge
+ */
+export async function fetchRaumbuchData(gebaeude_ID: number): Promise<RaumbuchEntry[]> {
+  // Feste Abfrage über das zwischengespeicherte PreparedStatement
+  const data = await executePrepared(RAUMBUCH_STATEMENT, { gebaeude_ID });
+  return mapToRaumbuchEntries(data);
+}
+
+/**
+ * Lädt die Raumbuch-Daten für ein Gebäude in Spaltenform; Fehler werden
+ * weitergereicht
+ *
+ * Die Datenbankzeilen werden direkt in Spalten übernommen, ohne Zwischenobjekte
+ * je Zeile.
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @returns Raumbuch-Einträge als Frame
+ */
+export async function fetchRaumbuchFrame(gebaeude_ID: number): Promise<RaumbuchFrame> {
+  const data = await executePrepared(RAUMBUCH_STATEMENT, { gebaeude_ID });
+
+  countRows('map', data.length);
+  return timeStage('map', () => RaumbuchFrame.from(data));
+}
+
+/**
+ * Ermittelt den Datenstand der Raumbuch-Einträge eines Gebäudes
+ * (Anzahl, letzte Änderung, höchste Version)
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @returns Vergleichbarer Versionsschlüssel
+ */
+export async function getRaumbuchVersion(gebaeude_ID: number): Promise<string> {
+  const data = await executeSingleQuery<{
+    Anzahl: number;
+    xDatum: Date | string | null;
+    xVersion: number | null;
+  }>(RAUMBUCH_VERSION_QUERY, { gebaeude_ID });
+
+  if (!data) {
+    return '0';
+  }
+
+  const xDatum = data.xDatum instanceof Date ? data.xDatum.toISOString() : data.xDatum;
+  return `${data.Anzahl}|${xDatum ?? ''}|${data.xVersion ?? ''}`;
+}
+
+/**
+ * Konvertiert eine Zeile der Aggregat-Abfrage in eine Gruppenzeile
+ *
+ * @param data - Daten aus der Datenbank
+ * @returns Gruppenzeile
+ */
+export function mapToRaumbuchAggregateRow(data: any): RaumbuchAggregateRow {
+  const dimension = AGGREGATE_GROUPINGS[data.Gruppierung] ?? null;
+
+  return {
+    dimension,
+    key: dimension ? data[dimension] : null,
+    anzahl: toNumber(data.Anzahl),
+    menge: toNumber(data.Menge),
+    mengeAktivMonat: toNumber(data.MengeAktivMonat),
+    vkWertNettoMonat: toNumber(data.VkWertNettoMonat),
+    vkWertBruttoMonat: toNumber(data.VkWertBruttoMonat),
+    rgWertNettoMonat: toNumber(data.RgWertNettoMonat),
+    rgWertBruttoMonat: toNumber(data.RgWertBruttoMonat),
+    stundenMonat: toNumber(data.StundeMonat),
+  };
+}
+
+/**
+ * Berechnet die Summen eines Gebäudes je Bereich, Reinigungsgruppe, Etage und
+ * Gebäudeteil in der Datenbank; Fehler werden weitergereicht
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @returns Gesamtzeile und Zeilen je Gruppe
+ */
+export async function fetchRaumbuchAggregateRows(
+  gebaeude_ID: number
+): Promise<RaumbuchAggregateRow[]> {
+  const data = await executeQuery(RAUMBUCH_AGGREGATE_QUERY, { gebaeude_ID });
+  return data.map(mapToRaumbuchAggregateRow);
+}
+
+/**
+ * Erlaubte Spalten der Raumbuch-Abfrage mit ihrem SQL-Ausdruck (Whitelist
+ * für die Spaltenauswahl; Namen aus der Anfrage gelangen nie in das SQL)
+ */
+export const RAUMBUCH_COLUMNS: Readonly<Record<keyof RaumbuchRow, string>> = {
+  ID: 'Raumbuch.ID',
+  Firma_ID: 'Raumbuch.Firma_ID',
+  Standort_ID: 'Raumbuch.Standort_ID',
+  Gebaeude_ID: 'Raumbuch.Gebaeude_ID',
+  Standort: 'Standort.Bezeichnung Standort',
+  Gebaeude: 'Raumbuch.Gebaeude',
+  Raumnummer: 'Raumbuch.Raumnummer',
+  Bereich: 'Raumbuch.Bereich',
+  Gebaeudeteil: 'Raumbuch.Gebaeudeteil',
+  Etage: 'Raumbuch.Etage',
+  Bezeichnung: 'Raumbuch.Bezeichnung',
+  Reinigungsgruppe: 'Raumbuch.Reinigungsgruppe',
+  Menge: 'Raumbuch.Menge',
+  MengeAktiv: 'Raumbuch.MengeAktiv',
+  MengeInAktiv: 'Raumbuch.MengeInAktiv',
+  Einheit: 'Raumbuch.Einheit',
+  Anzahl: 'Raumbuch.Anzahl',
+  Reinigungsintervall: 'Raumbuch.Reinigungsintervall',
+  ReinigungstageMonat: 'Raumbuch.ReinigungstageMonat',
+  ReinigungstageJahr: 'Raumbuch.ReinigungstageJahr',
+  LeistungStunde: 'Raumbuch.LeistungStunde',
+  LeistungStundeIst: 'Raumbuch.LeistungStundeIst',
+  Aufschlag: 'Raumbuch.Aufschlag',
+  StundeTag: 'Raumbuch.StundeTag',
+  StundeMonat: 'Raumbuch.StundeMonat',
+  MengeAktivMonat: 'Raumbuch.MengeAktivMonat',
+  VkWertNettoMonat: 'Raumbuch.VkWertNettoMonat',
+  VkWertBruttoMonat: 'Raumbuch.VkWertBruttoMonat',
+  RgWertNettoMonat: 'Raumbuch.RgWertNettoMonat',
+  RgWertBruttoMonat: 'Raumbuch.RgWertBruttoMonat',
+  ReinigungsTage: 'Raumbuch.ReinigungsTage',
+  Reduzierung: 'Raumbuch.Reduzierung',
+  Bemerkung: 'Raumbuch.Bemerkung',
+  Bereich_ID: 'Raumbuch.Bereich_ID',
+  Gebaeudeteil_ID: 'Raumbuch.Gebaeudeteil_ID',
+  Etage_ID: 'Raumbuch.Etage_ID',
+  Reinigungsgruppe_ID: 'Raumbuch.Reinigungsgruppe_ID',
+  Einheit_ID: 'Raumbuch.Einheit_ID',
+  Reinigungsintervall_ID: 'Raumbuch.Reinigungsintervall_ID',
+  ReinigungsTage_ID: 'Raumbuch.ReinigungsTage_ID',
+  LfdNr: 'Raumbuch.LfdNr',
+  xStatus: 'Raumbuch.xStatus',
+  xDatum: 'Raumbuch.xDatum',
+  xBenutzer: 'Raumbuch.xBenutzer',
+  xVersion: 'Raumbuch.xVersion',
+};
+
+export type RaumbuchField = keyof RaumbuchRow;
+
+/**
+ * Filter der Raumbuch-Abfrage mit der zugehörigen Spalte; die _ID-Filter
+ * treffen die Fremdschlüssel, die Textfilter die Bezeichnungen
+ */
+const RAUMBUCH_FILTER_COLUMNS: ReadonlyArray<[keyof RaumbuchFilter, string]> = [
+  ['bereich_ID', 'Raumbuch.Bereich_ID'],
+  ['gebaeudeteil_ID', 'Raumbuch.Gebaeudeteil_ID'],
+  ['etage_ID', 'Raumbuch.Etage_ID'],
+  ['reinigungsgruppe_ID', 'Raumbuch.Reinigungsgruppe_ID'],
+  ['bereich', 'Raumbuch.Bereich'],
+  ['gebaeudeteil', 'Raumbuch.Gebaeudeteil'],
+  ['etage', 'Raumbuch.Etage'],
+  ['reinigungsgruppe', 'Raumbuch.Reinigungsgruppe'],
+];
+
+/**
+ * Optionen für die Raumbuch-Abfrage eines Gebäudes
+ */
+export interface RaumbuchQueryOptions {
+  gebaeude_ID: number;
+  filter?: RaumbuchFilter;
+  /** Zurückzugebende Spalten (Standard: alle) */
+  fields?: RaumbuchField[];
+  /** Sortierung und Schlüssel für die Keyset-Paginierung (Standard: ID) */
+  orderBy?: 'ID' | 'LfdNr';
+  limit?: number;
+  offset?: number;
+  /** Cursor der vorherigen Seite (nextCursor); ersetzt offset */
+  after?: string;
+}
+
+/**
+ * Eine Seite der Raumbuch-Abfrage
+ */
+export interface RaumbuchPage {
+  data: Partial<RaumbuchRow>[];
+  /** Anzahl aller Einträge, die den Filtern entsprechen */
+  totalCount: number;
+  /** Cursor für die nächste Seite oder null, wenn keine weitere folgt */
+  nextCursor: string | null;
+}
+
+/**
+ * Prüft, ob ein Name eine erlaubte Raumbuch-Spalte ist
+ *
+ * @param name - Spaltenname
+ * @returns true, wenn die Spalte ausgewählt werden darf
+ */
+export function isRaumbuchField(name: string): name is RaumbuchField {
+  return Object.prototype.hasOwnProperty.call(RAUMBUCH_COLUMNS, name);
+}
+
+/**
+ * Erstellt den Cursor einer Zeile für die Keyset-Paginierung
+ * ("ID" bzw. "LfdNr~ID", LfdNr leer bei NULL)
+ *
+ * @param row - Letzte Zeile der Seite
+ * @param orderBy - Sortierschlüssel
+ * @returns Cursor
+ */
+export function encodeRaumbuchCursor(
+  row: Partial<RaumbuchRow>,
+  orderBy: 'ID' | 'LfdNr' = 'ID'
+): string {
+  return orderBy === 'LfdNr' ? `${row.LfdNr ?? ''}~${row.ID}` : `${row.ID}`;
+}
+
+/**
+ * Liest einen Cursor von encodeRaumbuchCursor()
+ *
+ * @param cursor - Cursor
+ * @param orderBy - Sortierschlüssel
+ * @returns Schlüsselwerte oder null bei ungültigem Cursor
+ */
+export function parseRaumbuchCursor(
+  cursor: string,
+  orderBy: 'ID' | 'LfdNr' = 'ID'
+): { lfdNr: number | null; id: number } | null {
+  const parts = cursor.split('~');
+  if (parts.length !== (orderBy === 'LfdNr' ? 2 : 1)) {
+    return null;
+  }
+
+  const id = Number(parts[parts.length - 1]);
+  const lfdNr = orderBy === 'LfdNr' && parts[0] !== '' ? Number(parts[0]) : null;
+  if (!Number.isInteger(id) || (lfdNr !== null && !Number.isInteger(lfdNr))) {
+    return null;
+  }
+
+  return { lfdNr, id };
+}
+
+/**
+ * Baut die parametrisierte Seiten- und Zählabfrage für das Raumbuch
+ *
+ * Filterwerte, Cursor und Seitengröße werden ausschließlich als Parameter
+ * übergeben. Die Sortierung ist stabil (ID bzw. LfdNr, ID), damit OFFSET/FETCH
+ * und Keyset-Paginierung dieselbe Reihenfolge liefern. Der Sortierschlüssel
+ * wird immer mit ausgewählt, damit der nächste Cursor gebildet werden kann.
+ *
+ * @param options - Abfrageoptionen
+ * @returns SQL für Seite und Anzahl sowie die Parameter
+ */
+export function buildRaumbuchQuery(options: RaumbuchQueryOptions): {
+  query: string;
+  countQuery: string;
+  params: Record<string, unknown>;
+} {
+  const orderBy = options.orderBy ?? 'ID';
+  const params: Record<string, unknown> = { gebaeude_ID: options.gebaeude_ID };
+  const conditions = ['Raumbuch.Gebaeude_ID = @gebaeude_ID'];
+
+  for (const [name, column] of RAUMBUCH_FILTER_COLUMNS) {
+    const value = options.filter?.[name];
+    if (value !== undefined && value !== '') {
+      conditions.push(`${column} = @${name}`);
+      params[name] = value;
+    }
+  }
+
+  const fields = new Set<RaumbuchField>(options.fields?.length ? options.fields : undefined);
+  const columns = fields.size
+    ? Object.entries(RAUMBUCH_COLUMNS)
+        .filter(
+          ([name]) => fields.has(name as RaumbuchField) || name === 'ID' || name === orderBy
+        )
+        .map(([, column]) => column)
+    : Object.values(RAUMBUCH_COLUMNS);
+
+  const from = `
+    FROM BIRD.Raumbuch WITH (NOLOCK)
+  INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Raumbuch.Standort_ID
+    WHERE ${conditions.join('\n      AND ')}`;
+  const countQuery = `
+    SELECT COUNT(*) Anzahl${from}
+`;
+
+  // Keyset-Bedingung nur für die Seite, nicht für die Anzahl
+  const pageConditions: string[] = [];
+  const cursor = options.after ? parseRaumbuchCursor(options.after, orderBy) : null;
+  if (cursor && orderBy === 'ID') {
+    pageConditions.push('Raumbuch.ID > @afterID');
+    params.afterID = cursor.id;
+  } else if (cursor) {
+    // NULL sortiert in SQL Server zuerst
+    pageConditions.push(
+      cursor.lfdNr === null
+        ? '(Raumbuch.LfdNr IS NOT NULL OR Raumbuch.ID > @afterID)'
+        : '(Raumbuch.LfdNr > @afterLfdNr' +
+            ' OR (Raumbuch.LfdNr = @afterLfdNr AND Raumbuch.ID > @afterID))'
+    );
+    params.afterID = cursor.id;
+    if (cursor.lfdNr !== null) {
+      params.afterLfdNr = cursor.lfdNr;
+    }
+  }
+
+  let query = `
+    SELECT ${columns.join('\n         ,')}${from}${pageConditions
+      .map(condition => `\n      AND ${condition}`)
+      .join('')}
+    ORDER BY ${orderBy === 'LfdNr' ? 'Raumbuch.LfdNr, Raumbuch.ID' : 'Raumbuch.ID'}`;
+
+  if (options.limit !== undefined) {
+    params.offset = cursor ? 0 : (options.offset ?? 0);
+    params.limit = options.limit;
+    query += `
+    OFFSET @offset ROWS FETCH NEXT @limit ROWS ONLY`;
+  }
+
+  return { query: `${query}\n`, countQuery, params };
+}
+
+/**
+ * Konvertiert ein Datenbankergebnis der Raumbuch-Abfrage in die ausgewählten Spalten
+ *
+ * @param data - Daten aus der Datenbank
+ * @param fields - Ausgewählte Spalten (Standard: alle)
+ * @returns RaumbuchEntry-Objekt bzw. die ausgewählten Spalten daraus
+ */
+export function mapToRaumbuchFields(data: any, fields?: RaumbuchField[]): Partial<RaumbuchRow> {
+  const entry = mapToRaumbuchEntry(data);
+  if (!fields?.length) {
+    return entry;
+  }
+
+  const picked: Partial<RaumbuchRow> = {};
+  for (const name of Object.keys(data)) {
+    if (isRaumbuchField(name)) {
+      (picked as Record<string, unknown>)[name] = entry[name];
+    }
+  }
+  return picked;
+}
+
+/**
+ * Lädt eine gefilterte Seite des Raumbuchs mit der Gesamtanzahl
+ *
+ * Seite und Anzahl werden parallel abgefragt; ohne limit werden alle
+ * passenden Einträge geliefert. Fehler werden weitergereicht.
+ *
+ * @param options - Abfrageoptionen
+ * @returns Seite mit Gesamtanzahl und Cursor für die nächste Seite
+ */
+export async function queryRaumbuch(options: RaumbuchQueryOptions): Promise<RaumbuchPage> {
+  const { query, countQuery, params } = buildRaumbuchQuery(options);
+  const [rows, count] = await Promise.all([
+    executeQuery(query, params),
+    executeSingleQuery<{ Anzahl: number }>(countQuery, params),
+  ]);
+
+  const data = rows.map(row => mapToRaumbuchFields(row, options.fields));
+
+  const last = data[data.length - 1];
+  const hasMore = options.limit !== undefined && data.length === options.limit;
+
+  return {
+    data,
+    totalCount: count?.Anzahl ?? 0,
+    nextCursor: hasMore && last ? encodeRaumbuchCursor(last, options.orderBy) : null,
+  };
+}
+
+/**
+ * Liefert die gefilterten Raumbuch-Einträge Zeile für Zeile aus einer
+ * Streaming-Abfrage, ohne das Ergebnis zu puffern (keine Gesamtanzahl)
+ *
+ * @param options - Abfrageoptionen wie bei queryRaumbuch()
+ * @returns Raumbuch-Einträge in der Sortierung der Abfrage
+ */
+export async function* streamRaumbuch(
+  options: RaumbuchQueryOptions
+): AsyncGenerator<Partial<RaumbuchRow>> {
+  const { query, params } = buildRaumbuchQuery(options);
+  let count = 0;
+
+  try {
+    for await (const row of streamQuery(query, params)) {
+      count++;
+      yield mapToRaumbuchFields(row, options.fields);
+    }
+  } finally {
+    countRows('stream', count);
+  }
+}
+
+/**
+ * Spalten, über die ein Portfolio eingegrenzt wird (Gebaeude und Raumbuch
+ * führen beide Standort_ID und Firma_ID)
+ */
+const PORTFOLIO_SCOPE_COLUMNS: ReadonlyArray<[keyof PortfolioScope, string]> = [
+  ['standort_ID', 'Standort_ID'],
+  ['firma_ID', 'Firma_ID'],
+];
+
+/**
+ * Erstellt die WHERE-Bedingung eines Portfolios
+ *
+ * @param scope - Standort und/oder Firma
+ * @param table - Tabelle, deren Spalten geprüft werden
+ * @returns Bedingung und Parameter
+ */
+function buildPortfolioWhere(
+  scope: PortfolioScope,
+  table: 'Gebaeude' | 'Raumbuch'
+): { where: string; params: Record<string, unknown> } {
+  const conditions: string[] = [];
+  const params: Record<string, unknown> = {};
+
+  PORTFOLIO_SCOPE_COLUMNS.forEach(([key, column]) => {
+    const value = scope[key];
+    if (value !== undefined) {
+      conditions.push(`${table}.${column} = @${key}`);
+      params[key] = value;
+    }
+  });
+
+  return { where: conditions.length > 0 ? conditions.join(' AND ') : '1 = 1', params };
+}
+
+/**
+ * Erstellt die Abfrage für die Summen aller Gebäude eines Standorts oder
+ * einer Firma (ein GROUP BY über Gebaeude_ID; Gebäude ohne Raumbuch-Einträge
+ * erscheinen mit 0)
+ *
+ * @param scope - Standort und/oder Firma
+ * @returns SQL-Abfrage und Parameter
+ */
+export function buildPortfolioQuery(scope: PortfolioScope): {
+  query: string;
+  params: Record<string, unknown>;
+} {
+  const { where, params } = buildPortfolioWhere(scope, 'Gebaeude');
+
+  const query = `
+    SELECT Gebaeude.ID Gebaeude_ID
+         ,Gebaeude.Firma_ID
+         ,Gebaeude.Standort_ID
+         ,Standort.Bezeichnung Standort
+         ,Gebaeude.Bezeichnung Gebaeude
+         ,COUNT(Raumbuch.ID) Anzahl
+         ,SUM(Raumbuch.Menge) Menge
+         ,SUM(Raumbuch.MengeAktivMonat) MengeAktivMonat
+         ,SUM(Raumbuch.VkWertNettoMonat) VkWertNettoMonat
+         ,SUM(Raumbuch.VkWertBruttoMonat) VkWertBruttoMonat
+         ,SUM(Raumbuch.RgWertNettoMonat) RgWertNettoMonat
+         ,SUM(Raumbuch.RgWertBruttoMonat) RgWertBruttoMonat
+         ,SUM(Raumbuch.StundeMonat) StundeMonat
+    FROM BIRD.Gebaeude WITH (NOLOCK)
+INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Gebaeude.Standort_ID
+ LEFT JOIN BIRD.Raumbuch WITH (NOLOCK) ON Raumbuch.Gebaeude_ID = Gebaeude.ID
+    WHERE ${where}
+    GROUP BY Gebaeude.ID, Gebaeude.Firma_ID, Gebaeude.Standort_ID,
+             Standort.Bezeichnung, Gebaeude.Bezeichnung
+    ORDER BY Standort.Bezeichnung, Gebaeude.Bezeichnung`;
+
+  return { query, params };
+}
+
+/**
+ * Konvertiert eine Zeile der Portfolio-Abfrage
+ *
+ * @param data - Daten aus der Datenbank
+ * @returns Summen eines Gebäudes
+ */
+export function mapToPortfolioGebaeudeRow(data: any): PortfolioGebaeudeRow {
+  return {
+    gebaeude_ID: data.Gebaeude_ID,
+    firma_ID: data.Firma_ID,
+    standort_ID: data.Standort_ID,
+    standort: data.Standort || '',
+    gebaeude: data.Gebaeude || '',
+    anzahl: toNumber(data.Anzahl),
+    menge: toNumber(data.Menge),
+    mengeAktivMonat: toNumber(data.MengeAktivMonat),
+    vkWertNettoMonat: toNumber(data.VkWertNettoMonat),
+    vkWertBruttoMonat: toNumber(data.VkWertBruttoMonat),
+    rgWertNettoMonat: toNumber(data.RgWertNettoMonat),
+    rgWertBruttoMonat: toNumber(data.RgWertBruttoMonat),
+    stundenMonat: toNumber(data.StundeMonat),
+  };
+}
+
+/**
+ * Lädt die Summen aller Gebäude eines Standorts oder einer Firma;
+ * Fehler werden weitergereicht
+ *
+ * @param scope - Standort und/oder Firma
+ * @returns Summen je Gebäude
+ */
+export async function fetchPortfolioRows(scope: PortfolioScope): Promise<PortfolioGebaeudeRow[]> {
+  const { query, params } = buildPortfolioQuery(scope);
+  const data = await executeQuery(query, params);
+  return data.map(mapToPortfolioGebaeudeRow);
+}
+
+/**
+ * Ermittelt den Datenstand eines Portfolios (Gebäude sowie Anzahl, letzte
+ * Änderung und höchste Version der Raumbuch-Einträge)
+ *
+ * @param scope - Standort und/oder Firma
+ * @returns Vergleichbarer Versionsschlüssel
+ */
+export async function getPortfolioVersion(scope: PortfolioScope): Promise<string> {
+  const { where: gebaeudeWhere, params } = buildPortfolioWhere(scope, 'Gebaeude');
+  const { where: raumbuchWhere } = buildPortfolioWhere(scope, 'Raumbuch');
+
+  const data = await executeSingleQuery<{
+    Gebaeude: number;
+    Anzahl: number;
+    xDatum: Date | string | null;
+    xVersion: number | null;
+  }>(
+    `
+    SELECT (SELECT COUNT(*) FROM BIRD.Gebaeude WITH (NOLOCK) WHERE ${gebaeudeWhere}) Gebaeude
+         ,COUNT(*) Anzahl
+         ,MAX(xDatum) xDatum
+         ,MAX(xVersion) xVersion
+    FROM BIRD.Raumbuch WITH (NOLOCK)
+    WHERE ${raumbuchWhere}`,
+    params
+  );
+
+  if (!data) {
+    return '0';
+  }
+
+  const xDatum = data.xDatum instanceof Date ? data.xDatum.toISOString() : data.xDatum;
+  return `${data.Gebaeude}|${data.Anzahl}|${xDatum ?? ''}|${data.xVersion ?? ''}`;
+}
+
 /**
  * Ruft alle verfügbaren Standorte ab
  *
@@ -285,7 +996,7 @@ export async function getStandorte(): Promise<Standort[]> {
  */
 export async function getGebaeude(): Promise<Gebaeude[]> {
   try {
-    const data = await executeQuery(GEBAEUDE_QUERY);
+    const data = await executePrepared(GEBAEUDE_STATEMENT);
     return mapToGebaeudeList(data);
   } catch (error) {
     console.error('Fehler beim Abrufen der Gebäude:', error);
@@ -301,8 +1012,7 @@ export async function getGebaeude(): Promise<Gebaeude[]> {
  */
 export async function getStandortById(standort_ID: number): Promise<Standort | null> {
   try {
-    const query = `SELECT ID, Bezeichnung, Adresse, Strasse, PLZ, Ort FROM BIRD.Standort WHERE ID = @standort_ID`;
-    const data = await executeSingleQuery(query, { standort_ID });
+    const data = await executePreparedSingle(STANDORT_BY_ID_STATEMENT, { standort_ID });
 
     if (!data) {
       return null;
@@ -324,24 +1034,7 @@ export async function getStandortById(standort_ID: number): Promise<Standort | n
  */
 export async function getGebaeudeById(gebaeude_ID: number): Promise<Gebaeude | null> {
   try {
-    const query = `
-        SELECT Gebaeude.ID Gebaeude_ID
-             ,Gebaeude.Firma_ID
-             ,Gebaeude.Standort_ID
-             ,Standort.Bezeichnung Standort
-             ,Standort.Adresse
-             ,Standort.Strasse
-             ,Standort.PLZ
-             ,Standort.Ort
-             ,Gebaeude.Bezeichnung Gebaeude
-             ,Gebaeude.Preis
-             ,Gebaeude.Preis7Tage
-             ,Gebaeude.PreisSonntag
-        FROM BIRD.Gebaeude WITH (NOLOCK)
-      INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
-        WHERE Gebaeude.ID = @gebaeude_ID
-    `;
-    const data = await executeSingleQuery(query, { gebaeude_ID });
+    const data = await executePreparedSingle(GEBAEUDE_BY_ID_STATEMENT, { gebaeude_ID });
 
     if (!data) {
       return null;
@@ -362,57 +1055,7 @@ export async function getGebaeudeById(gebaeude_ID: number): Promise<Gebaeude | n
  */
 export async function getRaumbuchEntryById(id: number): Promise<RaumbuchEntry | null> {
   try {
-    const query = `
-        SELECT Raumbuch.ID
-             ,Raumbuch.Firma_ID
-             ,Raumbuch.Standort_ID
-             ,Raumbuch.Gebaeude_ID
-             ,Standort.Bezeichnung Standort
-             ,Raumbuch.Gebaeude
-             ,Raumbuch.Raumnummer
-             ,Raumbuch.Bereich
-             ,Raumbuch.Gebaeudeteil
-             ,Raumbuch.Etage
-             ,Raumbuch.Bezeichnung
-             ,Raumbuch.Reinigungsgruppe
-             ,Raumbuch.Menge
-             ,Raumbuch.MengeAktiv
-             ,Raumbuch.MengeInAktiv
-             ,Raumbuch.Einheit
-             ,Raumbuch.Anzahl
-             ,Raumbuch.Reinigungsintervall
-             ,Raumbuch.ReinigungstageMonat
-             ,Raumbuch.ReinigungstageJahr
-             ,Raumbuch.LeistungStunde
-             ,Raumbuch.LeistungStundeIst
-             ,Raumbuch.Aufschlag
-             ,Raumbuch.StundeTag
-             ,Raumbuch.StundeMonat
-             ,Raumbuch.MengeAktivMonat
-             ,Raumbuch.VkWertNettoMonat
-             ,Raumbuch.VkWertBruttoMonat
-             ,Raumbuch.RgWertNettoMonat
-             ,Raumbuch.RgWertBruttoMonat
-             ,Raumbuch.ReinigungsTage
-             ,Raumbuch.Reduzierung
-             ,Raumbuch.Bemerkung
-             ,Raumbuch.Bereich_ID
-             ,Raumbuch.Gebaeudeteil_ID
-             ,Raumbuch.Etage_ID
-             ,Raumbuch.Reinigungsgruppe_ID
-             ,Raumbuch.Einheit_ID
-             ,Raumbuch.Reinigungsintervall_ID
-             ,Raumbuch.ReinigungsTage_ID
-             ,Raumbuch.LfdNr
-             ,Raumbuch.xStatus
-             ,Raumbuch.xDatum
-             ,Raumbuch.xBenutzer
-             ,Raumbuch.xVersion
-        FROM BIRD.Raumbuch WITH (NOLOCK)
-      INNER JOIN BIRD.Standort WITH (NOLOCK) ON Standort.ID = Standort_ID
-        WHERE Raumbuch.ID = @id
-    `;
-    const data = await executeSingleQuery(query, { id });
+    const data = await executePreparedSingle(RAUMBUCH_BY_ID_STATEMENT, { id });
 
     if (!data) {
       return null;
@@ -0,0 +1,162 @@
+/**
+ * Vorberechnete Raumbuch-Summen je Gebäude
+ *
+ * Hält je Gebäude die Summen für Bereich, Reinigungsgruppe, Etage und
+ * Gebäudeteil als Gruppenzeilen. Berechnet werden sie in der Datenbank mit
+ * GROUPING SETS, sodass keine Raumbuch-Zeilen geladen werden; Zusammenfassung
+ * und Diagrammdaten werden daraus wie aus den Zeilen abgeleitet.
+ *
+ * Aktualisiert wird nur, wenn sich der Datenstand des Gebäudes (COUNT,
+ * MAX(xDatum), MAX(xVersion)) geändert hat; die Summen anderer Gebäude bleiben
+ * unberührt. Innerhalb von RAUMBUCH_CACHE_CONFIG.probeIntervalMs wird der
+ * Datenstand nicht erneut geprüft.
+ */
+
+import { RAUMBUCH_AGGREGATE_CONFIG, RAUMBUCH_CACHE_CONFIG } from '@/config/database';
+import {
+  aggregatesFromGroupRows,
+  gebaeudeteilFromAggregates,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+} from '@/services/analysis/columnar-aggregation';
+
+import { estimateSize, LruCache, SingleFlight } from './cache';
+import { fetchRaumbuchAggregateRows, getRaumbuchVersion } from './queries';
+
+import type { CacheStats } from './cache';
+import type {
+  RaumbuchAggregateRow,
+  RaumbuchSummary,
+  VisualizationData,
+} from '@/types/raumbuch.types';
+
+/**
+ * Vorberechnete Summen eines Gebäudes mit abgeleiteten Auswertungen
+ */
+export interface RaumbuchAggregateResult {
+  gebaeude_ID: number;
+  /** Gesamtzeile und Zeilen je Gruppe */
+  rows: RaumbuchAggregateRow[];
+  summary: RaumbuchSummary;
+  visualizationData: VisualizationData;
+  gebaeudeteilData: Record<string, number>;
+  /** Datenstand laut getRaumbuchVersion() */
+  version: string;
+  /** Zeitpunkt der Berechnung (ms) */
+  refreshedAt: number;
+  /** Zeitpunkt der letzten Prüfung des Datenstands (ms) */
+  checkedAt: number;
+}
+
+const store = new LruCache<number, RaumbuchAggregateResult>({
+  maxBytes: RAUMBUCH_AGGREGATE_CONFIG.maxMegabytes * 1024 * 1024,
+  ttlMs: 0,
+  sizeOf: result =>
+    estimateSize(result.rows) +
+    estimateSize(result.summary) +
+    estimateSize(result.visualizationData) +
+    estimateSize(result.gebaeudeteilData),
+});
+
+const flights = new SingleFlight<number, RaumbuchAggregateResult>();
+
+/**
+ * Leitet Zusammenfassung und Diagrammdaten aus den Gruppenzeilen ab
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @param rows - Gruppenzeilen aus fetchRaumbuchAggregateRows()
+ * @param version - Datenstand
+ * @returns Vorberechnetes Ergebnis
+ */
+export function buildRaumbuchAggregateResult(
+  gebaeude_ID: number,
+  rows: RaumbuchAggregateRow[],
+  version: string
+): RaumbuchAggregateResult {
+  const aggregates = aggregatesFromGroupRows(rows);
+  const now = Date.now();
+
+  return {
+    gebaeude_ID,
+    rows,
+    summary: summaryFromAggregates(aggregates),
+    visualizationData: visualizationFromAggregates(aggregates),
+    gebaeudeteilData: gebaeudeteilFromAggregates(aggregates),
+    version,
+    refreshedAt: now,
+    checkedAt: now,
+  };
+}
+
+/**
+ * Liefert die vorberechneten Summen eines Gebäudes, bei unverändertem
+ * Datenstand aus dem Speicher
+ *
+ * Schlägt die Aktualisierung fehl, wird ein vorhandener Stand weiter
+ * ausgeliefert; ohne ihn wird der Fehler weitergereicht.
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @returns Vorberechnetes Ergebnis
+ */
+export async function getRaumbuchAggregates(gebaeude_ID: number): Promise<RaumbuchAggregateResult> {
+  const stored = store.get(gebaeude_ID);
+  if (stored && Date.now() - stored.checkedAt < RAUMBUCH_CACHE_CONFIG.probeIntervalMs) {
+    return stored;
+  }
+
+  return flights.run(gebaeude_ID, () => refreshRaumbuchAggregates(gebaeude_ID, stored));
+}
+
+/**
+ * Prüft den Datenstand und berechnet die Summen bei Bedarf neu
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @param stored - Vorhandener Stand
+ * @returns Aktuelles Ergebnis
+ */
+async function refreshRaumbuchAggregates(
+  gebaeude_ID: number,
+  stored: RaumbuchAggregateResult | undefined
+): Promise<RaumbuchAggregateResult> {
+  try {
+    // Datenstand vor der Berechnung ermitteln (siehe raumbuch-cache.ts)
+    const version = await getRaumbuchVersion(gebaeude_ID);
+    if (stored && stored.version === version) {
+      stored.checkedAt = Date.now();
+      return stored;
+    }
+
+    const rows = await fetchRaumbuchAggregateRows(gebaeude_ID);
+    const result = buildRaumbuchAggregateResult(gebaeude_ID, rows, version);
+    store.set(gebaeude_ID, result);
+    return result;
+  } catch (error) {
+    if (stored) {
+      console.error('Fehler beim Aktualisieren der Raumbuch-Summen:', error);
+      return stored;
+    }
+    throw error;
+  }
+}
+
+/**
+ * Verwirft vorberechnete Summen
+ *
+ * @param gebaeude_ID - ID des Gebäudes; ohne Angabe werden alle verworfen
+ */
+export function invalidateRaumbuchAggregates(gebaeude_ID?: number): void {
+  if (gebaeude_ID === undefined) {
+    store.clear();
+  } else {
+    store.delete(gebaeude_ID);
+  }
+}
+
+/**
+ * Liefert die Statistik des Summen-Speichers
+ *
+ * @returns Einträge, Größe, Treffer und Verdrängungen
+ */
+export function getRaumbuchAggregateStats(): CacheStats & { inflight: number } {
+  return { ...store.stats(), inflight: flights.size };
+}
@@ -0,0 +1,171 @@
+/**
+ * Cache für Raumbuch-Ergebnisse je Gebäude
+ *
+ * Hält die Zeilen in Spaltenform (RaumbuchFrame) zusammen mit Zusammenfassung,
+ * Visualisierungsdaten und Filteroptionen, damit Dashboard-Aufruf und anschließender Export nicht
+ * jeweils die volle Raumbuch-Abfrage ausführen. Vor der Auslieferung wird der
+ * Datenstand des Gebäudes geprüft (COUNT, MAX(xDatum), MAX(xVersion)); nur wenn
+ * er sich geändert hat, werden die Zeilen neu geladen. Gleichzeitige Anfragen
+ * für dasselbe Gebäude teilen sich einen Datenbank-Roundtrip.
+ *
+ * Die gelieferten Frames und Objekte werden von allen Aufrufern gemeinsam
+ * genutzt und dürfen nicht verändert werden (where() erzeugt einen neuen Frame).
+ */
+
+import { RAUMBUCH_CACHE_CONFIG } from '@/config/database';
+import { timeStage } from '@/lib/metrics';
+import {
+  aggregateFrame,
+  createFilterOptions,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+} from '@/services/analysis/raumbuch-analysis';
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
+
+import { estimateSize, LruCache, SingleFlight } from './cache';
+import { fetchRaumbuchFrame, getRaumbuchVersion } from './queries';
+
+import type { CacheStats } from './cache';
+import type { FilterOptions } from '@/services/analysis/raumbuch-analysis';
+import type { RaumbuchSummary, VisualizationData } from '@/types/raumbuch.types';
+
+/**
+ * Raumbuch-Daten eines Gebäudes mit abgeleiteten Auswertungen
+ */
+export interface RaumbuchResult {
+  gebaeude_ID: number;
+  frame: RaumbuchFrame;
+  summary: RaumbuchSummary;
+  visualizationData: VisualizationData;
+  filterOptions: FilterOptions;
+  /** Datenstand laut getRaumbuchVersion() */
+  version: string;
+  /** Zeitpunkt der letzten Prüfung des Datenstands (ms) */
+  checkedAt: number;
+}
+
+const cache = new LruCache<number, RaumbuchResult>({
+  maxBytes: RAUMBUCH_CACHE_CONFIG.maxMegabytes * 1024 * 1024,
+  ttlMs: RAUMBUCH_CACHE_CONFIG.ttlSeconds * 1000,
+  sizeOf: result =>
+    result.frame.byteSize() +
+    estimateSize(result.summary) +
+    estimateSize(result.visualizationData) +
+    estimateSize(result.filterOptions),
+});
+
+const flights = new SingleFlight<number, RaumbuchResult>();
+
+/**
+ * Erstellt ein Ergebnis mit Zusammenfassung, Visualisierungsdaten und Filteroptionen
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @param frame - Raumbuch-Einträge in Spaltenform
+ * @param version - Datenstand
+ * @returns Raumbuch-Ergebnis
+ */
+export function buildRaumbuchResult(
+  gebaeude_ID: number,
+  frame: RaumbuchFrame,
+  version: string
+): RaumbuchResult {
+  const aggregates = timeStage('aggregate', () => aggregateFrame(frame));
+
+  return {
+    gebaeude_ID,
+    frame,
+    summary: timeStage('summary', () => summaryFromAggregates(aggregates)),
+    visualizationData: timeStage('visualization', () => visualizationFromAggregates(aggregates)),
+    filterOptions: timeStage('filter_options', () => createFilterOptions(frame)),
+    version,
+    checkedAt: Date.now(),
+  };
+}
+
+/**
+ * Liefert die Auswertungen für eine (gefilterte) Teilmenge eines Ergebnisses;
+ * für die ungefilterten Zeilen wird das gecachte Ergebnis selbst geliefert
+ *
+ * @param result - Ergebnis von getRaumbuchResult()
+ * @param frame - result.frame oder ein daraus gefilterter Frame
+ * @returns Raumbuch-Ergebnis für die übergebenen Zeilen
+ */
+export function resultForRows(result: RaumbuchResult, frame: RaumbuchFrame): RaumbuchResult {
+  if (frame === result.frame) {
+    return result;
+  }
+
+  return buildRaumbuchResult(result.gebaeude_ID, frame, result.version);
+}
+
+/**
+ * Liefert die Raumbuch-Daten eines Gebäudes samt Auswertungen, bei
+ * unverändertem Datenstand aus dem Cache
+ *
+ * Wie getRaumbuchData() liefert ein Datenbankfehler ein leeres Ergebnis
+ * (das nicht gecacht wird); ein vorhandener, noch gültiger Eintrag wird in
+ * diesem Fall weiter ausgeliefert.
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @returns Raumbuch-Ergebnis
+ */
+export async function getRaumbuchResult(gebaeude_ID: number = -1): Promise<RaumbuchResult> {
+  const cached = cache.get(gebaeude_ID);
+  if (cached && Date.now() - cached.checkedAt < RAUMBUCH_CACHE_CONFIG.probeIntervalMs) {
+    return cached;
+  }
+
+  return flights.run(gebaeude_ID, () => refreshRaumbuchResult(gebaeude_ID, cached));
+}
+
+/**
+ * Prüft den Datenstand und lädt die Daten bei Bedarf neu
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @param cached - Vorhandener Cache-Eintrag
+ * @returns Aktuelles Raumbuch-Ergebnis
+ */
+async function refreshRaumbuchResult(
+  gebaeude_ID: number,
+  cached: RaumbuchResult | undefined
+): Promise<RaumbuchResult> {
+  try {
+    // Datenstand vor dem Laden ermitteln: ändert sich etwas während des
+    // Ladens, erkennt die nächste Prüfung den neueren Stand
+    const version = await getRaumbuchVersion(gebaeude_ID);
+    if (cached && cached.version === version) {
+      cached.checkedAt = Date.now();
+      return cached;
+    }
+
+    const frame = await fetchRaumbuchFrame(gebaeude_ID);
+    const result = buildRaumbuchResult(gebaeude_ID, frame, version);
+    cache.set(gebaeude_ID, result);
+    return result;
+  } catch (error) {
+    console.error('Fehler beim Abrufen der Raumbuch-Daten:', error);
+    return cached ?? buildRaumbuchResult(gebaeude_ID, RaumbuchFrame.empty(), '');
+  }
+}
+
+/**
+ * Verwirft gecachte Raumbuch-Ergebnisse
+ *
+ * @param gebaeude_ID - ID des Gebäudes; ohne Angabe wird der ganze Cache geleert
+ */
+export function invalidateRaumbuchCache(gebaeude_ID?: number): void {
+  if (gebaeude_ID === undefined) {
+    cache.clear();
+  } else {
+    cache.delete(gebaeude_ID);
+  }
+}
+
+/**
+ * Liefert die Statistik des Raumbuch-Caches
+ *
+ * @returns Einträge, Größe, Treffer und Verdrängungen
+ */
+export function getRaumbuchCacheStats(): CacheStats & { inflight: number } {
+  return { ...cache.stats(), inflight: flights.size };
+}
@@ -0,0 +1,309 @@
+/**
+ * Wiederholung vorübergehender Fehler und Circuit Breaker für den Datenbankzugriff
+ */
+
+/**
+ * Fehlercodes von mssql/tedious für Verbindungsprobleme, die sich durch einen
+ * erneuten Versuch beheben können
+ */
+const TRANSIENT_CODES = new Set([
+  'ETIMEOUT',
+  'ESOCKET',
+  'ECONNCLOSED',
+  'ECONNRESET',
+  'ECONNREFUSED',
+  'EPIPE',
+  'ENOTOPEN',
+  'EINSTLOOKUP',
+  'EPOOLFULL',
+]);
+
+/**
+ * SQL-Server-Fehlernummern, die vorübergehend sind (Deadlock, Timeout,
+ * Failover und Drosselung bei Azure SQL)
+ */
+const TRANSIENT_NUMBERS = new Set([
+  -2, 1205, 233, 4060, 4221, 10053, 10054, 10060, 10928, 10929, 40143, 40197, 40501, 40540,
+  40613, 49918, 49919, 49920,
+]);
+
+/**
+ * Prüft, ob ein Fehler vorübergehend ist und ein erneuter Versuch sinnvoll ist
+ *
+ * @param error - Aufgetretener Fehler
+ * @returns true bei Verbindungs-, Timeout- und Drosselungsfehlern
+ */
+export function isTransientError(error: unknown): boolean {
+  if (!error || typeof error !== 'object') {
+    return false;
+  }
+
+  if (error instanceof CircuitOpenError) {
+    return false;
+  }
+
+  const { code, number, originalError } = error as {
+    code?: unknown;
+    number?: unknown;
+    originalError?: unknown;
+  };
+
+  if (typeof code === 'string' && TRANSIENT_CODES.has(code)) {
+    return true;
+  }
+
+  if (typeof number === 'number' && TRANSIENT_NUMBERS.has(number)) {
+    return true;
+  }
+
+  // mssql verpackt Fehler von tedious
+  return originalError !== undefined && originalError !== error
+    ? isTransientError(originalError)
+    : false;
+}
+
+/**
+ * Optionen für wiederholte Versuche
+ */
+export interface RetryOptions {
+  /** Anzahl zusätzlicher Versuche nach dem ersten (0 = keine Wiederholung) */
+  retries: number;
+  /** Basiswartezeit in ms, verdoppelt sich mit jedem Versuch */
+  baseDelayMs: number;
+  /** Obergrenze der Wartezeit in ms */
+  maxDelayMs: number;
+  /** Entscheidet, ob ein Fehler wiederholt wird (Standard: isTransientError) */
+  shouldRetry?: (error: unknown) => boolean;
+  /** Wird vor jeder Wiederholung aufgerufen */
+  onRetry?: (error: unknown, attempt: number, delayMs: number) => void;
+}
+
+/**
+ * Wartezeit vor dem n-ten Wiederholungsversuch mit voller Streuung
+ * ("full jitter"): zufällig zwischen 0 und min(maxDelay, baseDelay * 2^n)
+ *
+ * @param attempt - Nummer der Wiederholung (ab 0)
+ * @param options - Basis- und Maximalwartezeit
+ * @param random - Zufallsquelle im Intervall [0, 1)
+ * @returns Wartezeit in ms
+ */
+export function backoffDelay(
+  attempt: number,
+  options: Pick<RetryOptions, 'baseDelayMs' | 'maxDelayMs'>,
+  random: () => number = Math.random
+): number {
+  const ceiling = Math.min(options.maxDelayMs, options.baseDelayMs * 2 ** attempt);
+  return Math.floor(random() * ceiling);
+}
+
+/**
+ * Führt fn aus und wiederholt vorübergehende Fehler mit gestreutem
+ * exponentiellem Backoff
+ *
+ * @param fn - Auszuführende Operation
+ * @param options - Wiederholungsoptionen
+ * @returns Ergebnis von fn
+ */
+export async function retryWithBackoff<T>(fn: () => Promise<T>, options: RetryOptions): Promise<T> {
+  const shouldRetry = options.shouldRetry ?? isTransientError;
+
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await fn();
+    } catch (error) {
+      if (attempt >= options.retries || !shouldRetry(error)) {
+        throw error;
+      }
+
+      const delayMs = backoffDelay(attempt, options);
+      options.onRetry?.(error, attempt + 1, delayMs);
+      await new Promise(resolve => setTimeout(resolve, delayMs));
+    }
+  }
+}
+
+/**
+ * Zustand des Circuit Breakers
+ */
+export type CircuitState = 'closed' | 'open' | 'half-open';
+
+/**
+ * Optionen für den Circuit Breaker
+ */
+export interface CircuitBreakerOptions {
+  /** Anzahl aufeinanderfolgender Fehler, nach der der Breaker öffnet (0 = nie) */
+  failureThreshold: number;
+  /** Dauer in ms, die der Breaker offen bleibt, bevor ein Probeaufruf erlaubt ist */
+  resetTimeoutMs: number;
+  /** Entscheidet, ob ein Fehler als Ausfall zählt (Standard: isTransientError) */
+  isFailure?: (error: unknown) => boolean;
+}
+
+/**
+ * Statistik des Circuit Breakers
+ */
+export interface CircuitBreakerStats {
+  state: CircuitState;
+  consecutiveFailures: number;
+  opened: number;
+  rejected: number;
+}
+
+/**
+ * Fehler, wenn der Circuit Breaker offen ist und Aufrufe sofort abweist
+ */
+export class CircuitOpenError extends Error {
+  readonly code = 'ECIRCUITOPEN';
+
+  constructor(readonly retryAfterMs: number) {
+    super(`Datenbank nicht erreichbar, nächster Versuch in ${Math.ceil(retryAfterMs / 1000)} s`);
+    this.name = 'CircuitOpenError';
+  }
+}
+
+/**
+ * Circuit Breaker, der bei einem Ausfall Aufrufe sofort abweist
+ *
+ * Nach failureThreshold aufeinanderfolgenden Ausfällen öffnet der Breaker und
+ * weist Aufrufe für resetTimeoutMs mit CircuitOpenError ab. Danach wird genau
+ * ein Probeaufruf durchgelassen (half-open): gelingt er, schließt der Breaker,
+ * sonst öffnet er erneut. Fehler, die nicht als Ausfall gelten (etwa
+ * SQL-Syntaxfehler), lassen den Zustand unverändert.
+ */
+export class CircuitBreaker {
+  private readonly options: CircuitBreakerOptions;
+  private state: CircuitState = 'closed';
+  private consecutiveFailures = 0;
+  private openedAt = 0;
+  private probing = false;
+  private opened = 0;
+  private rejected = 0;
+
+  constructor(options: CircuitBreakerOptions) {
+    this.options = options;
+  }
+
+  /**
+   * Führt fn aus, sofern der Breaker es zulässt
+   *
+   * @param fn - Auszuführende Operation
+   * @returns Ergebnis von fn
+   * @throws CircuitOpenError, wenn der Breaker offen ist
+   */
+  async run<T>(fn: () => Promise<T>): Promise<T> {
+    const settle = this.begin();
+
+    try {
+      const result = await fn();
+      settle();
+      return result;
+    } catch (error) {
+      settle(error);
+      throw error;
+    }
+  }
+
+  /**
+   * Lässt eine Operation zu, deren Ausgang erst später feststeht
+   *
+   * Für Abläufe, die sich nicht in run() einschließen lassen, etwa Streams:
+   * Der Ausgang wird über die zurückgegebene Funktion gemeldet, ohne Argument
+   * als Erfolg, sonst mit dem Fehler. Nur die erste Meldung zählt.
+   *
+   * @returns Funktion zum Melden des Ausgangs
+   * @throws CircuitOpenError, wenn der Breaker offen ist
+   */
+  begin(): (error?: unknown) => void {
+    const probe = this.admit();
+    let settled = false;
+
+    return (...args: [error?: unknown]) => {
+      if (settled) {
+        return;
+      }
+      settled = true;
+
+      if (probe) {
+        this.probing = false;
+      }
+      if (args.length === 0) {
+        this.onSuccess();
+      } else {
+        this.onError(args[0]);
+      }
+    };
+  }
+
+  /**
+   * Liefert die aktuelle Statistik
+   */
+  stats(): CircuitBreakerStats {
+    return {
+      state: this.currentState(),
+      consecutiveFailures: this.consecutiveFailures,
+      opened: this.opened,
+      rejected: this.rejected,
+    };
+  }
+
+  /**
+   * Setzt den Breaker in den geschlossenen Zustand zurück
+   */
+  reset(): void {
+    this.state = 'closed';
+    this.consecutiveFailures = 0;
+    this.probing = false;
+  }
+
+  /**
+   * Prüft, ob ein Aufruf erlaubt ist; liefert true für einen Probeaufruf
+   */
+  private admit(): boolean {
+    const state = this.currentState();
+
+    if (state === 'closed') {
+      return false;
+    }
+
+    if (state === 'half-open' && !this.probing) {
+      this.state = 'half-open';
+      this.probing = true;
+      return true;
+    }
+
+    this.rejected++;
+    const retryAfterMs = Math.max(0, this.openedAt + this.options.resetTimeoutMs - Date.now());
+    throw new CircuitOpenError(retryAfterMs);
+  }
+
+  private currentState(): CircuitState {
+    if (this.state === 'open' && Date.now() - this.openedAt >= this.options.resetTimeoutMs) {
+      return 'half-open';
+    }
+    return this.state;
+  }
+
+  private onSuccess(): void {
+    this.state = 'closed';
+    this.consecutiveFailures = 0;
+  }
+
+  private onError(error: unknown): void {
+    const isFailure = this.options.isFailure ?? isTransientError;
+    if (!isFailure(error)) {
+      // Die Datenbank hat geantwortet; ein Probeaufruf gilt damit als gelungen
+      if (this.state === 'half-open') {
+        this.onSuccess();
+      }
+      return;
+    }
+
+    this.consecutiveFailures++;
+    const threshold = this.options.failureThreshold;
+    if (this.state === 'half-open' || (threshold > 0 && this.consecutiveFailures >= threshold)) {
+      this.state = 'open';
+      this.openedAt = Date.now();
+      this.opened++;
+    }
+  }
+}
@@ -0,0 +1,281 @@
+/**
+ * Langlebiger Browser-Pool für die PDF-Erzeugung mit Puppeteer
+ *
+ * Statt für jeden Export einen eigenen Chromium zu starten, hält der Pool einen
+ * Browser mit einer begrenzten Zahl von Seiten. Weitere Anfragen warten in
+ * einer Warteschlange auf eine freie Seite. Seiten werden nach einer
+ * konfigurierbaren Zahl von Exporten oder nach einem Fehler neu erstellt; ein
+ * abgestürzter Browser wird beim nächsten Export neu gestartet.
+ */
+
+import * as puppeteer from 'puppeteer';
+
+import { EXPORT_CONFIG } from '@/config/app';
+
+/**
+ * Optionen für den Browser-Pool
+ */
+export interface BrowserPoolOptions {
+  /** Anzahl gleichzeitig nutzbarer Seiten */
+  size: number;
+  /** Seite nach so vielen Exporten neu erstellen */
+  maxRendersPerPage: number;
+  /** Maximale Wartezeit auf eine freie Seite in ms */
+  acquireTimeoutMs: number;
+  /** Browser nach so vielen ms ohne Export beenden (0 = nie) */
+  idleTimeoutMs: number;
+  /** Startet den Browser (Standard: puppeteer.launch) */
+  launch?: () => Promise<puppeteer.Browser>;
+}
+
+/**
+ * Statistik des Browser-Pools
+ */
+export interface BrowserPoolStats {
+  size: number;
+  active: number;
+  idle: number;
+  waiting: number;
+  launches: number;
+  renders: number;
+  recycled: number;
+}
+
+interface PooledPage {
+  page: puppeteer.Page;
+  renders: number;
+}
+
+interface Waiter {
+  resolve: () => void;
+  timer: ReturnType<typeof setTimeout>;
+}
+
+/**
+ * Startet Chromium mit den bisher für den PDF-Export verwendeten Optionen
+ */
+function launchBrowser(): Promise<puppeteer.Browser> {
+  return puppeteer.launch({
+    headless: true,
+    args: ['--no-sandbox', '--disable-setuid-sandbox'],
+  });
+}
+
+/**
+ * Pool von Puppeteer-Seiten in einem gemeinsamen Browser
+ */
+export class BrowserPool {
+  private readonly options: BrowserPoolOptions;
+  private browser: puppeteer.Browser | null = null;
+  private launching: Promise<puppeteer.Browser> | null = null;
+  private readonly idle: PooledPage[] = [];
+  private readonly waiters: Waiter[] = [];
+  private active = 0;
+  private idleTimer: ReturnType<typeof setTimeout> | null = null;
+  private launches = 0;
+  private renders = 0;
+  private recycled = 0;
+
+  constructor(options: BrowserPoolOptions) {
+    this.options = { ...options, size: Math.max(1, options.size) };
+  }
+
+  /**
+   * Führt fn mit einer Seite aus dem Pool aus und gibt die Seite danach zurück
+   *
+   * Wirft fn einen Fehler, wird die Seite verworfen, da ihr Zustand unklar ist.
+   *
+   * @param fn - Arbeit mit der Seite
+   * @returns Ergebnis von fn
+   */
+  async withPage<T>(fn: (page: puppeteer.Page) => Promise<T>): Promise<T> {
+    const slot = await this.acquire();
+    let healthy = false;
+
+    try {
+      const result = await fn(slot.page);
+      healthy = true;
+      return result;
+    } finally {
+      this.release(slot, healthy);
+    }
+  }
+
+  /**
+   * Liefert die aktuelle Statistik
+   */
+  stats(): BrowserPoolStats {
+    return {
+      size: this.options.size,
+      active: this.active,
+      idle: this.idle.length,
+      waiting: this.waiters.length,
+      launches: this.launches,
+      renders: this.renders,
+      recycled: this.recycled,
+    };
+  }
+
+  /**
+   * Beendet den Browser; wartende Anfragen erhalten danach einen neuen Browser
+   */
+  async close(): Promise<void> {
+    this.clearIdleTimer();
+    this.idle.length = 0;
+
+    const browser = this.browser;
+    this.browser = null;
+    if (browser) {
+      await browser.close().catch(error => {
+        console.error('Fehler beim Beenden des PDF-Browsers:', error);
+      });
+    }
+  }
+
+  private async acquire(): Promise<PooledPage> {
+    this.clearIdleTimer();
+    await this.acquirePermit();
+
+    try {
+      // Gesundheitsprüfung: geschlossene Seiten oder Seiten eines alten Browsers verwerfen
+      while (this.idle.length > 0) {
+        const slot = this.idle.pop() as PooledPage;
+        if (this.isHealthy(slot)) {
+          return slot;
+        }
+        this.recycle(slot);
+      }
+
+      const browser = await this.getBrowser();
+      return { page: await browser.newPage(), renders: 0 };
+    } catch (error) {
+      this.releasePermit();
+      throw error;
+    }
+  }
+
+  private release(slot: PooledPage, healthy: boolean): void {
+    slot.renders++;
+    this.renders++;
+
+    if (healthy && slot.renders < this.options.maxRendersPerPage && this.isHealthy(slot)) {
+      this.idle.push(slot);
+    } else {
+      this.recycle(slot);
+    }
+
+    this.releasePermit();
+    this.scheduleIdleClose();
+  }
+
+  private isHealthy(slot: PooledPage): boolean {
+    return (
+      this.browser !== null &&
+      this.browser.connected &&
+      slot.page.browser() === this.browser &&
+      !slot.page.isClosed()
+    );
+  }
+
+  private recycle(slot: PooledPage): void {
+    this.recycled++;
+    if (!slot.page.isClosed()) {
+      slot.page.close().catch(() => undefined);
+    }
+  }
+
+  private async getBrowser(): Promise<puppeteer.Browser> {
+    if (this.browser?.connected) {
+      return this.browser;
+    }
+
+    // Nur ein Start gleichzeitig, auch wenn mehrere Seiten angefordert werden
+    if (!this.launching) {
+      this.launching = (this.options.launch ?? launchBrowser)()
+        .then(browser => {
+          this.launches++;
+          this.browser = browser;
+          browser.on('disconnected', () => {
+            if (this.browser === browser) {
+              this.browser = null;
+            }
+          });
+          return browser;
+        })
+        .finally(() => {
+          this.launching = null;
+        });
+    }
+
+    return this.launching;
+  }
+
+  private acquirePermit(): Promise<void> {
+    if (this.active < this.options.size) {
+      this.active++;
+      return Promise.resolve();
+    }
+
+    return new Promise((resolve, reject) => {
+      const waiter: Waiter = {
+        resolve,
+        timer: setTimeout(() => {
+          this.waiters.splice(this.waiters.indexOf(waiter), 1);
+          reject(new Error('Zeitüberschreitung beim Warten auf eine freie PDF-Seite'));
+        }, this.options.acquireTimeoutMs),
+      };
+      this.waiters.push(waiter);
+    });
+  }
+
+  private releasePermit(): void {
+    // Die Berechtigung wird direkt an den nächsten Wartenden weitergegeben
+    const next = this.waiters.shift();
+    if (next) {
+      clearTimeout(next.timer);
+      next.resolve();
+    } else {
+      this.active--;
+    }
+  }
+
+  private scheduleIdleClose(): void {
+    if (this.active > 0 || this.options.idleTimeoutMs <= 0 || !this.browser) {
+      return;
+    }
+
+    this.clearIdleTimer();
+    this.idleTimer = setTimeout(() => {
+      this.idleTimer = null;
+      if (this.active === 0) {
+        this.close();
+      }
+    }, this.options.idleTimeoutMs);
+    this.idleTimer.unref?.();
+  }
+
+  private clearIdleTimer(): void {
+    if (this.idleTimer) {
+      clearTimeout(this.idleTimer);
+      this.idleTimer = null;
+    }
+  }
+}
+
+// Globaler Pool, damit Hot-Reload in der Entwicklung keine weiteren Browser startet
+const globalForBrowserPool = global as unknown as {
+  pdfBrowserPool: BrowserPool | undefined;
+};
+
+/**
+ * Liefert den gemeinsamen Browser-Pool für PDF-Exporte
+ *
+ * @returns Browser-Pool mit der Konfiguration aus EXPORT_CONFIG.pdf.pool
+ */
+export function getBrowserPool(): BrowserPool {
+  if (!globalForBrowserPool.pdfBrowserPool) {
+    globalForBrowserPool.pdfBrowserPool = new BrowserPool(EXPORT_CONFIG.pdf.pool);
+  }
+
+  return globalForBrowserPool.pdfBrowserPool;
+}
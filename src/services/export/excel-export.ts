@@ -4,7 +4,16 @@
 
 import ExcelJS from 'exceljs';
 
+import { countRows, recordStage } from '@/lib/metrics';
+import {
+  RaumbuchAccumulator,
+  summaryFromAggregates,
+} from '@/services/analysis/columnar-aggregation';
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
+
+import type { FrameMeasure } from '@/services/analysis/raumbuch-frame';
 import type { RaumbuchRow, RaumbuchSummary } from '@/types/raumbuch.types';
+import type { Writable } from 'stream';
 
 // Use RaumbuchRow as RaumbuchEntry for consistency with the rest of the code
 type RaumbuchEntry = RaumbuchRow;
@@ -25,311 +34,424 @@ function safeNumber(value: unknown, defaultValue: number = 0): number {
   return isNaN(parsed) ? defaultValue : parsed;
 }
 
+// Formatierungen (werden von allen Zellen geteilt)
+const headerStyle: Partial<ExcelJS.Style> = {
+  font: { bold: true, color: { argb: 'FFFFFFFF' } },
+  fill: { type: 'pattern', pattern: 'solid', fgColor: { argb: 'FF003366' } },
+  border: {
+    top: { style: 'thin' },
+    left: { style: 'thin' },
+    bottom: { style: 'thin' },
+    right: { style: 'thin' },
+  },
+  alignment: { horizontal: 'center', vertical: 'middle' },
+};
+
+const currencyFormat = '#,##0.00 €';
+const numberFormat = '#,##0.00';
+
+// Spaltenstile für numerische Spalten; neue Zellen übernehmen sie von der Spalte
+const currencyStyle: Partial<ExcelJS.Style> = {
+  numFmt: currencyFormat,
+  alignment: { horizontal: 'right' },
+};
+const numberStyle: Partial<ExcelJS.Style> = {
+  numFmt: numberFormat,
+  alignment: { horizontal: 'right' },
+};
+
+// Spalten der Hauptdaten-Tabelle
+const dataColumns: Partial<ExcelJS.Column>[] = [
+  { header: 'ID', key: 'ID', width: 6 },
+  { header: 'Raumnummer', key: 'Raumnummer', width: 12 },
+  { header: 'Bereich', key: 'Bereich', width: 15 },
+  { header: 'Gebäudeteil', key: 'Gebaeudeteil', width: 15 },
+  { header: 'Etage', key: 'Etage', width: 10 },
+  { header: 'Bezeichnung', key: 'Bezeichnung', width: 20 },
+  { header: 'RG', key: 'Reinigungsgruppe', width: 8 }, // Changed from RG to Reinigungsgruppe to match the database field
+  { header: 'qm', key: 'Menge', width: 10, style: numberStyle }, // Changed from qm to Menge to match the database field
+  { header: 'Anzahl', key: 'Anzahl', width: 8, style: numberStyle },
+  { header: 'Intervall', key: 'Reinigungsintervall', width: 12 }, // Changed from Intervall to Reinigungsintervall
+  { header: 'Rg/Jahr', key: 'ReinigungstageJahr', width: 10, style: numberStyle }, // Changed from RgJahr to ReinigungstageJahr
+  { header: 'Rg/Monat', key: 'ReinigungstageMonat', width: 10, style: numberStyle }, // Changed from RgMonat to ReinigungstageMonat
+  { header: 'qm/Monat', key: 'MengeAktivMonat', width: 10, style: numberStyle }, // Changed from qmMonat to MengeAktivMonat
+  { header: '€/Monat', key: 'VkWertNettoMonat', width: 12, style: currencyStyle }, // Changed from WertMonat to VkWertNettoMonat
+  { header: 'h/Tag', key: 'StundeTag', width: 10, style: numberStyle }, // Changed from StundenTag to StundeTag
+  { header: 'h/Monat', key: 'StundeMonat', width: 10, style: numberStyle }, // Changed from StundenMonat to StundeMonat
+  { header: '€/Jahr', key: 'VkWertNettoMonat*12', width: 12, style: currencyStyle }, // Calculated as VkWertNettoMonat*12
+  { header: 'qm/h', key: 'LeistungStunde', width: 10, style: numberStyle }, // Changed from qmStunde to LeistungStunde
+  { header: 'Reinigungstage', key: 'ReinigungsTage', width: 15 },
+  { header: 'Bemerkung', key: 'Bemerkung', width: 25 },
+  { header: 'Reduzierung', key: 'Reduzierung', width: 15 },
+];
+
+// Spalten der Summen-Zeile, die mit doppeltem Rahmen hervorgehoben werden
+const sumColumns = [8, 13, 14, 16, 17];
+
+// Zeilen, nach denen der Stream-Export die Ereignisschleife freigibt
+const STREAM_BATCH_ROWS = 1000;
+
 /**
- * Erzeugt eine Excel-Datei mit Raumbuch-Daten
+ * Werte einer Datenzeile
  *
- * @param data - Raumbuch-Einträge
- * @param standortName - Name des Standorts
- * @param summary - Optional: Zusammenfassung der Daten
- * @returns Buffer mit der Excel-Datei
+ * @param item - Raumbuch-Eintrag
+ * @returns Zeilenwerte nach Spaltenschlüssel
  */
-export async function generateExcel(
-  data: RaumbuchEntry[],
-  standortName: string,
-  summary?: RaumbuchSummary
-): Promise<ExcelJS.Buffer> {
-  // Erstelle neue Arbeitsmappe
-  const workbook = new ExcelJS.Workbook();
-  workbook.creator = 'Ritter Digital';
-  workbook.created = new Date();
-  workbook.modified = new Date();
-
-  // Formatierungen
-  const headerStyle = {
-    font: { bold: true, color: { argb: 'FFFFFFFF' } },
-    fill: { type: 'pattern', pattern: 'solid', fgColor: { argb: 'FF003366' } },
-    border: {
-      top: { style: 'thin' },
-      left: { style: 'thin' },
-      bottom: { style: 'thin' },
-      right: { style: 'thin' },
-    },
-    alignment: { horizontal: 'center', vertical: 'middle' },
+function dataRowValues(item: Partial<RaumbuchEntry>): Record<string, unknown> {
+  return {
+    ID: item.ID,
+    Raumnummer: item.Raumnummer,
+    Bereich: item.Bereich,
+    Gebaeudeteil: item.Gebaeudeteil,
+    Etage: item.Etage,
+    Bezeichnung: item.Bezeichnung,
+    Reinigungsgruppe: item.Reinigungsgruppe,
+    Menge: safeNumber(item.Menge),
+    Anzahl: safeNumber(item.Anzahl),
+    Reinigungsintervall: item.Reinigungsintervall,
+    ReinigungstageJahr: safeNumber(item.ReinigungstageJahr),
+    ReinigungstageMonat: safeNumber(item.ReinigungstageMonat),
+    MengeAktivMonat: safeNumber(item.MengeAktivMonat),
+    VkWertNettoMonat: safeNumber(item.VkWertNettoMonat),
+    StundeTag: safeNumber(item.StundeTag),
+    StundeMonat: safeNumber(item.StundeMonat),
+    'VkWertNettoMonat*12': safeNumber(item.VkWertNettoMonat) * 12, // Calculate yearly value
+    LeistungStunde: safeNumber(item.LeistungStunde),
+    ReinigungsTage: item.ReinigungsTage,
+    Bemerkung: item.Bemerkung,
+    Reduzierung: item.Reduzierung,
   };
+}
 
-  const currencyFormat = '#,##0.00 €';
-  const numberFormat = '#,##0.00';
-
-  // Hauptdaten-Tabelle
+/**
+ * Legt das Hauptdaten-Blatt mit formatierter Kopfzeile an
+ *
+ * @param workbook - Arbeitsmappe oder Stream-Writer
+ * @returns Hauptdaten-Blatt
+ */
+function addDataSheet(workbook: ExcelJS.Workbook): ExcelJS.Worksheet {
   const mainSheet = workbook.addWorksheet('Raumbuchdaten');
+  mainSheet.columns = dataColumns;
+
+  mainSheet.getRow(1).eachCell(cell => {
+    Object.assign(cell, headerStyle);
+  });
+
+  return mainSheet;
+}
+
+/**
+ * Fügt die Summen-Zeile an das Hauptdaten-Blatt an
+ *
+ * @param mainSheet - Hauptdaten-Blatt
+ * @param totals - Gesamtsummen
+ * @returns Summen-Zeile
+ */
+function addSumRow(
+  mainSheet: ExcelJS.Worksheet,
+  totals: Pick<
+    RaumbuchSummary,
+    'totalMenge' | 'totalMengeAktivMonat' | 'totalVkWertNettoMonat' | 'totalStundenMonat'
+  >
+): ExcelJS.Row {
+  const sumRow = mainSheet.addRow({
+    Bezeichnung: 'Summe:',
+    Menge: totals.totalMenge,
+    MengeAktivMonat: totals.totalMengeAktivMonat,
+    VkWertNettoMonat: totals.totalVkWertNettoMonat,
+    StundeMonat: totals.totalStundenMonat,
+    'VkWertNettoMonat*12': totals.totalVkWertNettoMonat * 12,
+  });
+
+  sumRow.eachCell((cell, colNumber) => {
+    cell.font = { bold: true };
+    if (sumColumns.includes(colNumber)) {
+      cell.border = {
+        top: { style: 'double' },
+        bottom: { style: 'double' },
+      };
+    }
+  });
 
-  // Spalten definieren
-  mainSheet.columns = [
-    { header: 'ID', key: 'ID', width: 6 },
-    { header: 'Raumnummer', key: 'Raumnummer', width: 12 },
-    { header: 'Bereich', key: 'Bereich', width: 15 },
-    { header: 'Gebäudeteil', key: 'Gebaeudeteil', width: 15 },
-    { header: 'Etage', key: 'Etage', width: 10 },
-    { header: 'Bezeichnung', key: 'Bezeichnung', width: 20 },
-    { header: 'RG', key: 'Reinigungsgruppe', width: 8 }, // Changed from RG to Reinigungsgruppe to match the database field
-    { header: 'qm', key: 'Menge', width: 10 }, // Changed from qm to Menge to match the database field
-    { header: 'Anzahl', key: 'Anzahl', width: 8 },
-    { header: 'Intervall', key: 'Reinigungsintervall', width: 12 }, // Changed from Intervall to Reinigungsintervall
-    { header: 'Rg/Jahr', key: 'ReinigungstageJahr', width: 10 }, // Changed from RgJahr to ReinigungstageJahr
-    { header: 'Rg/Monat', key: 'ReinigungstageMonat', width: 10 }, // Changed from RgMonat to ReinigungstageMonat
-    { header: 'qm/Monat', key: 'MengeAktivMonat', width: 10 }, // Changed from qmMonat to MengeAktivMonat
-    { header: '€/Monat', key: 'VkWertNettoMonat', width: 12 }, // Changed from WertMonat to VkWertNettoMonat
-    { header: 'h/Tag', key: 'StundeTag', width: 10 }, // Changed from StundenTag to StundeTag
-    { header: 'h/Monat', key: 'StundeMonat', width: 10 }, // Changed from StundenMonat to StundeMonat
-    { header: '€/Jahr', key: 'VkWertNettoMonat', width: 12 }, // Calculate this as VkWertNettoMonat*12
-    { header: 'qm/h', key: 'LeistungStunde', width: 10 }, // Changed from qmStunde to LeistungStunde
-    { header: 'Reinigungstage', key: 'ReinigungsTage', width: 15 },
-    { header: 'Bemerkung', key: 'Bemerkung', width: 25 },
-    { header: 'Reduzierung', key: 'Reduzierung', width: 15 },
+  return sumRow;
+}
+
+/**
+ * Legt ein Blatt mit Summen je Gruppe (Bereich oder Reinigungsgruppe) an
+ *
+ * @param workbook - Arbeitsmappe oder Stream-Writer
+ * @param name - Name des Blatts
+ * @param header - Überschrift der Gruppenspalte
+ * @param key - Schlüssel der Gruppenspalte
+ * @param stats - Statistiken je Gruppe
+ * @returns Das neue Blatt
+ */
+function addStatsSheet(
+  workbook: ExcelJS.Workbook,
+  name: string,
+  header: string,
+  key: string,
+  stats: { vkWertNettoMonat: number }[]
+): ExcelJS.Worksheet {
+  const sheet = workbook.addWorksheet(name);
+
+  sheet.columns = [
+    { header, key, width: 20 },
+    { header: 'Fläche (qm)', key: 'menge', width: 15, style: numberStyle },
+    { header: 'Wert/Monat (€)', key: 'vkWertNettoMonat', width: 15, style: currencyStyle },
+    { header: 'Wert/Jahr (€)', key: 'vkWertNettoMonat*12', width: 15, style: currencyStyle },
+    { header: 'Stunden/Monat', key: 'stundenMonat', width: 15, style: numberStyle },
   ];
 
-  // Header-Zeile formatieren
-  const headerRow = mainSheet.getRow(1);
-  headerRow.eachCell(cell => {
+  // Header formatieren
+  sheet.getRow(1).eachCell(cell => {
     Object.assign(cell, headerStyle);
   });
 
-  // Daten hinzufügen
-  data.forEach(item => {
-    mainSheet.addRow({
-      ID: item.ID,
-      Raumnummer: item.Raumnummer,
-      Bereich: item.Bereich,
-      Gebaeudeteil: item.Gebaeudeteil,
-      Etage: item.Etage,
-      Bezeichnung: item.Bezeichnung,
-      Reinigungsgruppe: item.Reinigungsgruppe,
-      Menge: safeNumber(item.Menge),
-      Anzahl: safeNumber(item.Anzahl),
-      Reinigungsintervall: item.Reinigungsintervall,
-      ReinigungstageJahr: safeNumber(item.ReinigungstageJahr),
-      ReinigungstageMonat: safeNumber(item.ReinigungstageMonat),
-      MengeAktivMonat: safeNumber(item.MengeAktivMonat),
-      VkWertNettoMonat: safeNumber(item.VkWertNettoMonat),
-      StundeTag: safeNumber(item.StundeTag),
-      StundeMonat: safeNumber(item.StundeMonat),
-      'VkWertNettoMonat*12': safeNumber(item.VkWertNettoMonat) * 12, // Calculate yearly value
-      LeistungStunde: safeNumber(item.LeistungStunde),
-      ReinigungsTage: item.ReinigungsTage,
-      Bemerkung: item.Bemerkung,
-      Reduzierung: item.Reduzierung,
-    });
+  // Daten hinzufügen und Jahreswert berechnen
+  stats.forEach(item => {
+    sheet.addRow({ ...item, 'vkWertNettoMonat*12': item.vkWertNettoMonat * 12 });
   });
 
-  // Zellenformatierung für numerische Spalten
-  mainSheet.eachRow((row, rowNumber) => {
-    if (rowNumber > 1) {
-      // Überspringe Header
-      const numericCells = [8, 9, 11, 12, 13, 14, 15, 16, 17, 18]; // Indizes der numerischen Spalten
-      numericCells.forEach(colIndex => {
-        const cell = row.getCell(colIndex);
-
-        // Format je nach Spaltentyp
-        if ([14, 17].includes(colIndex)) {
-          // € Spalten
-          cell.numFmt = currencyFormat;
-        } else {
-          cell.numFmt = numberFormat;
-        }
-
-        cell.alignment = { horizontal: 'right' };
-      });
+  return sheet;
+}
+
+/**
+ * Legt die Blätter "Zusammenfassung", "Nach Bereich" und "Nach Reinigungsgruppe" an
+ *
+ * @param workbook - Arbeitsmappe oder Stream-Writer
+ * @param standortName - Name des Standorts
+ * @param summary - Zusammenfassung der Daten
+ * @returns Die neuen Blätter
+ */
+function addSummarySheets(
+  workbook: ExcelJS.Workbook,
+  standortName: string,
+  summary: RaumbuchSummary
+): ExcelJS.Worksheet[] {
+  const summarySheet = workbook.addWorksheet('Zusammenfassung');
+
+  // Spaltenbreiten
+  summarySheet.getColumn('A').width = 30;
+  summarySheet.getColumn('B').width = 15;
+  summarySheet.getColumn('C').width = 10;
+
+  // Titel
+  summarySheet.mergeCells('A1:C1');
+  const titleCell = summarySheet.getCell('A1');
+  titleCell.value = `Zusammenfassung für ${standortName}`;
+  titleCell.font = { size: 14, bold: true };
+  titleCell.alignment = { horizontal: 'center' };
+
+  // Überschriften
+  summarySheet.getCell('A3').value = 'Metrik';
+  summarySheet.getCell('B3').value = 'Wert';
+  summarySheet.getCell('C3').value = 'Einheit';
+
+  ['A', 'B', 'C'].forEach(col => {
+    Object.assign(summarySheet.getCell(`${col}3`), headerStyle);
+  });
+
+  // Daten
+  const summaryData = [
+    { metric: 'Anzahl Räume', value: summary.totalRooms, unit: '' },
+    { metric: 'Gesamtfläche', value: summary.totalMenge, unit: 'm²' },
+    { metric: 'Monatlicher Wert', value: summary.totalVkWertNettoMonat, unit: '€' },
+    { metric: 'Jährlicher Wert', value: summary.totalVkWertNettoMonat * 12, unit: '€' },
+    { metric: 'Monatliche Arbeitsstunden', value: summary.totalStundenMonat, unit: 'h' },
+  ];
+
+  summaryData.forEach((item, index) => {
+    const rowIndex = index + 4;
+    summarySheet.getCell(`A${rowIndex}`).value = item.metric;
+    summarySheet.getCell(`C${rowIndex}`).value = item.unit;
+
+    // Formatierung für Werte
+    const valueCell = summarySheet.getCell(`B${rowIndex}`);
+    valueCell.value = item.value;
+    if (item.unit === '€') {
+      valueCell.numFmt = currencyFormat;
+    } else if (['m²', 'h'].includes(item.unit)) {
+      valueCell.numFmt = numberFormat;
     }
   });
 
+  const sheets = [summarySheet];
+
+  // Bereichsstatistiken, falls vorhanden
+  if (summary.bereichStats && summary.bereichStats.length > 0) {
+    sheets.push(
+      addStatsSheet(workbook, 'Nach Bereich', 'Bereich', 'bereich', summary.bereichStats)
+    );
+  }
+
+  // Reinigungsgruppen-Statistiken, falls vorhanden
+  if (summary.rgStats && summary.rgStats.length > 0) {
+    sheets.push(
+      addStatsSheet(
+        workbook,
+        'Nach Reinigungsgruppe',
+        'Reinigungsgruppe',
+        'reinigungsgruppe',
+        summary.rgStats
+      )
+    );
+  }
+
+  return sheets;
+}
+
+/**
+ * Setzt die Metadaten einer Arbeitsmappe
+ *
+ * @param workbook - Arbeitsmappe oder Stream-Writer
+ */
+function setWorkbookProperties(workbook: ExcelJS.Workbook): void {
+  workbook.creator = 'Ritter Digital';
+  workbook.created = new Date();
+  workbook.modified = new Date();
+}
+
+/**
+ * Erzeugt eine Excel-Datei mit Raumbuch-Daten
+ *
+ * @param data - Raumbuch-Einträge oder Frame (wird über Zeilensichten gelesen)
+ * @param standortName - Name des Standorts
+ * @param summary - Optional: Zusammenfassung der Daten
+ * @returns Buffer mit der Excel-Datei
+ */
+export async function generateExcel(
+  data: RaumbuchEntry[] | RaumbuchFrame,
+  standortName: string,
+  summary?: RaumbuchSummary
+): Promise<ExcelJS.Buffer> {
+  const start = performance.now();
+
+  // Erstelle neue Arbeitsmappe
+  const workbook = new ExcelJS.Workbook();
+  setWorkbookProperties(workbook);
+
+  // Hauptdaten-Tabelle
+  const mainSheet = addDataSheet(workbook);
+  const rows = data instanceof RaumbuchFrame ? data.rows() : data;
+  for (const item of rows) {
+    mainSheet.addRow(dataRowValues(item));
+  }
+
   // Summen-Zeile hinzufügen
   if (data.length > 0) {
-    const sumRow = mainSheet.addRow({
-      ID: '',
-      Raumnummer: '',
-      Bereich: '',
-      Gebaeudeteil: '',
-      Etage: '',
-      Bezeichnung: 'Summe:',
-      Reinigungsgruppe: '',
-      Menge: summary
-        ? summary.totalMenge
-        : data.reduce((sum, item) => sum + safeNumber(item.Menge), 0),
-      Anzahl: '',
-      Reinigungsintervall: '',
-      ReinigungstageJahr: '',
-      ReinigungstageMonat: '',
-      MengeAktivMonat: summary
-        ? summary.totalMengeAktivMonat
-        : data.reduce((sum, item) => sum + safeNumber(item.MengeAktivMonat), 0),
-      VkWertNettoMonat: summary
-        ? summary.totalVkWertNettoMonat
-        : data.reduce((sum, item) => sum + safeNumber(item.VkWertNettoMonat), 0),
-      StundeTag: '',
-      StundeMonat: summary
-        ? summary.totalStundenMonat
-        : data.reduce((sum, item) => sum + safeNumber(item.StundeMonat), 0),
-      'VkWertNettoMonat*12':
-        (summary
-          ? summary.totalVkWertNettoMonat
-          : data.reduce((sum, item) => sum + safeNumber(item.VkWertNettoMonat), 0)) * 12,
-      LeistungStunde: '',
-      ReinigungsTage: '',
-      Bemerkung: '',
-      Reduzierung: '',
-    });
-
-    sumRow.eachCell((cell, colNumber) => {
-      cell.font = { bold: true };
-      if ([8, 13, 14, 16, 17].includes(colNumber)) {
-        cell.border = {
-          top: { style: 'double' },
-          bottom: { style: 'double' },
-        };
-
-        if ([14, 17].includes(colNumber)) {
-          // € Spalten
-          cell.numFmt = currencyFormat;
-        } else {
-          cell.numFmt = numberFormat;
-        }
+    const sum = (field: FrameMeasure) =>
+      data instanceof RaumbuchFrame
+        ? data.sum(field)
+        : data.reduce((total, item) => total + safeNumber(item[field]), 0);
+
+    addSumRow(
+      mainSheet,
+      summary ?? {
+        totalMenge: sum('Menge'),
+        totalMengeAktivMonat: sum('MengeAktivMonat'),
+        totalVkWertNettoMonat: sum('VkWertNettoMonat'),
+        totalStundenMonat: sum('StundeMonat'),
       }
-    });
+    );
   }
 
-  // Zusammenfassungs-Tabelle
+  // Zusammenfassungs-Tabellen
   if (summary) {
-    const summarySheet = workbook.addWorksheet('Zusammenfassung');
-
-    // Titel
-    summarySheet.mergeCells('A1:C1');
-    const titleCell = summarySheet.getCell('A1');
-    titleCell.value = `Zusammenfassung für ${standortName}`;
-    titleCell.font = { size: 14, bold: true };
-    titleCell.alignment = { horizontal: 'center' };
-
-    // Überschriften
-    summarySheet.getCell('A3').value = 'Metrik';
-    summarySheet.getCell('B3').value = 'Wert';
-    summarySheet.getCell('C3').value = 'Einheit';
-
-    [3].forEach(row => {
-      ['A', 'B', 'C'].forEach(col => {
-        const cell = summarySheet.getCell(`${col}${row}`);
-        Object.assign(cell, headerStyle);
-      });
-    });
-
-    // Daten
-    const summaryData = [
-      { metric: 'Anzahl Räume', value: summary.totalRooms, unit: '' },
-      { metric: 'Gesamtfläche', value: summary.totalMenge, unit: 'm²' },
-      { metric: 'Monatlicher Wert', value: summary.totalVkWertNettoMonat, unit: '€' },
-      { metric: 'Jährlicher Wert', value: summary.totalVkWertNettoMonat * 12, unit: '€' },
-      { metric: 'Monatliche Arbeitsstunden', value: summary.totalStundenMonat, unit: 'h' },
-    ];
-
-    summaryData.forEach((item, index) => {
-      const rowIndex = index + 4;
-      summarySheet.getCell(`A${rowIndex}`).value = item.metric;
-      summarySheet.getCell(`B${rowIndex}`).value = item.value;
-      summarySheet.getCell(`C${rowIndex}`).value = item.unit;
-
-      // Formatierung für Werte
-      const valueCell = summarySheet.getCell(`B${rowIndex}`);
-      if (['€'].includes(item.unit)) {
-        valueCell.numFmt = currencyFormat;
-      } else if (['m²', 'h'].includes(item.unit)) {
-        valueCell.numFmt = numberFormat;
-      }
-    });
-
-    // Spaltenbreiten anpassen
-    summarySheet.getColumn('A').width = 30;
-    summarySheet.getColumn('B').width = 15;
-    summarySheet.getColumn('C').width = 10;
-
-    // Bereichsstatistiken, falls vorhanden
-    if (summary.bereichStats && summary.bereichStats.length > 0) {
-      const bereichSheet = workbook.addWorksheet('Nach Bereich');
-
-      bereichSheet.columns = [
-        { header: 'Bereich', key: 'bereich', width: 20 },
-        { header: 'Fläche (qm)', key: 'menge', width: 15 }, // Changed from qm to menge
-        { header: 'Wert/Monat (€)', key: 'vkWertNettoMonat', width: 15 }, // Changed from wertMonat to vkWertNettoMonat
-        { header: 'Wert/Jahr (€)', key: 'vkWertNettoMonat*12', width: 15 }, // Changed calculation
-        { header: 'Stunden/Monat', key: 'stundenMonat', width: 15 },
-      ];
-
-      // Header formatieren
-      const bereichHeader = bereichSheet.getRow(1);
-      bereichHeader.eachCell(cell => {
-        Object.assign(cell, headerStyle);
-      });
-
-      // Daten hinzufügen und Jahreswert berechnen
-      const bereichData = summary.bereichStats.map(item => ({
-        ...item,
-        'vkWertNettoMonat*12': item.vkWertNettoMonat * 12,
-      }));
-
-      bereichData.forEach(item => {
-        bereichSheet.addRow(item);
-      });
-
-      // Formatierung für numerische Zellen
-      bereichSheet.eachRow((row, rowNumber) => {
-        if (rowNumber > 1) {
-          // Format je nach Spaltentyp
-          row.getCell(2).numFmt = numberFormat; // menge
-          row.getCell(3).numFmt = currencyFormat; // vkWertNettoMonat
-          row.getCell(4).numFmt = currencyFormat; // vkWertNettoMonat*12
-          row.getCell(5).numFmt = numberFormat; // stundenMonat
-        }
-      });
-    }
+    addSummarySheets(workbook, standortName, summary);
+  }
+
+  // Erzeuge Excel-Buffer
+  const buffer = (await workbook.xlsx.writeBuffer()) as ExcelJS.Buffer;
+  recordStage('excel', performance.now() - start);
+  countRows('excel', data.length);
+  return buffer;
+}
 
-    // Reinigungsgruppen-Statistiken, falls vorhanden
-    if (summary.rgStats && summary.rgStats.length > 0) {
-      const rgSheet = workbook.addWorksheet('Nach Reinigungsgruppe');
-
-      rgSheet.columns = [
-        { header: 'Reinigungsgruppe', key: 'reinigungsgruppe', width: 20 }, // Changed from rg to reinigungsgruppe
-        { header: 'Fläche (qm)', key: 'menge', width: 15 }, // Changed from qm to menge
-        { header: 'Wert/Monat (€)', key: 'vkWertNettoMonat', width: 15 }, // Changed from wertMonat to vkWertNettoMonat
-        { header: 'Wert/Jahr (€)', key: 'vkWertNettoMonat*12', width: 15 }, // Changed calculation
-        { header: 'Stunden/Monat', key: 'stundenMonat', width: 15 },
-      ];
-
-      // Header formatieren
-      const rgHeader = rgSheet.getRow(1);
-      rgHeader.eachCell(cell => {
-        Object.assign(cell, headerStyle);
-      });
-
-      // Daten hinzufügen und Jahreswert berechnen
-      const rgData = summary.rgStats.map(item => ({
-        ...item,
-        'vkWertNettoMonat*12': item.vkWertNettoMonat * 12,
-      }));
-
-      rgData.forEach(item => {
-        rgSheet.addRow(item);
-      });
-
-      // Formatierung für numerische Zellen
-      rgSheet.eachRow((row, rowNumber) => {
-        if (rowNumber > 1) {
-          // Format je nach Spaltentyp
-          row.getCell(2).numFmt = numberFormat; // menge
-          row.getCell(3).numFmt = currencyFormat; // vkWertNettoMonat
-          row.getCell(4).numFmt = currencyFormat; // vkWertNettoMonat*12
-          row.getCell(5).numFmt = numberFormat; // stundenMonat
-        }
-      });
+/**
+ * Wartet, bis ein Stream wieder Daten annimmt oder geschlossen wurde
+ */
+function drained(stream: Writable): Promise<void> {
+  return new Promise(resolve => {
+    const done = () => {
+      stream.off('drain', done);
+      stream.off('close', done);
+      resolve();
+    };
+    stream.on('drain', done);
+    stream.on('close', done);
+  });
+}
+
+/**
+ * Schreibt eine Excel-Datei mit Raumbuch-Daten direkt in einen Stream
+ *
+ * Die Zeilen werden mit dem Streaming-Writer von ExcelJS geschrieben und
+ * einzeln committet, sodass keine Zeilenobjekte im Speicher bleiben. Die Summen
+ * für die Summen-Zeile und die Blätter "Zusammenfassung", "Nach Bereich" und
+ * "Nach Reinigungsgruppe" entstehen im selben Durchlauf; diese Blätter folgen
+ * daher nach dem Datenblatt.
+ *
+ * Hinweis: ExcelJS 4 erzeugt die Zip-Datei mit JSZip. Das Tabellen-XML wird
+ * bis workbook.commit() gepuffert und die Datei erst dann komprimiert und in
+ * einem Stück in den Stream geschrieben. Der Speicherbedarf wächst daher mit
+ * der Zeilenzahl, und der Empfänger erhält die ersten Bytes erst am Ende.
+ * Meldet der Stream einen vollen Puffer, wird vor der nächsten Zeile auf
+ * 'drain' gewartet.
+ *
+ * @param rows - Raumbuch-Einträge, z.B. direkt aus streamRaumbuch()
+ * @param standortName - Name des Standorts
+ * @param stream - Ziel der Excel-Datei; wird nach dem Schreiben beendet
+ * @returns Zusammenfassung der geschriebenen Daten
+ */
+export async function writeExcelStream(
+  rows: Iterable<Partial<RaumbuchEntry>> | AsyncIterable<Partial<RaumbuchEntry>>,
+  standortName: string,
+  stream: Writable
+): Promise<RaumbuchSummary> {
+  const start = performance.now();
+  const workbook = new ExcelJS.stream.xlsx.WorkbookWriter({
+    stream,
+    useStyles: true,
+    useSharedStrings: false,
+  });
+  setWorkbookProperties(workbook);
+
+  const accumulator = new RaumbuchAccumulator();
+  const mainSheet = addDataSheet(workbook);
+  mainSheet.getRow(1).commit();
+
+  let count = 0;
+  for await (const item of rows) {
+    mainSheet.addRow(dataRowValues(item)).commit();
+    accumulator.add(item);
+
+    // Bei vollem Puffer auf den Empfänger warten, sonst regelmäßig die
+    // Event-Loop freigeben; hat der Empfänger abgebrochen, endet die Schleife
+    // und damit auch die Quelle
+    count++;
+    if (stream.writableNeedDrain) {
+      await drained(stream);
+    } else if (count % STREAM_BATCH_ROWS === 0) {
+      await new Promise(resolve => setImmediate(resolve));
+    }
+    if (stream.destroyed) {
+      throw new Error('Excel-Export abgebrochen: Ziel-Stream wurde geschlossen');
     }
   }
 
-  // Erzeuge Excel-Buffer
-  return (await workbook.xlsx.writeBuffer()) as ExcelJS.Buffer;
+  const summary = summaryFromAggregates(accumulator.result());
+
+  if (count > 0) {
+    addSumRow(mainSheet, summary).commit();
+  }
+  mainSheet.commit();
+
+  addSummarySheets(workbook, standortName, summary).forEach(sheet => sheet.commit());
+  await workbook.commit();
+
+  // Umfasst beim Streaming auch die Wartezeit auf Datenbank und Empfänger
+  recordStage('excel', performance.now() - start);
+  countRows('excel', count);
+  return summary;
 }
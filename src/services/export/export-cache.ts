@@ -0,0 +1,393 @@
+/**
+ * Größenbegrenzter Datei-Cache für fertige Exporte
+ *
+ * Fertige Excel- und PDF-Dateien werden unter einem Schlüssel aus Format,
+ * Gebäude, Filter und Datenstand (siehe exportKey()) im Dateisystem abgelegt
+ * und bei einer erneuten Anfrage direkt ausgeliefert. Neben jeder Datei liegt
+ * eine JSON-Datei mit Schlüssel, Dateiname und Content-Type, aus der der Index
+ * nach einem Neustart wiederhergestellt wird. Dateien werden unter einem
+ * temporären Namen geschrieben und erst danach umbenannt, halbfertige Exporte
+ * werden also nie ausgeliefert. Überschreitet die Gesamtgröße maxBytes, werden
+ * die am längsten nicht genutzten Dateien gelöscht.
+ */
+
+import { createHash, randomBytes } from 'crypto';
+import { createWriteStream, promises as fs } from 'fs';
+import path from 'path';
+import { Readable } from 'stream';
+import { finished } from 'stream/promises';
+
+import { EXPORT_CONFIG } from '@/config/app';
+
+import type { CacheStats } from '@/services/database/cache';
+import type { Writable } from 'stream';
+
+/**
+ * Optionen für den Export-Cache
+ */
+export interface ExportCacheOptions {
+  /** Verzeichnis für die Dateien (wird nur vom Cache genutzt) */
+  directory: string;
+  /** Obergrenze für alle Dateien zusammen in Bytes */
+  maxBytes: number;
+}
+
+/**
+ * Eine Datei im Export-Cache
+ */
+export interface CachedExport {
+  key: string;
+  /** Pfad der Datei im Cache-Verzeichnis */
+  file: string;
+  /** Dateiname für den Download */
+  filename: string;
+  contentType: string;
+  size: number;
+  createdAt: number;
+}
+
+/**
+ * Geöffnete Datei aus dem Cache
+ */
+export interface OpenedExport {
+  entry: CachedExport;
+  body: ReadableStream<Uint8Array>;
+}
+
+/**
+ * Inhalt einer neuen Datei: fertige Bytes oder eine Funktion, die in den
+ * übergebenen Stream schreibt und ihn beendet (z.B. writeExcelStream)
+ */
+export type ExportContent = Uint8Array | ((stream: Writable) => Promise<unknown>);
+
+const META_SUFFIX = '.meta.json';
+const TEMP_SUFFIX = '.tmp';
+
+// Dateien des Caches: SHA-1 des Schlüssels, danach Endung
+const CACHE_FILE = /^[0-9a-f]{40}\./;
+
+/**
+ * Dateiname im Cache-Verzeichnis (ohne Endung) für einen Schlüssel
+ */
+function fileId(key: string): string {
+  return createHash('sha1').update(key).digest('hex');
+}
+
+/**
+ * Pfad der Metadaten zu einer Cache-Datei
+ */
+function metaFile(file: string): string {
+  return file.slice(0, file.length - path.extname(file).length) + META_SUFFIX;
+}
+
+/**
+ * Löscht eine Datei und ignoriert Fehler (fehlt bereits, unter Windows noch geöffnet)
+ */
+async function unlinkQuietly(file: string): Promise<void> {
+  try {
+    await fs.unlink(file);
+  } catch {
+    // Wird beim nächsten Einlesen des Verzeichnisses erneut versucht
+  }
+}
+
+/**
+ * LRU-Cache für Exportdateien im Dateisystem
+ */
+export class ExportCache {
+  private readonly options: ExportCacheOptions;
+  // Reihenfolge der Map = LRU-Reihenfolge (zuletzt genutzt am Ende)
+  private readonly entries = new Map<string, CachedExport>();
+  private loading: Promise<void> | null = null;
+  private bytes = 0;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+
+  constructor(options: ExportCacheOptions) {
+    this.options = options;
+  }
+
+  /**
+   * Liefert den Eintrag zu einem Schlüssel, wenn die Datei noch vorhanden ist
+   *
+   * @param key - Schlüssel, siehe exportKey()
+   * @returns Eintrag oder null
+   */
+  async get(key: string): Promise<CachedExport | null> {
+    await this.load();
+
+    const entry = this.entries.get(key);
+    if (entry) {
+      try {
+        await fs.access(entry.file);
+        this.touch(entry);
+        this.hits++;
+        return entry;
+      } catch {
+        // Datei wurde außerhalb des Caches gelöscht
+        this.remove(entry);
+      }
+    }
+
+    this.misses++;
+    return null;
+  }
+
+  /**
+   * Öffnet die Datei zu einem Schlüssel zum Lesen
+   *
+   * Die Datei wird vor der Rückgabe geöffnet, sodass eine gleichzeitige
+   * Verdrängung den laufenden Download nicht abbricht.
+   *
+   * @param key - Schlüssel, siehe exportKey()
+   * @returns Eintrag mit Inhalt als Stream oder null
+   */
+  async open(key: string): Promise<OpenedExport | null> {
+    await this.load();
+
+    const entry = this.entries.get(key);
+    if (entry) {
+      try {
+        const handle = await fs.open(entry.file, 'r');
+        this.touch(entry);
+        this.hits++;
+        return {
+          entry,
+          body: Readable.toWeb(handle.createReadStream()) as ReadableStream<Uint8Array>,
+        };
+      } catch {
+        this.remove(entry);
+      }
+    }
+
+    this.misses++;
+    return null;
+  }
+
+  /**
+   * Legt eine Datei im Cache ab und verdrängt bei Bedarf ältere Dateien
+   *
+   * @param key - Schlüssel, siehe exportKey()
+   * @param meta - Dateiname für den Download und Content-Type
+   * @param content - Inhalt der Datei
+   * @returns Neuer Eintrag oder null, wenn die Datei allein größer als der Cache ist
+   */
+  async put(
+    key: string,
+    meta: { filename: string; contentType: string },
+    content: ExportContent
+  ): Promise<CachedExport | null> {
+    await this.load();
+
+    const file = path.join(this.options.directory, fileId(key) + path.extname(meta.filename));
+    const temp = `${file}.${randomBytes(6).toString('hex')}${TEMP_SUFFIX}`;
+
+    try {
+      if (typeof content === 'function') {
+        const stream = createWriteStream(temp);
+        const written = finished(stream);
+        written.catch(() => undefined); // Wird unten ausgewertet
+
+        try {
+          await content(stream);
+        } catch (error) {
+          // Erst nach dem Schließen löschen, sonst bleibt die Datei liegen
+          stream.destroy();
+          await written.catch(() => undefined);
+          throw error;
+        }
+        await written;
+      } else {
+        await fs.writeFile(temp, content);
+      }
+
+      const { size } = await fs.stat(temp);
+      if (size > this.options.maxBytes) {
+        await unlinkQuietly(temp);
+        return null;
+      }
+
+      const entry: CachedExport = { key, file, ...meta, size, createdAt: Date.now() };
+      const previous = this.entries.get(key);
+      if (previous) {
+        this.entries.delete(key);
+        this.bytes -= previous.size;
+      }
+
+      await fs.rename(temp, file);
+      await fs.writeFile(
+        metaFile(file),
+        JSON.stringify({ key, ...meta, size, createdAt: entry.createdAt })
+      );
+
+      this.entries.set(key, entry);
+      this.bytes += size;
+      this.evict();
+      return entry;
+    } catch (error) {
+      await unlinkQuietly(temp);
+      throw error;
+    }
+  }
+
+  /**
+   * Entfernt die Datei zu einem Schlüssel
+   *
+   * @param key - Schlüssel, siehe exportKey()
+   */
+  async delete(key: string): Promise<void> {
+    await this.load();
+
+    const entry = this.entries.get(key);
+    if (entry) {
+      this.remove(entry);
+    }
+  }
+
+  /**
+   * Statistik im Format der übrigen Caches
+   */
+  stats(): CacheStats {
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxBytes: this.options.maxBytes,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+    };
+  }
+
+  /**
+   * Liest das Verzeichnis beim ersten Zugriff einmalig ein
+   */
+  private load(): Promise<void> {
+    if (!this.loading) {
+      this.loading = this.scan().catch(error => {
+        console.error('Export-Cache konnte nicht eingelesen werden:', error);
+      });
+    }
+
+    return this.loading;
+  }
+
+  /**
+   * Stellt den Index aus den Metadaten im Verzeichnis wieder her und entfernt
+   * Reste abgebrochener Schreibvorgänge
+   */
+  private async scan(): Promise<void> {
+    const directory = this.options.directory;
+    await fs.mkdir(directory, { recursive: true });
+
+    const names = (await fs.readdir(directory)).filter(name => CACHE_FILE.test(name));
+    const referenced = new Set<string>();
+    const found: CachedExport[] = [];
+
+    for (const name of names.filter(name => name.endsWith(META_SUFFIX))) {
+      try {
+        const stored = JSON.parse(await fs.readFile(path.join(directory, name), 'utf8'));
+        const file = path.join(
+          directory,
+          name.slice(0, -META_SUFFIX.length) + path.extname(stored.filename)
+        );
+        const { size } = await fs.stat(file);
+
+        found.push({ ...stored, file, size });
+        referenced.add(name);
+        referenced.add(path.basename(file));
+      } catch {
+        // Unvollständiger Eintrag, wird unten gelöscht
+      }
+    }
+
+    await Promise.all(
+      names
+        .filter(name => !referenced.has(name))
+        .map(name => unlinkQuietly(path.join(directory, name)))
+    );
+
+    for (const entry of found.sort((a, b) => a.createdAt - b.createdAt)) {
+      this.entries.set(entry.key, entry);
+      this.bytes += entry.size;
+    }
+    this.evict();
+  }
+
+  /**
+   * Markiert einen Eintrag als zuletzt genutzt
+   */
+  private touch(entry: CachedExport): void {
+    this.entries.delete(entry.key);
+    this.entries.set(entry.key, entry);
+  }
+
+  /**
+   * Entfernt einen Eintrag samt Dateien
+   */
+  private remove(entry: CachedExport): void {
+    if (this.entries.get(entry.key) !== entry) {
+      return;
+    }
+
+    this.entries.delete(entry.key);
+    this.bytes -= entry.size;
+    void unlinkQuietly(entry.file);
+    void unlinkQuietly(metaFile(entry.file));
+  }
+
+  /**
+   * Verdrängt die am längsten nicht genutzten Einträge bis unter maxBytes
+   */
+  private evict(): void {
+    for (const entry of this.entries.values()) {
+      if (this.bytes <= this.options.maxBytes) {
+        break;
+      }
+
+      this.remove(entry);
+      this.evictions++;
+    }
+  }
+}
+
+/**
+ * Antwort mit einer Datei aus dem Cache
+ *
+ * @param opened - Ergebnis von ExportCache.open()
+ * @returns Download-Antwort mit Content-Length
+ */
+export function cachedExportResponse(opened: OpenedExport): Response {
+  const { entry, body } = opened;
+
+  return new Response(body, {
+    status: 200,
+    headers: {
+      'Content-Type': entry.contentType,
+      'Content-Disposition': `attachment; filename="${entry.filename}"`,
+      'Content-Length': entry.size.toString(),
+      'X-Export-Cache': 'hit',
+    },
+  });
+}
+
+// Globaler Cache, damit Hot-Reload in der Entwicklung den Index nicht verliert
+const globalForExportCache = global as unknown as {
+  exportCache: ExportCache | undefined;
+};
+
+/**
+ * Liefert den gemeinsamen Datei-Cache für Exporte
+ *
+ * @returns Export-Cache mit der Konfiguration aus EXPORT_CONFIG.cache
+ */
+export function getExportCache(): ExportCache {
+  if (!globalForExportCache.exportCache) {
+    globalForExportCache.exportCache = new ExportCache({
+      directory: EXPORT_CONFIG.cache.folder,
+      maxBytes: EXPORT_CONFIG.cache.maxMegabytes * 1024 * 1024,
+    });
+  }
+
+  return globalForExportCache.exportCache;
+}
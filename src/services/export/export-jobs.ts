@@ -0,0 +1,629 @@
+/**
+ * Hintergrund-Jobs für Excel- und PDF-Exporte
+ *
+ * Große Gebäude brauchen für einen Export länger, als ein Client auf eine
+ * Antwort warten möchte. Ein Job wird über POST /api/export/jobs angelegt und
+ * von einem lokalen Worker-Pool abgearbeitet (EXPORT_CONFIG.jobs.workers
+ * Exporte gleichzeitig, weitere warten in einer Warteschlange). Den Fortschritt
+ * liefert GET /api/export/jobs/[jobId] als Momentaufnahme oder als
+ * NDJSON-Stream, die fertige Datei /api/export/jobs/[jobId]/download.
+ *
+ * Jobs mit gleichem Format, Gebäude, Filter und Datenstand werden zu einem Job
+ * zusammengefasst. Fertige Dateien landen im ExportCache und werden von dort
+ * auch von /api/export/excel/[id] und /api/export/pdf/[id] ausgeliefert.
+ *
+ * Die Worker laufen im Server-Prozess: Die PDF-Erzeugung findet ohnehin im
+ * Browser-Pool statt, und writeExcelStream() gibt die Event-Loop regelmäßig frei.
+ */
+
+import { randomUUID } from 'crypto';
+import { EventEmitter } from 'events';
+
+import { EXPORT_CONFIG } from '@/config/app';
+import { filterRaumbuchFrame } from '@/services/analysis/raumbuch-analysis';
+import {
+  getGebaeudeById,
+  getRaumbuchVersion,
+  streamRaumbuch,
+} from '@/services/database/queries';
+import { getRaumbuchResult, resultForRows } from '@/services/database/raumbuch-cache';
+
+import { writeExcelStream } from './excel-export';
+import { getExportCache } from './export-cache';
+import { generatePdf } from './pdf-export';
+
+import type { CachedExport, ExportCache } from './export-cache';
+import type { RaumbuchFilter, RaumbuchRow } from '@/types/raumbuch.types';
+
+/**
+ * Format eines Exports
+ */
+export type ExportFormat = 'excel' | 'pdf';
+
+/**
+ * Filter eines Exports (wie die Query-Parameter der Export-Routen)
+ */
+export type ExportFilter = Pick<
+  RaumbuchFilter,
+  'bereich' | 'gebaeudeteil' | 'etage' | 'reinigungsgruppe'
+>;
+
+/**
+ * Auftrag für einen Export
+ */
+export interface ExportJobRequest {
+  format: ExportFormat;
+  gebaeude_ID: number;
+  filter?: ExportFilter;
+}
+
+export type ExportJobStatus = 'queued' | 'running' | 'done' | 'failed';
+
+/**
+ * Zustand eines Export-Jobs
+ */
+export interface ExportJob {
+  id: string;
+  format: ExportFormat;
+  gebaeude_ID: number;
+  filter: ExportFilter;
+  status: ExportJobStatus;
+  /** Fortschritt von 0 bis 1 */
+  progress: number;
+  /** Aktueller Schritt: 'load', 'render' oder 'store' */
+  stage: string | null;
+  error: string | null;
+  /** Dateiname für den Download, sobald der Job fertig ist */
+  filename: string | null;
+  size: number | null;
+  /** Download über /api/export/jobs/[jobId]/download, sobald der Job fertig ist */
+  downloadUrl: string | null;
+  /** Ergebnis stammt ohne Export direkt aus dem Cache */
+  cached: boolean;
+  createdAt: number;
+  startedAt: number | null;
+  finishedAt: number | null;
+}
+
+/**
+ * Meldet den Fortschritt eines laufenden Exports
+ */
+export type ProgressReporter = (progress: number, stage: string) => void;
+
+/**
+ * Führt einen Export aus und legt das Ergebnis im Cache ab
+ */
+export type ExportRunner = (
+  job: ExportJob,
+  report: ProgressReporter,
+  cache: ExportCache
+) => Promise<CachedExport>;
+
+/**
+ * Optionen für die Job-Warteschlange
+ */
+export interface ExportJobQueueOptions {
+  /** Anzahl gleichzeitig laufender Exporte */
+  workers: number;
+  /** Maximale Zahl wartender Jobs */
+  maxQueued: number;
+  /** Abgeschlossene Jobs bleiben so viele ms abrufbar */
+  retainMs: number;
+  cache: ExportCache;
+  /** Führt den Export aus (Standard: runExport) */
+  run?: ExportRunner;
+}
+
+/**
+ * Statistik der Job-Warteschlange
+ */
+export interface ExportJobStats {
+  workers: number;
+  queued: number;
+  running: number;
+  done: number;
+  failed: number;
+  deduplicated: number;
+}
+
+interface JobState {
+  job: ExportJob;
+  key: string;
+  /** Schlüssel des Ergebnisses im Cache (Datenstand der tatsächlich exportierten Daten) */
+  resultKey: string | null;
+  revision: number;
+}
+
+const FILTER_FIELDS = ['bereich', 'gebaeudeteil', 'etage', 'reinigungsgruppe'] as const;
+
+const CONTENT_TYPES: Record<ExportFormat, string> = {
+  excel: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+  pdf: 'application/pdf',
+};
+
+const EXTENSIONS: Record<ExportFormat, string> = {
+  excel: 'xlsx',
+  pdf: 'pdf',
+};
+
+// Fortschritt beim Excel-Export nach so vielen Zeilen melden
+const PROGRESS_ROWS = 1000;
+
+/**
+ * Fehler, wenn die Warteschlange voll ist
+ */
+export class ExportQueueFullError extends Error {
+  readonly code = 'EQUEUEFULL';
+
+  constructor(readonly maxQueued: number) {
+    super(`Export-Warteschlange ist voll (${maxQueued} Jobs)`);
+    this.name = 'ExportQueueFullError';
+  }
+}
+
+/**
+ * Entfernt leere Filterwerte
+ *
+ * @param filter - Filter aus Query-Parametern oder Request-Body
+ * @returns Filter nur mit gesetzten Werten
+ */
+export function normalizeExportFilter(filter: ExportFilter = {}): ExportFilter {
+  const normalized: ExportFilter = {};
+  for (const field of FILTER_FIELDS) {
+    if (filter[field]) {
+      normalized[field] = filter[field];
+    }
+  }
+
+  return normalized;
+}
+
+/**
+ * Schlüssel eines Exports für Zusammenfassung und Cache
+ *
+ * @param format - Format des Exports
+ * @param gebaeude_ID - ID des Gebäudes
+ * @param filter - Filter (leere Werte werden ignoriert)
+ * @param version - Datenstand laut getRaumbuchVersion()
+ * @returns Schlüssel, unabhängig von der Reihenfolge der Filter
+ */
+export function exportKey(
+  format: ExportFormat,
+  gebaeude_ID: number,
+  filter: ExportFilter,
+  version: string
+): string {
+  const normalized = normalizeExportFilter(filter);
+  const parts = FILTER_FIELDS.filter(field => normalized[field] !== undefined).map(
+    field => `${field}=${encodeURIComponent(normalized[field] as string)}`
+  );
+
+  return [format, gebaeude_ID, version, parts.join('&')].join('|');
+}
+
+/**
+ * Dateiname für den Download
+ *
+ * @param format - Format des Exports
+ * @param name - Bezeichnung des Gebäudes
+ * @returns Dateiname wie bei den direkten Export-Routen
+ */
+export function exportFilename(format: ExportFormat, name: string): string {
+  const date = new Date().toISOString().split('T')[0];
+  return `Raumbuch_Auswertung_${name}_${date}.${EXTENSIONS[format]}`;
+}
+
+/**
+ * Content-Type eines Exportformats
+ */
+export function exportContentType(format: ExportFormat): string {
+  return CONTENT_TYPES[format];
+}
+
+/**
+ * Zeilen eines Excel-Exports direkt aus der Datenbank
+ *
+ * Wird von runExport() und /api/export/excel/[id] gemeinsam genutzt, damit
+ * beide für denselben Schlüssel dieselbe Datei erzeugen: Filter in SQL (mit
+ * der Collation der Datenbank) und Sortierung nach Raumbuch.ID.
+ *
+ * @param gebaeude_ID - ID des Gebäudes
+ * @param filter - Filter (leere Werte werden ignoriert)
+ * @returns Raumbuch-Einträge in Exportreihenfolge
+ */
+export function excelExportRows(
+  gebaeude_ID: number,
+  filter: ExportFilter = {}
+): AsyncGenerator<Partial<RaumbuchRow>> {
+  return streamRaumbuch({ gebaeude_ID, filter: normalizeExportFilter(filter) });
+}
+
+/**
+ * Reicht Zeilen weiter und meldet dabei den Fortschritt
+ *
+ * @param rows - Zeilen
+ * @param total - Erwartete Anzahl (Obergrenze, bei Filtern weniger)
+ * @param onProgress - Erhält den Anteil zwischen 0 und 1
+ */
+async function* rowsWithProgress<T>(
+  rows: AsyncIterable<T>,
+  total: number,
+  onProgress: (share: number) => void
+): AsyncGenerator<T> {
+  let count = 0;
+  for await (const row of rows) {
+    yield row;
+    if (++count % PROGRESS_ROWS === 0 && total > 0) {
+      onProgress(Math.min(1, count / total));
+    }
+  }
+}
+
+/**
+ * Erzeugt die Excel-Datei eines Jobs wie /api/export/excel/[id]
+ */
+async function runExcelExport(
+  job: ExportJob,
+  report: ProgressReporter,
+  cache: ExportCache
+): Promise<CachedExport | null> {
+  const [gebaeude, version] = await Promise.all([
+    getGebaeudeById(job.gebaeude_ID),
+    getRaumbuchVersion(job.gebaeude_ID),
+  ]);
+
+  if (!gebaeude) {
+    throw new Error(`Gebäude ${job.gebaeude_ID} nicht gefunden`);
+  }
+
+  // Der Datenstand beginnt mit der Anzahl aller Räume des Gebäudes
+  const total = parseInt(version, 10);
+  report(0.05, 'render');
+
+  return cache.put(
+    exportKey('excel', job.gebaeude_ID, job.filter, version),
+    { filename: exportFilename('excel', gebaeude.bezeichnung), contentType: CONTENT_TYPES.excel },
+    stream =>
+      writeExcelStream(
+        rowsWithProgress(excelExportRows(job.gebaeude_ID, job.filter), total, share =>
+          report(0.05 + share * 0.9, 'render')
+        ),
+        gebaeude.bezeichnung,
+        stream
+      )
+  );
+}
+
+/**
+ * Erzeugt die PDF-Datei eines Jobs wie /api/export/pdf/[id]
+ */
+async function runPdfExport(
+  job: ExportJob,
+  report: ProgressReporter,
+  cache: ExportCache
+): Promise<CachedExport | null> {
+  const [gebaeude, raumbuch] = await Promise.all([
+    getGebaeudeById(job.gebaeude_ID),
+    getRaumbuchResult(job.gebaeude_ID),
+  ]);
+
+  if (!gebaeude) {
+    throw new Error(`Gebäude ${job.gebaeude_ID} nicht gefunden`);
+  }
+  // getRaumbuchResult() liefert bei Datenbankfehlern ein leeres Ergebnis ohne Datenstand
+  if (!raumbuch.version) {
+    throw new Error('Raumbuch-Daten konnten nicht geladen werden');
+  }
+
+  const frame = filterRaumbuchFrame(raumbuch.frame, job.filter);
+  const { summary, visualizationData } = resultForRows(raumbuch, frame);
+  report(0.1, 'render');
+  const pdf = await generatePdf(frame, gebaeude.bezeichnung, { summary, visualizationData });
+  report(0.95, 'store');
+
+  return cache.put(
+    exportKey('pdf', job.gebaeude_ID, job.filter, raumbuch.version),
+    { filename: exportFilename('pdf', gebaeude.bezeichnung), contentType: CONTENT_TYPES.pdf },
+    pdf
+  );
+}
+
+/**
+ * Exportiert die Raumbuch-Daten eines Jobs und legt die Datei im Cache ab
+ *
+ * Jedes Format liest seine Daten aus derselben Quelle wie die zugehörige
+ * Export-Route, sodass Job und Route unter einem Schlüssel dieselbe Datei
+ * ablegen: Excel direkt aus der Datenbank (excelExportRows()), PDF aus dem
+ * Raumbuch-Cache. Der Schlüssel enthält jeweils den Datenstand der
+ * exportierten Daten.
+ *
+ * @param job - Auszuführender Job
+ * @param report - Meldet den Fortschritt
+ * @param cache - Ziel der fertigen Datei
+ * @returns Eintrag im Export-Cache
+ */
+export async function runExport(
+  job: ExportJob,
+  report: ProgressReporter,
+  cache: ExportCache
+): Promise<CachedExport> {
+  report(0, 'load');
+  const entry =
+    job.format === 'excel'
+      ? await runExcelExport(job, report, cache)
+      : await runPdfExport(job, report, cache);
+
+  if (!entry) {
+    throw new Error('Export ist größer als der Export-Cache (EXPORT_CACHE_MB)');
+  }
+
+  return entry;
+}
+
+/**
+ * Warteschlange für Export-Jobs mit lokalem Worker-Pool
+ */
+export class ExportJobQueue {
+  private readonly options: ExportJobQueueOptions & { run: ExportRunner };
+  private readonly jobs = new Map<string, JobState>();
+  // Offene und fertige Jobs je Schlüssel, für die Zusammenfassung gleicher Exporte
+  private readonly byKey = new Map<string, JobState>();
+  private readonly queue: JobState[] = [];
+  private readonly events = new EventEmitter();
+  private running = 0;
+  private deduplicated = 0;
+
+  constructor(options: ExportJobQueueOptions) {
+    this.options = { run: runExport, ...options, workers: Math.max(1, options.workers) };
+    this.events.setMaxListeners(0);
+  }
+
+  /**
+   * Legt einen Job an oder liefert einen gleichen, noch gültigen Job
+   *
+   * Liegt das Ergebnis bereits im Cache, ist der neue Job sofort fertig.
+   *
+   * @param request - Format, Gebäude und Filter
+   * @returns Zustand des Jobs
+   * @throws ExportQueueFullError, wenn bereits maxQueued Jobs warten
+   */
+  async submit(request: ExportJobRequest): Promise<ExportJob> {
+    this.sweep();
+
+    const filter = normalizeExportFilter(request.filter);
+    const version = await getRaumbuchVersion(request.gebaeude_ID);
+    const key = exportKey(request.format, request.gebaeude_ID, filter, version);
+
+    const existing = this.byKey.get(key);
+    if (existing && existing.job.status !== 'done') {
+      this.deduplicated++;
+      return { ...existing.job };
+    }
+
+    // Ein fertiger Job gilt nur, solange seine Datei noch im Cache liegt
+    const cached = await this.options.cache.get(existing?.resultKey ?? key);
+    const current = this.byKey.get(key);
+    if (current && (current.job.status !== 'done' || (current === existing && cached))) {
+      this.deduplicated++;
+      return { ...current.job };
+    }
+
+    if (!cached && this.queue.length >= this.options.maxQueued) {
+      throw new ExportQueueFullError(this.options.maxQueued);
+    }
+
+    const state: JobState = {
+      job: {
+        id: randomUUID(),
+        format: request.format,
+        gebaeude_ID: request.gebaeude_ID,
+        filter,
+        status: 'queued',
+        progress: 0,
+        stage: null,
+        error: null,
+        filename: null,
+        size: null,
+        downloadUrl: null,
+        cached: false,
+        createdAt: Date.now(),
+        startedAt: null,
+        finishedAt: null,
+      },
+      key,
+      resultKey: null,
+      revision: 0,
+    };
+    this.jobs.set(state.job.id, state);
+    this.byKey.set(key, state);
+
+    if (cached) {
+      this.finish(state, cached, true);
+    } else {
+      this.queue.push(state);
+      this.pump();
+    }
+
+    return { ...state.job };
+  }
+
+  /**
+   * Liefert den Zustand eines Jobs
+   *
+   * @param id - ID des Jobs
+   * @returns Zustand oder null, wenn der Job unbekannt oder abgelaufen ist
+   */
+  get(id: string): ExportJob | null {
+    this.sweep();
+    const state = this.jobs.get(id);
+    return state ? { ...state.job } : null;
+  }
+
+  /**
+   * Schlüssel der fertigen Datei eines Jobs im Export-Cache
+   *
+   * @param id - ID des Jobs
+   * @returns Schlüssel oder null, solange der Job nicht fertig ist
+   */
+  resultKey(id: string): string | null {
+    return this.jobs.get(id)?.resultKey ?? null;
+  }
+
+  /**
+   * Liefert den Zustand eines Jobs bei jeder Änderung, bis er fertig oder fehlgeschlagen ist
+   *
+   * @param id - ID des Jobs
+   * @returns Folge von Zuständen, beginnend mit dem aktuellen
+   */
+  async *watch(id: string): AsyncGenerator<ExportJob> {
+    let seen = -1;
+
+    while (true) {
+      const state = this.jobs.get(id);
+      if (!state) {
+        return;
+      }
+
+      if (state.revision !== seen) {
+        seen = state.revision;
+        yield { ...state.job };
+        if (state.job.status === 'done' || state.job.status === 'failed') {
+          return;
+        }
+        continue;
+      }
+
+      await new Promise(resolve => this.events.once(id, resolve));
+    }
+  }
+
+  /**
+   * Statistik für /api/metrics
+   */
+  stats(): ExportJobStats {
+    const stats: ExportJobStats = {
+      workers: this.options.workers,
+      queued: 0,
+      running: 0,
+      done: 0,
+      failed: 0,
+      deduplicated: this.deduplicated,
+    };
+    for (const { job } of this.jobs.values()) {
+      stats[job.status]++;
+    }
+
+    return stats;
+  }
+
+  /**
+   * Startet wartende Jobs, solange Worker frei sind
+   */
+  private pump(): void {
+    while (this.running < this.options.workers && this.queue.length > 0) {
+      const state = this.queue.shift() as JobState;
+      this.running++;
+      void this.execute(state).finally(() => {
+        this.running--;
+        this.pump();
+      });
+    }
+  }
+
+  /**
+   * Führt einen Job aus
+   */
+  private async execute(state: JobState): Promise<void> {
+    this.update(state, { status: 'running', startedAt: Date.now() });
+
+    try {
+      const entry = await this.options.run(
+        { ...state.job },
+        (progress, stage) => {
+          // Fortschritt nur in kleinen Schritten melden, nie rückwärts
+          const rounded = Math.floor(Math.min(progress, 0.99) * 100) / 100;
+          if (rounded > state.job.progress || stage !== state.job.stage) {
+            this.update(state, { progress: Math.max(rounded, state.job.progress), stage });
+          }
+        },
+        this.options.cache
+      );
+      this.finish(state, entry, false);
+    } catch (error) {
+      console.error(`Export-Job ${state.job.id} fehlgeschlagen:`, error);
+      // Ein neuer Auftrag soll den Export erneut versuchen
+      if (this.byKey.get(state.key) === state) {
+        this.byKey.delete(state.key);
+      }
+      this.update(state, {
+        status: 'failed',
+        stage: null,
+        error: error instanceof Error ? error.message : String(error),
+        finishedAt: Date.now(),
+      });
+    }
+  }
+
+  /**
+   * Schließt einen Job mit einer Datei aus dem Cache ab
+   */
+  private finish(state: JobState, entry: CachedExport, cached: boolean): void {
+    state.resultKey = entry.key;
+    this.update(state, {
+      status: 'done',
+      progress: 1,
+      stage: null,
+      filename: entry.filename,
+      size: entry.size,
+      downloadUrl: `/api/export/jobs/${state.job.id}/download`,
+      cached,
+      finishedAt: Date.now(),
+    });
+  }
+
+  /**
+   * Ändert den Zustand eines Jobs und benachrichtigt Beobachter
+   */
+  private update(state: JobState, changes: Partial<ExportJob>): void {
+    Object.assign(state.job, changes);
+    state.revision++;
+    this.events.emit(state.job.id);
+  }
+
+  /**
+   * Entfernt abgeschlossene Jobs nach retainMs
+   */
+  private sweep(): void {
+    const now = Date.now();
+    for (const [id, state] of this.jobs) {
+      const { finishedAt } = state.job;
+      if (finishedAt !== null && now - finishedAt >= this.options.retainMs) {
+        this.jobs.delete(id);
+        if (this.byKey.get(state.key) === state) {
+          this.byKey.delete(state.key);
+        }
+      }
+    }
+  }
+}
+
+// Globale Warteschlange, damit Hot-Reload in der Entwicklung keine Jobs verliert
+const globalForExportJobs = global as unknown as {
+  exportJobQueue: ExportJobQueue | undefined;
+};
+
+/**
+ * Liefert die gemeinsame Warteschlange für Export-Jobs
+ *
+ * @returns Warteschlange mit der Konfiguration aus EXPORT_CONFIG.jobs
+ */
+export function getExportJobQueue(): ExportJobQueue {
+  if (!globalForExportJobs.exportJobQueue) {
+    globalForExportJobs.exportJobQueue = new ExportJobQueue({
+      ...EXPORT_CONFIG.jobs,
+      cache: getExportCache(),
+    });
+  }
+
+  return globalForExportJobs.exportJobQueue;
+}
@@ -2,12 +2,19 @@
  * Service zum Exportieren von Raumbuch-Daten nach PDF
  */
 
+import { readFile } from 'fs/promises';
+import path from 'path';
+
 import handlebars from 'handlebars';
-import * as puppeteer from 'puppeteer';
 
-import { formatCurrency, formatHours, formatNumber, formatSquareMeters } from '@/lib/formatters';
+import { formatCurrency, formatHours, formatSquareMeters } from '@/lib/formatters';
+import { countRows, recordStage, timeStageAsync } from '@/lib/metrics';
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
+
+import { getBrowserPool } from './browser-pool';
 
 import type { RaumbuchRow, RaumbuchSummary, VisualizationData } from '@/types/raumbuch.types';
+import type { Page } from 'puppeteer';
 
 // Use RaumbuchRow as RaumbuchEntry for consistency with the rest of the code
 type RaumbuchEntry = RaumbuchRow;
@@ -21,119 +28,8 @@ interface ChartParam {
   visualizationData?: VisualizationData;
 }
 
-/**
- * Erzeugt eine PDF-Datei mit Raumbuch-Daten und Visualisierungen
- *
- * @param data - Raumbuch-Einträge
- * @param standortName - Name des Standorts
- * @param chartParams - Optionale Parameter für Charts und Zusammenfassung
- * @returns Buffer mit der PDF-Datei
- */
-export async function generatePdf(
-  data: RaumbuchEntry[],
-  standortName: string,
-  chartParams?: ChartParam
-): Promise<Uint8Array> {
-  try {
-    // Formatierte Daten für die Tabelle vorbereiten
-    const formattedData = data.map(item => ({
-      ...item,
-      Menge: formatSquareMeters(item.Menge),
-      ReinigungstageJahr: formatNumber(item.ReinigungstageJahr),
-      ReinigungstageMonat: formatNumber(item.ReinigungstageMonat),
-      MengeAktivMonat: formatSquareMeters(item.MengeAktivMonat),
-      VkWertNettoMonat: formatCurrency(item.VkWertNettoMonat),
-      StundeTag: formatHours(item.StundeTag, 3),
-      StundeMonat: formatHours(item.StundeMonat),
-      VkWertNettoJahr: formatCurrency(item.VkWertNettoMonat ? item.VkWertNettoMonat * 12 : 0),
-      LeistungStunde: formatNumber(item.LeistungStunde),
-    }));
-
-    // Formatierte Zusammenfassungsdaten
-    const formattedSummary = chartParams?.summary
-      ? {
-          totalRooms: chartParams.summary.totalRooms,
-          totalMenge: formatSquareMeters(chartParams.summary.totalMenge),
-          totalMengeAktivMonat: formatSquareMeters(chartParams.summary.totalMengeAktivMonat),
-          totalVkWertNettoMonat: formatCurrency(chartParams.summary.totalVkWertNettoMonat),
-          totalVkWertNettoJahr: formatCurrency(chartParams.summary.totalVkWertNettoMonat * 12),
-          totalStundenMonat: formatHours(chartParams.summary.totalStundenMonat),
-        }
-      : null;
-
-    // Generieren des HTML-Templates
-    const htmlContent = await generateHtmlTemplate(
-      formattedData,
-      standortName,
-      formattedSummary,
-      chartParams?.visualizationData
-    );
-
-    // PDF mit Puppeteer erzeugen
-    const browser = await puppeteer.launch({
-      headless: true,
-      args: ['--no-sandbox', '--disable-setuid-sandbox'],
-    });
-
-    const page = await browser.newPage();
-    await page.setContent(htmlContent, { waitUntil: 'networkidle0' });
-
-    // Erzeugen von Chart-Bildern, falls Visualisierungsdaten vorhanden sind
-    if (chartParams?.visualizationData) {
-      await generateCharts(page, chartParams.visualizationData);
-    }
-
-    // PDF erzeugen
-    const pdfBuffer = await page.pdf({
-      format: 'A4',
-      printBackground: true,
-      margin: {
-        top: '20mm',
-        bottom: '20mm',
-        left: '15mm',
-        right: '15mm',
-      },
-      displayHeaderFooter: true,
-      headerTemplate: `
-        <div style="width: 100%; font-size: 10px; padding: 0 15mm; display: flex; justify-content: space-between; margin-top: 10px;">
-          <div>Ritter Digital Raumbuch Auswertung</div>
-          <div>${standortName}</div>
-          <div>Datum: ${new Date().toLocaleDateString('de-DE')}</div>
-        </div>
-      `,
-      footerTemplate: `
-        <div style="width: 100%; font-size: 10px; padding: 0 15mm; display: flex; justify-content: space-between; margin-bottom: 10px;">
-          <div>© Ritter Digital</div>
-          <div>Seite <span class="pageNumber"></span> von <span class="totalPages"></span></div>
-        </div>
-      `,
-    });
-
-    await browser.close();
-    return pdfBuffer;
-  } catch (error) {
-    console.error('Fehler beim PDF-Export:', error);
-    throw error;
-  }
-}
-
-/**
- * Erzeugt das HTML-Template für das PDF-Dokument
- *
- * @param data - Formatierte Raumbuch-Einträge
- * @param standortName - Name des Standorts
- * @param summary - Formatierte Zusammenfassung
- * @param visualizationData - Daten für Visualisierungen
- * @returns HTML-String für das PDF
- */
-async function generateHtmlTemplate(
-  data: Record<string, unknown>[],
-  standortName: string,
-  summary: Record<string, unknown> | null,
-  visualizationData?: VisualizationData
-): Promise<string> {
-  // Handlebars-Template definieren
-  const templateString = `
+// Handlebars-Template für das PDF-Dokument
+const PDF_TEMPLATE = `
     <!DOCTYPE html>
     <html lang="de">
     <head>
@@ -225,7 +121,6 @@ async function generateHtmlTemplate(
           border: 1px dashed #ccc;
         }
       </style>
-      <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     </head>
     <body>
       <div class="container">
@@ -333,8 +228,192 @@ async function generateHtmlTemplate(
     </html>
   `;
 
-  // Handlebars-Template kompilieren
-  const template = handlebars.compile(templateString);
+// Templates nach Name; kompiliert wird einmal pro Prozess
+const PDF_TEMPLATES = {
+  raumbuch: PDF_TEMPLATE,
+};
+
+const compiledTemplates = new Map<keyof typeof PDF_TEMPLATES, handlebars.TemplateDelegate>();
+
+/**
+ * Liefert ein kompiliertes PDF-Template aus dem Modul-Cache
+ *
+ * @param name - Name des Templates
+ * @returns Handlebars-Template-Funktion
+ */
+function getPdfTemplate(name: keyof typeof PDF_TEMPLATES): handlebars.TemplateDelegate {
+  let template = compiledTemplates.get(name);
+  if (!template) {
+    template = handlebars.compile(PDF_TEMPLATES[name]);
+    compiledTemplates.set(name, template);
+  }
+  return template;
+}
+
+// Chart.js aus der lokalen Abhängigkeit, wird beim ersten Export mit Diagrammen gelesen
+let chartJsSource: Promise<string> | null = null;
+
+/**
+ * Lädt das UMD-Bundle von Chart.js aus node_modules (statt vom CDN),
+ * damit der Export auch ohne Internetzugang funktioniert
+ *
+ * @returns Quelltext von Chart.js
+ */
+function loadChartJs(): Promise<string> {
+  if (!chartJsSource) {
+    chartJsSource = readFile(
+      path.join(process.cwd(), 'node_modules', 'chart.js', 'dist', 'chart.umd.js'),
+      'utf8'
+    ).catch(error => {
+      chartJsSource = null;
+      throw error;
+    });
+  }
+  return chartJsSource;
+}
+
+/**
+ * Prüft, ob Daten für mindestens ein Diagramm vorhanden sind
+ *
+ * @param visualizationData - Daten für Visualisierungen
+ * @returns true, wenn Bereich- oder RG-Daten vorhanden sind
+ */
+function hasVisualizationData(visualizationData: VisualizationData): boolean {
+  return (
+    Object.keys(visualizationData.bereichData || {}).length > 0 ||
+    Object.keys(visualizationData.rgData || {}).length > 0
+  );
+}
+
+/**
+ * Formatiert die Felder einer Zeile, die die Tabelle im Template anzeigt
+ *
+ * @param item - Raumbuch-Eintrag oder Zeilensicht
+ * @returns Formatierte Tabellenzeile
+ */
+function tableRow(item: Readonly<RaumbuchEntry>): Record<string, unknown> {
+  return {
+    Raumnummer: item.Raumnummer,
+    Bereich: item.Bereich,
+    Gebaeudeteil: item.Gebaeudeteil,
+    Etage: item.Etage,
+    Bezeichnung: item.Bezeichnung,
+    Reinigungsgruppe: item.Reinigungsgruppe,
+    Menge: formatSquareMeters(item.Menge),
+    VkWertNettoMonat: formatCurrency(item.VkWertNettoMonat),
+    StundeMonat: formatHours(item.StundeMonat),
+    VkWertNettoJahr: formatCurrency(item.VkWertNettoMonat ? item.VkWertNettoMonat * 12 : 0),
+  };
+}
+
+/**
+ * Erzeugt eine PDF-Datei mit Raumbuch-Daten und Visualisierungen
+ *
+ * @param data - Raumbuch-Einträge oder Frame (wird über Zeilensichten gelesen)
+ * @param standortName - Name des Standorts
+ * @param chartParams - Optionale Parameter für Charts und Zusammenfassung
+ * @returns Buffer mit der PDF-Datei
+ */
+export async function generatePdf(
+  data: RaumbuchEntry[] | RaumbuchFrame,
+  standortName: string,
+  chartParams?: ChartParam
+): Promise<Uint8Array> {
+  const start = performance.now();
+  countRows('pdf', data.length);
+
+  try {
+    // Formatierte Daten für die Tabelle vorbereiten (nur die Spalten des Templates)
+    const formattedData: Record<string, unknown>[] = [];
+    const rows = data instanceof RaumbuchFrame ? data.rows() : data;
+    for (const item of rows) {
+      formattedData.push(tableRow(item));
+    }
+
+    // Formatierte Zusammenfassungsdaten
+    const formattedSummary = chartParams?.summary
+      ? {
+          totalRooms: chartParams.summary.totalRooms,
+          totalMenge: formatSquareMeters(chartParams.summary.totalMenge),
+          totalMengeAktivMonat: formatSquareMeters(chartParams.summary.totalMengeAktivMonat),
+          totalVkWertNettoMonat: formatCurrency(chartParams.summary.totalVkWertNettoMonat),
+          totalVkWertNettoJahr: formatCurrency(chartParams.summary.totalVkWertNettoMonat * 12),
+          totalStundenMonat: formatHours(chartParams.summary.totalStundenMonat),
+        }
+      : null;
+
+    // Generieren des HTML-Templates
+    const htmlContent = await timeStageAsync('pdf_template', () =>
+      generateHtmlTemplate(
+        formattedData,
+        standortName,
+        formattedSummary,
+        chartParams?.visualizationData
+      )
+    );
+
+    // PDF mit einer Seite aus dem Browser-Pool erzeugen (wartet, bis eine Seite frei ist)
+    return await getBrowserPool().withPage(async page => {
+      // Das Template lädt keine externen Ressourcen, daher genügt 'load'
+      await page.setContent(htmlContent, { waitUntil: 'load' });
+
+      // Erzeugen von Chart-Bildern, falls Visualisierungsdaten vorhanden sind
+      if (chartParams?.visualizationData && hasVisualizationData(chartParams.visualizationData)) {
+        await page.addScriptTag({ content: await loadChartJs() });
+        await generateCharts(page, chartParams.visualizationData);
+      }
+
+      // PDF erzeugen
+      return page.pdf({
+        format: 'A4',
+        printBackground: true,
+        margin: {
+          top: '20mm',
+          bottom: '20mm',
+          left: '15mm',
+          right: '15mm',
+        },
+        displayHeaderFooter: true,
+        headerTemplate: `
+          <div style="width: 100%; font-size: 10px; padding: 0 15mm; display: flex; justify-content: space-between; margin-top: 10px;">
+            <div>Ritter Digital Raumbuch Auswertung</div>
+            <div>${standortName}</div>
+            <div>Datum: ${new Date().toLocaleDateString('de-DE')}</div>
+          </div>
+        `,
+        footerTemplate: `
+          <div style="width: 100%; font-size: 10px; padding: 0 15mm; display: flex; justify-content: space-between; margin-bottom: 10px;">
+            <div>© Ritter Digital</div>
+            <div>Seite <span class="pageNumber"></span> von <span class="totalPages"></span></div>
+          </div>
+        `,
+      });
+    });
+  } catch (error) {
+    console.error('Fehler beim PDF-Export:', error);
+    throw error;
+  } finally {
+    recordStage('pdf', performance.now() - start);
+  }
+}
+
+/**
+ * Erzeugt das HTML-Template für das PDF-Dokument
+ *
+ * @param data - Formatierte Raumbuch-Einträge
+ * @param standortName - Name des Standorts
+ * @param summary - Formatierte Zusammenfassung
+ * @param visualizationData - Daten für Visualisierungen
+ * @returns HTML-String für das PDF
+ */
+async function generateHtmlTemplate(
+  data: Record<string, unknown>[],
+  standortName: string,
+  summary: Record<string, unknown> | null,
+  visualizationData?: VisualizationData
+): Promise<string> {
+  // Kompiliertes Template aus dem Modul-Cache
+  const template = getPdfTemplate('raumbuch');
 
   // Daten in Seiten aufteilen
   const dataPages = [];
@@ -347,10 +426,7 @@ async function generateHtmlTemplate(
     standortName,
     summary,
     dataPages,
-    hasVisualizationData:
-      visualizationData &&
-      (Object.keys(visualizationData.bereichData || {}).length > 0 ||
-        Object.keys(visualizationData.rgData || {}).length > 0),
+    hasVisualizationData: visualizationData && hasVisualizationData(visualizationData),
   };
 
   // HTML-Template rendern
@@ -364,7 +440,7 @@ async function generateHtmlTemplate(
  * @param visualizationData - Daten für Visualisierungen
  */
 async function generateCharts(
-  page: puppeteer.Page,
+  page: Page,
   visualizationData: VisualizationData
 ): Promise<void> {
   // Chart.js-Skript für die Browser-Umgebung
@@ -402,6 +478,7 @@ async function generateCharts(
             ],
           },
           options: {
+            animation: false,
             responsive: true,
             maintainAspectRatio: true,
             plugins: {
@@ -453,6 +530,7 @@ async function generateCharts(
             ],
           },
           options: {
+            animation: false,
             responsive: true,
             maintainAspectRatio: true,
             plugins: {
@@ -500,8 +578,8 @@ async function generateCharts(
     }
   }, visualizationData);
 
-  // Use evaluate with setTimeout instead of waitForTimeout
+  // Ohne Animation zeichnet Chart.js sofort; zwei Frames abwarten, bis das Layout steht
   await page.evaluate(() => {
-    return new Promise(resolve => setTimeout(resolve, 1000));
+    return new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
   });
 }
@@ -0,0 +1,77 @@
+/**
+ * Type definitions for portfolio analytics across Gebaeude
+ */
+import { BereichStat, RgStat } from './raumbuch.types';
+
+/**
+ * Selects the Gebaeude of a portfolio (at least one ID is set)
+ */
+export interface PortfolioScope {
+  standort_ID?: number;
+  firma_ID?: number;
+}
+
+/**
+ * Summed Raumbuch measures (names as in BereichStat/RgStat)
+ */
+export interface PortfolioSums {
+  /** Number of Raumbuch entries */
+  anzahl: number;
+  menge: number;
+  mengeAktivMonat: number;
+  vkWertNettoMonat: number;
+  vkWertBruttoMonat: number;
+  rgWertNettoMonat: number;
+  rgWertBruttoMonat: number;
+  stundenMonat: number;
+}
+
+/**
+ * Summed measures with key figures derived from them
+ */
+export interface PortfolioMeasures extends PortfolioSums {
+  /** Monthly net sales value per qm */
+  vkWertNettoProQm: number;
+  /** Active qm per month and hour worked */
+  mengeProStunde: number;
+}
+
+/**
+ * Sums of a single Gebaeude as returned by the portfolio query
+ */
+export interface PortfolioGebaeudeRow extends PortfolioSums {
+  gebaeude_ID: number;
+  firma_ID: number;
+  standort_ID: number;
+  standort: string;
+  gebaeude: string;
+}
+
+/**
+ * Portfolio figures of a single Gebaeude
+ */
+export interface PortfolioGebaeude extends PortfolioGebaeudeRow, PortfolioMeasures {
+  /** Only with stats requested */
+  bereichStats?: BereichStat[];
+  /** Only with stats requested */
+  rgStats?: RgStat[];
+}
+
+/**
+ * Portfolio figures of a Standort (sum over its Gebaeude)
+ */
+export interface PortfolioStandort extends PortfolioMeasures {
+  standort_ID: number;
+  standort: string;
+  gebaeudeCount: number;
+}
+
+/**
+ * Portfolio of a Standort or Firma
+ */
+export interface Portfolio {
+  scope: PortfolioScope;
+  totals: PortfolioMeasures & { gebaeudeCount: number };
+  standorte: PortfolioStandort[];
+  gebaeude: PortfolioGebaeude[];
+}
@@ -123,6 +123,10 @@ export interface RaumbuchFilter {
   gebaeudeteil?: string;
   etage?: string;
   reinigungsgruppe?: string;
+  bereich_ID?: number;
+  gebaeudeteil_ID?: number;
+  etage_ID?: number;
+  reinigungsgruppe_ID?: number;
   standort_ID?: number;
   gebaeude_ID?: number; // Changed from objekt_ID to match database
 }
@@ -165,6 +169,25 @@ export interface RgStat {
   stundenMonat: number;
 }
 
+/**
+ * Precomputed aggregate of one Raumbuch group of a Gebaeude
+ * (measures named like BereichStat/RgStat)
+ */
+export interface RaumbuchAggregateRow {
+  /** Grouping column, null for the total over all rows */
+  dimension: 'Bereich' | 'Reinigungsgruppe' | 'Etage' | 'Gebaeudeteil' | null;
+  /** Group value (may itself be null), null for the total */
+  key: string | null;
+  anzahl: number;
+  menge: number;
+  mengeAktivMonat: number;
+  vkWertNettoMonat: number;
+  vkWertBruttoMonat: number;
+  rgWertNettoMonat: number;
+  rgWertBruttoMonat: number;
+  stundenMonat: number;
+}
+
 /**
  * Visualization data for charts
  */
@@ -0,0 +1,39 @@
+/**
+ * Web Worker für den Facettenindex
+ *
+ * Hält die Zeilen eines Gebäudes und den Bitmap-Index; der Hauptthread
+ * schickt die Zeilen einmal ('build') und danach nur noch die Auswahl
+ * ('query'). Zurück kommen die Positionen der ausgewählten Zeilen sowie
+ * Zusammenfassung, Diagrammdaten und Facettenanzahlen.
+ */
+
+import { FacetIndexStore } from '@/services/analysis/facet-index';
+
+import type { FacetWorkerRequest, FacetWorkerResponse } from '@/lib/facet-index-client';
+
+const ctx = self as unknown as Worker;
+
+let store: FacetIndexStore | null = null;
+
+ctx.onmessage = (event: MessageEvent<FacetWorkerRequest>) => {
+  const request = event.data;
+  let response: FacetWorkerResponse;
+
+  try {
+    if (request.type === 'build') {
+      store = new FacetIndexStore(request.rows);
+      response = { type: 'built', id: request.id, filterOptions: store.filterOptions() };
+    } else {
+      if (!store) throw new Error('Facettenindex wurde noch nicht aufgebaut');
+      response = { type: 'result', id: request.id, result: store.query(request.selection) };
+    }
+  } catch (error) {
+    response = {
+      type: 'error',
+      id: request.id,
+      message: error instanceof Error ? error.message : String(error),
+    };
+  }
+
+  ctx.postMessage(response);
+};
@@ -0,0 +1,100 @@
+/**
+ * Lokaler Ersatz für mssql in den Benchmarks
+ *
+ * Liefert die mit setStandInRows() gesetzten Zeilen für jede Abfrage, ob als
+ * normale Query oder über ein PreparedStatement, sodass der komplette Weg von
+ * fetchRaumbuchData() bis zum Mapping ohne Datenbank gemessen werden kann.
+ * Eingebunden wird er mit:
+ *
+ *   jest.mock('mssql', () => require('./db-stand-in').mssqlStandIn);
+ */
+
+let standInRows: Record<string, unknown>[] = [];
+let standInLatencyMs = 0;
+
+/**
+ * Setzt die Zeilen, die jede Abfrage liefert
+ *
+ * @param rows - Datenbankzeilen, z.B. aus toDatabaseRows()
+ * @param latencyMs - Simulierte Antwortzeit der Datenbank je Abfrage
+ */
+export function setStandInRows(rows: Record<string, unknown>[], latencyMs: number = 0): void {
+  standInRows = rows;
+  standInLatencyMs = latencyMs;
+}
+
+function respond(): Promise<{ recordset: Record<string, unknown>[] }> {
+  // Wie mssql liefert jede Abfrage ein neues Array
+  const result = { recordset: standInRows.slice() };
+  return standInLatencyMs > 0
+    ? new Promise(resolve => setTimeout(() => resolve(result), standInLatencyMs))
+    : Promise.resolve(result);
+}
+
+class StandInRequest {
+  input(): this {
+    return this;
+  }
+
+  query() {
+    return respond();
+  }
+}
+
+class StandInConnectionPool {
+  size = 1;
+  available = 1;
+  borrowed = 0;
+  pending = 0;
+
+  connect() {
+    return Promise.resolve(this);
+  }
+
+  on(): this {
+    return this;
+  }
+
+  request() {
+    return new StandInRequest();
+  }
+
+  close() {
+    return Promise.resolve();
+  }
+}
+
+class StandInPreparedStatement {
+  input(): this {
+    return this;
+  }
+
+  prepare() {
+    return Promise.resolve();
+  }
+
+  execute() {
+    return respond();
+  }
+
+  unprepare() {
+    return Promise.resolve();
+  }
+}
+
+const types = new Proxy(
+  {},
+  {
+    get: (_target, name) => (name === 'MAX' ? -1 : () => name),
+  }
+);
+
+/**
+ * Modul-Ersatz für jest.mock('mssql', ...)
+ */
+export const mssqlStandIn = {
+  __esModule: true,
+  default: types,
+  ConnectionPool: StandInConnectionPool,
+  PreparedStatement: StandInPreparedStatement,
+};
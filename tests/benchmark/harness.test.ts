@@ -0,0 +1,98 @@
+/**
+ * @jest-environment node
+ */
+import { compareToBaseline, percentile, runBenchmark } from './harness';
+import { CARDINALITY_PROFILES, generateRaumbuchRows, toDatabaseRows } from './synthetic-raumbuch';
+
+import type { BenchmarkResult, BenchmarkThresholds } from './harness';
+
+const THRESHOLDS: BenchmarkThresholds = {
+  latencyP50: 0.25,
+  latencyP95: 0.5,
+  throughput: 0.2,
+  peakMemory: 0.3,
+  minLatencyMs: 2,
+  minMemoryMb: 4,
+};
+
+const BASELINE: BenchmarkResult = {
+  name: 'analysis@10000',
+  rows: 10000,
+  iterations: 20,
+  meanMs: 40,
+  p50Ms: 40,
+  p95Ms: 50,
+  p99Ms: 55,
+  rowsPerSecond: 250000,
+  peakHeapMb: 20,
+};
+
+describe('generateRaumbuchRows', () => {
+  test('Liefert mit gleichem Seed dieselben Zeilen', () => {
+    const first = generateRaumbuchRows(500, { seed: 7 });
+    const second = generateRaumbuchRows(500, { seed: 7 });
+    const other = generateRaumbuchRows(500, { seed: 8 });
+
+    expect(second).toEqual(first);
+    expect(other).not.toEqual(first);
+  });
+
+  test('Hält die Kardinalitäten des Profils ein', () => {
+    const rows = generateRaumbuchRows(5000, { seed: 1, ...CARDINALITY_PROFILES.klein });
+    const distinct = (key: 'Bereich' | 'Etage' | 'Reinigungsgruppe') =>
+      new Set(rows.map(row => row[key])).size;
+
+    expect(rows).toHaveLength(5000);
+    expect(distinct('Bereich')).toBe(CARDINALITY_PROFILES.klein.bereiche);
+    expect(distinct('Etage')).toBe(CARDINALITY_PROFILES.klein.etagen);
+    expect(distinct('Reinigungsgruppe')).toBe(CARDINALITY_PROFILES.klein.reinigungsgruppen);
+  });
+
+  test('Liefert DECIMAL-Spalten für die Datenbank als Strings', () => {
+    const [row] = toDatabaseRows(generateRaumbuchRows(1, { nullRatio: 0 }));
+
+    expect(typeof row.VkWertNettoMonat).toBe('string');
+    expect(typeof row.LeistungStunde).toBe('number');
+  });
+});
+
+describe('Benchmark-Auswertung', () => {
+  test('Berechnet Perzentile nach dem nächsten Rang', () => {
+    const sorted = Array.from({ length: 100 }, (_, i) => i + 1);
+
+    expect(percentile(sorted, 50)).toBe(50);
+    expect(percentile(sorted, 95)).toBe(95);
+    expect(percentile(sorted, 99)).toBe(99);
+    expect(percentile([3], 99)).toBe(3);
+    expect(percentile([], 50)).toBe(0);
+  });
+
+  test('Misst Durchläufe und Durchsatz', async () => {
+    const result = await runBenchmark('noop', 1000, () => undefined, {
+      warmup: 1,
+      minIterations: 3,
+      maxIterations: 3,
+    });
+
+    expect(result.name).toBe('noop@1000');
+    expect(result.iterations).toBe(3);
+    expect(result.p50Ms).toBeLessThanOrEqual(result.p95Ms);
+    expect(result.rowsPerSecond).toBeGreaterThan(0);
+  });
+
+  test('Meldet Regressionen nur jenseits der Schwellwerte', () => {
+    const within = { ...BASELINE, p50Ms: 45, p95Ms: 60, rowsPerSecond: 222000, peakHeapMb: 24 };
+    const slower = { ...BASELINE, p50Ms: 60, p95Ms: 80, rowsPerSecond: 166000, peakHeapMb: 30 };
+
+    expect(compareToBaseline(within, BASELINE, THRESHOLDS)).toEqual([]);
+    expect(compareToBaseline(slower, BASELINE, THRESHOLDS)).toHaveLength(4);
+    expect(compareToBaseline(slower, undefined, THRESHOLDS)).toEqual([]);
+  });
+
+  test('Ignoriert Abweichungen unterhalb der Mindestwerte', () => {
+    const tiny = { ...BASELINE, p50Ms: 0.2, p95Ms: 0.3, peakHeapMb: 1 };
+    const noisy = { ...tiny, p50Ms: 0.5, p95Ms: 0.9, rowsPerSecond: 1000, peakHeapMb: 3 };
+
+    expect(compareToBaseline(noisy, tiny, THRESHOLDS)).toEqual([]);
+  });
+});
@@ -0,0 +1,248 @@
+/**
+ * Messung und Baseline-Vergleich für die Benchmarks
+ *
+ * Jeder Lauf misst Latenz-Perzentile, Durchsatz in Zeilen pro Sekunde und den
+ * höchsten Heap-Zuwachs gegenüber dem Stand vor dem Durchlauf. Vor jedem
+ * Durchlauf wird eine Garbage Collection erzwungen, damit Reste früherer
+ * Durchläufe die Speichermessung nicht verfälschen.
+ */
+
+import { existsSync, mkdirSync, readFileSync, writeFileSync } from 'fs';
+import path from 'path';
+import { setFlagsFromString } from 'v8';
+import { runInNewContext } from 'vm';
+
+/**
+ * Ergebnis eines Benchmarks
+ */
+export interface BenchmarkResult {
+  /** Name in der Form "stufe@zeilen" */
+  name: string;
+  rows: number;
+  iterations: number;
+  meanMs: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  rowsPerSecond: number;
+  peakHeapMb: number;
+}
+
+/**
+ * Erlaubte Verschlechterung gegenüber der Baseline (relativ, 0.25 = 25 %)
+ */
+export interface BenchmarkThresholds {
+  latencyP50: number;
+  latencyP95: number;
+  throughput: number;
+  peakMemory: number;
+  /** Latenzen unter diesem Wert (ms) werden nicht verglichen */
+  minLatencyMs: number;
+  /** Speicherwerte unter diesem Wert (MB) werden nicht verglichen */
+  minMemoryMb: number;
+}
+
+/**
+ * Inhalt von baselines.json
+ */
+export interface BaselineFile {
+  /** Rechner und Zeitpunkt der Messung, von `npm run bench:baseline` gesetzt */
+  recordedOn?: string;
+  thresholds: BenchmarkThresholds;
+  results: Record<string, BenchmarkResult>;
+}
+
+/**
+ * Optionen für einen Benchmark
+ */
+export interface BenchmarkOptions {
+  /** Durchläufe vor der Messung */
+  warmup?: number;
+  /** Mindestanzahl gemessener Durchläufe */
+  minIterations?: number;
+  /** Höchstzahl gemessener Durchläufe */
+  maxIterations?: number;
+  /** Zeitbudget für die Messung in ms; bestimmt die Zahl der Durchläufe */
+  budgetMs?: number;
+}
+
+export const BASELINE_FILE = path.join(__dirname, 'baselines.json');
+export const RESULTS_FILE = path.join(__dirname, 'results', 'latest.json');
+
+setFlagsFromString('--expose-gc');
+const gc = runInNewContext('gc') as () => void;
+
+const MB = 1024 * 1024;
+
+/**
+ * Perzentil einer aufsteigend sortierten Liste (nächster Rang)
+ *
+ * @param sorted - Aufsteigend sortierte Werte
+ * @param p - Perzentil zwischen 0 und 100
+ * @returns Wert des Perzentils
+ */
+export function percentile(sorted: number[], p: number): number {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  const rank = Math.ceil((p / 100) * sorted.length);
+  return sorted[Math.min(sorted.length, Math.max(1, rank)) - 1];
+}
+
+function round(value: number, digits: number = 3): number {
+  const factor = 10 ** digits;
+  return Math.round(value * factor) / factor;
+}
+
+/**
+ * Führt fn einmal aus und misst Dauer und höchsten Heap-Zuwachs
+ */
+async function measureOnce(fn: () => unknown): Promise<{ ms: number; peakBytes: number }> {
+  gc();
+  const before = process.memoryUsage().heapUsed;
+  let peak = before;
+
+  // Asynchrone Arbeit wird zwischendurch abgetastet, synchrone nur am Ende
+  const sampler = setInterval(() => {
+    peak = Math.max(peak, process.memoryUsage().heapUsed);
+  }, 5);
+
+  const start = performance.now();
+  try {
+    await fn();
+  } finally {
+    clearInterval(sampler);
+  }
+  const ms = performance.now() - start;
+  peak = Math.max(peak, process.memoryUsage().heapUsed);
+
+  return { ms, peakBytes: Math.max(0, peak - before) };
+}
+
+/**
+ * Misst eine Stufe mit einer bestimmten Zeilenzahl
+ *
+ * @param stage - Name der Stufe, z.B. 'analysis'
+ * @param rows - Anzahl der verarbeiteten Zeilen
+ * @param fn - Gemessene Arbeit
+ * @param options - Aufwärmen, Durchläufe und Zeitbudget
+ * @returns Messergebnis
+ */
+export async function runBenchmark(
+  stage: string,
+  rows: number,
+  fn: () => unknown,
+  options: BenchmarkOptions = {}
+): Promise<BenchmarkResult> {
+  const { warmup = 2, minIterations = 5, maxIterations = 50, budgetMs = 5000 } = options;
+
+  let firstMs = 0;
+  for (let i = 0; i < warmup; i++) {
+    firstMs = (await measureOnce(fn)).ms;
+  }
+
+  const iterations = Math.max(
+    minIterations,
+    Math.min(maxIterations, Math.floor(budgetMs / Math.max(firstMs, 1)))
+  );
+
+  const durations: number[] = [];
+  let peakBytes = 0;
+  for (let i = 0; i < iterations; i++) {
+    const run = await measureOnce(fn);
+    durations.push(run.ms);
+    peakBytes = Math.max(peakBytes, run.peakBytes);
+  }
+
+  durations.sort((a, b) => a - b);
+  const meanMs = durations.reduce((sum, ms) => sum + ms, 0) / durations.length;
+
+  return {
+    name: `${stage}@${rows}`,
+    rows,
+    iterations,
+    meanMs: round(meanMs),
+    p50Ms: round(percentile(durations, 50)),
+    p95Ms: round(percentile(durations, 95)),
+    p99Ms: round(percentile(durations, 99)),
+    rowsPerSecond: Math.round(rows / (percentile(durations, 50) / 1000)),
+    peakHeapMb: round(peakBytes / MB, 2),
+  };
+}
+
+/**
+ * Vergleicht ein Ergebnis mit seiner Baseline
+ *
+ * @param result - Aktuelles Ergebnis
+ * @param baseline - Gespeicherte Baseline (fehlt sie, gibt es nichts zu vergleichen)
+ * @param thresholds - Erlaubte Verschlechterung
+ * @returns Beschreibung jeder Überschreitung; leer, wenn alles im Rahmen liegt
+ */
+export function compareToBaseline(
+  result: BenchmarkResult,
+  baseline: BenchmarkResult | undefined,
+  thresholds: BenchmarkThresholds
+): string[] {
+  if (!baseline) {
+    return [];
+  }
+
+  const regressions: string[] = [];
+  const slower = (key: 'p50Ms' | 'p95Ms', tolerance: number) => {
+    const limit = baseline[key] * (1 + tolerance);
+    if (result[key] > limit && result[key] - baseline[key] >= thresholds.minLatencyMs) {
+      regressions.push(`${result.name}: ${key} ${result[key]} ms > ${round(limit)} ms`);
+    }
+  };
+
+  slower('p50Ms', thresholds.latencyP50);
+  slower('p95Ms', thresholds.latencyP95);
+
+  const minThroughput = baseline.rowsPerSecond * (1 - thresholds.throughput);
+  if (result.rowsPerSecond < minThroughput && result.p50Ms >= thresholds.minLatencyMs) {
+    regressions.push(
+      `${result.name}: ${result.rowsPerSecond} rows/s < ${Math.round(minThroughput)} rows/s`
+    );
+  }
+
+  const maxMemory = baseline.peakHeapMb * (1 + thresholds.peakMemory);
+  if (result.peakHeapMb > maxMemory && result.peakHeapMb >= thresholds.minMemoryMb) {
+    regressions.push(
+      `${result.name}: peak heap ${result.peakHeapMb} MB > ${round(maxMemory, 2)} MB`
+    );
+  }
+
+  return regressions;
+}
+
+/**
+ * Liest die gespeicherten Baselines
+ *
+ * @param file - Pfad zu baselines.json
+ * @returns Schwellwerte und Baselines
+ */
+export function loadBaselines(file: string = BASELINE_FILE): BaselineFile {
+  return JSON.parse(readFileSync(file, 'utf8')) as BaselineFile;
+}
+
+/**
+ * Schreibt die Ergebnisse eines Laufs (Übernahme als Baseline mit
+ * `npm run bench:baseline`)
+ *
+ * @param results - Ergebnisse des Laufs
+ * @param file - Zieldatei
+ */
+export function saveResults(results: BenchmarkResult[], file: string = RESULTS_FILE): void {
+  if (!existsSync(path.dirname(file))) {
+    mkdirSync(path.dirname(file), { recursive: true });
+  }
+
+  const byName = Object.fromEntries(results.map(result => [result.name, result]));
+  const content = {
+    node: process.version,
+    platform: `${process.platform}-${process.arch}`,
+    createdAt: new Date().toISOString(),
+    results: byName,
+  };
+  writeFileSync(file, `${JSON.stringify(content, null, 2)}\n`);
+}
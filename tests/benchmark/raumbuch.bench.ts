@@ -0,0 +1,173 @@
+/**
+ * @jest-environment node
+ */
+
+/**
+ * Benchmarks für Analyse, Mapping, Excel- und PDF-Export
+ *
+ * Läuft komplett offline: Die Datenbank wird durch db-stand-in ersetzt, die
+ * Daten stammen aus dem Generator mit festem Seed. Aufruf:
+ *
+ *   npm run bench                        # alle Größen bis 200k Zeilen
+ *   BENCH_PROFILE=quick npm run bench    # nur bis 10k Zeilen
+ *   BENCH_PDF=false npm run bench        # ohne PDF (benötigt lokales Chromium)
+ *   npm run bench:baseline               # letzten Lauf als Baseline übernehmen
+ *
+ * Ein Test schlägt fehl, wenn seine Messung die Schwellwerte aus
+ * baselines.json gegenüber der gespeicherten Baseline überschreitet. Ohne
+ * Baseline wird nur gemessen.
+ */
+
+import { Writable } from 'stream';
+
+import { analyzeRaumbuchData } from '@/services/analysis/raumbuch-analysis';
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
+import { fetchRaumbuchData, fetchRaumbuchFrame } from '@/services/database/queries';
+import { buildRaumbuchResult } from '@/services/database/raumbuch-cache';
+import { getBrowserPool } from '@/services/export/browser-pool';
+import { generateExcel, writeExcelStream } from '@/services/export/excel-export';
+import { generatePdf } from '@/services/export/pdf-export';
+
+import { setStandInRows } from './db-stand-in';
+import { compareToBaseline, loadBaselines, runBenchmark, saveResults } from './harness';
+import { CARDINALITY_PROFILES, generateRaumbuchRows, toDatabaseRows } from './synthetic-raumbuch';
+
+import type { BenchmarkOptions, BenchmarkResult } from './harness';
+import type { RaumbuchEntry } from '@/types/raumbuch.types';
+
+jest.mock('mssql', () => require('./db-stand-in').mssqlStandIn);
+
+const SIZES =
+  process.env.BENCH_PROFILE === 'quick'
+    ? [100, 1_000, 10_000]
+    : [100, 1_000, 10_000, 50_000, 200_000];
+
+const SEED = Number(process.env.BENCH_SEED ?? 20240101);
+
+interface Stage {
+  name: string;
+  /** Größte Zeilenzahl, die für diese Stufe sinnvoll ist */
+  maxRows: number;
+  enabled: boolean;
+  options?: BenchmarkOptions;
+  /** Vorbereitung außerhalb der Messung; liefert die gemessene Arbeit */
+  setup: (rows: RaumbuchEntry[]) => () => unknown;
+}
+
+/**
+ * Verwirft alles, was geschrieben wird
+ */
+function nullStream(): Writable {
+  return new Writable({
+    write(_chunk, _encoding, callback) {
+      callback();
+    },
+  });
+}
+
+const STAGES: Stage[] = [
+  {
+    name: 'analysis',
+    maxRows: Infinity,
+    enabled: true,
+    setup: rows => () => analyzeRaumbuchData(rows),
+  },
+  {
+    name: 'mapping',
+    maxRows: Infinity,
+    enabled: true,
+    setup: rows => {
+      setStandInRows(toDatabaseRows(rows));
+      return () => fetchRaumbuchData(1);
+    },
+  },
+  {
+    name: 'mapping_frame',
+    maxRows: Infinity,
+    enabled: true,
+    setup: rows => {
+      setStandInRows(toDatabaseRows(rows));
+      return () => fetchRaumbuchFrame(1);
+    },
+  },
+  {
+    name: 'analysis_frame',
+    maxRows: Infinity,
+    enabled: true,
+    setup: rows => {
+      const frame = RaumbuchFrame.from(rows);
+      return () => buildRaumbuchResult(1, frame, '');
+    },
+  },
+  {
+    name: 'excel',
+    maxRows: 50_000,
+    enabled: true,
+    options: { warmup: 1, maxIterations: 10 },
+    setup: rows => {
+      const { summary } = analyzeRaumbuchData(rows);
+      return () => generateExcel(rows, 'Benchmark-Standort', summary);
+    },
+  },
+  {
+    name: 'excel_stream',
+    maxRows: 200_000,
+    enabled: true,
+    options: { warmup: 1, maxIterations: 10 },
+    setup: rows => () => writeExcelStream(rows, 'Benchmark-Standort', nullStream()),
+  },
+  {
+    name: 'pdf',
+    maxRows: 1_000,
+    enabled: process.env.BENCH_PDF !== 'false',
+    options: { warmup: 1, maxIterations: 10 },
+    setup: rows => {
+      const { summary, visualizationData } = analyzeRaumbuchData(rows);
+      return () => generatePdf(rows, 'Benchmark-Standort', { summary, visualizationData });
+    },
+  },
+];
+
+const baselines = loadBaselines();
+const results: BenchmarkResult[] = [];
+
+afterAll(async () => {
+  setStandInRows([]);
+  saveResults(results);
+  await getBrowserPool().close();
+});
+
+describe.each(STAGES.filter(stage => stage.enabled))('$name', stage => {
+  const sizes = SIZES.filter(size => size <= stage.maxRows);
+
+  test.each(sizes)('%i Zeilen', async size => {
+    const rows = generateRaumbuchRows(size, { seed: SEED, ...CARDINALITY_PROFILES.typisch });
+    const result = await runBenchmark(stage.name, size, stage.setup(rows), stage.options);
+    results.push(result);
+
+    const baseline = baselines.results[result.name];
+    console.log(
+      `${result.name}: p50 ${result.p50Ms} ms, p95 ${result.p95Ms} ms, ` +
+        `${result.rowsPerSecond} rows/s, peak ${result.peakHeapMb} MB` +
+        (baseline ? '' : ' (keine Baseline)')
+    );
+    expect(compareToBaseline(result, baseline, baselines.thresholds)).toEqual([]);
+  });
+});
+
+describe('Kardinalität', () => {
+  test.each(Object.keys(CARDINALITY_PROFILES) as (keyof typeof CARDINALITY_PROFILES)[])(
+    'analysis mit Profil %s',
+    async profile => {
+      const size = Math.min(50_000, SIZES[SIZES.length - 1]);
+      const rows = generateRaumbuchRows(size, { seed: SEED, ...CARDINALITY_PROFILES[profile] });
+      const result = await runBenchmark(`analysis_${profile}`, size, () =>
+        analyzeRaumbuchData(rows)
+      );
+      results.push(result);
+
+      const baseline = baselines.results[result.name];
+      expect(compareToBaseline(result, baseline, baselines.thresholds)).toEqual([]);
+    }
+  );
+});
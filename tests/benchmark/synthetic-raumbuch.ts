@@ -0,0 +1,229 @@
+/**
+ * Reproduzierbare synthetische Raumbuch-Daten für Benchmarks
+ *
+ * Gleicher Seed und gleiche Optionen liefern immer dieselben Zeilen. Die Werte
+ * der Gruppierungsspalten sind schief verteilt (wenige große Bereiche, viele
+ * kleine), wie in echten Gebäuden; die Kennzahlen werden wie in der Datenbank
+ * aus Menge, Leistung und Reinigungstagen abgeleitet.
+ */
+
+import type { RaumbuchRow } from '@/types/raumbuch.types';
+
+/**
+ * Optionen für den Generator
+ */
+export interface SyntheticRaumbuchOptions {
+  /** Startwert des Zufallsgenerators */
+  seed?: number;
+  /** Anzahl unterschiedlicher Bereiche */
+  bereiche?: number;
+  /** Anzahl unterschiedlicher Etagen */
+  etagen?: number;
+  /** Anzahl unterschiedlicher Reinigungsgruppen */
+  reinigungsgruppen?: number;
+  /** Anzahl unterschiedlicher Gebäudeteile */
+  gebaeudeteile?: number;
+  /** Anteil der Zeilen mit NULL in Kennzahlen (wie in Altdaten) */
+  nullRatio?: number;
+  /** Gebäude-ID der Zeilen */
+  gebaeude_ID?: number;
+}
+
+type Cardinalities = Required<
+  Pick<SyntheticRaumbuchOptions, 'bereiche' | 'etagen' | 'reinigungsgruppen' | 'gebaeudeteile'>
+>;
+
+/**
+ * Kardinalitäten für kleine, typische und sehr große Gebäude
+ */
+export const CARDINALITY_PROFILES: Record<'klein' | 'typisch' | 'gross', Cardinalities> = {
+  klein: { bereiche: 4, etagen: 3, reinigungsgruppen: 3, gebaeudeteile: 1 },
+  typisch: { bereiche: 15, etagen: 8, reinigungsgruppen: 10, gebaeudeteile: 4 },
+  gross: { bereiche: 120, etagen: 40, reinigungsgruppen: 60, gebaeudeteile: 25 },
+};
+
+const BEREICH_NAMEN = [
+  'Büro',
+  'Flur',
+  'Sanitär',
+  'Treppenhaus',
+  'Besprechung',
+  'Küche',
+  'Lager',
+  'Technik',
+];
+
+const INTERVALLE: [string, number][] = [
+  ['täglich', 21.67],
+  ['2x wöchentlich', 8.67],
+  ['wöchentlich', 4.33],
+  ['14-tägig', 2.17],
+  ['monatlich', 1],
+];
+
+/**
+ * Zufallsgenerator mulberry32: schnell, 32 Bit Zustand, reproduzierbar
+ *
+ * @param seed - Startwert
+ * @returns Funktion mit Werten im Intervall [0, 1)
+ */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Wählt einen Index in [0, n) mit Zipf-ähnlicher Verteilung (kleine Indizes häufiger)
+ */
+function skewedIndex(random: () => number, n: number): number {
+  return Math.min(n - 1, Math.floor(n * random() ** 2));
+}
+
+function round(value: number, digits: number): number {
+  const factor = 10 ** digits;
+  return Math.round(value * factor) / factor;
+}
+
+function etageName(index: number): string {
+  if (index === 0) return 'EG';
+  if (index === 1) return 'UG';
+  return `${index - 1}.OG`;
+}
+
+function bereichName(index: number): string {
+  const base = BEREICH_NAMEN[index % BEREICH_NAMEN.length];
+  const suffix = Math.floor(index / BEREICH_NAMEN.length);
+  return suffix === 0 ? base : `${base} ${suffix}`;
+}
+
+/**
+ * Erzeugt synthetische Raumbuch-Zeilen
+ *
+ * @param count - Anzahl der Zeilen
+ * @param options - Seed und Kardinalitäten
+ * @returns Zeilen in der Form von mapToRaumbuchEntry()
+ */
+export function generateRaumbuchRows(
+  count: number,
+  options: SyntheticRaumbuchOptions = {}
+): RaumbuchRow[] {
+  const {
+    seed = 1,
+    bereiche = CARDINALITY_PROFILES.typisch.bereiche,
+    etagen = CARDINALITY_PROFILES.typisch.etagen,
+    reinigungsgruppen = CARDINALITY_PROFILES.typisch.reinigungsgruppen,
+    gebaeudeteile = CARDINALITY_PROFILES.typisch.gebaeudeteile,
+    nullRatio = 0.02,
+    gebaeude_ID = 1,
+  } = options;
+
+  const random = createRandom(seed);
+  const nullable = (value: number) => (random() < nullRatio ? null : value);
+  const xDatum = new Date(Date.UTC(2024, 0, 1));
+  const rows: RaumbuchRow[] = new Array(count);
+
+  for (let i = 0; i < count; i++) {
+    const bereich = skewedIndex(random, bereiche);
+    const etage = skewedIndex(random, etagen);
+    const rg = skewedIndex(random, reinigungsgruppen);
+    const teil = skewedIndex(random, gebaeudeteile);
+    const [intervall, tageMonat] = INTERVALLE[skewedIndex(random, INTERVALLE.length)];
+
+    const menge = round(5 + random() * 195, 2);
+    const aktiv = random() < 0.9;
+    const leistung = round(80 + random() * 320, 0);
+    const stundeTag = round(menge / leistung, 4);
+    const stundeMonat = round(stundeTag * tageMonat, 4);
+    const mengeAktivMonat = aktiv ? round(menge * tageMonat, 2) : 0;
+    const vkNetto = round(stundeMonat * 28.5, 2);
+    const rgNetto = round(vkNetto * 0.97, 2);
+
+    rows[i] = {
+      ID: i + 1,
+      Firma_ID: 1,
+      Standort_ID: 1,
+      Gebaeude_ID: gebaeude_ID,
+      Standort: 'Benchmark-Standort',
+      Gebaeude: `Gebäude ${gebaeude_ID}`,
+      Raumnummer: `${etageName(etage)}-${String(i % 1000).padStart(3, '0')}`,
+      Bereich: bereichName(bereich),
+      Gebaeudeteil: `Teil ${String.fromCharCode(65 + (teil % 26))}${teil >= 26 ? teil : ''}`,
+      Etage: etageName(etage),
+      Bezeichnung: `Raum ${i + 1}`,
+      Reinigungsgruppe: `RG ${rg + 1}`,
+      Menge: nullable(menge),
+      MengeAktiv: aktiv ? menge : 0,
+      MengeInAktiv: aktiv ? 0 : menge,
+      Einheit: 'm²',
+      Anzahl: 1,
+      Reinigungsintervall: intervall,
+      ReinigungstageMonat: tageMonat,
+      ReinigungstageJahr: round(tageMonat * 12, 2),
+      LeistungStunde: leistung,
+      LeistungStundeIst: leistung,
+      Aufschlag: 0,
+      StundeTag: nullable(stundeTag),
+      StundeMonat: nullable(stundeMonat),
+      MengeAktivMonat: nullable(mengeAktivMonat),
+      VkWertNettoMonat: nullable(vkNetto),
+      VkWertBruttoMonat: nullable(round(vkNetto * 1.19, 2)),
+      RgWertNettoMonat: nullable(rgNetto),
+      RgWertBruttoMonat: nullable(round(rgNetto * 1.19, 2)),
+      ReinigungsTage: 'Mo-Fr',
+      Reduzierung: null,
+      Bemerkung: random() < 0.1 ? 'Sonderreinigung nach Absprache' : null,
+      Bereich_ID: bereich + 1,
+      Gebaeudeteil_ID: teil + 1,
+      Etage_ID: etage + 1,
+      Reinigungsgruppe_ID: rg + 1,
+      Einheit_ID: 1,
+      Reinigungsintervall_ID: INTERVALLE.findIndex(([name]) => name === intervall) + 1,
+      ReinigungsTage_ID: 1,
+      LfdNr: i + 1,
+      xStatus: 1,
+      xDatum,
+      xBenutzer: 'benchmark',
+      xVersion: 1,
+    };
+  }
+
+  return rows;
+}
+
+/**
+ * Spalten, die mssql als DECIMAL liefert
+ */
+const DECIMAL_COLUMNS: (keyof RaumbuchRow)[] = [
+  'Menge',
+  'MengeAktivMonat',
+  'VkWertNettoMonat',
+  'VkWertBruttoMonat',
+  'RgWertNettoMonat',
+  'RgWertBruttoMonat',
+  'StundeTag',
+  'StundeMonat',
+];
+
+/**
+ * Wandelt Zeilen in die Form um, in der mssql sie liefert: DECIMAL-Spalten
+ * als Strings, damit das Mapping dieselbe Arbeit hat wie mit der Datenbank
+ *
+ * @param rows - Zeilen aus generateRaumbuchRows()
+ * @returns Datenbankzeilen
+ */
+export function toDatabaseRows(rows: RaumbuchRow[]): Record<string, unknown>[] {
+  return rows.map(row => {
+    const record: Record<string, unknown> = { ...row };
+    for (const key of DECIMAL_COLUMNS) {
+      const value = row[key];
+      record[key] = value === null ? null : String(value);
+    }
+    return record;
+  });
+}
@@ -0,0 +1,105 @@
+/**
+ * @jest-environment node
+ */
+import { promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+
+import ExcelJS from 'exceljs';
+import { NextRequest } from 'next/server';
+
+import { GET } from '@/app/api/export/excel/[id]/route';
+import { streamQuery } from '@/services/database/client';
+import { ExportCache } from '@/services/export/export-cache';
+import { exportKey, runExport } from '@/services/export/export-jobs';
+
+import type { ExportJob } from '@/services/export/export-jobs';
+
+// Datenbank: Gebäude, Datenstand und die Raumbuch-Zeilen in SQL-Reihenfolge
+jest.mock('@/services/database/client', () => ({
+  executePreparedSingle: jest.fn().mockResolvedValue({
+    Gebaeude_ID: 1,
+    Gebaeude: 'Testgebäude',
+  }),
+  executeSingleQuery: jest.fn().mockResolvedValue({ Anzahl: 3, xDatum: null, xVersion: 7 }),
+  streamQuery: jest.fn(),
+}));
+
+jest.mock('@/services/export/pdf-export', () => ({
+  generatePdf: jest.fn(),
+}));
+
+const mockStreamQuery = streamQuery as jest.Mock;
+
+// Die Datenbank filtert ohne Beachtung der Groß-/Kleinschreibung
+const dbRows = [
+  { ID: 1, Raumnummer: '0.01', Etage: 'EG', Bezeichnung: 'Empfang', Menge: 20 },
+  { ID: 2, Raumnummer: '0.02', Etage: 'eg', Bezeichnung: 'WC', Menge: 10 },
+  { ID: 4, Raumnummer: '0.03', Etage: 'EG', Bezeichnung: 'Lager', Menge: 5 },
+];
+
+let directory: string;
+let cache: ExportCache;
+
+beforeEach(async () => {
+  directory = await fs.mkdtemp(path.join(os.tmpdir(), 'export-excel-'));
+  cache = new ExportCache({ directory, maxBytes: 10 * 1024 * 1024 });
+  (global as unknown as { exportCache: ExportCache }).exportCache = cache;
+
+  mockStreamQuery.mockReset().mockImplementation(async function* () {
+    yield* dbRows;
+  });
+});
+
+afterEach(async () => {
+  await fs.rm(directory, { recursive: true, force: true });
+});
+
+/**
+ * Werte des Datenblatts einer Excel-Datei
+ */
+async function dataSheetValues(content: Buffer): Promise<unknown[]> {
+  const workbook = new ExcelJS.Workbook();
+  await workbook.xlsx.load(content);
+  return workbook.getWorksheet('Raumbuchdaten')!.getSheetValues();
+}
+
+describe('Excel-Export: Route und Export-Job', () => {
+  test('Erzeugen für denselben Schlüssel dieselbe Datei', async () => {
+    const url = 'http://localhost:3000/api/export/excel/1?etage=EG';
+
+    // Direkter Download ohne Cache-Eintrag
+    const direct = await GET(new NextRequest(url), { params: { id: '1' } });
+    expect(direct.status).toBe(200);
+    expect(direct.headers.get('X-Export-Cache')).toBeNull();
+    const routeFile = Buffer.from(await direct.arrayBuffer());
+
+    // Export-Job mit denselben Filtern
+    const job = {
+      id: 'job-1',
+      format: 'excel',
+      gebaeude_ID: 1,
+      filter: { etage: 'EG' },
+    } as ExportJob;
+    const entry = await runExport(job, () => undefined, cache);
+    expect(entry.key).toBe(exportKey('excel', 1, { etage: 'EG' }, '3||7'));
+    const jobFile = await fs.readFile(entry.file);
+
+    // Beide lesen dieselben Zeilen mit derselben Abfrage
+    expect(mockStreamQuery).toHaveBeenCalledTimes(2);
+    expect(mockStreamQuery.mock.calls[1]).toEqual(mockStreamQuery.mock.calls[0]);
+    expect(mockStreamQuery.mock.calls[0][0]).toContain('ORDER BY Raumbuch.ID');
+    expect(mockStreamQuery.mock.calls[0][1]).toEqual({ gebaeude_ID: 1, etage: 'EG' });
+
+    const routeValues = await dataSheetValues(routeFile);
+    expect(await dataSheetValues(jobFile)).toEqual(routeValues);
+    // Kopfzeile, drei Räume, Summen-Zeile
+    expect(routeValues.filter(Boolean)).toHaveLength(5);
+
+    // Die Route liefert danach die Datei des Jobs aus
+    const hit = await GET(new NextRequest(url), { params: { id: '1' } });
+    expect(hit.headers.get('X-Export-Cache')).toBe('hit');
+    expect(Buffer.from(await hit.arrayBuffer()).equals(jobFile)).toBe(true);
+    expect(mockStreamQuery).toHaveBeenCalledTimes(2);
+  });
+});
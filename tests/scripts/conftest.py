@@ -0,0 +1,6 @@
+"""Makes the helper scripts in scripts/ importable for the tests in this folder."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from create_project import ScaffoldError, load_manifest, setup_project
+
+
+def write_manifest(tmp_path, data):
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def test_manifest_paths_are_normalized(tmp_path):
+    manifest = write_manifest(tmp_path, {
+        'directories': ['src\\reports/', './docs'],
+        'files': {'a/../README.md': '# $project_name\n'},
+    })
+
+    directories, files, _ = load_manifest(manifest)
+
+    assert directories == ['src/reports', 'docs']
+    assert files == {'README.md': '# $project_name\n'}
+
+
+@pytest.mark.parametrize('path', [
+    '../escape.txt',
+    'a/../../x',
+    '..\\escape.txt',
+    '/etc/passwd',
+    'C:/Windows/x.txt',
+    '.',
+])
+@pytest.mark.parametrize('kind', ['files', 'directories'])
+def test_manifest_rejects_paths_outside_base_dir(tmp_path, path, kind):
+    data = {'files': {path: ''}} if kind == 'files' else {'directories': [path]}
+
+    with pytest.raises(ScaffoldError):
+        load_manifest(write_manifest(tmp_path, data))
+
+
+def test_manifest_files_stay_below_base_dir(tmp_path):
+    manifest = write_manifest(tmp_path, {
+        'files': {'sub/../inside.txt': 'ok', 'sub/file.txt': None},
+        'replace_defaults': True,
+    })
+    base_dir = tmp_path / 'project'
+
+    setup_project([str(base_dir)], manifest=manifest, workers=2)
+
+    created = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob('*'))
+    assert created == [
+        'manifest.json',
+        'project',
+        'project/inside.txt',
+        'project/sub',
+        'project/sub/file.txt',
+    ]
@@ -0,0 +1,62 @@
+import io
+import os
+
+from dump_engine import DumpFile, DumpStyle, Output, TextSink
+from dump_snapshot import Snapshot, SnapshotEntry, run_dump
+
+
+def run(files, snapshot_dir, incremental=None):
+    output = Output(io.BytesIO())
+    sink = TextSink(output, DumpStyle())
+    run_dump(files, files, output, sink, {'workers': 2}, snapshot_dir,
+             incremental=incremental, record=incremental is None)
+
+
+def stored_objects(snapshot_dir):
+    objects = os.path.join(snapshot_dir, 'objects')
+    return sorted(
+        bucket + name
+        for bucket in os.listdir(objects) if not bucket.startswith('.')
+        for name in os.listdir(os.path.join(objects, bucket))
+    )
+
+
+def test_unreferenced_objects_are_removed(tmp_path):
+    a = tmp_path / 'a.txt'
+    b = tmp_path / 'b.txt'
+    a.write_text('version 1\n', encoding='utf-8')
+    b.write_text('unchanged\n', encoding='utf-8')
+    snapshot_dir = str(tmp_path / 'snapshot')
+
+    run([DumpFile(str(a)), DumpFile(str(b))], snapshot_dir)
+    assert len(stored_objects(snapshot_dir)) == 2
+
+    # Geänderte Datei: nur noch die neue Version bleibt
+    a.write_text('version 2 with more text\n', encoding='utf-8')
+    run([DumpFile(str(a)), DumpFile(str(b))], snapshot_dir, incremental='changed')
+    snapshot = Snapshot.load(snapshot_dir)
+    expected = sorted(entry.sha256 for entry in snapshot.entries.values())
+    assert stored_objects(snapshot_dir) == expected
+
+    # Gelöschte Datei: ihr Objekt verschwindet ebenfalls
+    run([DumpFile(str(b))], snapshot_dir)
+    assert stored_objects(snapshot_dir) == [Snapshot.load(snapshot_dir).entries[str(b)].sha256]
+
+
+def test_prune_keeps_referenced_objects_and_temp_files(tmp_path):
+    source = tmp_path / 'file.txt'
+    source.write_text('content\n', encoding='utf-8')
+    snapshot = Snapshot(str(tmp_path / 'snapshot'))
+    sha256, _ = snapshot.store_file(str(source))
+    orphan = snapshot.object_path('ff' * 32)
+    os.makedirs(os.path.dirname(orphan), exist_ok=True)
+    open(orphan, 'wb').close()
+    temp = os.path.join(snapshot.directory, 'objects', '.obj-pending')
+    open(temp, 'wb').close()
+
+    snapshot.entries['file.txt'] = SnapshotEntry(str(source), 8, 0, sha256)
+
+    assert snapshot.prune_objects() == 1
+    assert snapshot.has_object(sha256)
+    assert not os.path.exists(os.path.dirname(orphan))
+    assert os.path.exists(temp)
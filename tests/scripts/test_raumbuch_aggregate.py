@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+import raumbuch_aggregate
+
+# Dieselbe Golden-Datei wie tests/unit/services/columnar-aggregation.test.ts
+GOLDEN = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'raumbuch-aggregation.golden.json')
+
+
+def test_pure_python_matches_golden_file():
+    assert raumbuch_aggregate.verify(GOLDEN, use_numpy=False) == []
+
+
+def test_numpy_matches_golden_file():
+    # verify() fällt ohne NumPy still auf reines Python zurück
+    pytest.importorskip('numpy')
+    assert raumbuch_aggregate.np is not None
+    assert raumbuch_aggregate.verify(GOLDEN, use_numpy=True) == []
@@ -344,4 +344,34 @@ describe('RaumbuchTable Component', () => {
     expect(firstRowCells[6]).toHaveTextContent('40.00'); // 40 qm
     expect(lastRowCells[6]).toHaveTextContent('20.00'); // 20 qm
   });
+
+  test('Rendert im virtualisierten Modus nur die sichtbaren Zeilen', async () => {
+    const manyRows = Array.from({ length: 1000 }, (_, i) => ({
+      ...mockData[i % 3],
+      ID: i + 1,
+      Raumnummer: String(i + 1),
+      Menge: 1000 - i,
+    }));
+
+    render(
+      <RaumbuchTable
+        data={manyRows}
+        summary={mockSummary}
+        virtualized
+        height={450}
+        rowHeight={45}
+        overscan={5}
+      />
+    );
+
+    // Sichtbare Zeilen (10) + overscan (5) + Header (1) + Summary (1)
+    let rows = screen.getAllByRole('row');
+    expect(rows).toHaveLength(17);
+    expect(screen.getByText(/Zeige 1000 von 1000 Einträgen/)).toBeInTheDocument();
+
+    // Sortierung gilt für alle Zeilen, nicht nur für die gerenderten
+    await userEvent.click(screen.getByText('Menge'));
+    rows = screen.getAllByRole('row');
+    expect(within(rows[1]).getAllByRole('cell')[0]).toHaveTextContent('1000');
+  });
 });
@@ -0,0 +1,80 @@
+/**
+ * @jest-environment node
+ */
+import {
+  countRows,
+  metrics,
+  MetricsRegistry,
+  RequestTimings,
+  setRequestTimingsProvider,
+  timeStage,
+  timeStageAsync,
+} from '@/lib/metrics';
+
+describe('MetricsRegistry', () => {
+  test('Gibt Zähler und kumulierte Histogramme im Prometheus-Format aus', () => {
+    const registry = new MetricsRegistry();
+    registry.counter('test_rows_total', 'Rows').inc({ stage: 'map' }, 3);
+    const histogram = registry.histogram('test_seconds', 'Duration', [0.1, 1]);
+    histogram.observe({ stage: 'db' }, 0.05);
+    histogram.observe({ stage: 'db' }, 0.5);
+    histogram.observe({ stage: 'db' }, 5);
+
+    const text = registry.render([
+      { name: 'test_ratio', help: 'Ratio', type: 'gauge', samples: [{ value: 0.5 }] },
+    ]);
+
+    expect(text).toContain('# TYPE test_rows_total counter');
+    expect(text).toContain('test_rows_total{stage="map"} 3');
+    expect(text).toContain('test_seconds_bucket{le="0.1",stage="db"} 1');
+    expect(text).toContain('test_seconds_bucket{le="1",stage="db"} 2');
+    expect(text).toContain('test_seconds_bucket{le="+Inf",stage="db"} 3');
+    expect(text).toContain('test_seconds_sum{stage="db"} 5.55');
+    expect(text).toContain('test_seconds_count{stage="db"} 3');
+    expect(text).toContain('# TYPE test_ratio gauge\ntest_ratio 0.5');
+    expect(text.endsWith('\n')).toBe(true);
+  });
+
+  test('Maskiert Anführungszeichen in Label-Werten', () => {
+    const registry = new MetricsRegistry();
+    registry.counter('test_total', 'Test').inc({ route: 'a"b' });
+
+    expect(registry.render()).toContain('test_total{route="a\\"b"} 1');
+  });
+});
+
+describe('Schritt-Messung', () => {
+  afterEach(() => {
+    setRequestTimingsProvider(() => undefined);
+  });
+
+  test('Erfasst Schritte im Histogramm und für die laufende Anfrage', async () => {
+    const timings = new RequestTimings();
+    setRequestTimingsProvider(() => timings);
+    const durations = metrics.histogram('rd_stage_duration_seconds', '');
+    const rows = metrics.counter('rd_stage_rows_total', '');
+    const countBefore = durations.get({ stage: 'map' }).count;
+    const rowsBefore = rows.get({ stage: 'map' });
+
+    expect(timeStage('map', () => 42)).toBe(42);
+    expect(timeStage('map', () => 43)).toBe(43);
+    await expect(timeStageAsync('db', () => Promise.resolve('ok'))).resolves.toBe('ok');
+    countRows('map', 10);
+
+    expect(durations.get({ stage: 'map' }).count).toBe(countBefore + 2);
+    expect(rows.get({ stage: 'map' })).toBe(rowsBefore + 10);
+    expect(timings.toHeader()).toMatch(/^map;dur=\d+\.\d;desc="2x", db;dur=\d+\.\d$/);
+  });
+
+  test('Erfasst die Dauer auch bei Fehlern', () => {
+    const timings = new RequestTimings();
+    setRequestTimingsProvider(() => timings);
+
+    expect(() =>
+      timeStage('pdf', () => {
+        throw new Error('kaputt');
+      })
+    ).toThrow('kaputt');
+    expect(timings.toHeader()).toMatch(/^pdf;dur=/);
+  });
+});
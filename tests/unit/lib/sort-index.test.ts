@@ -0,0 +1,56 @@
+import { SortIndex, sortPermutation } from '@/lib/sort-index';
+
+interface Row {
+  ID: number;
+  Bereich: string | null;
+  Menge: number | null;
+}
+
+const rows: Row[] = [
+  { ID: 1, Bereich: 'Flur', Menge: 20 },
+  { ID: 2, Bereich: 'büro', Menge: null },
+  { ID: 3, Bereich: null, Menge: 5 },
+  { ID: 4, Bereich: 'Büro', Menge: 20 },
+  { ID: 5, Bereich: 'Archiv', Menge: 12.5 },
+  { ID: 6, Bereich: 'Flur', Menge: 5 },
+];
+
+// Bisherige Vergleichsfunktion der Raumbuch-Tabelle
+function legacySort(data: Row[], key: keyof Row, direction: 'asc' | 'desc'): number[] {
+  return [...data]
+    .sort((a, b) => {
+      const aValue = a[key];
+      const bValue = b[key];
+      if (aValue === null || aValue === undefined) return direction === 'asc' ? -1 : 1;
+      if (bValue === null || bValue === undefined) return direction === 'asc' ? 1 : -1;
+      if (typeof aValue === 'number' && typeof bValue === 'number') {
+        return direction === 'asc' ? aValue - bValue : bValue - aValue;
+      }
+      const aString = String(aValue).toLowerCase();
+      const bString = String(bValue).toLowerCase();
+      return direction === 'asc' ? aString.localeCompare(bString) : bString.localeCompare(aString);
+    })
+    .map(row => row.ID);
+}
+
+describe('SortIndex', () => {
+  test.each([
+    ['Bereich', 'asc'],
+    ['Bereich', 'desc'],
+    ['Menge', 'asc'],
+    ['Menge', 'desc'],
+  ] as const)('%s %s entspricht der bisherigen Sortierung', (key, direction) => {
+    const order = new SortIndex(rows).order(key, direction);
+
+    expect(Array.from(order, index => rows[index].ID)).toEqual(legacySort(rows, key, direction));
+  });
+
+  test('Berechnet jede Reihenfolge nur einmal', () => {
+    const index = new SortIndex(rows);
+    const ascending = index.order('Menge', 'asc');
+
+    expect(index.order('Menge', 'asc')).toBe(ascending);
+    expect(index.order('Menge', 'desc')).toBe(index.order('Menge', 'desc'));
+    expect(sortPermutation(rows, 'ID')).toEqual(Uint32Array.from([0, 1, 2, 3, 4, 5]));
+  });
+});
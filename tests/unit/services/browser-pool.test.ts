@@ -0,0 +1,145 @@
+import { BrowserPool } from '@/services/export/browser-pool';
+
+import type { Browser, Page } from 'puppeteer';
+
+// Puppeteer wird in diesen Tests nie gestartet
+jest.mock('puppeteer', () => ({
+  launch: jest.fn(),
+}));
+
+// Minimaler Browser mit Seiten, die ihren Zustand kennen
+function createFakeBrowser() {
+  const listeners: Record<string, () => void> = {};
+  const pages: { closed: boolean }[] = [];
+
+  const browser = {
+    connected: true,
+    pages,
+    on: (event: string, listener: () => void) => {
+      listeners[event] = listener;
+    },
+    newPage: jest.fn(async () => {
+      const state = { closed: false };
+      pages.push(state);
+      return {
+        browser: () => browser,
+        isClosed: () => state.closed,
+        close: async () => {
+          state.closed = true;
+        },
+      } as unknown as Page;
+    }),
+    close: jest.fn(async () => {
+      browser.connected = false;
+    }),
+    crash: () => {
+      browser.connected = false;
+      listeners.disconnected?.();
+    },
+  };
+
+  return browser;
+}
+
+function createPool(size: number, maxRendersPerPage = 10, acquireTimeoutMs = 1000) {
+  const browsers: ReturnType<typeof createFakeBrowser>[] = [];
+  const launch = jest.fn(async () => {
+    const browser = createFakeBrowser();
+    browsers.push(browser);
+    return browser as unknown as Browser;
+  });
+
+  const pool = new BrowserPool({
+    size,
+    maxRendersPerPage,
+    acquireTimeoutMs,
+    idleTimeoutMs: 0,
+    launch,
+  });
+
+  return { pool, launch, browsers };
+}
+
+describe('BrowserPool', () => {
+  test('Lässt weitere Anfragen auf eine freie Seite warten', async () => {
+    const { pool, launch, browsers } = createPool(1);
+    const order: string[] = [];
+    let finishFirst: () => void = () => undefined;
+
+    const first = pool.withPage(async () => {
+      order.push('first:start');
+      await new Promise<void>(resolve => {
+        finishFirst = resolve;
+      });
+      order.push('first:end');
+    });
+    const second = pool.withPage(async () => {
+      order.push('second');
+    });
+
+    await new Promise(resolve => setTimeout(resolve, 0));
+    expect(pool.stats()).toMatchObject({ active: 1, waiting: 1 });
+
+    finishFirst();
+    await Promise.all([first, second]);
+
+    expect(order).toEqual(['first:start', 'first:end', 'second']);
+    expect(launch).toHaveBeenCalledTimes(1);
+    expect(browsers[0].newPage).toHaveBeenCalledTimes(1);
+    expect(pool.stats()).toMatchObject({ active: 0, idle: 1, renders: 2 });
+  });
+
+  test('Erstellt Seiten nach maxRendersPerPage Exporten neu', async () => {
+    const { pool, browsers } = createPool(1, 2);
+
+    for (let i = 0; i < 5; i++) {
+      await pool.withPage(async () => undefined);
+    }
+
+    expect(browsers[0].newPage).toHaveBeenCalledTimes(3);
+    expect(browsers[0].pages.filter(page => page.closed)).toHaveLength(2);
+  });
+
+  test('Verwirft die Seite nach einem Fehler', async () => {
+    const { pool, browsers } = createPool(1);
+
+    await expect(
+      pool.withPage(async () => {
+        throw new Error('Render-Fehler');
+      })
+    ).rejects.toThrow('Render-Fehler');
+    await pool.withPage(async () => undefined);
+
+    expect(browsers[0].pages[0].closed).toBe(true);
+    expect(browsers[0].newPage).toHaveBeenCalledTimes(2);
+  });
+
+  test('Startet den Browser nach einem Absturz neu', async () => {
+    const { pool, launch, browsers } = createPool(1);
+
+    await pool.withPage(async () => undefined);
+    browsers[0].crash();
+    await pool.withPage(async () => undefined);
+
+    expect(launch).toHaveBeenCalledTimes(2);
+    expect(browsers[1].newPage).toHaveBeenCalledTimes(1);
+  });
+
+  test('Bricht das Warten nach acquireTimeoutMs ab', async () => {
+    const { pool } = createPool(1, 10, 20);
+    let finish: () => void = () => undefined;
+
+    const busy = pool.withPage(
+      () =>
+        new Promise<void>(resolve => {
+          finish = resolve;
+        })
+    );
+
+    await expect(pool.withPage(async () => undefined)).rejects.toThrow('Zeitüberschreitung');
+    expect(pool.stats().waiting).toBe(0);
+
+    finish();
+    await busy;
+  });
+});
@@ -0,0 +1,94 @@
+import { calculateSummary } from '@/services/analysis/calculate-summary';
+import {
+  aggregateColumns,
+  aggregateRaumbuch,
+  gebaeudeteilFromAggregates,
+  RaumbuchAccumulator,
+  summaryFromAggregates,
+  toColumns,
+  visualizationFromAggregates,
+} from '@/services/analysis/columnar-aggregation';
+import {
+  prepareDataForVisualization,
+  prepareGebaeudeteilData,
+} from '@/services/analysis/prepare-visualization';
+import { RaumbuchRow } from '@/types/raumbuch.types';
+
+import golden from '../../fixtures/raumbuch-aggregation.golden.json';
+
+// Golden-Datei, erzeugt mit den früheren reduce()/groupBy()-Implementierungen.
+// scripts/raumbuch_aggregate.py prüft gegen dieselbe Datei.
+const cases = golden.cases.map(c => ({
+  name: c.name,
+  rows: c.rows as unknown as RaumbuchRow[],
+  expected: c.expected,
+}));
+
+// JSON-Rundreise wie in der Golden-Datei (-0 wird zu 0); der String-Vergleich
+// prüft zusätzlich die Schlüsselreihenfolge
+function expectGolden(actual: unknown, expected: unknown): void {
+  expect(JSON.parse(JSON.stringify(actual))).toEqual(expected);
+  expect(JSON.stringify(actual)).toBe(JSON.stringify(expected));
+}
+
+describe('Columnar Aggregation', (): void => {
+  describe.each(cases)('Golden-Datei: $name', ({ rows, expected }) => {
+    test('calculateSummary entspricht der Golden-Datei', () => {
+      expectGolden(calculateSummary(rows), expected.summary);
+    });
+
+    test('prepareDataForVisualization entspricht der Golden-Datei', () => {
+      expectGolden(prepareDataForVisualization(rows), expected.visualization);
+    });
+
+    test('prepareGebaeudeteilData entspricht der Golden-Datei', () => {
+      expectGolden(prepareGebaeudeteilData(rows), expected.gebaeudeteil);
+    });
+
+    test('Ein gemeinsamer Aggregationsdurchlauf liefert alle Ergebnisse', () => {
+      const aggregates = aggregateRaumbuch(rows);
+
+      expectGolden(summaryFromAggregates(aggregates), expected.summary);
+      expectGolden(visualizationFromAggregates(aggregates), expected.visualization);
+      expectGolden(gebaeudeteilFromAggregates(aggregates), expected.gebaeudeteil);
+    });
+
+    test('RaumbuchAccumulator liefert dieselben Summen Zeile für Zeile', () => {
+      const accumulator = new RaumbuchAccumulator();
+      rows.forEach(row => accumulator.add(row));
+      const aggregates = accumulator.result();
+
+      expect(aggregates).toEqual(aggregateRaumbuch(rows));
+      expectGolden(summaryFromAggregates(aggregates), expected.summary);
+      expectGolden(visualizationFromAggregates(aggregates), expected.visualization);
+    });
+  });
+
+  describe('toColumns Function', () => {
+    test('Kodiert Gruppenschlüssel wie groupBy() über String(wert)', () => {
+      const rows = [
+        { Bereich: 'Buero', Etage: 1, Menge: 10 },
+        { Bereich: null, Etage: '1', Menge: '2.5' },
+        { Bereich: 'Buero', Menge: null },
+      ] as unknown as RaumbuchRow[];
+
+      const columns = toColumns(rows);
+
+      expect(columns.rowCount).toBe(3);
+      expect(columns.dimensions.Bereich.keys).toEqual(['Buero', 'null']);
+      expect(Array.from(columns.dimensions.Bereich.codes)).toEqual([0, 1, 0]);
+      expect(columns.dimensions.Etage.keys).toEqual(['1', 'undefined']);
+      expect(Array.from(columns.dimensions.Etage.codes)).toEqual([0, 0, 1]);
+      expect(Array.from(columns.measures.Menge)).toEqual([10, 2.5, 0]);
+    });
+
+    test('Summiert Gruppen in Zeilenreihenfolge', () => {
+      const rows = [0.1, 0.2, 0.3].map(Menge => ({ Bereich: 'A', Menge })) as RaumbuchRow[];
+
+      const aggregates = aggregateColumns(toColumns(rows));
+
+      expect(aggregates.totals[0]).toBe(0.1 + 0.2 + 0.3);
+      expect(aggregates.groups.Bereich.sums[0]).toBe(0.1 + 0.2 + 0.3);
+    });
+  });
+});
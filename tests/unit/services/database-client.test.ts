@@ -0,0 +1,177 @@
+/**
+ * @jest-environment node
+ */
+import { executePrepared, getPool, getPoolStats } from '@/services/database/client';
+import {
+  backoffDelay,
+  CircuitBreaker,
+  CircuitOpenError,
+  isTransientError,
+  retryWithBackoff,
+} from '@/services/database/resilience';
+
+const mockConnects = jest.fn();
+const mockPrepares = jest.fn();
+const mockQueries = jest.fn();
+let mockExecute: () => Promise<{ recordset: unknown[] }>;
+
+jest.mock('mssql', () => {
+  class MockPool {
+    size = 1;
+    available = 1;
+    borrowed = 0;
+    pending = 0;
+
+    connect() {
+      mockConnects();
+      return new Promise(resolve => setTimeout(() => resolve(this), 5));
+    }
+
+    on = jest.fn();
+
+    request() {
+      return {
+        input: jest.fn(),
+        query: (sql: string) => {
+          mockQueries(sql);
+          return Promise.resolve({ recordset: [{ ID: 'adhoc' }] });
+        },
+      };
+    }
+  }
+
+  class MockPreparedStatement {
+    input = jest.fn();
+    prepare(sql: string) {
+      mockPrepares(sql);
+      return Promise.resolve();
+    }
+    execute() {
+      return mockExecute();
+    }
+    unprepare() {
+      return Promise.resolve();
+    }
+  }
+
+  return {
+    __esModule: true,
+    default: { Int: 'Int' },
+    ConnectionPool: MockPool,
+    PreparedStatement: MockPreparedStatement,
+  };
+});
+
+function transient(): Error {
+  return Object.assign(new Error('socket hang up'), { code: 'ESOCKET' });
+}
+
+describe('Datenbank-Client', () => {
+  let consoleLog: jest.SpyInstance;
+  let consoleWarn: jest.SpyInstance;
+
+  beforeEach(() => {
+    consoleLog = jest.spyOn(console, 'log').mockImplementation(() => undefined);
+    consoleWarn = jest.spyOn(console, 'warn').mockImplementation(() => undefined);
+  });
+
+  afterEach(() => {
+    consoleLog.mockRestore();
+    consoleWarn.mockRestore();
+  });
+
+  test('Baut bei gleichzeitigen Aufrufen nur einen Pool auf', async () => {
+    const pools = await Promise.all([getPool(), getPool(), getPool()]);
+
+    expect(mockConnects).toHaveBeenCalledTimes(1);
+    expect(pools[1]).toBe(pools[0]);
+    expect(pools[2]).toBe(pools[0]);
+  });
+
+  test('Bereitet feste Abfragen einmal vor und weicht bei belegtem Statement aus', async () => {
+    const definition = { name: 'test', sql: 'SELECT 1', params: { id: 'Int' as const } };
+    let release: () => void = () => undefined;
+    mockExecute = () =>
+      new Promise(resolve => {
+        release = () => resolve({ recordset: [{ ID: 'prepared' }] });
+      });
+
+    const first = executePrepared(definition, { id: 1 });
+    await new Promise(resolve => setTimeout(resolve, 0));
+    const second = await executePrepared(definition, { id: 2 });
+    release();
+
+    expect(await first).toEqual([{ ID: 'prepared' }]);
+    expect(second).toEqual([{ ID: 'adhoc' }]);
+    expect(mockPrepares).toHaveBeenCalledTimes(1);
+    expect(getPoolStats()).toMatchObject({
+      connected: true,
+      preparedStatements: 1,
+      preparedExecutions: 1,
+      preparedFallbacks: 1,
+    });
+  });
+});
+
+describe('Fehlerbehandlung', () => {
+  test('Erkennt vorübergehende Fehler auch in verpackten Fehlern', () => {
+    expect(isTransientError(transient())).toBe(true);
+    expect(isTransientError({ number: 1205 })).toBe(true);
+    expect(isTransientError({ code: 'EREQUEST', originalError: { number: 40613 } })).toBe(true);
+    expect(isTransientError({ code: 'EREQUEST', number: 207 })).toBe(false);
+    expect(isTransientError(new CircuitOpenError(100))).toBe(false);
+  });
+
+  test('Begrenzt den gestreuten Backoff nach oben', () => {
+    const options = { baseDelayMs: 100, maxDelayMs: 1000 };
+
+    expect(backoffDelay(0, options, () => 0.5)).toBe(50);
+    expect(backoffDelay(2, options, () => 0.5)).toBe(200);
+    expect(backoffDelay(10, options, () => 0.999)).toBe(999);
+    expect(backoffDelay(3, options, () => 0)).toBe(0);
+  });
+
+  test('Wiederholt nur vorübergehende Fehler', async () => {
+    const options = { retries: 3, baseDelayMs: 0, maxDelayMs: 0 };
+    const flaky = jest
+      .fn()
+      .mockRejectedValueOnce(transient())
+      .mockRejectedValueOnce(transient())
+      .mockResolvedValue('ok');
+
+    await expect(retryWithBackoff(flaky, options)).resolves.toBe('ok');
+    expect(flaky).toHaveBeenCalledTimes(3);
+
+    const broken = jest.fn().mockRejectedValue(new Error('Invalid column name'));
+    await expect(retryWithBackoff(broken, options)).rejects.toThrow('Invalid column name');
+    expect(broken).toHaveBeenCalledTimes(1);
+  });
+
+  test('Öffnet den Circuit Breaker und lässt nach der Wartezeit einen Probeaufruf zu', async () => {
+    const now = jest.spyOn(Date, 'now').mockReturnValue(0);
+    const breaker = new CircuitBreaker({ failureThreshold: 2, resetTimeoutMs: 1000 });
+    const failing = () => Promise.reject(transient());
+
+    await expect(breaker.run(failing)).rejects.toThrow('socket hang up');
+    await expect(breaker.run(failing)).rejects.toThrow('socket hang up');
+    expect(breaker.stats().state).toBe('open');
+
+    const fn = jest.fn(() => Promise.resolve(1));
+    await expect(breaker.run(fn)).rejects.toBeInstanceOf(CircuitOpenError);
+    expect(fn).not.toHaveBeenCalled();
+
+    now.mockReturnValue(1000);
+    expect(breaker.stats().state).toBe('half-open');
+    await expect(breaker.run(fn)).resolves.toBe(1);
+    expect(breaker.stats()).toMatchObject({ state: 'closed', opened: 1, rejected: 1 });
+
+    now.mockRestore();
+  });
+
+  test('Zählt Fehler ohne Verbindungsbezug nicht als Ausfall', async () => {
+    const breaker = new CircuitBreaker({ failureThreshold: 1, resetTimeoutMs: 1000 });
+
+    await expect(breaker.run(() => Promise.reject(new Error('Syntaxfehler')))).rejects.toThrow();
+    expect(breaker.stats().state).toBe('closed');
+  });
+});
@@ -0,0 +1,122 @@
+/**
+ * @jest-environment node
+ */
+
+import ExcelJS from 'exceljs';
+import { PassThrough } from 'stream';
+
+import { writeExcelStream } from '@/services/export/excel-export';
+import { RaumbuchRow, RaumbuchSummary } from '@/types/raumbuch.types';
+
+const rows: Partial<RaumbuchRow>[] = [
+  {
+    ID: 1,
+    Raumnummer: '0.01',
+    Bereich: 'Büro',
+    Etage: 'EG',
+    Bezeichnung: 'Empfang',
+    Reinigungsgruppe: 'RG1',
+    Menge: 20.5,
+    MengeAktivMonat: 41,
+    VkWertNettoMonat: 100.25,
+    StundeMonat: 2.5,
+  },
+  {
+    ID: 2,
+    Raumnummer: '0.02',
+    Bereich: 'Sanitär',
+    Etage: 'EG',
+    Bezeichnung: 'WC',
+    Reinigungsgruppe: 'RG2',
+    Menge: 10,
+    MengeAktivMonat: 200,
+    VkWertNettoMonat: 50,
+    StundeMonat: 4,
+  },
+  {
+    ID: 3,
+    Raumnummer: '1.01',
+    Bereich: 'Büro',
+    Etage: 'OG1',
+    Bezeichnung: 'Büro',
+    Reinigungsgruppe: 'RG1',
+    Menge: 30,
+    MengeAktivMonat: 60,
+    VkWertNettoMonat: 80,
+    StundeMonat: 1.5,
+  },
+];
+
+// Schreibt die Datei in einen PassThrough und liest sie mit ExcelJS zurück
+async function roundTrip(
+  input: Partial<RaumbuchRow>[]
+): Promise<{ workbook: ExcelJS.Workbook; summary: RaumbuchSummary }> {
+  const output = new PassThrough();
+  const chunks: Buffer[] = [];
+  output.on('data', chunk => chunks.push(chunk));
+  const ended = new Promise(resolve => output.on('end', resolve));
+
+  const summary = await writeExcelStream(input, 'Teststandort', output);
+  await ended;
+
+  const workbook = new ExcelJS.Workbook();
+  await workbook.xlsx.load(Buffer.concat(chunks));
+  return { workbook, summary };
+}
+
+describe('writeExcelStream Function', () => {
+  test('Schreibt das Datenblatt vor den Zusammenfassungen', async () => {
+    const { workbook } = await roundTrip(rows);
+
+    expect(workbook.worksheets.map(sheet => sheet.name)).toEqual([
+      'Raumbuchdaten',
+      'Zusammenfassung',
+      'Nach Bereich',
+      'Nach Reinigungsgruppe',
+    ]);
+    expect(workbook.getWorksheet('Zusammenfassung')!.getCell('A1').value).toBe(
+      'Zusammenfassung für Teststandort'
+    );
+  });
+
+  test('Schreibt alle Zeilen und die Summen-Zeile', async () => {
+    const { workbook, summary } = await roundTrip(rows);
+    const sheet = workbook.getWorksheet('Raumbuchdaten')!;
+
+    // Kopfzeile, drei Datenzeilen, Summen-Zeile
+    expect(sheet.rowCount).toBe(5);
+    expect([2, 3, 4].map(row => sheet.getRow(row).getCell(1).value)).toEqual([1, 2, 3]);
+
+    const sumRow = sheet.getRow(5);
+    expect(sumRow.getCell(6).value).toBe('Summe:');
+    expect(sumRow.getCell(8).value).toBeCloseTo(60.5);
+    expect(sumRow.getCell(13).value).toBeCloseTo(301);
+    expect(sumRow.getCell(14).value).toBeCloseTo(230.25);
+    expect(sumRow.getCell(16).value).toBeCloseTo(8);
+    expect(sumRow.getCell(17).value).toBeCloseTo(2763);
+
+    expect(summary.totalRooms).toBe(3);
+    expect(summary.totalVkWertNettoMonat).toBeCloseTo(230.25);
+  });
+
+  test('Leere Eingabe ergibt nur Kopfzeile und Zusammenfassung', async () => {
+    const { workbook, summary } = await roundTrip([]);
+
+    expect(workbook.worksheets.map(sheet => sheet.name)).toEqual([
+      'Raumbuchdaten',
+      'Zusammenfassung',
+    ]);
+    expect(workbook.getWorksheet('Raumbuchdaten')!.rowCount).toBe(1);
+    expect(summary.totalRooms).toBe(0);
+    expect(summary.totalMenge).toBe(0);
+  });
+
+  test('Bricht ab, wenn der Ziel-Stream geschlossen wurde', async () => {
+    const output = new PassThrough();
+    output.destroy();
+
+    await expect(writeExcelStream(rows, 'Teststandort', output)).rejects.toThrow(
+      'Excel-Export abgebrochen'
+    );
+  });
+});
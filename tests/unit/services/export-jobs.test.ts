@@ -0,0 +1,290 @@
+/**
+ * @jest-environment node
+ */
+import { promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+
+import { getRaumbuchVersion } from '@/services/database/queries';
+import { ExportCache } from '@/services/export/export-cache';
+import {
+  ExportJobQueue,
+  ExportQueueFullError,
+  exportKey,
+  normalizeExportFilter,
+} from '@/services/export/export-jobs';
+
+import type { ExportJob, ProgressReporter } from '@/services/export/export-jobs';
+
+// Datenbank und PDF-Erzeugung werden in diesen Tests nie aufgerufen
+jest.mock('@/services/database/queries', () => ({
+  getGebaeudeById: jest.fn(),
+  getRaumbuchVersion: jest.fn(),
+}));
+
+jest.mock('@/services/database/raumbuch-cache', () => ({
+  getRaumbuchResult: jest.fn(),
+  resultForRows: jest.fn(),
+}));
+
+jest.mock('@/services/export/pdf-export', () => ({
+  generatePdf: jest.fn(),
+}));
+
+const mockVersion = getRaumbuchVersion as jest.Mock;
+
+const META = { filename: 'Raumbuch.pdf', contentType: 'application/pdf' };
+
+let directory: string;
+
+beforeEach(async () => {
+  directory = await fs.mkdtemp(path.join(os.tmpdir(), 'export-cache-'));
+  mockVersion.mockReset().mockResolvedValue('2|2024-01-01|1');
+});
+
+afterEach(async () => {
+  await fs.rm(directory, { recursive: true, force: true });
+});
+
+/**
+ * Runner, dessen Exporte erst auf Anforderung fertig werden
+ */
+function createManualRunner(cache: ExportCache) {
+  const pending: { job: ExportJob; report: ProgressReporter; resolve: () => void }[] = [];
+  const run = jest.fn(
+    (job: ExportJob, report: ProgressReporter) =>
+      new Promise<void>(resolve => pending.push({ job, report, resolve })).then(async () => {
+        const key = exportKey(job.format, job.gebaeude_ID, job.filter, '2|2024-01-01|1');
+        return (await cache.put(key, META, Buffer.from(`export ${job.id}`)))!;
+      })
+  );
+
+  return { run, pending };
+}
+
+/**
+ * Wartet, bis eine Bedingung erfüllt ist (höchstens eine Sekunde)
+ */
+async function until(check: () => boolean): Promise<void> {
+  for (let i = 0; i < 100 && !check(); i++) {
+    await new Promise(resolve => setTimeout(resolve, 10));
+  }
+}
+
+/**
+ * Liest einen Stream vollständig als Text
+ */
+async function readText(body: ReadableStream<Uint8Array>): Promise<string> {
+  const reader = body.getReader();
+  const chunks: Uint8Array[] = [];
+  for (let next = await reader.read(); !next.done; next = await reader.read()) {
+    chunks.push(next.value);
+  }
+
+  return Buffer.concat(chunks).toString('utf8');
+}
+
+describe('ExportCache', () => {
+  test('Speichert Dateien und liefert sie wieder aus', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+
+    await cache.put('a', META, Buffer.from('pdf-inhalt'));
+    await cache.put('b', { ...META, filename: 'Raumbuch.xlsx' }, async stream => {
+      stream.end('excel-inhalt');
+    });
+
+    const opened = await cache.open('a');
+    expect(opened?.entry).toMatchObject({ key: 'a', size: 10, filename: 'Raumbuch.pdf' });
+    expect(await readText(opened!.body)).toBe('pdf-inhalt');
+    expect((await cache.get('b'))?.file.endsWith('.xlsx')).toBe(true);
+    expect(await cache.get('c')).toBeNull();
+    expect(cache.stats()).toMatchObject({ entries: 2, bytes: 22, hits: 2, misses: 1 });
+  });
+
+  test('Verdrängt die am längsten nicht genutzten Dateien nach Größe', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 30 });
+
+    await cache.put('a', META, Buffer.alloc(10));
+    await cache.put('b', META, Buffer.alloc(10));
+    await cache.put('c', META, Buffer.alloc(10));
+    await cache.get('a');
+    await cache.put('d', META, Buffer.alloc(10));
+
+    expect(await cache.get('b')).toBeNull();
+    expect(await cache.get('a')).not.toBeNull();
+    expect(cache.stats()).toMatchObject({ entries: 3, bytes: 30, evictions: 1 });
+  });
+
+  test('Speichert keine Dateien, die allein größer als der Cache sind', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 10 });
+
+    expect(await cache.put('gross', META, Buffer.alloc(100))).toBeNull();
+    expect(await fs.readdir(directory)).toEqual([]);
+  });
+
+  test('Stellt den Index nach einem Neustart wieder her und entfernt Reste', async () => {
+    await new ExportCache({ directory, maxBytes: 1024 }).put('a', META, Buffer.from('pdf'));
+    await fs.writeFile(path.join(directory, `${'0'.repeat(40)}.pdf.1234.tmp`), 'halb');
+
+    const restarted = new ExportCache({ directory, maxBytes: 1024 });
+
+    expect(await restarted.get('a')).toMatchObject({ key: 'a', size: 3, ...META });
+    expect(await fs.readdir(directory)).toHaveLength(2);
+  });
+
+  test('Verwirft die temporäre Datei, wenn der Export fehlschlägt', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+
+    await expect(
+      cache.put('a', META, async () => {
+        throw new Error('Export fehlgeschlagen');
+      })
+    ).rejects.toThrow('Export fehlgeschlagen');
+
+    expect(await fs.readdir(directory)).toEqual([]);
+  });
+});
+
+describe('exportKey', () => {
+  test('Ist unabhängig von Reihenfolge und leeren Filterwerten', () => {
+    const key = exportKey('excel', 1, { etage: 'EG', bereich: 'Buero' }, 'v1');
+    const reordered = { bereich: 'Buero', etage: 'EG', gebaeudeteil: '' };
+
+    expect(exportKey('excel', 1, reordered, 'v1')).toBe(key);
+    expect(exportKey('pdf', 1, { etage: 'EG', bereich: 'Buero' }, 'v1')).not.toBe(key);
+    expect(exportKey('excel', 1, { etage: 'EG', bereich: 'Buero' }, 'v2')).not.toBe(key);
+    expect(normalizeExportFilter({ etage: '', bereich: 'Buero' })).toEqual({ bereich: 'Buero' });
+  });
+});
+
+describe('ExportJobQueue', () => {
+  test('Fasst gleiche Jobs zusammen und liefert die fertige Datei', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const { run, pending } = createManualRunner(cache);
+    const queue = new ExportJobQueue({ workers: 2, maxQueued: 10, retainMs: 60000, cache, run });
+
+    const first = await queue.submit({ format: 'pdf', gebaeude_ID: 1, filter: { etage: 'EG' } });
+    const second = await queue.submit({ format: 'pdf', gebaeude_ID: 1, filter: { etage: 'EG' } });
+    const other = await queue.submit({ format: 'pdf', gebaeude_ID: 1 });
+
+    expect(second.id).toBe(first.id);
+    expect(other.id).not.toBe(first.id);
+    expect(run).toHaveBeenCalledTimes(2);
+
+    pending[0].resolve();
+    await until(() => queue.get(first.id)?.status === 'done');
+
+    const done = queue.get(first.id);
+    expect(done).toMatchObject({ status: 'done', progress: 1, cached: false });
+    expect(done?.size).toBeGreaterThan(0);
+    expect(done?.downloadUrl).toBe(`/api/export/jobs/${first.id}/download`);
+    expect(await cache.get(queue.resultKey(first.id)!)).not.toBeNull();
+    expect(queue.stats()).toMatchObject({ done: 1, running: 1, deduplicated: 1 });
+  });
+
+  test('Liefert ein Ergebnis aus dem Cache ohne neuen Export', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const { run } = createManualRunner(cache);
+    const queue = new ExportJobQueue({ workers: 1, maxQueued: 10, retainMs: 60000, cache, run });
+    await cache.put(exportKey('excel', 3, {}, '2|2024-01-01|1'), META, Buffer.from('xlsx'));
+
+    const job = await queue.submit({ format: 'excel', gebaeude_ID: 3 });
+
+    expect(job).toMatchObject({ status: 'done', cached: true, size: 4 });
+    expect(run).not.toHaveBeenCalled();
+  });
+
+  test('Exportiert nach einer Datenänderung neu', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const { run } = createManualRunner(cache);
+    const queue = new ExportJobQueue({ workers: 1, maxQueued: 10, retainMs: 60000, cache, run });
+
+    const first = await queue.submit({ format: 'excel', gebaeude_ID: 1 });
+    mockVersion.mockResolvedValue('3|2024-01-02|1');
+    const second = await queue.submit({ format: 'excel', gebaeude_ID: 1 });
+
+    expect(second.id).not.toBe(first.id);
+  });
+
+  test('Startet höchstens so viele Exporte wie Worker', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const { run, pending } = createManualRunner(cache);
+    const queue = new ExportJobQueue({ workers: 1, maxQueued: 1, retainMs: 60000, cache, run });
+
+    await queue.submit({ format: 'pdf', gebaeude_ID: 1 });
+    const waiting = await queue.submit({ format: 'pdf', gebaeude_ID: 2 });
+    await expect(queue.submit({ format: 'pdf', gebaeude_ID: 3 })).rejects.toThrow(
+      ExportQueueFullError
+    );
+
+    expect(run).toHaveBeenCalledTimes(1);
+    expect(queue.get(waiting.id)?.status).toBe('queued');
+
+    pending[0].resolve();
+    await until(() => run.mock.calls.length === 2);
+
+    expect(run).toHaveBeenCalledTimes(2);
+    expect(queue.get(waiting.id)?.status).toBe('running');
+  });
+
+  test('Meldet den Fortschritt bis zum Abschluss', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const { run, pending } = createManualRunner(cache);
+    const queue = new ExportJobQueue({ workers: 1, maxQueued: 10, retainMs: 60000, cache, run });
+
+    const job = await queue.submit({ format: 'excel', gebaeude_ID: 1 });
+    const updates: ExportJob[] = [];
+    const watching = (async () => {
+      for await (const update of queue.watch(job.id)) {
+        updates.push(update);
+      }
+    })();
+
+    await until(() => updates.length === 1);
+    pending[0].report(0.5, 'render');
+    pending[0].report(0.5, 'render');
+    pending[0].resolve();
+    await watching;
+
+    expect(updates.map(update => update.status)).toEqual(['running', 'running', 'done']);
+    expect(updates[1]).toMatchObject({ progress: 0.5, stage: 'render' });
+  });
+
+  test('Wiederholt fehlgeschlagene Exporte bei einem neuen Auftrag', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const run = jest
+      .fn()
+      .mockRejectedValueOnce(new Error('Datenbank nicht erreichbar'))
+      .mockReturnValue(new Promise(() => undefined));
+    const queue = new ExportJobQueue({ workers: 1, maxQueued: 10, retainMs: 60000, cache, run });
+    const error = jest.spyOn(console, 'error').mockImplementation(() => undefined);
+
+    const failed = await queue.submit({ format: 'pdf', gebaeude_ID: 1 });
+    await until(() => queue.get(failed.id)?.status === 'failed');
+
+    expect(queue.get(failed.id)).toMatchObject({
+      status: 'failed',
+      error: 'Datenbank nicht erreichbar',
+    });
+
+    const retried = await queue.submit({ format: 'pdf', gebaeude_ID: 1 });
+    expect(retried.id).not.toBe(failed.id);
+    expect(run).toHaveBeenCalledTimes(2);
+
+    error.mockRestore();
+  });
+
+  test('Entfernt abgeschlossene Jobs nach retainMs', async () => {
+    const cache = new ExportCache({ directory, maxBytes: 1024 });
+    const { run, pending } = createManualRunner(cache);
+    const queue = new ExportJobQueue({ workers: 1, maxQueued: 10, retainMs: 1000, cache, run });
+
+    const job = await queue.submit({ format: 'pdf', gebaeude_ID: 1 });
+    pending[0].resolve();
+    await until(() => queue.get(job.id)?.status === 'done');
+
+    const now = jest.spyOn(Date, 'now').mockReturnValue(Date.now() + 1000);
+    expect(queue.get(job.id)).toBeNull();
+    now.mockRestore();
+  });
+});
@@ -0,0 +1,74 @@
+import {
+  aggregateRaumbuch,
+  summaryFromAggregates,
+  visualizationFromAggregates,
+} from '@/services/analysis/columnar-aggregation';
+import {
+  bitmapPositions,
+  buildFacetIndex,
+  countFacets,
+  FacetIndexStore,
+  parseFacetSelection,
+  selectRows,
+} from '@/services/analysis/facet-index';
+import { filterRaumbuchData } from '@/services/analysis/raumbuch-analysis';
+import { RaumbuchRow } from '@/types/raumbuch.types';
+
+// 100 Zeilen, damit die Bitmaps mehrere Worte umfassen
+const rows = Array.from(
+  { length: 100 },
+  (_, i) =>
+    ({
+      ID: i + 1,
+      Bereich: ['Buero', 'Flur', 'Sanitaer'][i % 3],
+      Gebaeudeteil: i < 50 ? 'Nord' : 'Sued',
+      Etage: ['UG', 'EG', '1.OG', '2.OG'][i % 4],
+      Reinigungsgruppe: i % 7 === 0 ? '' : `RG${i % 5}`,
+      Menge: 10 + (i % 9) * 2.5,
+      MengeAktivMonat: 100 + i,
+      VkWertNettoMonat: 20.1 * ((i % 6) + 1),
+      VkWertBruttoMonat: 23.92 * ((i % 6) + 1),
+      RgWertNettoMonat: 0,
+      RgWertBruttoMonat: 0,
+      StundeMonat: 1.5 + (i % 4),
+    }) as unknown as RaumbuchRow
+);
+
+describe('Facet Index', () => {
+  test('Schnittmenge entspricht filterRaumbuchData', () => {
+    const index = buildFacetIndex(rows);
+    const selection = parseFacetSelection('bereich=Flur&gebaeudeteil=Sued&etage=EG');
+    const expected = filterRaumbuchData(rows, selection).map(row => row.ID);
+
+    const positions = bitmapPositions(selectRows(index, selection));
+
+    expect(Array.from(positions, position => rows[position].ID)).toEqual(expected);
+    expect(bitmapPositions(selectRows(index, {}))).toHaveLength(100);
+    expect(bitmapPositions(selectRows(index, { etage: 'Dach' }))).toHaveLength(0);
+  });
+
+  test('Zählt je Facettenwert unter der Auswahl der übrigen Facetten', () => {
+    const index = buildFacetIndex(rows);
+    const counts = countFacets(index, { bereich: 'Buero', gebaeudeteil: 'Nord' });
+
+    // Die eigene Auswahl grenzt die eigene Facette nicht ein
+    expect(counts.bereich).toEqual({ Buero: 17, Flur: 17, Sanitaer: 16 });
+    expect(counts.gebaeudeteil).toEqual({ Nord: 17, Sued: 17 });
+    expect(Object.values(counts.etage).reduce((sum, n) => sum + n, 0)).toBe(17);
+    // Leere Werte bilden keine Option
+    expect(Object.keys(counts.reinigungsgruppe)).not.toContain('');
+  });
+
+  test('Auswertung entspricht der Aggregation der gefilterten Zeilen', () => {
+    const store = new FacetIndexStore(rows);
+    const selection = { etage: '1.OG', reinigungsgruppe: 'RG2' };
+    const aggregates = aggregateRaumbuch(filterRaumbuchData(rows, selection));
+
+    const result = store.query(selection);
+
+    expect(result.summary).toEqual(summaryFromAggregates(aggregates));
+    expect(result.visualizationData).toEqual(visualizationFromAggregates(aggregates));
+    expect(store.query({ ...selection })).toBe(result);
+    expect(store.filterOptions().etage).toEqual(['1.OG', '2.OG', 'EG', 'UG']);
+  });
+});
@@ -0,0 +1,95 @@
+import { mapWithConcurrency } from '@/lib/utils';
+import { buildPortfolio } from '@/services/analysis/portfolio-analysis';
+import { buildPortfolioQuery } from '@/services/database/queries';
+import { PortfolioGebaeudeRow } from '@/types/portfolio.types';
+
+// Mocks für den Datenbankzugriff
+jest.mock('@/services/database/client', () => ({
+  executeQuery: jest.fn(),
+  executeSingleQuery: jest.fn(),
+  streamQuery: jest.fn(),
+}));
+
+function gebaeudeRow(
+  gebaeude_ID: number,
+  standort_ID: number,
+  menge: number,
+  vkWertNettoMonat: number,
+  stundenMonat: number
+): PortfolioGebaeudeRow {
+  return {
+    gebaeude_ID,
+    firma_ID: 1,
+    standort_ID,
+    standort: `Standort ${standort_ID}`,
+    gebaeude: `Gebäude ${gebaeude_ID}`,
+    anzahl: 10,
+    menge,
+    mengeAktivMonat: menge * 4,
+    vkWertNettoMonat,
+    vkWertBruttoMonat: vkWertNettoMonat * 1.19,
+    rgWertNettoMonat: 0,
+    rgWertBruttoMonat: 0,
+    stundenMonat,
+  };
+}
+
+describe('Portfolio', () => {
+  describe('buildPortfolio Function', () => {
+    test('Summiert je Standort und gesamt und berechnet Kennzahlen', () => {
+      const portfolio = buildPortfolio({ firma_ID: 1 }, [
+        gebaeudeRow(1, 10, 100, 500, 20),
+        gebaeudeRow(2, 10, 300, 1500, 60),
+        gebaeudeRow(3, 20, 0, 0, 0),
+      ]);
+
+      expect(portfolio.totals).toMatchObject({
+        gebaeudeCount: 3,
+        anzahl: 30,
+        menge: 400,
+        vkWertNettoMonat: 2000,
+        vkWertNettoProQm: 5,
+        mengeProStunde: 20,
+      });
+      expect(portfolio.standorte).toHaveLength(2);
+      expect(portfolio.standorte[0]).toMatchObject({
+        standort_ID: 10,
+        gebaeudeCount: 2,
+        menge: 400,
+        stundenMonat: 80,
+      });
+      // Ohne Fläche und Stunden keine Division durch 0
+      expect(portfolio.gebaeude[2]).toMatchObject({ vkWertNettoProQm: 0, mengeProStunde: 0 });
+    });
+  });
+
+  describe('buildPortfolioQuery Function', () => {
+    test('Grenzt per Parameter auf Standort und Firma ein', () => {
+      const { query, params } = buildPortfolioQuery({ standort_ID: 4, firma_ID: 2 });
+
+      expect(query).toContain(
+        'Gebaeude.Standort_ID = @standort_ID AND Gebaeude.Firma_ID = @firma_ID'
+      );
+      expect(query).toContain('LEFT JOIN BIRD.Raumbuch');
+      expect(params).toEqual({ standort_ID: 4, firma_ID: 2 });
+    });
+  });
+
+  describe('mapWithConcurrency Function', () => {
+    test('Begrenzt die Zahl gleichzeitiger Aufrufe und behält die Reihenfolge', async () => {
+      let running = 0;
+      let maxRunning = 0;
+
+      const results = await mapWithConcurrency([5, 1, 4, 2, 3], 2, async value => {
+        running++;
+        maxRunning = Math.max(maxRunning, running);
+        await new Promise(resolve => setTimeout(resolve, value));
+        running--;
+        return value * 10;
+      });
+
+      expect(results).toEqual([50, 10, 40, 20, 30]);
+      expect(maxRunning).toBe(2);
+    });
+  });
+});
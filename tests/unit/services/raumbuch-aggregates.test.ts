@@ -0,0 +1,145 @@
+import { calculateSummary } from '@/services/analysis/calculate-summary';
+import {
+  prepareDataForVisualization,
+  prepareGebaeudeteilData,
+} from '@/services/analysis/prepare-visualization';
+import * as databaseQueries from '@/services/database/queries';
+import {
+  buildRaumbuchAggregateResult,
+  getRaumbuchAggregates,
+  invalidateRaumbuchAggregates,
+} from '@/services/database/raumbuch-aggregates';
+import { RaumbuchAggregateRow, RaumbuchRow } from '@/types/raumbuch.types';
+
+// Mocks für die Datenbankabfragen
+jest.mock('@/services/database/queries', () => ({
+  fetchRaumbuchAggregateRows: jest.fn(),
+  getRaumbuchVersion: jest.fn(),
+}));
+
+const rows = [
+  {
+    ID: 1,
+    Bereich: 'Buero',
+    Reinigungsgruppe: 'RG1',
+    Etage: 'EG',
+    Gebaeudeteil: 'A',
+    Menge: 25,
+    VkWertNettoMonat: 150,
+    StundeMonat: 10,
+  },
+  {
+    ID: 2,
+    Bereich: 'Flur',
+    Reinigungsgruppe: 'RG1',
+    Etage: '1.OG',
+    Gebaeudeteil: 'A',
+    Menge: 40,
+    VkWertNettoMonat: 250,
+    StundeMonat: 5,
+  },
+  {
+    ID: 3,
+    Bereich: 'Buero',
+    Reinigungsgruppe: 'RG2',
+    Etage: 'EG',
+    Gebaeudeteil: null,
+    Menge: 15,
+    VkWertNettoMonat: 100,
+    StundeMonat: 2,
+  },
+] as unknown as RaumbuchRow[];
+
+// Gruppenzeilen, wie sie die GROUPING-SETS-Abfrage für die Zeilen oben liefert
+function groupRow(
+  dimension: RaumbuchAggregateRow['dimension'],
+  key: string | null,
+  anzahl: number,
+  menge: number,
+  vkWertNettoMonat: number,
+  stundenMonat: number
+): RaumbuchAggregateRow {
+  return {
+    dimension,
+    key,
+    anzahl,
+    menge,
+    mengeAktivMonat: 0,
+    vkWertNettoMonat,
+    vkWertBruttoMonat: 0,
+    rgWertNettoMonat: 0,
+    rgWertBruttoMonat: 0,
+    stundenMonat,
+  };
+}
+
+const aggregateRows = [
+  groupRow(null, null, 3, 80, 500, 17),
+  groupRow('Bereich', 'Buero', 2, 40, 250, 12),
+  groupRow('Reinigungsgruppe', 'RG1', 2, 65, 400, 15),
+  groupRow('Etage', 'EG', 2, 40, 250, 12),
+  groupRow('Gebaeudeteil', 'A', 2, 65, 400, 15),
+  groupRow('Bereich', 'Flur', 1, 40, 250, 5),
+  groupRow('Etage', '1.OG', 1, 40, 250, 5),
+  groupRow('Reinigungsgruppe', 'RG2', 1, 15, 100, 2),
+  groupRow('Gebaeudeteil', null, 1, 15, 100, 2),
+];
+
+describe('Raumbuch-Summen', () => {
+  let now: jest.SpyInstance;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    invalidateRaumbuchAggregates();
+    now = jest.spyOn(Date, 'now').mockReturnValue(1_000_000);
+    (databaseQueries.fetchRaumbuchAggregateRows as jest.Mock).mockResolvedValue(aggregateRows);
+    (databaseQueries.getRaumbuchVersion as jest.Mock).mockResolvedValue('3|2024-01-01|1');
+  });
+
+  afterEach(() => {
+    now.mockRestore();
+  });
+
+  test('Liefert dieselben Auswertungen wie die Berechnung aus den Zeilen', () => {
+    const result = buildRaumbuchAggregateResult(1, aggregateRows, 'v1');
+
+    expect(result.summary).toEqual(calculateSummary(rows));
+    expect(result.visualizationData).toEqual(prepareDataForVisualization(rows));
+    expect(result.gebaeudeteilData).toEqual(prepareGebaeudeteilData(rows));
+  });
+
+  test('Berechnet neu, wenn sich der Datenstand ändert', async () => {
+    await getRaumbuchAggregates(1);
+
+    // Innerhalb des Prüfintervalls ohne Datenbankzugriff
+    await getRaumbuchAggregates(1);
+    expect(databaseQueries.getRaumbuchVersion).toHaveBeenCalledTimes(1);
+
+    // Unveränderter Datenstand: nur die Prüfung
+    now.mockReturnValue(2_000_000);
+    await getRaumbuchAggregates(1);
+    expect(databaseQueries.getRaumbuchVersion).toHaveBeenCalledTimes(2);
+    expect(databaseQueries.fetchRaumbuchAggregateRows).toHaveBeenCalledTimes(1);
+
+    // Geänderter Datenstand: neu berechnen
+    now.mockReturnValue(3_000_000);
+    (databaseQueries.getRaumbuchVersion as jest.Mock).mockResolvedValue('4|2024-01-02|2');
+    const result = await getRaumbuchAggregates(1);
+    expect(databaseQueries.fetchRaumbuchAggregateRows).toHaveBeenCalledTimes(2);
+    expect(result.version).toBe('4|2024-01-02|2');
+  });
+
+  test('Liefert bei Datenbankfehlern den vorhandenen Stand', async () => {
+    const consoleError = jest.spyOn(console, 'error').mockImplementation(() => undefined);
+    const first = await getRaumbuchAggregates(1);
+
+    now.mockReturnValue(2_000_000);
+    (databaseQueries.getRaumbuchVersion as jest.Mock).mockRejectedValueOnce(new Error('offline'));
+    expect(await getRaumbuchAggregates(1)).toBe(first);
+
+    (databaseQueries.getRaumbuchVersion as jest.Mock).mockRejectedValueOnce(new Error('offline'));
+    await expect(getRaumbuchAggregates(2)).rejects.toThrow('offline');
+
+    consoleError.mockRestore();
+  });
+});
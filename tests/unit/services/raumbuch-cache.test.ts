@@ -0,0 +1,176 @@
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
+import { estimateSize, LruCache, SingleFlight } from '@/services/database/cache';
+import * as databaseQueries from '@/services/database/queries';
+import {
+  getRaumbuchCacheStats,
+  getRaumbuchResult,
+  invalidateRaumbuchCache,
+  resultForRows,
+} from '@/services/database/raumbuch-cache';
+import { RaumbuchRow } from '@/types/raumbuch.types';
+
+// Mocks für die Datenbankabfragen
+jest.mock('@/services/database/queries', () => ({
+  fetchRaumbuchFrame: jest.fn(),
+  getRaumbuchVersion: jest.fn(),
+}));
+
+const rows = [
+  { ID: 1, Bereich: 'Buero', Etage: 'EG', Menge: 25, VkWertNettoMonat: 150, StundeMonat: 10 },
+  { ID: 2, Bereich: 'Flur', Etage: '1.OG', Menge: 40, VkWertNettoMonat: 250, StundeMonat: 5 },
+] as RaumbuchRow[];
+
+const frame = RaumbuchFrame.from(rows);
+
+describe('LruCache', () => {
+  test('Verdrängt die am längsten nicht genutzten Einträge nach Größe', () => {
+    const cache = new LruCache<string, number>({ maxBytes: 30, ttlMs: 0, sizeOf: () => 10 });
+
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.set('c', 3);
+    expect(cache.get('a')).toBe(1); // a ist jetzt zuletzt genutzt
+
+    cache.set('d', 4);
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('d')).toBe(4);
+    expect(cache.stats()).toMatchObject({ entries: 3, bytes: 30, evictions: 1 });
+  });
+
+  test('Speichert keine Werte, die allein größer als der Cache sind', () => {
+    const cache = new LruCache<string, string>({ maxBytes: 10, ttlMs: 0 });
+
+    expect(cache.set('gross', 'x'.repeat(100))).toBe(false);
+    expect(cache.get('gross')).toBeUndefined();
+  });
+
+  test('Verwirft abgelaufene Einträge', () => {
+    const now = jest.spyOn(Date, 'now').mockReturnValue(1000);
+    const cache = new LruCache<string, number>({ maxBytes: 100, ttlMs: 500 });
+
+    cache.set('a', 1);
+    now.mockReturnValue(1499);
+    expect(cache.get('a')).toBe(1);
+    now.mockReturnValue(1500);
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.stats().bytes).toBe(0);
+
+    now.mockRestore();
+  });
+
+  test('Schätzt Strings, Zahlen und Objekte', () => {
+    expect(estimateSize('abc')).toBeGreaterThan(estimateSize('a'));
+    expect(estimateSize({ a: 1, b: 'x' })).toBeGreaterThan(estimateSize({ a: 1 }));
+    expect(estimateSize(rows)).toBeGreaterThan(estimateSize(rows[0]));
+  });
+});
+
+describe('SingleFlight', () => {
+  test('Fasst gleichzeitige Aufrufe zusammen', async () => {
+    const flights = new SingleFlight<number, string>();
+    const loader = jest.fn(() => Promise.resolve('wert'));
+
+    const results = await Promise.all([flights.run(1, loader), flights.run(1, loader)]);
+
+    expect(results).toEqual(['wert', 'wert']);
+    expect(loader).toHaveBeenCalledTimes(1);
+    expect(flights.size).toBe(0);
+
+    await flights.run(1, loader);
+    expect(loader).toHaveBeenCalledTimes(2);
+  });
+});
+
+describe('Raumbuch-Cache', () => {
+  let now: jest.SpyInstance;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    invalidateRaumbuchCache();
+    now = jest.spyOn(Date, 'now').mockReturnValue(1_000_000);
+    (databaseQueries.getRaumbuchVersion as jest.Mock).mockResolvedValue('2|2024-01-01|7');
+    (databaseQueries.fetchRaumbuchFrame as jest.Mock).mockResolvedValue(frame);
+  });
+
+  afterEach(() => {
+    now.mockRestore();
+  });
+
+  test('Liefert Zeilen samt Zusammenfassung, Visualisierung und Filteroptionen', async () => {
+    const result = await getRaumbuchResult(1);
+
+    expect(databaseQueries.fetchRaumbuchFrame).toHaveBeenCalledWith(1);
+    expect(result.frame).toBe(frame);
+    expect(result.version).toBe('2|2024-01-01|7');
+    expect(result.summary.totalMenge).toBe(65);
+    expect(result.visualizationData.bereichData).toEqual({ Buero: 25, Flur: 40 });
+    expect(result.filterOptions.etage).toEqual(['1.OG', 'EG']);
+  });
+
+  test('Beantwortet Folgeanfragen ohne erneute Abfrage', async () => {
+    const first = await getRaumbuchResult(1);
+    const second = await getRaumbuchResult(1);
+
+    expect(second).toBe(first);
+    expect(databaseQueries.getRaumbuchVersion).toHaveBeenCalledTimes(1);
+    expect(databaseQueries.fetchRaumbuchFrame).toHaveBeenCalledTimes(1);
+  });
+
+  test('Prüft nach dem Prüfintervall nur den Datenstand', async () => {
+    const first = await getRaumbuchResult(1);
+    now.mockReturnValue(1_000_000 + 60_000);
+
+    const second = await getRaumbuchResult(1);
+
+    expect(second).toBe(first);
+    expect(databaseQueries.getRaumbuchVersion).toHaveBeenCalledTimes(2);
+    expect(databaseQueries.fetchRaumbuchFrame).toHaveBeenCalledTimes(1);
+  });
+
+  test('Lädt neu, wenn sich der Datenstand geändert hat', async () => {
+    await getRaumbuchResult(1);
+    now.mockReturnValue(1_000_000 + 60_000);
+    (databaseQueries.getRaumbuchVersion as jest.Mock).mockResolvedValue('2|2024-01-02|8');
+
+    const result = await getRaumbuchResult(1);
+
+    expect(result.version).toBe('2|2024-01-02|8');
+    expect(databaseQueries.fetchRaumbuchFrame).toHaveBeenCalledTimes(2);
+  });
+
+  test('Fasst gleichzeitige Anfragen zu einem Datenbank-Roundtrip zusammen', async () => {
+    const results = await Promise.all([1, 2, 3].map(() => getRaumbuchResult(1)));
+
+    expect(results[1]).toBe(results[0]);
+    expect(results[2]).toBe(results[0]);
+    expect(databaseQueries.fetchRaumbuchFrame).toHaveBeenCalledTimes(1);
+    expect(getRaumbuchCacheStats().inflight).toBe(0);
+  });
+
+  test('Liefert bei Datenbankfehlern ein leeres Ergebnis ohne es zu cachen', async () => {
+    const consoleError = jest.spyOn(console, 'error').mockImplementation(() => undefined);
+    (databaseQueries.fetchRaumbuchFrame as jest.Mock).mockRejectedValueOnce(new Error('timeout'));
+
+    const failed = await getRaumbuchResult(1);
+    const retried = await getRaumbuchResult(1);
+
+    expect(failed.frame.length).toBe(0);
+    expect(retried.frame).toBe(frame);
+    expect(databaseQueries.fetchRaumbuchFrame).toHaveBeenCalledTimes(2);
+    expect(consoleError).toHaveBeenCalled();
+
+    consoleError.mockRestore();
+  });
+
+  test('Berechnet Auswertungen für gefilterte Zeilen neu', async () => {
+    const result = await getRaumbuchResult(1);
+
+    expect(resultForRows(result, result.frame)).toBe(result);
+
+    const filtered = resultForRows(result, result.frame.where([['Bereich', 'Flur']]));
+    expect(filtered.summary.totalMenge).toBe(40);
+    expect(filtered.filterOptions.bereiche).toEqual(['Flur']);
+  });
+});
@@ -0,0 +1,160 @@
+import { aggregateFrame, aggregateRaumbuch } from '@/services/analysis/columnar-aggregation';
+import {
+  createFilterOptions,
+  filterRaumbuchData,
+  filterRaumbuchFrame,
+} from '@/services/analysis/raumbuch-analysis';
+import { RaumbuchFrame } from '@/services/analysis/raumbuch-frame';
+import { mapToRaumbuchEntries, mapToRaumbuchEntry } from '@/services/database/queries';
+
+jest.mock('@/services/database/client', () => ({
+  executePrepared: jest.fn(),
+  executePreparedSingle: jest.fn(),
+  executeQuery: jest.fn(),
+  executeSingleQuery: jest.fn(),
+  streamQuery: jest.fn(),
+}));
+
+// Wie aus der Datenbank: alle Spalten vorhanden, nicht gesetzte als NULL
+const FIELDS = Object.keys(mapToRaumbuchEntry({}));
+const complete = (partial: Record<string, unknown>) => ({
+  ...Object.fromEntries(FIELDS.map(field => [field, null])),
+  ...partial,
+});
+
+// Datenbankzeilen: DECIMAL als String, NULL in Kennzahlen und Texten
+const records = [
+  {
+    ID: 1,
+    Bereich: 'Buero',
+    Etage: 'EG',
+    Gebaeudeteil: 'A',
+    Reinigungsgruppe: 'RG 1',
+    Bereich_ID: 10,
+    Menge: '25.5',
+    VkWertNettoMonat: '150.25',
+    StundeMonat: 10,
+    Bemerkung: null,
+    xDatum: new Date('2024-01-01T00:00:00Z'),
+  },
+  {
+    ID: 2,
+    Bereich: 'Flur',
+    Etage: '1.OG',
+    Gebaeudeteil: 'A',
+    Reinigungsgruppe: 'RG 2',
+    Bereich_ID: 11,
+    Menge: null,
+    VkWertNettoMonat: '250',
+    StundeMonat: 5,
+    Bemerkung: 'Glasfront',
+    xDatum: null,
+  },
+  {
+    ID: 3,
+    Bereich: 'Buero',
+    Etage: '1.OG',
+    Gebaeudeteil: null,
+    Reinigungsgruppe: 'RG 1',
+    Bereich_ID: 10,
+    Menge: '40',
+    VkWertNettoMonat: '99.9',
+    StundeMonat: '2.5',
+    Bemerkung: null,
+    xDatum: null,
+  },
+].map(complete);
+
+describe('RaumbuchFrame', () => {
+  const rows = mapToRaumbuchEntries(records);
+
+  test('Liefert dieselben Zeilen wie mapToRaumbuchEntries()', () => {
+    const frame = RaumbuchFrame.from(records);
+
+    expect(frame.length).toBe(3);
+    expect(frame.toRows()).toEqual(rows);
+    expect(Object.keys(frame.toObject(0))).toEqual(Object.keys(rows[0]));
+    expect(JSON.stringify(frame)).toBe(JSON.stringify(rows));
+  });
+
+  test('Liest Felder einer Zeilensicht erst beim Zugriff', () => {
+    const frame = RaumbuchFrame.from(records);
+    const view = frame.row(1);
+
+    expect(view.Bereich).toBe('Flur');
+    expect(view.Menge).toBe(0);
+    expect(view.VkWertNettoMonat).toBe(250);
+    expect(view.Bemerkung).toBe('Glasfront');
+    expect(view.xDatum).toBeNull();
+    expect(frame.row(0).xDatum).toEqual(new Date('2024-01-01T00:00:00Z'));
+    expect(view.toObject()).toEqual(rows[1]);
+  });
+
+  test('Durchläuft die Zeilen mit einer wiederverwendeten Sicht', () => {
+    const frame = RaumbuchFrame.from(records);
+    const ids: number[] = [];
+    const views = new Set<unknown>();
+
+    for (const view of frame.rows()) {
+      ids.push(view.ID);
+      views.add(view);
+    }
+
+    expect(ids).toEqual([1, 2, 3]);
+    expect(views.size).toBe(1);
+  });
+
+  test('Filtert ohne Zeilenkopien wie filterRaumbuchData()', () => {
+    const frame = RaumbuchFrame.from(records);
+
+    const byName = filterRaumbuchFrame(frame, { bereich: 'Buero', etage: '1.OG' });
+    expect(byName.toRows()).toEqual(filterRaumbuchData(rows, { bereich: 'Buero', etage: '1.OG' }));
+
+    const byId = filterRaumbuchFrame(frame, { bereich_ID: 10 });
+    expect(byId.toRows().map(row => row.ID)).toEqual([1, 3]);
+
+    // Verschachtelte Auswahl und unbekannte Werte
+    expect(byId.where([['Etage', 'EG']]).toRows().map(row => row.ID)).toEqual([1]);
+    expect(filterRaumbuchFrame(frame, { bereich: 'Keller' }).length).toBe(0);
+    expect(filterRaumbuchFrame(frame, {})).toBe(frame);
+  });
+
+  test('Aggregiert bitgenau wie aggregateRaumbuch() über dieselben Zeilen', () => {
+    const frame = RaumbuchFrame.from(records);
+    const filter = { reinigungsgruppe: 'RG 1' };
+
+    expect(aggregateFrame(frame)).toEqual(aggregateRaumbuch(rows));
+    expect(aggregateFrame(filterRaumbuchFrame(frame, filter))).toEqual(
+      aggregateRaumbuch(filterRaumbuchData(rows, filter))
+    );
+    expect(frame.sum('Menge')).toBe(65.5);
+    expect(filterRaumbuchFrame(frame, filter).sum('StundeMonat')).toBe(12.5);
+  });
+
+  test('Erstellt Filteroptionen wie für Zeilenobjekte', () => {
+    const frame = RaumbuchFrame.from(records);
+    const filtered = filterRaumbuchFrame(frame, { etage: '1.OG' });
+
+    expect(createFilterOptions(frame)).toEqual(createFilterOptions(rows));
+    expect(createFilterOptions(filtered)).toEqual(
+      createFilterOptions(filterRaumbuchData(rows, { etage: '1.OG' }))
+    );
+  });
+
+  test('Behält Werte, die keine Zahl sind, in ID-Spalten unverändert', () => {
+    const frame = RaumbuchFrame.from([complete({ ID: '9007199254740993' })]);
+
+    expect(frame.get('ID', 0)).toBe('9007199254740993');
+    expect(frame.get('Bereich_ID', 0)).toBeNull();
+    expect(frame.where([['ID', '9007199254740993']]).length).toBe(1);
+  });
+
+  test('Benötigt weniger Speicher als die Zeilenobjekte', () => {
+    const many = Array.from({ length: 1000 }, (_, i) => ({ ...records[i % 3], ID: i }));
+    const frame = RaumbuchFrame.from(many);
+    const filtered = filterRaumbuchFrame(frame, { bereich: 'Flur' });
+
+    expect(frame.byteSize()).toBeLessThan(45 * 8 * many.length);
+    expect(filtered.byteSize() - frame.byteSize()).toBe(filtered.length * 4);
+  });
+});
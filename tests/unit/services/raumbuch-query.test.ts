@@ -0,0 +1,134 @@
+import { filterRaumbuchData } from '@/services/analysis/raumbuch-analysis';
+import { executeQuery, executeSingleQuery } from '@/services/database/client';
+import {
+  buildRaumbuchQuery,
+  encodeRaumbuchCursor,
+  isRaumbuchField,
+  parseRaumbuchCursor,
+  queryRaumbuch,
+} from '@/services/database/queries';
+import { RaumbuchRow } from '@/types/raumbuch.types';
+
+// Mocks für den Datenbankzugriff
+jest.mock('@/services/database/client', () => ({
+  executeQuery: jest.fn(),
+  executeSingleQuery: jest.fn(),
+}));
+
+describe('Raumbuch-Abfrage', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+  });
+
+  describe('buildRaumbuchQuery Function', () => {
+    test('Übergibt Filterwerte ausschließlich als Parameter', () => {
+      const { query, countQuery, params } = buildRaumbuchQuery({
+        gebaeude_ID: 3,
+        filter: { bereich: "Buero'; DROP TABLE x --", etage_ID: 4, etage: '' },
+      });
+
+      expect(query).toContain('Raumbuch.Etage_ID = @etage_ID');
+      expect(query).toContain('Raumbuch.Bereich = @bereich');
+      expect(query).not.toContain('DROP');
+      expect(query).not.toContain('Raumbuch.Etage =');
+      expect(countQuery).toContain('COUNT(*)');
+      expect(params).toEqual({ gebaeude_ID: 3, etage_ID: 4, bereich: "Buero'; DROP TABLE x --" });
+    });
+
+    test('Wählt nur angeforderte Spalten samt Sortierschlüssel aus', () => {
+      const { query } = buildRaumbuchQuery({
+        gebaeude_ID: 1,
+        fields: ['Menge', 'Bereich'],
+        orderBy: 'LfdNr',
+      });
+
+      expect(query).toContain('Raumbuch.Menge');
+      expect(query).toContain('Raumbuch.ID');
+      expect(query).toContain('Raumbuch.LfdNr');
+      expect(query).not.toContain('Raumbuch.Etage');
+      expect(query).toContain('ORDER BY Raumbuch.LfdNr, Raumbuch.ID');
+    });
+
+    test('Paginiert mit OFFSET/FETCH', () => {
+      const { query, params } = buildRaumbuchQuery({ gebaeude_ID: 1, limit: 20, offset: 40 });
+
+      expect(query).toContain('OFFSET @offset ROWS FETCH NEXT @limit ROWS ONLY');
+      expect(params).toMatchObject({ limit: 20, offset: 40 });
+    });
+
+    test('Paginiert per Keyset nach einem Cursor', () => {
+      const byId = buildRaumbuchQuery({ gebaeude_ID: 1, after: '12', limit: 20, offset: 40 });
+      expect(byId.query).toContain('Raumbuch.ID > @afterID');
+      expect(byId.countQuery).not.toContain('@afterID');
+      expect(byId.params).toMatchObject({ afterID: 12, offset: 0 });
+
+      const byLfdNr = buildRaumbuchQuery({ gebaeude_ID: 1, orderBy: 'LfdNr', after: '7~12' });
+      expect(byLfdNr.query).toContain('Raumbuch.LfdNr > @afterLfdNr');
+      expect(byLfdNr.params).toMatchObject({ afterLfdNr: 7, afterID: 12 });
+    });
+  });
+
+  describe('Cursor', () => {
+    test('Kodiert und liest Cursor für ID und LfdNr', () => {
+      expect(encodeRaumbuchCursor({ ID: 5, LfdNr: 3 })).toBe('5');
+      expect(encodeRaumbuchCursor({ ID: 5, LfdNr: 3 }, 'LfdNr')).toBe('3~5');
+      expect(parseRaumbuchCursor('3~5', 'LfdNr')).toEqual({ lfdNr: 3, id: 5 });
+      expect(parseRaumbuchCursor('~5', 'LfdNr')).toEqual({ lfdNr: null, id: 5 });
+      expect(parseRaumbuchCursor('5', 'LfdNr')).toBeNull();
+      expect(parseRaumbuchCursor('abc')).toBeNull();
+    });
+
+    test('Prüft Spaltennamen gegen die Whitelist', () => {
+      expect(isRaumbuchField('Menge')).toBe(true);
+      expect(isRaumbuchField('toString')).toBe(false);
+      expect(isRaumbuchField('Menge; DROP')).toBe(false);
+    });
+  });
+
+  describe('queryRaumbuch Function', () => {
+    test('Liefert Seite, Gesamtanzahl und nächsten Cursor', async () => {
+      (executeQuery as jest.Mock).mockResolvedValue([
+        { ID: 5, Menge: '2.5' },
+        { ID: 7, Menge: 1 },
+      ]);
+      (executeSingleQuery as jest.Mock).mockResolvedValue({ Anzahl: 42 });
+
+      const page = await queryRaumbuch({ gebaeude_ID: 1, fields: ['Menge'], limit: 2 });
+
+      expect(page).toEqual({
+        data: [
+          { ID: 5, Menge: 2.5 },
+          { ID: 7, Menge: 1 },
+        ],
+        totalCount: 42,
+        nextCursor: '7',
+      });
+    });
+
+    test('Liefert keinen Cursor auf der letzten Seite', async () => {
+      (executeQuery as jest.Mock).mockResolvedValue([{ ID: 5 }]);
+      (executeSingleQuery as jest.Mock).mockResolvedValue({ Anzahl: 1 });
+
+      const page = await queryRaumbuch({ gebaeude_ID: 1, limit: 2 });
+
+      expect(page.nextCursor).toBeNull();
+      expect(page.totalCount).toBe(1);
+    });
+  });
+
+  describe('filterRaumbuchData Function', () => {
+    const rows = [
+      { ID: 1, Bereich: 'A', Etage_ID: 1 },
+      { ID: 2, Bereich: 'A', Etage_ID: 2 },
+      { ID: 3, Bereich: 'B', Etage_ID: 1 },
+    ] as RaumbuchRow[];
+
+    test('Liefert ohne Filter dieselbe Liste', () => {
+      expect(filterRaumbuchData(rows, {})).toBe(rows);
+    });
+
+    test('Kombiniert Text- und ID-Filter', () => {
+      expect(filterRaumbuchData(rows, { bereich: 'A', etage_ID: 1 })).toEqual([rows[0]]);
+    });
+  });
+});
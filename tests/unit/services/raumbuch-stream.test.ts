@@ -0,0 +1,253 @@
+/**
+ * @jest-environment node
+ */
+import { EventEmitter } from 'events';
+
+import { DATABASE_POOL_CONFIG } from '@/config/database';
+import { createRowStream, NdjsonParser, prefetchFirstRow } from '@/lib/ndjson';
+import { getPoolStats, streamQuery } from '@/services/database/client';
+import { CircuitOpenError } from '@/services/database/resilience';
+
+// Request im Streaming-Modus, der bis zum pause() alle Zeilen auf einmal liefert
+class MockRequest extends EventEmitter {
+  stream = false;
+  paused = false;
+  cancelled = false;
+  pauseCount = 0;
+  next = 0;
+
+  constructor(private readonly total: number) {
+    super();
+  }
+
+  input = jest.fn();
+
+  pause() {
+    this.paused = true;
+    this.pauseCount++;
+    return true;
+  }
+
+  resume() {
+    this.paused = false;
+    setTimeout(() => this.emitRows(), 0);
+    return true;
+  }
+
+  cancel() {
+    this.cancelled = true;
+  }
+
+  query() {
+    setTimeout(() => this.emitRows(), 0);
+    return this;
+  }
+
+  private emitRows() {
+    while (this.next < this.total && !this.paused && !this.cancelled) {
+      this.emit('row', { ID: this.next++ });
+    }
+    if (this.next === this.total && mockError) {
+      this.emit('error', mockError);
+    } else if (this.next === this.total) {
+      this.emit('done');
+    }
+  }
+}
+
+const mockRequests: MockRequest[] = [];
+let mockTotal = 0;
+// Fehler, den der Request nach den Zeilen statt 'done' meldet
+let mockError: Error | null = null;
+
+jest.mock('mssql', () => ({
+  ConnectionPool: jest.fn().mockImplementation(() => ({
+    connect() {
+      return Promise.resolve(this);
+    },
+    on: jest.fn(),
+    request: () => {
+      const request = new MockRequest(mockTotal);
+      mockRequests.push(request);
+      return request;
+    },
+  })),
+}));
+
+// Quelle, die die Zeilen nacheinander liefert und ihr Ende meldet
+async function* rowsOf<T>(rows: T[], finished?: () => void): AsyncGenerator<T> {
+  try {
+    yield* rows;
+  } finally {
+    finished?.();
+  }
+}
+
+// Liest alle Blöcke eines Streams als Text
+async function readChunks(stream: ReadableStream<Uint8Array>): Promise<string[]> {
+  const decoder = new TextDecoder();
+  const reader = stream.getReader();
+  const chunks: string[] = [];
+  for (let next = await reader.read(); !next.done; next = await reader.read()) {
+    chunks.push(decoder.decode(next.value));
+  }
+  return chunks;
+}
+
+describe('Streaming', () => {
+  let consoleLog: jest.SpyInstance;
+
+  beforeEach(() => {
+    mockRequests.length = 0;
+    consoleLog = jest.spyOn(console, 'log').mockImplementation(() => undefined);
+  });
+
+  afterEach(() => {
+    consoleLog.mockRestore();
+  });
+
+  describe('streamQuery Function', () => {
+    test('Liefert alle Zeilen und pausiert bei vollem Puffer', async () => {
+      mockTotal = 250;
+      const ids: number[] = [];
+
+      for await (const row of streamQuery<{ ID: number }>('SELECT 1', { id: 1 }, 100)) {
+        ids.push(row.ID);
+      }
+
+      expect(ids).toEqual(Array.from({ length: 250 }, (_, i) => i));
+      expect(mockRequests[0].stream).toBe(true);
+      expect(mockRequests[0].input).toHaveBeenCalledWith('id', 1);
+      expect(mockRequests[0].pauseCount).toBe(2);
+    });
+
+    test('Bricht die Query ab, wenn der Verbraucher aufhört', async () => {
+      mockTotal = 1000;
+      let count = 0;
+
+      for await (const _row of streamQuery('SELECT 1', {}, 100)) {
+        if (++count === 10) break;
+      }
+
+      expect(mockRequests[0].cancelled).toBe(true);
+    });
+
+    test('Meldet Fehler mitten im Stream an den Circuit Breaker', async () => {
+      const consoleError = jest.spyOn(console, 'error').mockImplementation(() => undefined);
+      const read = async () => {
+        for await (const _row of streamQuery('SELECT 1')) {
+          // Zeilen verwerfen
+        }
+      };
+
+      try {
+        mockTotal = 3;
+        mockError = Object.assign(new Error('socket hang up'), { code: 'ESOCKET' });
+        const threshold = DATABASE_POOL_CONFIG.breakerThreshold;
+        for (let i = 0; i < threshold; i++) {
+          await expect(read()).rejects.toThrow('socket hang up');
+        }
+
+        expect(getPoolStats().breaker.state).toBe('open');
+        await expect(read()).rejects.toBeInstanceOf(CircuitOpenError);
+        expect(mockRequests).toHaveLength(threshold);
+
+        // Nach der Wartezeit schließt ein gelungener Probe-Stream den Breaker wieder
+        mockError = null;
+        const later = Date.now() + DATABASE_POOL_CONFIG.breakerResetMs;
+        const clock = jest.spyOn(Date, 'now').mockReturnValue(later);
+        await read();
+        clock.mockRestore();
+        expect(getPoolStats().breaker.state).toBe('closed');
+      } finally {
+        mockError = null;
+        consoleError.mockRestore();
+      }
+    });
+  });
+
+  describe('createRowStream Function', () => {
+    test('Gibt ein JSON-Array mit Kommas zwischen den Zeilen aus', async () => {
+      const rows = [{ ID: 1 }, { ID: 2 }, { ID: 3 }];
+      const text = (await readChunks(createRowStream(rowsOf(rows), 'json'))).join('');
+
+      expect(text).toBe('[{"ID":1},{"ID":2},{"ID":3}]');
+      expect(JSON.parse(text)).toEqual(rows);
+    });
+
+    test('Gibt für eine leere Quelle ein leeres Array bzw. nichts aus', async () => {
+      expect((await readChunks(createRowStream(rowsOf([]), 'json'))).join('')).toBe('[]');
+      expect(await readChunks(createRowStream(rowsOf([]), 'ndjson'))).toEqual([]);
+    });
+
+    test('Sendet zuerst nur die erste Zeile, danach Blöcke', async () => {
+      const rows = Array.from({ length: 100 }, (_, i) => ({ ID: i }));
+
+      const ndjson = await readChunks(createRowStream(rowsOf(rows), 'ndjson'));
+      expect(ndjson[0]).toBe('{"ID":0}\n');
+      expect(ndjson).toHaveLength(2);
+
+      const json = await readChunks(createRowStream(rowsOf(rows), 'json', 40));
+      expect(json[0]).toBe('[{"ID":0}');
+      expect(json.length).toBeGreaterThan(2);
+      expect(JSON.parse(json.join(''))).toEqual(rows);
+    });
+
+    test('Gibt Fehler der Quelle an den Empfänger weiter', async () => {
+      async function* failing() {
+        yield { ID: 1 };
+        throw new Error('Verbindung getrennt');
+      }
+      const reader = createRowStream(failing(), 'ndjson').getReader();
+
+      await reader.read();
+      await expect(reader.read()).rejects.toThrow('Verbindung getrennt');
+    });
+
+    test('Bricht bei Abbruch durch den Client die Query ab', async () => {
+      mockTotal = 1000;
+      const rows = await prefetchFirstRow(streamQuery('SELECT 1', {}, 100));
+      const reader = createRowStream(rows, 'ndjson').getReader();
+
+      await reader.read();
+      await reader.cancel();
+
+      expect(mockRequests[0].cancelled).toBe(true);
+    });
+  });
+
+  describe('prefetchFirstRow Function', () => {
+    test('Wirft Query-Fehler, bevor die Antwort erstellt wird', async () => {
+      async function* failing(): AsyncGenerator<{ ID: number }> {
+        throw new Error('Ungültiger Objektname');
+      }
+
+      await expect(prefetchFirstRow(failing())).rejects.toThrow('Ungültiger Objektname');
+    });
+
+    test('Liefert anschließend alle Zeilen einschließlich der ersten', async () => {
+      const finished = jest.fn();
+      const rows = await prefetchFirstRow(rowsOf([{ ID: 1 }, { ID: 2 }], finished));
+      const ids: number[] = [];
+
+      for await (const row of rows) {
+        ids.push(row.ID);
+      }
+
+      expect(ids).toEqual([1, 2]);
+      expect(finished).toHaveBeenCalledTimes(1);
+    });
+  });
+
+  describe('NdjsonParser', () => {
+    test('Setzt über Blockgrenzen geteilte Zeilen zusammen', () => {
+      const parser = new NdjsonParser<{ ID: number }>();
+
+      expect(parser.push('{"ID":1}\n{"I')).toEqual([{ ID: 1 }]);
+      expect(parser.push('D":2}\n')).toEqual([{ ID: 2 }]);
+      expect(parser.push('{"ID":3}')).toEqual([]);
+      expect(parser.flush()).toEqual([{ ID: 3 }]);
+      expect(parser.flush()).toEqual([]);
+    });
+  });
+});